@@ -0,0 +1,247 @@
+"""OpenAI 兼容异步客户端（基于 aiohttp）。
+
+面向性能压测的高并发场景：单事件循环内复用一个 `aiohttp.ClientSession`
+与按并发度限流的连接池，避免“每请求一线程”的 CPU/内存开销。
+接口形态与 `OpenAICompatClient` 保持一致，便于执行器在两种引擎间切换。
+"""
+
+from __future__ import annotations
+
+from types import TracebackType
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Type, cast
+
+import aiohttp
+
+from vllm_cibench.clients.openai_client import (
+    DEFAULT_CONNECT_TIMEOUT_S,
+    DEFAULT_READ_TIMEOUT_S,
+    SSE_DONE,
+    StreamTruncatedError,
+    parse_sse_line,
+)
+
+
+async def _aiter_sse(resp: aiohttp.ClientResponse) -> AsyncIterator[Dict[str, Any]]:
+    """按到达顺序逐个产出 SSE chunk，遇到 `[DONE]` 结束。
+
+    异常:
+        StreamTruncatedError: 响应体在 `[DONE]` 之前结束。
+    """
+
+    async for raw in resp.content:
+        chunk = parse_sse_line(raw)
+        if chunk is None:
+            continue
+        if chunk is SSE_DONE:
+            return
+        yield chunk
+    raise StreamTruncatedError("SSE stream ended before [DONE]")
+
+
+class AsyncOpenAICompatClient:
+    """OpenAI 兼容异步客户端。
+
+    参数:
+        base_url: 服务基础 URL，例如 `http://127.0.0.1:9000/v1`。
+        api_key: 认证用 API Key（可选）。
+        pool_size: 连接池上限（通常取并发度）；0 表示不限制。
+        connect_timeout_s: 建连超时（秒）。
+        read_timeout_s: 读超时（秒；流式下为相邻两个 chunk 之间的最长间隔）。
+            不设整体超时，长输出不会因总时长被中断（与 `OpenAICompatClient` 一致）。
+        default_headers: 默认请求头（可选）。
+
+    返回值:
+        客户端实例；需在 `async with` 中使用以管理会话生命周期。
+
+    副作用:
+        进入上下文时创建 `aiohttp.ClientSession`，退出时关闭连接池。
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        *,
+        pool_size: int = 0,
+        connect_timeout_s: float = DEFAULT_CONNECT_TIMEOUT_S,
+        read_timeout_s: float = DEFAULT_READ_TIMEOUT_S,
+        default_headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        self.base_url = base_url
+        self.api_key = api_key
+        self.pool_size = max(0, int(pool_size))
+        self.connect_timeout_s = float(connect_timeout_s)
+        self.read_timeout_s = float(read_timeout_s)
+        self.default_headers = default_headers
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncOpenAICompatClient":
+        connector = aiohttp.TCPConnector(limit=self.pool_size)
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                total=None,
+                connect=self.connect_timeout_s,
+                sock_read=self.read_timeout_s,
+            ),
+        )
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """关闭底层会话与连接池（可重复调用）。"""
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _headers(self) -> Dict[str, str]:
+        """构造请求头（与同步客户端一致）。"""
+
+        headers: Dict[str, str] = {"Content-Type": "application/json"}
+        if self.default_headers:
+            headers.update(dict(self.default_headers))
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def _require_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            raise RuntimeError("client session not started; use 'async with'")
+        return self._session
+
+    async def _post(
+        self, path: str, payload: Mapping[str, Any]
+    ) -> Dict[str, Any] | List[Dict[str, Any]]:
+        """发送 POST 请求并按是否流式解析响应。
+
+        参数:
+            path: 相对 `base_url` 的端点路径（如 `/chat/completions`）。
+            payload: 请求体。
+
+        返回值:
+            非流式返回 JSON 字典；流式返回 chunk 列表。
+
+        副作用:
+            网络请求；非 2xx 抛出 `aiohttp.ClientResponseError`。
+        """
+
+        session = self._require_session()
+        url = f"{self.base_url.rstrip('/')}{path}"
+        stream = bool(payload.get("stream"))
+        async with session.post(url, headers=self._headers(), json=payload) as resp:
+            resp.raise_for_status()
+            if not stream:
+                return cast(Dict[str, Any], await resp.json(content_type=None))
+            return [c async for c in _aiter_sse(resp)]
+
+    async def _stream(
+        self, path: str, payload: Mapping[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """以 `stream=True` 发送请求并逐个产出 SSE chunk（响应在结束或中断时释放）。"""
+
+        session = self._require_session()
+        url = f"{self.base_url.rstrip('/')}{path}"
+        body = {**payload, "stream": True}
+        async with session.post(url, headers=self._headers(), json=body) as resp:
+            resp.raise_for_status()
+            async for chunk in _aiter_sse(resp):
+                yield chunk
+
+    def stream_chat_completions(
+        self,
+        model: str,
+        messages: List[Mapping[str, Any]],
+        **params: Any,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """以异步生成器形式流式调用 `/v1/chat/completions`。
+
+        参数:
+            model: 模型名。
+            messages: OpenAI 格式的消息数组。
+            params: 其他可选参数；`stream` 总是被置为 True。
+
+        返回值:
+            AsyncIterator[dict]: 按到达顺序产出的 chunk。
+
+        副作用:
+            网络请求；非 2xx 抛出 `aiohttp.ClientResponseError`。
+        """
+
+        payload: Dict[str, Any] = {"model": model, "messages": messages}
+        payload.update(params)
+        return self._stream("/chat/completions", payload)
+
+    async def chat_completions(
+        self,
+        model: str,
+        messages: List[Mapping[str, Any]],
+        **params: Any,
+    ) -> Dict[str, Any] | List[Dict[str, Any]]:
+        """调用 `/v1/chat/completions` 端点。
+
+        参数:
+            model: 模型名。
+            messages: OpenAI 格式的消息数组。
+            params: 其他可选参数（如 temperature/stream 等）。
+
+        返回值:
+            当 `stream=False` 时返回单个 JSON 响应；当 `stream=True` 时返
+            回按顺序排列的 chunk 列表。
+        """
+
+        payload: Dict[str, Any] = {"model": model, "messages": messages}
+        payload.update(params)
+        return await self._post("/chat/completions", payload)
+
+    def stream_completions(
+        self,
+        model: str,
+        prompt: str,
+        **params: Any,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """以异步生成器形式流式调用 `/v1/completions`。
+
+        参数:
+            model: 模型名。
+            prompt: 文本补全提示。
+            params: 其他可选参数；`stream` 总是被置为 True。
+
+        返回值:
+            AsyncIterator[dict]: 按到达顺序产出的 chunk。
+
+        副作用:
+            网络请求；非 2xx 抛出 `aiohttp.ClientResponseError`。
+        """
+
+        payload: Dict[str, Any] = {"model": model, "prompt": prompt}
+        payload.update(params)
+        return self._stream("/completions", payload)
+
+    async def completions(
+        self,
+        model: str,
+        prompt: str,
+        **params: Any,
+    ) -> Dict[str, Any] | List[Dict[str, Any]]:
+        """调用 `/v1/completions` 端点。
+
+        参数:
+            model: 模型名。
+            prompt: 文本补全提示。
+            params: 其他可选参数。
+
+        返回值:
+            同 `chat_completions`。
+        """
+
+        payload: Dict[str, Any] = {"model": model, "prompt": prompt}
+        payload.update(params)
+        return await self._post("/completions", payload)
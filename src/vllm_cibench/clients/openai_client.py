@@ -2,15 +2,131 @@
 
 使用 `requests` 以 OpenAI 兼容的 REST 方式访问 `/v1/chat/completions` 等端点，
 便于在单元测试中通过 `requests-mock` 进行模拟，不依赖官方 SDK 的 httpx 传输。
+
+客户端经 `requests.Session` 复用 keep-alive 连接（连接池大小由 `pool_size`
+决定，应不小于调用方并发），避免每个请求重新握手把建连耗时计入 TTFT。
+多个阶段可通过 `pooled_session` 创建一个会话并注入各客户端共享连接池。
 """
 
 from __future__ import annotations
 
+import enum
 import json
-from dataclasses import dataclass
-from typing import Any, Dict, List, Mapping, Optional, cast
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Dict,
+    Final,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
 import requests
+from requests.adapters import HTTPAdapter
+
+
+class _Done(enum.Enum):
+    """SSE `[DONE]` 结束标记的单例类型。"""
+
+    DONE = "[DONE]"
+
+
+SSE_DONE: Final = _Done.DONE
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT_S = 10.0
+DEFAULT_READ_TIMEOUT_S = 30.0
+
+
+class StreamTruncatedError(IOError):
+    """SSE 流在收到 `[DONE]` 之前结束（服务端中断或响应被截断）。"""
+
+
+def parse_sse_line(line: bytes) -> Optional[Union[Dict[str, Any], _Done]]:
+    """解析单行 SSE 数据。
+
+    参数:
+        line: 原始字节行（可含行尾换行）。
+
+    返回值:
+        解析出的 JSON 字典；非 `data:` 行返回 None；`[DONE]` 返回 `SSE_DONE`
+        哨兵（调用方以 `is SSE_DONE` 判断流结束）。
+
+    副作用:
+        无；JSON 非法时抛出 `json.JSONDecodeError`。
+    """
+
+    line = line.strip()
+    if not line.startswith(b"data:"):
+        return None
+    data = line[len(b"data:") :].strip()
+    if data == b"[DONE]":
+        return SSE_DONE
+    return cast(Dict[str, Any], json.loads(data))
+
+
+def iter_sse(resp: requests.Response) -> Iterator[Dict[str, Any]]:
+    """按到达顺序逐个产出 SSE chunk，遇到 `[DONE]` 结束。
+
+    异常:
+        StreamTruncatedError: 响应体在 `[DONE]` 之前结束。
+    """
+
+    for line in resp.iter_lines():
+        if not line:
+            continue
+        chunk = parse_sse_line(line)
+        if chunk is None:
+            continue
+        if chunk is SSE_DONE:
+            return
+        yield chunk
+    raise StreamTruncatedError("SSE stream ended before [DONE]")
+
+
+def pooled_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """创建连接池大小为 `pool_size` 的 `requests.Session`。
+
+    参数:
+        pool_size: 每个主机保持的最大连接数（应不小于并发数，否则超出部分的
+            连接用完即丢弃）。
+
+    返回值:
+        requests.Session: 已为 http/https 挂载连接池适配器的会话。
+
+    异常:
+        ValueError: `pool_size < 1`。
+    """
+
+    if pool_size < 1:
+        raise ValueError(f"pool_size must be >= 1, got {pool_size}")
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@contextmanager
+def session_scope(
+    session: Optional[requests.Session] = None, pool_size: int = DEFAULT_POOL_SIZE
+) -> Iterator[requests.Session]:
+    """给定会话时原样产出（不关闭）；否则临时创建一个并在退出时关闭。"""
+
+    if session is not None:
+        yield session
+        return
+    own = pooled_session(pool_size)
+    try:
+        yield own
+    finally:
+        own.close()
 
 
 @dataclass
@@ -21,17 +137,77 @@ class OpenAICompatClient:
         base_url: 服务基础 URL，例如 `http://127.0.0.1:9000/v1`。
         api_key: 认证用 API Key（可选）。
         default_headers: 默认请求头（可选）。
+        pool_size: 自建会话的连接池大小（应不小于并发数）。
+        connect_timeout_s: 建连超时（秒）。
+        read_timeout_s: 读超时（秒；流式下为相邻两个 chunk 之间的最长间隔）。
+        session: 外部共享的会话（可选）；给定时 `pool_size` 不生效，
+            `close()` 也不会关闭它。
 
     返回值:
-        客户端实例，可调用 `chat_completions` 等方法。
+        客户端实例，可调用 `chat_completions` 等方法；可用作上下文管理器，
+        退出时关闭自建会话。
 
     副作用:
-        无；仅保存配置，实际网络请求在方法调用时执行。
+        无；会话在首次请求时创建，实际网络请求在方法调用时执行。
+
+    异常:
+        ValueError: `pool_size < 1` 或超时非正。
     """
 
     base_url: str
     api_key: Optional[str] = None
     default_headers: Optional[Mapping[str, str]] = None
+    pool_size: int = DEFAULT_POOL_SIZE
+    connect_timeout_s: float = DEFAULT_CONNECT_TIMEOUT_S
+    read_timeout_s: float = DEFAULT_READ_TIMEOUT_S
+    session: Optional[requests.Session] = None
+    _owned: Optional[requests.Session] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.pool_size < 1:
+            raise ValueError(f"pool_size must be >= 1, got {self.pool_size}")
+        if self.connect_timeout_s <= 0 or self.read_timeout_s <= 0:
+            raise ValueError(
+                "timeouts must be > 0, got "
+                f"connect={self.connect_timeout_s} read={self.read_timeout_s}"
+            )
+
+    def __enter__(self) -> "OpenAICompatClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """传给 `requests` 的 `(connect, read)` 超时。"""
+
+        return (self.connect_timeout_s, self.read_timeout_s)
+
+    def _session(self) -> requests.Session:
+        if self.session is not None:
+            return self.session
+        if self._owned is None:
+            self._owned = pooled_session(self.pool_size)
+        return self._owned
+
+    def close(self) -> None:
+        """关闭自建会话及其连接（可重复调用；外部共享的会话不受影响）。"""
+
+        if self._owned is not None:
+            self._owned.close()
+            self._owned = None
+
+    def _post(
+        self, path: str, payload: Mapping[str, Any], *, stream: bool
+    ) -> requests.Response:
+        return self._session().post(
+            f"{self.base_url.rstrip('/')}/{path}",
+            headers=self._headers(),
+            json=payload,
+            timeout=self.timeout,
+            stream=stream,
+        )
 
     def _headers(self, extra: Optional[Mapping[str, str]] = None) -> Dict[str, str]:
         """构造请求头。
@@ -57,6 +233,15 @@ class OpenAICompatClient:
             headers["Authorization"] = f"Bearer {self.api_key}"
         return headers
 
+    def _stream(
+        self, path: str, payload: Mapping[str, Any]
+    ) -> Iterator[Dict[str, Any]]:
+        """以 `stream=True` 发送请求并逐个产出 SSE chunk（响应在结束或中断时关闭）。"""
+
+        with self._post(path, {**payload, "stream": True}, stream=True) as resp:
+            resp.raise_for_status()
+            yield from iter_sse(resp)
+
     def chat_completions(
         self,
         model: str,
@@ -78,31 +263,65 @@ class OpenAICompatClient:
             发起网络请求；可能抛出 `requests.RequestException`。
         """
 
-        url = f"{self.base_url.rstrip('/')}/chat/completions"
         payload: Dict[str, Any] = {"model": model, "messages": messages}
         payload.update(params)
         stream = bool(params.get("stream"))
-        resp = requests.post(
-            url,
-            headers=self._headers(),
-            json=payload,
-            timeout=30,
-            stream=stream,
-        )
-        resp.raise_for_status()
-        if not stream:
-            return cast(Dict[str, Any], resp.json())
-
-        chunks: List[Dict[str, Any]] = []
-        for line in resp.iter_lines():
-            if not line:
-                continue
-            if line.startswith(b"data:"):
-                data = line[len(b"data:") :].strip()
-                if data == b"[DONE]":
-                    break
-                chunks.append(json.loads(data))
-        return chunks
+        with self._post("chat/completions", payload, stream=stream) as resp:
+            resp.raise_for_status()
+            if not stream:
+                return cast(Dict[str, Any], resp.json())
+            return list(iter_sse(resp))
+
+    def stream_chat_completions(
+        self,
+        model: str,
+        messages: List[Mapping[str, Any]],
+        **params: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        """以生成器形式流式调用 `/v1/chat/completions`。
+
+        与 `chat_completions(stream=True)` 不同，chunk 在到达时即被产出，
+        便于调用方为每个 chunk 打时间戳（TTFT/ITL 测量）。
+
+        参数:
+            model: 模型名。
+            messages: OpenAI 格式的消息数组。
+            params: 其他可选参数；`stream` 总是被置为 True。
+
+        返回值:
+            Iterator[dict]: 按到达顺序的 chunk。
+
+        副作用:
+            发起网络请求；非 2xx 时在首次迭代时抛出 `HTTPError`。
+        """
+
+        payload: Dict[str, Any] = {"model": model, "messages": messages}
+        payload.update(params)
+        return self._stream("chat/completions", payload)
+
+    def stream_completions(
+        self,
+        model: str,
+        prompt: str,
+        **params: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        """以生成器形式流式调用 `/v1/completions`（chunk 到达即产出）。
+
+        参数:
+            model: 模型名。
+            prompt: 文本补全提示。
+            params: 其他可选参数；`stream` 总是被置为 True。
+
+        返回值:
+            Iterator[dict]: 按到达顺序的 chunk。
+
+        副作用:
+            发起网络请求；非 2xx 时在首次迭代时抛出 `HTTPError`。
+        """
+
+        payload: Dict[str, Any] = {"model": model, "prompt": prompt}
+        payload.update(params)
+        return self._stream("completions", payload)
 
     def completions(
         self,
@@ -125,28 +344,11 @@ class OpenAICompatClient:
             发起网络请求；可能抛出 `requests.RequestException` 或 `HTTPError`。
         """
 
-        url = f"{self.base_url.rstrip('/')}/completions"
         payload: Dict[str, Any] = {"model": model, "prompt": prompt}
         payload.update(params)
         stream = bool(params.get("stream"))
-        resp = requests.post(
-            url,
-            headers=self._headers(),
-            json=payload,
-            timeout=30,
-            stream=stream,
-        )
-        resp.raise_for_status()
-        if not stream:
-            return cast(Dict[str, Any], resp.json())
-
-        chunks: List[Dict[str, Any]] = []
-        for line in resp.iter_lines():
-            if not line:
-                continue
-            if line.startswith(b"data:"):
-                data = line[len(b"data:") :].strip()
-                if data == b"[DONE]":
-                    break
-                chunks.append(json.loads(data))
-        return chunks
+        with self._post("completions", payload, stream=stream) as resp:
+            resp.raise_for_status()
+            if not stream:
+                return cast(Dict[str, Any], resp.json())
+            return list(iter_sse(resp))
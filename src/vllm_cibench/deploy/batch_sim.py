@@ -0,0 +1,620 @@
+"""连续批处理（continuous batching）vLLM 服务的离散事件模拟器。
+
+用于不占用 GPU 的容量规划（“流量翻倍会怎样”“decode 的 `--max-num-seqs` 从 24 改成
+48 会怎样”），以及用已知真值校验压测工具的分位点计算。模型刻画 vLLM 调度器的
+主要行为：
+
+- 每个调度步（step）先按 FIFO 接纳等待队列中的请求，直至运行中的序列数达到
+  `max_num_seqs` 或 KV cache 装不下；新接纳的序列在本步做 prefill 并产出首 token，
+  已在运行的序列各 decode 一个 token；
+- 步长 = `decode_base_ms`（有序列运行时）+ `prefill_ms_per_token` × 本步 prefill
+  token 数 + `decode_ms_per_seq` × 本步 decode 序列数；
+- KV cache 以 token 计（`kv_cache_tokens`），每个序列占用“prompt + 已生成”个 token；
+  下一步装不下时抢占最晚接纳的序列（放回等待队列队首）：`recompute` 模式恢复时
+  重新 prefill 全部上下文，`swap` 模式恢复时不重算；
+- 单个请求的 prompt + 输出超过 KV 容量时直接拒绝。
+
+`BatchScheduler` 是与时钟无关的核心；`simulate` 在虚拟时间上离线推进（快于实时），
+`LiveBatchEngine` 在 asyncio 事件循环上按真实时间推进，作为 mock 服务
+（`deploy.mock_server`）的后端。`fit_sim_config` 由 `run-perf` 的流式 CSV 拟合
+步长参数；`sim_config_from_args` 从场景的 vLLM 启动参数（如 PD 场景的
+`decode_params`）读取 `--max-num-seqs` 与 `--num-gpu-blocks-override`。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import shlex
+from collections import deque
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from vllm_cibench.testsuites.perf_exec import RequestRecord
+
+PREEMPTION_MODES: Tuple[str, ...] = ("recompute", "swap")
+# vLLM 默认 KV block 大小（token），用于换算 `--num-gpu-blocks-override`
+DEFAULT_BLOCK_SIZE = 16
+# 在线引擎保留的已完成请求数（供事后取真值，避免长时间运行内存增长）
+LIVE_HISTORY = 100_000
+
+
+@dataclass
+class SimConfig:
+    """模拟器参数。
+
+    属性:
+        max_num_seqs: 同时运行的序列上限（对应 vLLM `--max-num-seqs`）。
+        kv_cache_tokens: KV cache 容量（token 数）。
+        prefill_ms_per_token: prefill 每个 token 的耗时（毫秒）。
+        decode_base_ms: 每个调度步的固定耗时（毫秒，权重读取等）。
+        decode_ms_per_seq: 每个 decode 序列在一步中的增量耗时（毫秒）。
+        preemption_mode: 抢占恢复方式（`recompute`/`swap`）。
+    """
+
+    max_num_seqs: int = 256
+    kv_cache_tokens: int = 262_144
+    prefill_ms_per_token: float = 0.05
+    decode_base_ms: float = 10.0
+    decode_ms_per_seq: float = 0.05
+    preemption_mode: str = "recompute"
+
+    def __post_init__(self) -> None:
+        if self.max_num_seqs < 1:
+            raise ValueError(f"max_num_seqs must be >= 1, got {self.max_num_seqs}")
+        if self.kv_cache_tokens < 1:
+            raise ValueError(
+                f"kv_cache_tokens must be >= 1, got {self.kv_cache_tokens}"
+            )
+        costs = (self.prefill_ms_per_token, self.decode_base_ms, self.decode_ms_per_seq)
+        if min(costs) < 0 or max(costs) <= 0:
+            raise ValueError("step costs must be >= 0 and not all zero")
+        if self.preemption_mode not in PREEMPTION_MODES:
+            raise ValueError(
+                f"unknown preemption_mode: {self.preemption_mode!r}; "
+                f"expected one of {PREEMPTION_MODES}"
+            )
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "SimConfig":
+        """从配置字典构造（未知字段被忽略；`engine_args` 按 vLLM 启动参数解析）。
+
+        异常:
+            ValueError: 参数非法。
+        """
+
+        known = {k: data[k] for k in cls.__dataclass_fields__ if k in data}
+        cfg = cls(**known)
+        if data.get("engine_args"):
+            cfg = sim_config_from_args(str(data["engine_args"]), cfg)
+        return cfg
+
+
+@dataclass(eq=False)
+class SimRequest:
+    """一个模拟请求及其真值时间线（秒，与调度器时钟同一基准）。
+
+    属性:
+        rid: 请求序号。
+        arrival_s: 到达时刻。
+        prompt_tokens: 输入 token 数。
+        output_tokens: 目标输出 token 数。
+        generated: 已生成 token 数。
+        token_times: 各输出 token 的生成时刻。
+        preemptions: 被抢占次数。
+        rejected: 是否因超出 KV 容量被拒绝。
+        finish_s: 完成（或拒绝）时刻。
+    """
+
+    rid: int
+    arrival_s: float
+    prompt_tokens: int
+    output_tokens: int
+    generated: int = 0
+    token_times: List[float] = field(default_factory=list)
+    preemptions: int = 0
+    rejected: bool = False
+    finish_s: Optional[float] = None
+    _prefilled: bool = field(default=False, repr=False)
+
+    @property
+    def context(self) -> int:
+        """当前占用的 KV token 数（prompt + 已生成）。"""
+
+        return self.prompt_tokens + self.generated
+
+    @property
+    def ttft_ms(self) -> Optional[float]:
+        """首 token 时延（毫秒）；未产出 token 时为 None。"""
+
+        if not self.token_times:
+            return None
+        return (self.token_times[0] - self.arrival_s) * 1000.0
+
+    @property
+    def latency_ms(self) -> Optional[float]:
+        """E2E 时延（毫秒）；未完成或被拒绝时为 None。"""
+
+        if self.finish_s is None or self.rejected:
+            return None
+        return (self.finish_s - self.arrival_s) * 1000.0
+
+    @property
+    def tpot_ms(self) -> Optional[float]:
+        """首 token 之后的平均每 token 时延（毫秒）；不足 2 个 token 时为 None。"""
+
+        if len(self.token_times) < 2:
+            return None
+        span = self.token_times[-1] - self.token_times[0]
+        return span * 1000.0 / (len(self.token_times) - 1)
+
+
+class BatchScheduler:
+    """连续批处理调度器核心（与时钟无关，由调用方推进时间）。
+
+    参数:
+        config: 模拟器参数。
+    """
+
+    def __init__(self, config: SimConfig) -> None:
+        self.config = config
+        self.waiting: Deque[SimRequest] = deque()
+        self.running: List[SimRequest] = []
+        self.kv_used = 0
+        self._next_rid = 0
+
+    @property
+    def idle(self) -> bool:
+        """是否既无运行中也无等待中的序列。"""
+
+        return not self.waiting and not self.running
+
+    def submit(
+        self, arrival_s: float, prompt_tokens: int, output_tokens: int
+    ) -> SimRequest:
+        """提交一个请求到等待队列，返回其模拟对象。"""
+
+        req = SimRequest(
+            self._next_rid, arrival_s, max(0, prompt_tokens), max(1, output_tokens)
+        )
+        self._next_rid += 1
+        self.waiting.append(req)
+        return req
+
+    def abort(self, req: SimRequest, now: float) -> None:
+        """中止未完成的请求（客户端断开）并释放其 KV 占用。"""
+
+        if req in self.waiting:
+            self.waiting.remove(req)
+        elif req in self.running:
+            self.running.remove(req)
+            self.kv_used -= req.context
+        else:
+            return
+        req.finish_s = now
+
+    def _fits(self, req: SimRequest) -> bool:
+        return req.prompt_tokens + req.output_tokens <= self.config.kv_cache_tokens
+
+    def _admit(self, now: float, done: List[SimRequest]) -> List[SimRequest]:
+        """FIFO 接纳等待中的请求，返回本步需要 prefill 的序列。"""
+
+        cfg = self.config
+        admitted: List[SimRequest] = []
+        while self.waiting and len(self.running) < cfg.max_num_seqs:
+            req = self.waiting[0]
+            if not self._fits(req):
+                self.waiting.popleft()
+                req.rejected, req.finish_s = True, now
+                done.append(req)
+                continue
+            if self.kv_used + req.context + 1 > cfg.kv_cache_tokens:
+                break
+            self.waiting.popleft()
+            self.running.append(req)
+            self.kv_used += req.context
+            if not req._prefilled or cfg.preemption_mode == "recompute":
+                admitted.append(req)
+        return admitted
+
+    def _preempt(self) -> None:
+        """下一步 KV 不足时，抢占最晚接纳的序列直至装得下。"""
+
+        while self.running and self.kv_used + len(self.running) > (
+            self.config.kv_cache_tokens
+        ):
+            victim = self.running.pop()
+            self.kv_used -= victim.context
+            victim.preemptions += 1
+            self.waiting.appendleft(victim)
+
+    def step(self, now: float) -> Tuple[float, List[SimRequest]]:
+        """执行一个调度步。
+
+        参数:
+            now: 本步开始时刻（秒）。
+
+        返回值:
+            (duration_s, touched): 步长与本步产出 token、完成或被拒绝的请求；
+            本步生成的 token 时刻为 `now + duration_s`。无可运行序列时步长为 0。
+        """
+
+        cfg = self.config
+        touched: List[SimRequest] = []
+        prefill = self._admit(now, touched)
+        self._preempt()
+        prefill = [r for r in prefill if r in self.running]
+        if not self.running:
+            return 0.0, touched
+        n_decode = len(self.running) - len(prefill)
+        ms = (
+            cfg.decode_base_ms
+            + cfg.prefill_ms_per_token * sum(r.context for r in prefill)
+            + cfg.decode_ms_per_seq * n_decode
+        )
+        end = now + ms / 1000.0
+        still: List[SimRequest] = []
+        for req in self.running:
+            req._prefilled = True
+            req.generated += 1
+            req.token_times.append(end)
+            self.kv_used += 1
+            touched.append(req)
+            if req.generated >= req.output_tokens:
+                req.finish_s = end
+                self.kv_used -= req.context
+            else:
+                still.append(req)
+        self.running = still
+        return ms / 1000.0, touched
+
+
+def simulate(
+    config: SimConfig, requests: Iterable[Tuple[float, int, int]]
+) -> List[SimRequest]:
+    """在虚拟时间上离线模拟一组请求。
+
+    参数:
+        config: 模拟器参数。
+        requests: `(arrival_s, prompt_tokens, output_tokens)` 序列（任意顺序）。
+
+    返回值:
+        list[SimRequest]: 按到达顺序排列的请求真值。
+    """
+
+    sched = BatchScheduler(config)
+    pending = sorted(requests, key=lambda x: x[0])
+    out: List[SimRequest] = []
+    now, i = 0.0, 0
+    while i < len(pending) or not sched.idle:
+        while i < len(pending) and pending[i][0] <= now:
+            out.append(sched.submit(*pending[i]))
+            i += 1
+        if sched.idle:
+            now = pending[i][0]
+            continue
+        dur, _ = sched.step(now)
+        now += dur
+    return out
+
+
+def open_loop_requests(
+    rate: float,
+    n_requests: int,
+    prompt_tokens: int,
+    output_tokens: int,
+    *,
+    arrival: str = "poisson",
+    seed: int = 0,
+) -> List[Tuple[float, int, int]]:
+    """生成开环到达的请求序列（到达间隔同 `perf_exec.arrival_gaps`）。"""
+
+    from vllm_cibench.testsuites.perf_exec import arrival_gaps
+
+    gaps = arrival_gaps(rate, arrival, seed)
+    out: List[Tuple[float, int, int]] = []
+    t = 0.0
+    for _ in range(max(0, n_requests)):
+        out.append((t, prompt_tokens, output_tokens))
+        t += next(gaps)
+    return out
+
+
+def exact_percentile(values: Sequence[float], pct: float) -> float:
+    """排序后线性插值的精确百分位（与 `LatencyHistogram.percentiles` 同一定义）。"""
+
+    if not values:
+        return 0.0
+    xs = sorted(values)
+    k = min(max(pct, 0.0), 100.0) / 100.0 * (len(xs) - 1)
+    f = int(k)
+    c = min(f + 1, len(xs) - 1)
+    return xs[f] + (xs[c] - xs[f]) * (k - f)
+
+
+def sim_summary(
+    results: Sequence[SimRequest], quantiles: Sequence[float] = (50, 90, 99)
+) -> Dict[str, float]:
+    """模拟结果的真值汇总（精确分位点，列名与 perf CSV 一致）。
+
+    返回值:
+        dict: `latency/ttft/tpot` 各分位点（毫秒）、`throughput_rps`、
+        `output_tps`、`fail_rate`（拒绝比例）与 `preemptions`（抢占总次数）。
+    """
+
+    ok = [r for r in results if not r.rejected and r.finish_s is not None]
+    out: Dict[str, float] = {
+        "fail_rate": (len(results) - len(ok)) / len(results) if results else 0.0,
+        "preemptions": float(sum(r.preemptions for r in results)),
+    }
+    series = {
+        "latency": [r.latency_ms for r in ok],
+        "ttft": [r.ttft_ms for r in ok],
+        "tpot": [r.tpot_ms for r in ok],
+    }
+    for name, vals in series.items():
+        xs = [float(v) for v in vals if v is not None]
+        for q in quantiles:
+            out[f"{name}_p{q:g}_ms"] = exact_percentile(xs, q)
+    if ok:
+        span = max(r.finish_s or 0.0 for r in ok) - min(r.arrival_s for r in results)
+        out["throughput_rps"] = len(ok) / span if span > 0 else 0.0
+        out["output_tps"] = sum(r.output_tokens for r in ok) / span if span > 0 else 0.0
+    return out
+
+
+def to_records(results: Iterable[SimRequest]) -> List["RequestRecord"]:
+    """把模拟真值转为 `RequestRecord`，可直接喂给压测工具的统计逻辑做对照。"""
+
+    from vllm_cibench.testsuites.perf_exec import RequestRecord
+
+    out: List[RequestRecord] = []
+    for r in results:
+        times = r.token_times
+        out.append(
+            RequestRecord(
+                start_s=r.arrival_s,
+                end_s=r.finish_s if r.finish_s is not None else r.arrival_s,
+                ok=not r.rejected,
+                first_token_s=times[0] if times else None,
+                itl_ms=[(b - a) * 1000.0 for a, b in zip(times, times[1:])],
+                output_tokens=r.generated,
+                input_tokens=r.prompt_tokens,
+                error="http_4xx" if r.rejected else "",
+            )
+        )
+    return out
+
+
+def sim_config_from_args(args: str, base: Optional[SimConfig] = None) -> SimConfig:
+    """从 vLLM 启动参数字符串读取调度相关参数。
+
+    识别 `--max-num-seqs`、`--num-gpu-blocks-override`（× `--block-size`，缺省 16
+    换算为 KV token 数）与 `--preemption-mode`；`=` 与空格分隔、连字符与下划线
+    均可。其余参数忽略。
+
+    参数:
+        args: 如 PD 场景的 `decode_params`。
+        base: 其余参数的基础配置（缺省为 `SimConfig()`）。
+
+    返回值:
+        SimConfig: 覆盖后的配置。
+
+    异常:
+        ValueError: 参数值非法。
+    """
+
+    opts: Dict[str, str] = {}
+    tokens = shlex.split(args)
+    for i, tok in enumerate(tokens):
+        if not tok.startswith("--"):
+            continue
+        key, sep, val = tok[2:].partition("=")
+        if not sep:
+            nxt = tokens[i + 1] if i + 1 < len(tokens) else ""
+            val = "" if nxt.startswith("--") else nxt
+        opts[key.replace("_", "-")] = val
+    cfg = base or SimConfig()
+    changes: Dict[str, Any] = {}
+    if opts.get("max-num-seqs"):
+        changes["max_num_seqs"] = int(opts["max-num-seqs"])
+    if opts.get("num-gpu-blocks-override"):
+        block = int(opts.get("block-size") or DEFAULT_BLOCK_SIZE)
+        changes["kv_cache_tokens"] = int(opts["num-gpu-blocks-override"]) * block
+    if opts.get("preemption-mode"):
+        changes["preemption_mode"] = opts["preemption-mode"]
+    return replace(cfg, **changes)
+
+
+def fit_sim_config(
+    rows: Iterable[Mapping[str, Any]], base: Optional[SimConfig] = None
+) -> SimConfig:
+    """由实测 perf CSV（`parse_perf_csv` 的结果，需流式运行）拟合步长参数。
+
+    - decode：`tpot_p50_ms ≈ decode_base_ms + decode_ms_per_seq × concurrency`，
+      对各并发点做最小二乘（只有一个并发值时斜率取 0）；
+    - prefill：最低并发点上 `(ttft_p50_ms - decode_base_ms) / input_len` 的中位数。
+
+    参数:
+        rows: 闭环（`concurrency > 0`）负载点行。
+        base: 非拟合参数（`max_num_seqs`、KV 容量等）的基础配置。
+
+    返回值:
+        SimConfig: 拟合后的配置。
+
+    异常:
+        ValueError: 没有同时含 `ttft_p50_ms` 与 `tpot_p50_ms` 的闭环负载点。
+    """
+
+    pts = [
+        (
+            float(r["concurrency"]),
+            float(r.get("input_len") or 0),
+            float(r["ttft_p50_ms"]),
+            float(r["tpot_p50_ms"]),
+        )
+        for r in rows
+        if float(r.get("concurrency") or 0) > 0
+        and r.get("ttft_p50_ms") is not None
+        and r.get("tpot_p50_ms") is not None
+    ]
+    if not pts:
+        raise ValueError("fit requires closed-loop rows with ttft_p50_ms/tpot_p50_ms")
+    xs = [p[0] for p in pts]
+    ys = [p[3] for p in pts]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    var = sum((x - mx) ** 2 for x in xs)
+    slope = sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / var if var else 0.0
+    slope = max(0.0, slope)
+    base_ms = max(0.0, my - slope * mx)
+    low = min(xs)
+    per_tok = sorted(
+        max(0.0, (ttft - base_ms) / n_in)
+        for c, n_in, ttft, _ in pts
+        if c == low and n_in > 0
+    )
+    cfg = base or SimConfig()
+    return replace(
+        cfg,
+        decode_base_ms=base_ms or cfg.decode_base_ms,
+        decode_ms_per_seq=slope,
+        prefill_ms_per_token=(
+            per_tok[len(per_tok) // 2] if per_tok else cfg.prefill_ms_per_token
+        ),
+    )
+
+
+def load_sim_config(
+    path: Optional[str] = None,
+    *,
+    fit_csv: Optional[str] = None,
+    engine_args: Optional[str] = None,
+) -> SimConfig:
+    """按“配置文件 → 拟合 → 启动参数”的顺序逐层构造模拟器参数。
+
+    参数:
+        path: YAML 配置（`SimConfig` 字段，可含 `engine_args`）；None 用默认值。
+        fit_csv: `run-perf` 输出的流式 CSV；给定时拟合步长参数（见 `fit_sim_config`）。
+        engine_args: vLLM 启动参数（见 `sim_config_from_args`），最后覆盖。
+
+    返回值:
+        SimConfig: 最终配置。
+
+    异常:
+        ValueError: 参数非法或 CSV 无法拟合。
+    """
+
+    import yaml
+
+    from vllm_cibench.testsuites.perf import parse_perf_csv
+
+    data: Mapping[str, Any] = {}
+    if path:
+        data = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    cfg = SimConfig.from_dict(data)
+    if fit_csv:
+        rows = parse_perf_csv(Path(fit_csv).read_text(encoding="utf-8"))
+        cfg = fit_sim_config(rows, cfg)
+    if engine_args:
+        cfg = sim_config_from_args(engine_args, cfg)
+    return cfg
+
+
+class LiveBatchEngine:
+    """在 asyncio 事件循环上按真实时间推进的调度器（mock 服务后端）。
+
+    参数:
+        config: 模拟器参数。
+
+    说明:
+        调度循环在首个请求到来时以后台任务启动；时间基准为 `loop.time()`。
+        最近 `LIVE_HISTORY` 个已完成请求保存在 `completed` 中，可作为真值。
+    """
+
+    def __init__(self, config: SimConfig) -> None:
+        self.config = config
+        self.scheduler = BatchScheduler(config)
+        self.completed: Deque[SimRequest] = deque(maxlen=LIVE_HISTORY)
+        self._queues: Dict[int, "asyncio.Queue[Optional[int]]"] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def fits(self, prompt_tokens: int, output_tokens: int) -> bool:
+        """请求是否装得下 KV cache（装不下的请求应直接拒绝）。"""
+
+        return prompt_tokens + output_tokens <= self.config.kv_cache_tokens
+
+    async def generate(
+        self, prompt_tokens: int, output_tokens: int
+    ) -> AsyncIterator[int]:
+        """提交请求并按生成时刻逐个产出输出 token 序号。
+
+        异常:
+            ValueError: 请求超出 KV 容量被拒绝。
+        """
+
+        loop = asyncio.get_running_loop()
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        req = self.scheduler.submit(loop.time(), prompt_tokens, output_tokens)
+        queue: "asyncio.Queue[Optional[int]]" = asyncio.Queue()
+        self._queues[req.rid] = queue
+        self._wake.set()
+        try:
+            while True:
+                idx = await queue.get()
+                if idx is None:
+                    break
+                yield idx
+        finally:
+            self._queues.pop(req.rid, None)
+            if req.finish_s is None:
+                self.scheduler.abort(req, loop.time())
+        if req.rejected:
+            raise ValueError("request exceeds KV cache capacity")
+
+    async def close(self) -> None:
+        """停止后台调度循环（须在引擎所在事件循环中调用）。"""
+
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        assert self._wake is not None
+        while True:
+            if self.scheduler.idle:
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+            dur, touched = self.scheduler.step(loop.time())
+            if dur > 0:
+                await asyncio.sleep(dur)
+            for req in touched:
+                queue = self._queues.get(req.rid)
+                if not req.rejected and queue is not None:
+                    queue.put_nowait(req.generated - 1)
+                if req.finish_s is not None:
+                    self.completed.append(req)
+                    if queue is not None:
+                        queue.put_nowait(None)
@@ -0,0 +1,306 @@
+"""内置 OpenAI 兼容 mock 服务（asyncio/aiohttp）。
+
+`tools/acs_bench_mock.py` 只生成假 CSV，真实模式的 `perf_exec` 执行路径与客户端
+流式解析在 CI 中从未被覆盖。本模块提供一个可在无 GPU 机器上承受高 QPS 的
+mock 服务（`python -m vllm_cibench.run serve-mock`）：
+
+- `GET /v1/models`：返回单个模型；
+- `POST /v1/chat/completions`、`POST /v1/completions`：支持非流式与 SSE 流式
+  （`stream_options.include_usage` 时末尾附 usage chunk，最后发送 `[DONE]`）；
+- 输出 token 数取请求的 `max_tokens`（缺省 `MockConfig.output_tokens`），
+  prompt token 数按字符数 / 4 近似；
+- 时延模型：首 token 前等待 `ttft_ms`，此后每个 token 间隔 `token_delay_ms`；
+  非流式响应在全部 token 生成后一次返回；
+- 故障注入：按 `fail_rate` 概率立即返回 `fail_status`（模拟过载快速失败），
+  流式请求按 `truncate_rate` 概率在输出一半后断开且不发送 `[DONE]`；
+- 并发上限：`max_concurrency > 0` 时超出上限的请求排队等待（排队时间计入 TTFT）；
+- 模拟后端：给定 `MockConfig.sim` 时改由连续批处理模拟器（`batch_sim`）决定
+  每个 token 的生成时刻（`ttft_ms`/`token_delay_ms` 不再生效），超出 KV 容量的
+  请求返回 400。
+
+注意：服务不做鉴权，默认仅监听 127.0.0.1。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Mapping, Optional
+
+from aiohttp import web
+
+from vllm_cibench.deploy.batch_sim import LiveBatchEngine, SimConfig
+
+DEFAULT_MOCK_PORT = 8000
+
+
+@dataclass
+class MockConfig:
+    """mock 服务的行为参数。
+
+    属性:
+        model: `/v1/models` 返回的模型名（请求中的 `model` 不做校验）。
+        ttft_ms: 首 token 时延（毫秒）。
+        token_delay_ms: 相邻输出 token 的间隔（毫秒）。
+        output_tokens: 请求未给 `max_tokens` 时的输出 token 数。
+        fail_rate: 立即返回 `fail_status` 的概率（0-1）。
+        fail_status: 注入失败的 HTTP 状态码。
+        truncate_rate: 流式响应中途断开（不发送 `[DONE]`）的概率（0-1）。
+        max_concurrency: 同时处理的请求上限（0 表示不限，超出时排队）。
+        seed: 故障注入的随机种子（None 表示不固定）。
+        sim: 连续批处理模拟器参数；给定时替代固定时延模型。
+    """
+
+    model: str = "mock"
+    ttft_ms: float = 20.0
+    token_delay_ms: float = 5.0
+    output_tokens: int = 16
+    fail_rate: float = 0.0
+    fail_status: int = 503
+    truncate_rate: float = 0.0
+    max_concurrency: int = 0
+    seed: Optional[int] = None
+    sim: Optional[SimConfig] = None
+
+    def __post_init__(self) -> None:
+        if self.ttft_ms < 0 or self.token_delay_ms < 0:
+            raise ValueError("ttft_ms and token_delay_ms must be >= 0")
+        if self.output_tokens < 1:
+            raise ValueError(f"output_tokens must be >= 1, got {self.output_tokens}")
+        for name in ("fail_rate", "truncate_rate"):
+            val = getattr(self, name)
+            if not 0.0 <= val <= 1.0:
+                raise ValueError(f"{name} must be in [0, 1], got {val}")
+        if not 400 <= self.fail_status <= 599:
+            raise ValueError(f"fail_status must be 4xx/5xx, got {self.fail_status}")
+        if self.max_concurrency < 0:
+            raise ValueError(
+                f"max_concurrency must be >= 0, got {self.max_concurrency}"
+            )
+
+
+def _prompt_tokens(payload: Mapping[str, Any]) -> int:
+    """按字符数 / 4 近似 prompt token 数（至少 1）。"""
+
+    if "messages" in payload:
+        chars = sum(
+            len(str(m.get("content") or "")) for m in payload.get("messages") or []
+        )
+    else:
+        chars = len(str(payload.get("prompt") or ""))
+    return max(1, chars // 4)
+
+
+class MockServer:
+    """OpenAI 兼容 mock 服务。
+
+    参数:
+        config: 行为参数（缺省为 `MockConfig()`）。
+        host: 监听地址（默认仅本机）。
+        port: 监听端口（0 表示随机空闲端口）。
+
+    副作用:
+        构造时即绑定端口；`start()` 在后台线程服务，`serve_forever()` 阻塞服务。
+    """
+
+    def __init__(
+        self,
+        config: Optional[MockConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_MOCK_PORT,
+    ) -> None:
+        self.config = config or MockConfig()
+        self.requests_total = 0
+        self.inflight = 0
+        self.peak_inflight = 0
+        self._rng = random.Random(self.config.seed)
+        self.engine: Optional[LiveBatchEngine] = None
+        if self.config.sim is not None:
+            self.engine = LiveBatchEngine(self.config.sim)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop = asyncio.new_event_loop()
+        app = web.Application()
+        app.router.add_get("/v1/models", self._models)
+        app.router.add_post("/v1/chat/completions", self._chat)
+        app.router.add_post("/v1/completions", self._completions)
+        self._runner = web.AppRunner(app, access_log=None)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, host, port)
+        self._loop.run_until_complete(site.start())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """OpenAI 基础 URL（如 `http://127.0.0.1:8000/v1`）。"""
+
+        host, port = self._runner.addresses[0][:2]
+        return f"http://{host!s}:{port}/v1"
+
+    def start(self) -> "MockServer":
+        """在后台守护线程中开始服务，返回自身。"""
+
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """在当前线程阻塞服务，直至 `shutdown()`。"""
+
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def shutdown(self) -> None:
+        """停止服务并释放端口。"""
+
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+        if self.engine is not None:
+            self._loop.run_until_complete(self.engine.close())
+        self._loop.run_until_complete(self._runner.cleanup())
+        self._loop.close()
+
+    async def _models(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "object": "list",
+                "data": [
+                    {"id": self.config.model, "object": "model", "owned_by": "mock"}
+                ],
+            }
+        )
+
+    async def _chat(self, request: web.Request) -> web.StreamResponse:
+        return await self._serve(request, chat=True)
+
+    async def _completions(self, request: web.Request) -> web.StreamResponse:
+        return await self._serve(request, chat=False)
+
+    async def _tokens(self, n_prompt: int, n_tokens: int) -> AsyncIterator[int]:
+        """按时延模型逐个产出输出 token 的序号（到达产出时刻即为该 token 生成时刻）。"""
+
+        if self.engine is not None:
+            async for i in self.engine.generate(n_prompt, n_tokens):
+                yield i
+            return
+        cfg = self.config
+        for i in range(n_tokens):
+            delay = cfg.ttft_ms if i == 0 else cfg.token_delay_ms
+            if delay > 0:
+                await asyncio.sleep(delay / 1000.0)
+            yield i
+
+    async def _serve(self, request: web.Request, *, chat: bool) -> web.StreamResponse:
+        """处理一次 chat/completions 请求（含排队、故障注入与流式输出）。"""
+
+        self.requests_total += 1
+        try:
+            payload = await request.json()
+        except json.JSONDecodeError:
+            return _error(400, "request body is not valid JSON")
+        if not isinstance(payload, dict):
+            return _error(400, "request body must be a JSON object")
+        if self._rng.random() < self.config.fail_rate:
+            return _error(self.config.fail_status, "injected failure")
+        n_prompt = _prompt_tokens(payload)
+        n_tokens = int(payload.get("max_tokens") or self.config.output_tokens)
+        if self.engine is not None and not self.engine.fits(n_prompt, n_tokens):
+            return _error(400, "prompt + max_tokens exceeds KV cache capacity")
+        if self.config.max_concurrency and self._slots is None:
+            self._slots = asyncio.Semaphore(self.config.max_concurrency)
+        if self._slots is not None:
+            await self._slots.acquire()
+        self.inflight += 1
+        self.peak_inflight = max(self.peak_inflight, self.inflight)
+        try:
+            if payload.get("stream"):
+                return await self._stream(
+                    request, payload, n_prompt, n_tokens, chat=chat
+                )
+            return await self._complete(payload, n_prompt, n_tokens, chat=chat)
+        finally:
+            self.inflight -= 1
+            if self._slots is not None:
+                self._slots.release()
+
+    async def _complete(
+        self, payload: Mapping[str, Any], n_prompt: int, n_tokens: int, *, chat: bool
+    ) -> web.Response:
+        text = "".join([f"t{i} " async for i in self._tokens(n_prompt, n_tokens)])
+        choice: Dict[str, Any] = {"index": 0, "finish_reason": "length"}
+        if chat:
+            choice["message"] = {"role": "assistant", "content": text}
+        else:
+            choice["text"] = text
+        return web.json_response(
+            {
+                "id": f"mock-{self.requests_total}",
+                "object": "chat.completion" if chat else "text_completion",
+                "created": int(time.time()),
+                "model": payload.get("model", self.config.model),
+                "choices": [choice],
+                "usage": _usage(n_prompt, n_tokens),
+            }
+        )
+
+    async def _stream(
+        self,
+        request: web.Request,
+        payload: Mapping[str, Any],
+        n_prompt: int,
+        n_tokens: int,
+        *,
+        chat: bool,
+    ) -> web.StreamResponse:
+        truncate = self._rng.random() < self.config.truncate_rate
+        resp = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await resp.prepare(request)
+        base = {
+            "id": f"mock-{self.requests_total}",
+            "object": "chat.completion.chunk" if chat else "text_completion",
+            "created": int(time.time()),
+            "model": payload.get("model", self.config.model),
+        }
+        async for i in self._tokens(n_prompt, n_tokens):
+            if truncate and i >= n_tokens // 2:
+                # 中途断开：不发送 [DONE]，客户端记为 stream_truncated
+                return resp
+            choice: Dict[str, Any] = {"index": 0, "finish_reason": None}
+            if i == n_tokens - 1:
+                choice["finish_reason"] = "length"
+            if chat:
+                choice["delta"] = {"content": f"t{i} "}
+            else:
+                choice["text"] = f"t{i} "
+            await _send(resp, {**base, "choices": [choice]})
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            await _send(
+                resp, {**base, "choices": [], "usage": _usage(n_prompt, n_tokens)}
+            )
+        await resp.write(b"data: [DONE]\n\n")
+        await resp.write_eof()
+        return resp
+
+
+def _usage(n_prompt: int, n_tokens: int) -> Dict[str, int]:
+    return {
+        "prompt_tokens": n_prompt,
+        "completion_tokens": n_tokens,
+        "total_tokens": n_prompt + n_tokens,
+    }
+
+
+async def _send(resp: web.StreamResponse, chunk: Mapping[str, Any]) -> None:
+    await resp.write(f"data: {json.dumps(chunk)}\n\n".encode())
+
+
+def _error(status: int, message: str) -> web.Response:
+    return web.json_response(
+        {"error": {"message": message, "type": "mock_error", "code": status}},
+        status=status,
+    )
@@ -8,7 +8,7 @@ PR 或 fork 情况下直接跳过。读取环境变量 `PROM_PUSHGATEWAY_URL`
 from __future__ import annotations
 
 import os
-from typing import Dict, Iterable, Mapping, Optional
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 
 # isort: off
 from prometheus_client import (
@@ -52,6 +52,21 @@ def metrics_from_perf_records(
         dict: 包含均值等聚合结果的指标，例如：
             - ci_perf_throughput_rps_avg
             - ci_perf_latency_p50_ms_avg
+            - ci_perf_ttft_p99_ms_avg / ci_perf_tpot_p99_ms_avg（仅流式记录）
+            - ci_perf_goodput_rps_avg / ci_perf_goodput_tps_avg /
+              ci_perf_slo_attainment_pct_avg（仅含 goodput 列的记录）：满足逐请求
+              SLO 的有效吞吐（req/s、输出 tok/s）与达标率（%）
+            - ci_perf_input_tps_avg / ci_perf_output_tps_avg / ci_perf_total_tps_avg /
+              ci_perf_request_output_tps_p50_avg（仅含对应列的记录）：token 吞吐
+              （tok/s）与单请求输出速率，可跨长度组合与量化版本比较
+            - ci_perf_fail_rate_avg（仅含 `fail_rate` 的记录）与
+              ci_perf_errors_<class>_total（各错误分类失败数之和，见
+              `perf.ERROR_CLASSES`）
+            - ci_perf_client_bound_total（仅含 `client_bound` 的记录）：受压测端
+              限制的负载点数（非 0 时相应负载点的数字不可信，见 `perf_client`）
+            - ci_perf_capacity_concurrency / ci_perf_capacity_rps（仅含 `slo_ok`
+              的记录）：每个 (input_len, output_len, prefix_share) 组合满足 SLO 的最大并发
+              （或开环目标 QPS），多个组合取最小值（保守容量）
 
     副作用:
         无。
@@ -61,6 +76,24 @@ def metrics_from_perf_records(
     p50 = []
     p95 = []
     p99 = []
+    ttft_p99 = []
+    tpot_p99 = []
+    goodput: Dict[str, List[float]] = {
+        "goodput_rps": [],
+        "goodput_tps": [],
+        "slo_attainment_pct": [],
+    }
+    tokens: Dict[str, List[float]] = {
+        "input_tps": [],
+        "output_tps": [],
+        "total_tps": [],
+        "request_output_tps_p50": [],
+    }
+    fail_rate: List[float] = []
+    errors: Dict[str, float] = {}
+    client_bound: List[float] = []
+    # (维度, input_len, output_len, prefix_share) -> 满足 SLO 的最大负载
+    capacity: Dict[Tuple[str, float, float, float], float] = {}
     for r in records:
         if "throughput_rps" in r:
             thr.append(float(r["throughput_rps"]))
@@ -70,6 +103,32 @@ def metrics_from_perf_records(
             p95.append(float(r["latency_p95_ms"]))
         if "latency_p99_ms" in r:
             p99.append(float(r["latency_p99_ms"]))
+        if "ttft_p99_ms" in r:
+            ttft_p99.append(float(r["ttft_p99_ms"]))
+        if "tpot_p99_ms" in r:
+            tpot_p99.append(float(r["tpot_p99_ms"]))
+        for col, vals in [*goodput.items(), *tokens.items()]:
+            if col in r:
+                vals.append(float(r[col]))
+        if "fail_rate" in r:
+            fail_rate.append(float(r["fail_rate"]))
+        for col, val in r.items():
+            if col.startswith("errors_"):
+                errors[col] = errors.get(col, 0.0) + float(val)
+        if "client_bound" in r:
+            client_bound.append(float(r["client_bound"]))
+        if "slo_ok" in r:
+            rate = r.get("request_rate")
+            dim, load = ("rps", rate) if rate else ("concurrency", r["concurrency"])
+            key = (
+                dim,
+                float(r.get("input_len", 0)),
+                float(r.get("output_len", 0)),
+                float(r.get("prefix_share", -1)),
+            )
+            best = capacity.setdefault(key, 0.0)
+            if float(r["slo_ok"]) >= 1:
+                capacity[key] = max(best, float(load))
     out: Dict[str, float] = {}
     if thr:
         out["ci_perf_throughput_rps_avg"] = sum(thr) / len(thr)
@@ -78,6 +137,23 @@ def metrics_from_perf_records(
     # 若不存在相应分位数记录，则给出占位 -1，便于面板与告警配置
     out.setdefault("ci_perf_latency_p95_ms_avg", (sum(p95) / len(p95)) if p95 else -1.0)
     out.setdefault("ci_perf_latency_p99_ms_avg", (sum(p99) / len(p99)) if p99 else -1.0)
+    # 流式指标（TTFT/TPOT）仅在流式运行的记录中出现
+    if ttft_p99:
+        out["ci_perf_ttft_p99_ms_avg"] = sum(ttft_p99) / len(ttft_p99)
+    if tpot_p99:
+        out["ci_perf_tpot_p99_ms_avg"] = sum(tpot_p99) / len(tpot_p99)
+    for col, vals in [*goodput.items(), *tokens.items()]:
+        if vals:
+            out[f"ci_perf_{col}_avg"] = sum(vals) / len(vals)
+    if fail_rate:
+        out["ci_perf_fail_rate_avg"] = sum(fail_rate) / len(fail_rate)
+    for col, total in sorted(errors.items()):
+        out[f"ci_perf_{col}_total"] = total
+    if client_bound:
+        out["ci_perf_client_bound_total"] = sum(client_bound)
+    for (dim, *_), load in sorted(capacity.items()):
+        name = f"ci_perf_capacity_{dim}"
+        out[name] = min(out.get(name, load), load)
     return out
 
 
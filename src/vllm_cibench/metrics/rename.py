@@ -10,6 +10,15 @@ from typing import Dict, Mapping
 DEFAULT_MAPPING: Mapping[str, str] = {
     "latency_p50_ms": "latency_p50_milliseconds",
     "throughput_rps": "throughput_requests_per_second",
+    "goodput_rps": "goodput_requests_per_second",
+    "goodput_tps": "goodput_tokens_per_second",
+    "slo_attainment_pct": "slo_attainment_percent",
+    "fail_rate": "fail_ratio",
+    "input_tps": "input_tokens_per_second",
+    "output_tps": "output_tokens_per_second",
+    "total_tps": "total_tokens_per_second",
+    "request_output_tps_avg": "request_output_tokens_per_second_avg",
+    "request_output_tps_p50": "request_output_tokens_per_second_p50",
 }
 
 
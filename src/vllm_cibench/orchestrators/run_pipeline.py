@@ -8,12 +8,14 @@
 from __future__ import annotations
 
 import os
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 import json as _json
 import yaml
 
+from vllm_cibench.clients.openai_client import DEFAULT_POOL_SIZE, pooled_session
 from vllm_cibench.config import Scenario, list_scenarios, load_matrix, resolve_plan
 from vllm_cibench.deploy.k8s import hybrid as k8s_hybrid
 from vllm_cibench.deploy.k8s import pd as k8s_pd
@@ -34,7 +36,12 @@ from vllm_cibench.testsuites.functional import (
     run_smoke_suite,
 )
 from vllm_cibench.testsuites.perf import PerfResult, gen_mock_csv, parse_perf_csv
-from vllm_cibench.testsuites.perf_exec import PerfProfile, run_profile_to_csv
+from vllm_cibench.testsuites.perf_exec import run_profile_to_csv
+from vllm_cibench.testsuites.perf_profile import (
+    PerfProfile,
+    http_pool_size,
+    profile_from_dict,
+)
 from vllm_cibench.testsuites.accuracy import run_accuracy
 
 
@@ -195,6 +202,44 @@ def _load_functional_cases(base: Path) -> Tuple[List[ChatCase], List[CompletionC
     return build_cases_from_config(data)
 
 
+def _load_perf_profile(
+    base: Path, scenario: Scenario, run_type: str
+) -> Optional[PerfProfile]:
+    """加载真实压测档位（mock 模式返回 None）。
+
+    参数:
+        base: 仓库根目录。
+        scenario: 场景对象（`perf.mode=real` 时为真实压测）。
+        run_type: 运行类型，决定默认档位文件 `pr.yaml`/`daily.yaml`。
+
+    返回值:
+        Optional[PerfProfile]: 档位；`VLLM_CIBENCH_PERF_MODE`/场景均未启用真实
+        压测时为 None。
+
+    副作用:
+        读取环境变量 `VLLM_CIBENCH_PERF_MODE`/`VLLM_CIBENCH_PERF_PROFILE` 与档位文件。
+    """
+
+    mode_env = os.environ.get("VLLM_CIBENCH_PERF_MODE", "").strip().lower()
+    real_mode = mode_env == "real" or bool(
+        (scenario.raw.get("perf", {}) or {}).get("mode") == "real"
+    )
+    if not real_mode:
+        return None
+    # 读取 profile（默认按 run_type 选择 pr/daily），可被环境变量覆盖
+    prof_path_env = os.environ.get("VLLM_CIBENCH_PERF_PROFILE")
+    if prof_path_env:
+        prof_path = Path(prof_path_env)
+    else:
+        prof_name = "pr.yaml" if run_type == "pr" else "daily.yaml"
+        prof_path = base / "configs" / "tests" / "perf" / "profiles" / prof_name
+    try:
+        data = yaml.safe_load(prof_path.read_text(encoding="utf-8")) or {}
+    except Exception:
+        data = {}
+    return profile_from_dict(data)
+
+
 def _load_capabilities(base: Path, scenario: Scenario) -> List[str]:
     """加载服务能力列表（用于按能力跳过用例）。
 
@@ -289,6 +334,32 @@ def execute(
         读取文件系统、可能进行网络探活（已在测试中通过 monkeypatch 避免）。
     """
 
+    with ExitStack() as stack:
+        return _execute(
+            stack,
+            scenario_id,
+            run_type,
+            root=root,
+            timeout_s=timeout_s,
+            dry_run=dry_run,
+        )
+
+
+def _execute(
+    stack: ExitStack,
+    scenario_id: str,
+    run_type: str,
+    *,
+    root: Optional[str],
+    timeout_s: Optional[float],
+    dry_run: bool,
+) -> Dict[str, Any]:
+    """`execute` 的主体。
+
+    共享连接池与自动启动的服务注册到 `stack`，返回或任一阶段抛出异常时由
+    `execute` 统一释放。
+    """
+
     base = Path(root) if root else Path.cwd()
     matrix = load_matrix(base / "configs" / "matrix.yaml")
     scenario = _find_scenario(base, scenario_id)
@@ -307,7 +378,7 @@ def execute(
     launcher: Optional[ServiceLauncher] = None
     if scenario.mode == "local" and autostart_enabled(scenario):
         logs_dir = base / "artifacts" / "logs"
-        launcher = ServiceLauncher(scenario, base, logs_dir)
+        launcher = stack.enter_context(ServiceLauncher(scenario, base, logs_dir))
         launcher.start()
         # 使用场景超时或默认上限 1200s
         max_wait = int(
@@ -320,17 +391,31 @@ def execute(
             result["error"] = "service not ready after autostart"
             if launcher.log_path:
                 result["service_log"] = str(launcher.log_path)
-            launcher.stop()
             return result
     base_url = _discover_and_wait(base, scenario, timeout_s=timeout_s)
     result["base_url"] = base_url
     if launcher and launcher.log_path:
         result["service_log"] = str(launcher.log_path)
 
+    # 各阶段共用一个 keep-alive 连接池，大小取真实压测的最大并发；档位非法时
+    # 按默认大小建池，错误留到性能阶段抛出，不影响此前的功能测试
+    pf: Optional[PerfProfile] = None
+    pf_error: Optional[ValueError] = None
+    if plan.get("perf"):
+        try:
+            pf = _load_perf_profile(base, scenario, run_type)
+        except ValueError as exc:
+            pf_error = exc
+    http = stack.enter_context(
+        pooled_session(http_pool_size(pf) if pf else DEFAULT_POOL_SIZE)
+    )
+
     # Functional
     if plan.get("functional"):
         try:
-            resp = run_smoke_suite(base_url=base_url, model=scenario.served_model_name)
+            resp = run_smoke_suite(
+                base_url=base_url, model=scenario.served_model_name, session=http
+            )
             ok = bool(resp.get("choices"))
             result["functional"] = "ok" if ok else "failed"
         except Exception:
@@ -345,6 +430,7 @@ def execute(
                 model=scenario.served_model_name,
                 cases=chat_cases,
                 capabilities=capabilities,
+                session=http,
             )
             result["functional_report"]["chat"] = report
         if comp_cases:
@@ -353,6 +439,7 @@ def execute(
                 model=scenario.served_model_name,
                 cases=comp_cases,
                 capabilities=capabilities,
+                session=http,
             )
             result["functional_report"]["completions"] = report
         # 汇总并在 daily 时推送功能性指标（包括可选的 per-case 指标）
@@ -438,39 +525,29 @@ def execute(
 
     # Perf（mock 或 real）
     if plan.get("perf"):
-        mode_env = os.environ.get("VLLM_CIBENCH_PERF_MODE", "").strip().lower()
-        real_mode = mode_env == "real" or bool(
-            (scenario.raw.get("perf", {}) or {}).get("mode") == "real"
-        )
-        if real_mode:
-            # 真实执行：读取 profile（默认按 run_type 选择 pr/daily），可被环境变量覆盖
-            prof_path_env = os.environ.get("VLLM_CIBENCH_PERF_PROFILE")
-            if prof_path_env:
-                prof_path = Path(prof_path_env)
-            else:
-                prof_name = "pr.yaml" if run_type == "pr" else "daily.yaml"
-                prof_path = base / "configs" / "tests" / "perf" / "profiles" / prof_name
-            # 解析 profile 并执行
-            try:
-                data = yaml.safe_load(prof_path.read_text(encoding="utf-8")) or {}
-            except Exception:
-                data = {}
-            pf = PerfProfile(
-                concurrency=list(data.get("concurrency", []) or []),
-                input_length=list(data.get("input_length", []) or []),
-                output_length=list(data.get("output_length", []) or []),
-                num_requests_per_concurrency=int(
-                    data.get("num_requests_per_concurrency", 8)
-                ),
-                warmup=int(data.get("warmup", 1)),
-                epochs=int(data.get("epochs", 1)),
-                temperature=float(data.get("temperature", 0.0)),
-            )
+        if pf_error is not None:
+            raise pf_error
+        if pf is not None:
+            # 真实执行：逐请求记录与负载点汇总落地到 artifacts/perf/{scenario}/{ts}/
+            ts = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+            perf_dir = base / "artifacts" / "perf" / scenario.id / ts
             csv_text = run_profile_to_csv(
                 base_url=base_url,
                 model=scenario.served_model_name,
                 profile=pf,
+                artifacts_dir=str(perf_dir),
+                tag=run_type,
+                session=http,
             )
+            try:
+                perf_dir.mkdir(parents=True, exist_ok=True)
+                (perf_dir / f"perf_{run_type}.csv").write_text(
+                    csv_text, encoding="utf-8"
+                )
+                result.setdefault("artifacts", {})["perf_dir"] = str(perf_dir)
+            except Exception:
+                # 写盘失败不影响主流程
+                pass
         else:
             # 生成少量 mock 数据 -> 解析 -> 重命名 -> 聚合
             csv_text = gen_mock_csv(
@@ -486,7 +563,7 @@ def execute(
         result["perf_metrics"] = {
             **agg,
             "records": renamed,
-            "mode": ("real" if real_mode else "mock"),
+            "mode": ("real" if pf is not None else "mock"),
         }
 
         # Push（仅 daily）
@@ -513,6 +590,7 @@ def execute(
                 base_url=base_url,
                 model=scenario.served_model_name,
                 cfg=acc_cfg,
+                session=http,
             )
             # 阈值与通过判定：支持配置 min_score（缺省不判定）
             try:
@@ -564,8 +642,6 @@ def execute(
         except Exception as exc:
             result["accuracy"] = {"error": str(exc)}
 
-    if launcher is not None:
-        launcher.stop()
     # 可选：K8s 资源清理（仅在场景声明或环境变量提供 YAML 时执行）
     try:
         if scenario.mode.startswith("k8s"):
@@ -22,6 +22,9 @@ import typer
 import yaml as _yaml
 
 from .config import ScenarioRegistry, load_matrix, resolve_plan
+from .deploy.batch_sim import load_sim_config, open_loop_requests, sim_summary
+from .deploy.batch_sim import simulate as simulate_batch
+from .deploy.mock_server import DEFAULT_MOCK_PORT, MockConfig, MockServer
 from .orchestrators import run_matrix as run_matrix_mod
 from .orchestrators import run_pipeline
 from .testsuites.functional import (
@@ -29,7 +32,11 @@ from .testsuites.functional import (
     run_chat_suite,
     run_completions_suite,
 )
-from .testsuites.perf_exec import PerfProfile, run_profile_to_csv
+from .testsuites.harness_bench import failures as bench_failures
+from .testsuites.harness_bench import load_thresholds, run_benchmarks
+from .testsuites.perf_dist import DEFAULT_AGENT_PORT, PerfAgent
+from .testsuites.perf_exec import run_profile_to_csv
+from .testsuites.perf_profile import profile_from_dict
 
 app = typer.Typer(help="vLLM CI Bench / 计划与编排 CLI")
 
@@ -242,6 +249,27 @@ def run_perf(
     profile: str = typer.Option(..., "--profile", help="性能档位 YAML 路径"),
     out_csv: str = typer.Option("perf.csv", "--out", help="输出 CSV 路径"),
     api_key: Optional[str] = typer.Option(None, "--api-key", help="可选 API Key"),
+    engine: Optional[str] = typer.Option(
+        None, "--engine", help="执行引擎 thread/asyncio（默认读取档位 engine 字段）"
+    ),
+    stream: Optional[bool] = typer.Option(
+        None,
+        "--stream/--no-stream",
+        help="流式请求并统计 TTFT/ITL/TPOT（默认读取档位 stream 字段）",
+    ),
+    artifacts_dir: Optional[str] = typer.Option(
+        None,
+        "--artifacts-dir",
+        help="逐请求记录 requests_perf.* 与汇总 summary_perf.csv 的输出目录",
+    ),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", help="压测进程数（默认读取档位 workers 字段，缺省 1）"
+    ),
+    agents: Optional[str] = typer.Option(
+        None,
+        "--agents",
+        help="协调者模式：逗号分隔的压测代理 URL（perf-agent），负载均分到各代理",
+    ),
 ) -> None:
     """运行最小性能执行器并输出 CSV（与 mock CSV 兼容）。
 
@@ -251,6 +279,11 @@ def run_perf(
         profile: 档位 YAML（如 configs/tests/perf/profiles/pr.yaml）。
         out_csv: 输出 CSV 文件路径。
         api_key: 可选 API Key。
+        engine: 覆盖档位中的执行引擎。
+        stream: 覆盖档位中的流式开关。
+        artifacts_dir: 可选产物目录（逐请求记录与负载点汇总）。
+        workers: 覆盖档位中的压测进程数。
+        agents: 覆盖档位中的压测代理列表（协调者模式）。
 
     返回值:
         无；将 CSV 落盘至 out_csv。
@@ -259,19 +292,224 @@ def run_perf(
     import yaml as _yaml2
 
     data = _yaml2.safe_load(_Path(profile).read_text(encoding="utf-8")) or {}
-    pf = PerfProfile(
-        concurrency=list(data.get("concurrency", []) or []),
-        input_length=list(data.get("input_length", []) or []),
-        output_length=list(data.get("output_length", []) or []),
-        num_requests_per_concurrency=int(data.get("num_requests_per_concurrency", 8)),
-        warmup=int(data.get("warmup", 1)),
-        epochs=int(data.get("epochs", 1)),
-        temperature=float(data.get("temperature", 0.0)),
+    if workers is not None:
+        # 覆盖写入档位字典后再解析，使 trace/session 单进程与代理地址等校验同样生效
+        data = {**data, "workers": workers}
+    if agents is not None:
+        data = {**data, "agents": agents}
+    try:
+        pf = profile_from_dict(data, engine=engine)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc))
+    if stream is not None:
+        pf.stream = stream
+    csv_text = run_profile_to_csv(
+        base_url, model, pf, api_key=api_key, artifacts_dir=artifacts_dir
     )
-    csv_text = run_profile_to_csv(base_url, model, pf, api_key=api_key)
     _Path(out_csv).write_text(csv_text, encoding="utf-8")
     typer.echo(out_csv)
 
 
+@app.command("perf-agent")
+def perf_agent(
+    host: str = typer.Option(
+        "127.0.0.1", "--host", help="监听地址（跨机器部署时设为 0.0.0.0）"
+    ),
+    port: int = typer.Option(DEFAULT_AGENT_PORT, "--port", help="监听端口"),
+) -> None:
+    """启动压测代理，执行协调者（`run-perf --agents`）下发的负载分片。
+
+    参数:
+        host: 监听地址。
+        port: 监听端口。
+
+    返回值:
+        无；阻塞服务直至进程被中断。
+    """
+
+    agent = PerfAgent(host, port)
+    typer.echo(agent.url)
+    try:
+        agent.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        agent.shutdown()
+
+
+@app.command("serve-mock")
+def serve_mock(
+    host: str = typer.Option("127.0.0.1", "--host", help="监听地址"),
+    port: int = typer.Option(DEFAULT_MOCK_PORT, "--port", help="监听端口"),
+    model: str = typer.Option("mock", "--model", help="/v1/models 返回的模型名"),
+    ttft_ms: float = typer.Option(20.0, "--ttft-ms", help="首 token 时延（毫秒）"),
+    token_delay_ms: float = typer.Option(
+        5.0, "--token-delay-ms", help="相邻输出 token 间隔（毫秒）"
+    ),
+    output_tokens: int = typer.Option(
+        16, "--output-tokens", help="请求未给 max_tokens 时的输出 token 数"
+    ),
+    fail_rate: float = typer.Option(
+        0.0, "--fail-rate", help="立即返回失败状态码的概率（0-1）"
+    ),
+    fail_status: int = typer.Option(503, "--fail-status", help="注入失败的状态码"),
+    truncate_rate: float = typer.Option(
+        0.0, "--truncate-rate", help="流式响应中途断开的概率（0-1）"
+    ),
+    max_concurrency: int = typer.Option(
+        0, "--max-concurrency", help="同时处理的请求上限（0 不限，超出排队）"
+    ),
+    seed: Optional[int] = typer.Option(None, "--seed", help="故障注入随机种子"),
+    sim_config: Optional[str] = typer.Option(
+        None, "--sim-config", help="连续批处理模拟器参数 YAML（启用模拟后端）"
+    ),
+    fit_csv: Optional[str] = typer.Option(
+        None, "--fit-csv", help="由实测 perf CSV 拟合模拟器步长参数（启用模拟后端）"
+    ),
+    engine_args: Optional[str] = typer.Option(
+        None,
+        "--engine-args",
+        help="vLLM 启动参数，如 '--max-num-seqs=24'（启用模拟后端）",
+    ),
+) -> None:
+    """启动 OpenAI 兼容 mock 服务，用于无 GPU 环境下压测与回归测试压测工具本身。
+
+    参数:
+        host: 监听地址。
+        port: 监听端口。
+        sim_config/fit_csv/engine_args: 任一给定时以连续批处理模拟器决定时延
+            （见 `deploy.batch_sim.load_sim_config`）。
+        其余参数见 `deploy.mock_server.MockConfig`。
+
+    返回值:
+        无；输出服务基础 URL 后阻塞服务直至进程被中断。
+    """
+
+    try:
+        sim = None
+        if sim_config or fit_csv or engine_args:
+            sim = load_sim_config(sim_config, fit_csv=fit_csv, engine_args=engine_args)
+        cfg = MockConfig(
+            model=model,
+            ttft_ms=ttft_ms,
+            token_delay_ms=token_delay_ms,
+            output_tokens=output_tokens,
+            fail_rate=fail_rate,
+            fail_status=fail_status,
+            truncate_rate=truncate_rate,
+            max_concurrency=max_concurrency,
+            seed=seed,
+            sim=sim,
+        )
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc))
+    server = MockServer(cfg, host, port)
+    typer.echo(server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+@app.command("simulate")
+def simulate_cmd(
+    request_rate: str = typer.Option(
+        ..., "--request-rate", help="到达速率列表（req/s，逗号分隔）"
+    ),
+    num_requests: int = typer.Option(1000, "--num-requests", help="每个速率的请求数"),
+    input_len: int = typer.Option(1024, "--input-len", help="输入 token 数"),
+    output_len: int = typer.Option(256, "--output-len", help="输出 token 数"),
+    arrival: str = typer.Option("poisson", "--arrival", help="poisson/constant"),
+    seed: int = typer.Option(0, "--seed", help="到达过程随机种子"),
+    sim_config: Optional[str] = typer.Option(
+        None, "--sim-config", help="模拟器参数 YAML"
+    ),
+    fit_csv: Optional[str] = typer.Option(
+        None, "--fit-csv", help="由实测 perf CSV 拟合步长参数"
+    ),
+    engine_args: Optional[str] = typer.Option(
+        None, "--engine-args", help="vLLM 启动参数，如 PD 场景的 decode_params"
+    ),
+) -> None:
+    """离线模拟连续批处理服务在各到达速率下的表现（容量规划 / what-if）。
+
+    参数:
+        request_rate: 逗号分隔的到达速率。
+        其余参数见 `deploy.batch_sim.open_loop_requests` 与 `load_sim_config`。
+
+    返回值:
+        无；输出 JSON 列表，每个速率一项（精确分位点，列名同 perf CSV）。
+    """
+
+    try:
+        cfg = load_sim_config(sim_config, fit_csv=fit_csv, engine_args=engine_args)
+        rates = [float(r) for r in request_rate.split(",") if r.strip()]
+        if not rates or min(rates) <= 0:
+            raise ValueError("--request-rate must list positive rates")
+        out = []
+        for rate in rates:
+            reqs = open_loop_requests(
+                rate, num_requests, input_len, output_len, arrival=arrival, seed=seed
+            )
+            res = simulate_batch(cfg, reqs)
+            out.append({"request_rate": rate, **sim_summary(res)})
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc))
+    typer.echo(_json.dumps(out, ensure_ascii=False))
+
+
+@app.command("bench")
+def bench(
+    only: Optional[str] = typer.Option(
+        None, "--only", help="逗号分隔的用例名（缺省全部）"
+    ),
+    out_json: str = typer.Option(
+        "artifacts/bench/harness_bench.json", "--out", help="结果 JSON 路径"
+    ),
+    thresholds: Optional[str] = typer.Option(
+        None,
+        "--thresholds",
+        help="阈值 JSON（{用例名: 微秒}），或此前的结果 JSON（作为基线）",
+    ),
+    tolerance: float = typer.Option(
+        0.5, "--tolerance", help="以结果 JSON 为基线时允许的相对变慢幅度"
+    ),
+    min_time: float = typer.Option(0.02, "--min-time", help="单批最短耗时（秒）"),
+    repeat: int = typer.Option(5, "--repeat", help="重复批数"),
+) -> None:
+    """运行压测工具自身热点路径的微基准，结果写入 JSON 并与阈值比较。
+
+    参数:
+        only: 要运行的用例（见 `testsuites.harness_bench.BENCHMARKS`）。
+        out_json: 结果文件路径。
+        thresholds: 阈值文件（见 `harness_bench.load_thresholds`）。
+        tolerance: 基线模式下的容忍度。
+        min_time: 单批最短耗时。
+        repeat: 重复批数。
+
+    返回值:
+        无；输出结果路径，有用例超出阈值时以退出码 1 结束。
+    """
+
+    names = [n.strip() for n in only.split(",") if n.strip()] if only else None
+    try:
+        limits = load_thresholds(thresholds, tolerance=tolerance)
+        report = run_benchmarks(
+            names, thresholds=limits, min_time_s=min_time, repeat=repeat
+        )
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc))
+    out = _Path(out_json)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(_json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    for name, median_us, limit_us in bench_failures(report):
+        typer.echo(f"{name}: {median_us:.1f}us > {limit_us:.1f}us", err=True)
+    typer.echo(out_json)
+    if not report["ok"]:
+        raise typer.Exit(code=1)
+
+
 if __name__ == "__main__":
     main()
@@ -15,6 +15,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
 
+import requests
+
 from vllm_cibench.clients.openai_client import OpenAICompatClient
 
 
@@ -81,6 +83,7 @@ def run_accuracy(
     cfg: Optional[Mapping[str, Any]] = None,
     *,
     api_key: Optional[str] = None,
+    session: Optional[requests.Session] = None,
 ) -> Dict[str, Any]:
     """运行最小化精度评测。
 
@@ -91,6 +94,7 @@ def run_accuracy(
             - task: 任务名（默认 "gpqa"，仅作标签使用）。
             - samples: List[dict]，每项包含 {question, choices, answer}。
         api_key: 可选 API Key。
+        session: 共享的 HTTP 会话（可选；缺省为本次调用临时创建）。
 
     返回值:
         dict: {"task", "score", "correct", "total"}。
@@ -185,37 +189,39 @@ def run_accuracy(
     if max_samples and max_samples > 0:
         samples = samples[:max_samples]
 
-    client = OpenAICompatClient(base_url=base_url, api_key=api_key)
     correct = 0
-    for sm in samples:
-        messages: List[Mapping[str, Any]] = [
-            {"role": "system", "content": "You are a helpful assistant."},
-            {
-                "role": "user",
-                "content": f"Question: {sm.question}\nChoices: {', '.join(sm.choices)}\nAnswer with the choice only.",
-            },
-        ]
-        resp = client.chat_completions(model=model, messages=messages, temperature=0)
-        # chat_completions 在非 stream 情况下应返回 Dict[str, Any]
-        if isinstance(resp, dict):
-            pred = _parse_choice_text(resp)
-        else:  # 防御式处理：若出现流模式返回 list，取首个块解析
-            pred = _parse_choice_text(resp[0] if resp else {})
-
-        # 归一化与别名命中
-        norm_cfg: Dict[str, Any] = dict(cfg or {})
-        pred_n = _normalize(pred, norm_cfg)
-        ans_n = _normalize(sm.answer, norm_cfg)
-        ok = pred_n == ans_n
-        # 支持样本提供 answer_aliases（等价正确答案）
-        aliases = getattr(sm, "answer_aliases", None)
-        if not ok and isinstance(aliases, list):
-            for a in aliases:
-                if _normalize(str(a), norm_cfg) == pred_n:
-                    ok = True
-                    break
-        if ok:
-            correct += 1
+    with OpenAICompatClient(base_url, api_key=api_key, session=session) as client:
+        for sm in samples:
+            messages: List[Mapping[str, Any]] = [
+                {"role": "system", "content": "You are a helpful assistant."},
+                {
+                    "role": "user",
+                    "content": f"Question: {sm.question}\nChoices: {', '.join(sm.choices)}\nAnswer with the choice only.",
+                },
+            ]
+            resp = client.chat_completions(
+                model=model, messages=messages, temperature=0
+            )
+            # chat_completions 在非 stream 情况下应返回 Dict[str, Any]
+            if isinstance(resp, dict):
+                pred = _parse_choice_text(resp)
+            else:  # 防御式处理：若出现流模式返回 list，取首个块解析
+                pred = _parse_choice_text(resp[0] if resp else {})
+
+            # 归一化与别名命中
+            norm_cfg: Dict[str, Any] = dict(cfg or {})
+            pred_n = _normalize(pred, norm_cfg)
+            ans_n = _normalize(sm.answer, norm_cfg)
+            ok = pred_n == ans_n
+            # 支持样本提供 answer_aliases（等价正确答案）
+            aliases = getattr(sm, "answer_aliases", None)
+            if not ok and isinstance(aliases, list):
+                for a in aliases:
+                    if _normalize(str(a), norm_cfg) == pred_n:
+                        ok = True
+                        break
+            if ok:
+                correct += 1
 
     total = len(samples)
     score = (correct / total) if total else 0.0
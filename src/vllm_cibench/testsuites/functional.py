@@ -16,7 +16,9 @@ from dataclasses import dataclass
 
 # isort: off
 from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, cast
-from vllm_cibench.clients.openai_client import OpenAICompatClient
+import requests
+
+from vllm_cibench.clients.openai_client import OpenAICompatClient, session_scope
 
 # isort: on
 
@@ -307,6 +309,7 @@ def run_chat_case(
     case: ChatCase,
     *,
     api_key: Optional[str] = None,
+    session: Optional[requests.Session] = None,
 ) -> SuiteResult:
     """执行单个 Chat 用例（支持 stream 与参数扩展）。
 
@@ -315,6 +318,7 @@ def run_chat_case(
         model: 模型名。
         case: ChatCase 用例。
         api_key: 可选 API Key。
+        session: 共享的 HTTP 会话（可选；缺省为本次调用临时创建）。
 
     返回值:
         dict: {ok: bool, error: Optional[str], payload: Any}。
@@ -323,7 +327,7 @@ def run_chat_case(
         真实网络请求；HTTPError 将被捕获转为 error。
     """
 
-    client = OpenAICompatClient(base_url=base_url, api_key=api_key)
+    client = OpenAICompatClient(base_url=base_url, api_key=api_key, session=session)
     try:
         out = client.chat_completions(
             model=model, messages=case.messages, **dict(case.params)
@@ -335,12 +339,15 @@ def run_chat_case(
         if case.expect_error:
             return _ok({"exception": str(exc)})
         return _err(str(exc))
+    finally:
+        client.close()
 
 
 def run_smoke_suite(
     base_url: str,
     model: str,
     api_key: Optional[str] = None,
+    session: Optional[requests.Session] = None,
 ) -> Dict[str, Any]:
     """执行基础冒烟套件（单次请求）。
 
@@ -348,6 +355,7 @@ def run_smoke_suite(
         base_url: 服务基础 URL，例如 `http://127.0.0.1:9000/v1`。
         model: 模型名。
         api_key: 可选 API Key。
+        session: 共享的 HTTP 会话（可选；缺省为本次调用临时创建）。
 
     返回值:
         dict: 响应体，调用者可进一步断言字段。
@@ -356,11 +364,11 @@ def run_smoke_suite(
         发起网络请求。
     """
 
-    client = OpenAICompatClient(base_url=base_url, api_key=api_key)
     messages: List[Mapping[str, Any]] = [
         {"role": "user", "content": "Say hello in one word."}
     ]
-    out = run_basic_chat(client, model, messages, temperature=0)
+    with OpenAICompatClient(base_url, api_key=api_key, session=session) as client:
+        out = run_basic_chat(client, model, messages, temperature=0)
     return cast(Dict[str, Any], out)
 
 
@@ -371,6 +379,7 @@ def run_chat_suite(
     *,
     api_key: Optional[str] = None,
     capabilities: Optional[Sequence[str]] = None,
+    session: Optional[requests.Session] = None,
 ) -> Dict[str, Any]:
     """批量执行 Chat 用例并汇总结果（支持能力跳过）。
 
@@ -379,6 +388,7 @@ def run_chat_suite(
         model: 模型名。
         cases: ChatCase 序列。
         api_key: 可选 API Key。
+        session: 共享的 HTTP 会话（可选；缺省为本次调用临时创建）。
         capabilities: 服务已支持的能力列表（如 ["chat.logprobs"])；
             若用例声明了 `required_capabilities` 且不被包含，且 `skip_if_unsupported=True`，
             则该用例标记为 skipped 而不执行网络请求。
@@ -394,25 +404,26 @@ def run_chat_suite(
     passed = 0
     skipped = 0
     caps = set(capabilities or [])
-    for c in cases:
-        reqs = set(c.required_capabilities or [])
-        if c.skip_if_unsupported and reqs and not reqs.issubset(caps):
-            results.append(
-                {
-                    "id": c.id,
-                    "ok": False,
-                    "skipped": True,
-                    "error": None,
-                    "payload": None,
-                    "missing_capabilities": sorted(reqs - caps),
-                }
-            )
-            skipped += 1
-            continue
-        r = run_chat_case(base_url, model, c, api_key=api_key)
-        results.append({"id": c.id, "skipped": False, **r})
-        if r["ok"]:
-            passed += 1
+    with session_scope(session) as http:
+        for c in cases:
+            reqs = set(c.required_capabilities or [])
+            if c.skip_if_unsupported and reqs and not reqs.issubset(caps):
+                results.append(
+                    {
+                        "id": c.id,
+                        "ok": False,
+                        "skipped": True,
+                        "error": None,
+                        "payload": None,
+                        "missing_capabilities": sorted(reqs - caps),
+                    }
+                )
+                skipped += 1
+                continue
+            r = run_chat_case(base_url, model, c, api_key=api_key, session=http)
+            results.append({"id": c.id, "skipped": False, **r})
+            if r["ok"]:
+                passed += 1
     return {
         "summary": {
             "total": len(cases),
@@ -455,6 +466,7 @@ def run_basic_completion(
     model: str,
     prompt: str,
     api_key: Optional[str] = None,
+    session: Optional[requests.Session] = None,
     **params: Any,
 ) -> Dict[str, Any] | List[Dict[str, Any]]:
     """执行基础文本补全（/v1/completions）。
@@ -464,6 +476,7 @@ def run_basic_completion(
         model: 模型名。
         prompt: 文本补全提示词。
         api_key: 可选 API Key。
+        session: 共享的 HTTP 会话（可选；缺省为本次调用临时创建）。
         params: 其他请求参数（如 temperature/top_p/stream 等）。
 
     返回值:
@@ -474,8 +487,8 @@ def run_basic_completion(
         发起网络请求。
     """
 
-    client = OpenAICompatClient(base_url=base_url, api_key=api_key)
-    return client.completions(model=model, prompt=prompt, **params)
+    with OpenAICompatClient(base_url, api_key=api_key, session=session) as client:
+        return client.completions(model=model, prompt=prompt, **params)
 
 
 def run_completions_case(
@@ -484,6 +497,7 @@ def run_completions_case(
     case: CompletionCase,
     *,
     api_key: Optional[str] = None,
+    session: Optional[requests.Session] = None,
 ) -> SuiteResult:
     """执行单个 Completions 用例。
 
@@ -492,6 +506,7 @@ def run_completions_case(
         model: 模型名。
         case: CompletionCase 用例。
         api_key: 可选 API Key。
+        session: 共享的 HTTP 会话（可选；缺省为本次调用临时创建）。
 
     返回值:
         dict: {ok: bool, error: Optional[str], payload: Any}。
@@ -500,7 +515,7 @@ def run_completions_case(
         真实网络请求；HTTPError 将被捕获转为 error。
     """
 
-    client = OpenAICompatClient(base_url=base_url, api_key=api_key)
+    client = OpenAICompatClient(base_url=base_url, api_key=api_key, session=session)
     try:
         out = client.completions(model=model, prompt=case.prompt, **dict(case.params))
         if case.expect_error:
@@ -510,6 +525,8 @@ def run_completions_case(
         if case.expect_error:
             return _ok({"exception": str(exc)})
         return _err(str(exc))
+    finally:
+        client.close()
 
 
 def run_completions_suite(
@@ -519,6 +536,7 @@ def run_completions_suite(
     *,
     api_key: Optional[str] = None,
     capabilities: Optional[Sequence[str]] = None,
+    session: Optional[requests.Session] = None,
 ) -> Dict[str, Any]:
     """批量执行 Completions 用例并汇总结果（支持能力跳过）。
 
@@ -527,6 +545,7 @@ def run_completions_suite(
         model: 模型名。
         cases: CompletionCase 序列。
         api_key: 可选 API Key。
+        session: 共享的 HTTP 会话（可选；缺省为本次调用临时创建）。
         capabilities: 服务能力列表（如 ["completions.suffix"]）。
 
     返回值:
@@ -540,25 +559,26 @@ def run_completions_suite(
     passed = 0
     skipped = 0
     caps = set(capabilities or [])
-    for c in cases:
-        reqs = set(c.required_capabilities or [])
-        if c.skip_if_unsupported and reqs and not reqs.issubset(caps):
-            results.append(
-                {
-                    "id": c.id,
-                    "ok": False,
-                    "skipped": True,
-                    "error": None,
-                    "payload": None,
-                    "missing_capabilities": sorted(reqs - caps),
-                }
-            )
-            skipped += 1
-            continue
-        r = run_completions_case(base_url, model, c, api_key=api_key)
-        results.append({"id": c.id, "skipped": False, **r})
-        if r["ok"]:
-            passed += 1
+    with session_scope(session) as http:
+        for c in cases:
+            reqs = set(c.required_capabilities or [])
+            if c.skip_if_unsupported and reqs and not reqs.issubset(caps):
+                results.append(
+                    {
+                        "id": c.id,
+                        "ok": False,
+                        "skipped": True,
+                        "error": None,
+                        "payload": None,
+                        "missing_capabilities": sorted(reqs - caps),
+                    }
+                )
+                skipped += 1
+                continue
+            r = run_completions_case(base_url, model, c, api_key=api_key, session=http)
+            results.append({"id": c.id, "skipped": False, **r})
+            if r["ok"]:
+                passed += 1
     return {
         "summary": {
             "total": len(cases),
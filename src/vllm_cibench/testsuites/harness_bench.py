@@ -0,0 +1,289 @@
+"""压测工具自身热点路径的微基准。
+
+压测工具的开销（SSE 解析、统计、CSV 解析等）会直接叠加到测得的时延上，
+却从未被度量过。本模块为这些热点路径提供固定规模的微基准，结果以 JSON 落盘并与
+阈值比较，便于在工具开销回归影响服务端测量之前发现问题：
+
+- `sse_parse_1k`：`OpenAICompatClient` 流式响应的 SSE 解析（1000 个 chunk）；
+- `compute_summary_10k`：1 万个时延样本的汇总（直方图插入 + 分位点）；
+- `percentiles_100k`：10 万样本直方图上一次取全部报告分位点；
+- `parse_perf_csv_5k`：5000 行全列 perf CSV 的解析；
+- `make_prompt_4096`/`make_prompt_32768`：长提示词生成；
+- `build_cases_10k`：约 1 万条用例的功能测试配置展开；
+- `metrics_from_perf_records_5k`：5000 条 perf 记录聚合为 Pushgateway 指标。
+
+计时：每个用例先把单批调用次数倍增到单批耗时不少于 `min_time_s`，再重复
+`repeat` 批，取单次调用耗时的中位数与最小值（微秒）；准备数据不计入耗时。
+
+阈值：`DEFAULT_THRESHOLDS_US` 为宽松的绝对上限（微秒，按量级设定，防止数量级
+回归）；`load_thresholds` 可读取 `{用例名: 微秒}` 映射，或以此前的结果 JSON 为
+基线，按 `(1 + tolerance) × 中位数` 生成更紧的阈值。
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import platform
+import random
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import requests
+
+from vllm_cibench.clients.openai_client import iter_sse
+from vllm_cibench.metrics.pushgateway import metrics_from_perf_records
+from vllm_cibench.testsuites.functional import build_cases_from_config
+from vllm_cibench.testsuites.perf import (
+    PERF_CSV_COLUMNS,
+    REPORT_QUANTILES,
+    parse_perf_csv,
+)
+from vllm_cibench.testsuites.perf_exec import compute_summary
+from vllm_cibench.testsuites.perf_hist import LatencyHistogram
+from vllm_cibench.testsuites.perf_prompts import make_prompt
+
+# 准备函数：构造输入数据，返回被计时的无参调用
+BenchSetup = Callable[[], Callable[[], object]]
+
+DEFAULT_MIN_TIME_S = 0.02
+DEFAULT_REPEAT = 5
+DEFAULT_TOLERANCE = 0.5
+
+
+def _sse_parse() -> Callable[[], object]:
+    chunk = {
+        "id": "bench",
+        "object": "chat.completion.chunk",
+        "choices": [{"index": 0, "delta": {"content": "token "}}],
+    }
+    line = f"data: {json.dumps(chunk)}\n\n".encode()
+    body = line * 1000 + b"data: [DONE]\n\n"
+
+    def run() -> object:
+        resp = requests.Response()
+        resp.raw = io.BytesIO(body)
+        return sum(1 for _ in iter_sse(resp))
+
+    return run
+
+
+def _latencies(n: int, seed: int = 0) -> List[float]:
+    rng = random.Random(seed)
+    return [rng.lognormvariate(4.0, 0.6) for _ in range(n)]
+
+
+def _compute_summary() -> Callable[[], object]:
+    lat = _latencies(10_000)
+    return lambda: compute_summary(lat, 10.0, len(lat))
+
+
+def _percentiles() -> Callable[[], object]:
+    hist = LatencyHistogram().extend(_latencies(100_000))
+    return lambda: hist.percentiles(REPORT_QUANTILES)
+
+
+def _perf_csv(n_rows: int) -> str:
+    rng = random.Random(0)
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(PERF_CSV_COLUMNS)
+    for i in range(n_rows):
+        w.writerow(
+            [1 + i % 64, 128 << (i % 4), 128]
+            + [f"{rng.uniform(1.0, 500.0):.3f}" for _ in PERF_CSV_COLUMNS[3:]]
+        )
+    return buf.getvalue()
+
+
+def _parse_perf_csv() -> Callable[[], object]:
+    text = _perf_csv(5000)
+    return lambda: parse_perf_csv(text)
+
+
+def _make_prompt(length: int) -> BenchSetup:
+    return lambda: (lambda: make_prompt(length))
+
+
+def _build_cases() -> Callable[[], object]:
+    messages = [{"role": "user", "content": "hello"}]
+    grid = {f"p{i}": [0, 1, 2] for i in range(500)}
+    data: Dict[str, Any] = {
+        "cases": [
+            {
+                "id": f"c{i}",
+                "type": "chat" if i % 2 else "completions",
+                "messages": messages,
+                "prompt": "hi",
+                "params": {"max_tokens": 8},
+            }
+            for i in range(6000)
+        ],
+        "matrices": {"chat": [{"messages": messages, "params_grid": grid}]},
+        "negative": {
+            "chat": [{"messages": messages, "params_list": [{"top_p": 1.5}] * 3000}]
+        },
+    }
+    return lambda: build_cases_from_config(data)
+
+
+def _metrics_from_records() -> Callable[[], object]:
+    rows = parse_perf_csv(_perf_csv(5000))
+    for i, row in enumerate(rows):
+        row["slo_ok"] = float(i % 3 != 0)
+    return lambda: metrics_from_perf_records(rows)
+
+
+BENCHMARKS: Dict[str, BenchSetup] = {
+    "sse_parse_1k": _sse_parse,
+    "compute_summary_10k": _compute_summary,
+    "percentiles_100k": _percentiles,
+    "parse_perf_csv_5k": _parse_perf_csv,
+    "make_prompt_4096": _make_prompt(4096),
+    "make_prompt_32768": _make_prompt(32768),
+    "build_cases_10k": _build_cases,
+    "metrics_from_perf_records_5k": _metrics_from_records,
+}
+
+# 绝对上限（微秒）：约为普通开发机实测值的 20 倍，只拦截数量级回归
+DEFAULT_THRESHOLDS_US: Dict[str, float] = {
+    "sse_parse_1k": 150_000.0,
+    "compute_summary_10k": 200_000.0,
+    "percentiles_100k": 4_000.0,
+    "parse_perf_csv_5k": 7_000_000.0,
+    "make_prompt_4096": 50.0,
+    "make_prompt_32768": 150.0,
+    "build_cases_10k": 500_000.0,
+    "metrics_from_perf_records_5k": 3_000_000.0,
+}
+
+
+def measure(
+    fn: Callable[[], object],
+    *,
+    min_time_s: float = DEFAULT_MIN_TIME_S,
+    repeat: int = DEFAULT_REPEAT,
+) -> Dict[str, float]:
+    """测量无参调用的单次耗时。
+
+    参数:
+        fn: 被测调用。
+        min_time_s: 单批最短耗时（秒），决定单批调用次数。
+        repeat: 重复批数。
+
+    返回值:
+        dict: `median_us`/`min_us`（单次调用微秒）、`number`（单批次数）与 `repeat`。
+    """
+
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - t0 >= min_time_s:
+            break
+        number *= 2
+    per_call: List[float] = []
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call.append((time.perf_counter() - t0) * 1e6 / number)
+    return {
+        "median_us": statistics.median(per_call),
+        "min_us": min(per_call),
+        "number": float(number),
+        "repeat": float(len(per_call)),
+    }
+
+
+def load_thresholds(
+    path: Optional[str] = None, *, tolerance: float = DEFAULT_TOLERANCE
+) -> Dict[str, float]:
+    """读取阈值（覆盖在 `DEFAULT_THRESHOLDS_US` 之上）。
+
+    参数:
+        path: JSON 文件：`{用例名: 微秒}`，或 `run_benchmarks` 的结果文件（含
+            `results`，此时阈值为 `(1 + tolerance) × median_us`）；None 只用默认值。
+        tolerance: 以结果文件为基线时允许的相对变慢幅度。
+
+    返回值:
+        dict: 用例名到阈值（微秒）。
+
+    异常:
+        ValueError: 文件内容不是对象，或 `tolerance` 为负。
+    """
+
+    if tolerance < 0:
+        raise ValueError(f"tolerance must be >= 0, got {tolerance}")
+    out = dict(DEFAULT_THRESHOLDS_US)
+    if not path:
+        return out
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError(f"threshold file must be a JSON object: {path}")
+    if "results" in data:
+        for name, res in data["results"].items():
+            out[name] = float(res["median_us"]) * (1.0 + tolerance)
+    else:
+        out.update({k: float(v) for k, v in data.items()})
+    return out
+
+
+def run_benchmarks(
+    names: Optional[Iterable[str]] = None,
+    *,
+    thresholds: Optional[Mapping[str, float]] = None,
+    min_time_s: float = DEFAULT_MIN_TIME_S,
+    repeat: int = DEFAULT_REPEAT,
+) -> Dict[str, Any]:
+    """运行微基准并与阈值比较。
+
+    参数:
+        names: 要运行的用例（缺省全部）。
+        thresholds: 用例名到阈值（微秒）；缺省 `DEFAULT_THRESHOLDS_US`。
+        min_time_s: 见 `measure`。
+        repeat: 见 `measure`。
+
+    返回值:
+        dict: `python`/`platform` 环境信息、`results`（每个用例的测量值、
+        `threshold_us` 与 `ok`）以及总体 `ok`。
+
+    异常:
+        ValueError: 用例名未知。
+    """
+
+    selected = list(names) if names is not None else list(BENCHMARKS)
+    unknown = [n for n in selected if n not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"unknown benchmarks: {unknown}; expected {list(BENCHMARKS)}")
+    limits = DEFAULT_THRESHOLDS_US if thresholds is None else thresholds
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in selected:
+        res: Dict[str, Any] = dict(
+            measure(BENCHMARKS[name](), min_time_s=min_time_s, repeat=repeat)
+        )
+        limit = limits.get(name)
+        if limit is not None:
+            res["threshold_us"] = float(limit)
+        res["ok"] = limit is None or res["median_us"] <= limit
+        results[name] = res
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+        "ok": all(r["ok"] for r in results.values()),
+    }
+
+
+def failures(report: Mapping[str, Any]) -> List[Tuple[str, float, float]]:
+    """超出阈值的用例：`(名称, 中位数微秒, 阈值微秒)` 列表。"""
+
+    return [
+        (name, float(r["median_us"]), float(r["threshold_us"]))
+        for name, r in report["results"].items()
+        if not r["ok"]
+    ]
@@ -8,7 +8,114 @@ from __future__ import annotations
 import csv
 import io
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Tuple
+
+# 分布类指标统一输出的分位点（P50/P75/P90/P95/P99）
+REPORT_QUANTILES: Tuple[int, ...] = (50, 75, 90, 95, 99)
+
+BASE_COLUMNS: Tuple[str, ...] = (
+    "concurrency",
+    "input_len",
+    "output_len",
+    "latency_p50_ms",
+    "throughput_rps",
+)
+
+
+def dist_columns(name: str) -> Tuple[str, ...]:
+    """返回某个分布指标的列名（各分位点 + 均值 + 最大值）。
+
+    参数:
+        name: 指标前缀，如 `latency`（E2E）、`ttft`、`itl`、`tpot`。
+
+    返回值:
+        tuple[str, ...]: 形如 `ttft_p50_ms, ..., ttft_avg_ms, ttft_max_ms`。
+    """
+
+    return tuple(f"{name}_p{q}_ms" for q in REPORT_QUANTILES) + (
+        f"{name}_avg_ms",
+        f"{name}_max_ms",
+    )
+
+
+def ci_columns(name: str) -> Tuple[str, ...]:
+    """返回某个分布指标各分位点置信区间的列名。
+
+    参数:
+        name: 指标前缀，同 `dist_columns`。
+
+    返回值:
+        tuple[str, ...]: 形如 `ttft_p50_ci_lo_ms, ttft_p50_ci_hi_ms, ...`。
+    """
+
+    return tuple(
+        f"{name}_p{q}_ci_{side}_ms" for q in REPORT_QUANTILES for side in ("lo", "hi")
+    )
+
+
+# token 吞吐（按服务端 usage，流式缺失 usage 时按内容 chunk 计数）：输入/输出/合计
+# tok/s（仅成功请求）与单请求输出速率（输出 token 数 / E2E 时延）的均值与 P50
+TOKEN_COLUMNS: Tuple[str, ...] = (
+    "input_tps",
+    "output_tps",
+    "total_tps",
+    "request_output_tps_avg",
+    "request_output_tps_p50",
+)
+
+# 失败请求的错误分类（见 `perf_errors.classify_error`）
+ERROR_CLASSES: Tuple[str, ...] = (
+    "http_4xx",
+    "http_429",
+    "http_5xx",
+    "timeout",
+    "connection",
+    "stream_truncated",
+    "invalid_json",
+    "other",
+)
+
+# 失败率与各错误分类的失败数（`errors_<class>`）
+ERROR_COLUMNS: Tuple[str, ...] = ("fail_rate",) + tuple(
+    f"errors_{c}" for c in ERROR_CLASSES
+)
+
+# 逐请求 SLO 达标统计：达标率（%）与达标请求的有效吞吐（req/s、输出 tok/s）
+GOODPUT_COLUMNS: Tuple[str, ...] = ("slo_attainment_pct", "goodput_rps", "goodput_tps")
+
+# 压测端瓶颈检测（档位 `client_check`，见 `perf_client`）：实际平均在途数、
+# 本进程平均/峰值 CPU 利用率（核）与是否受压测端限制（1/0）
+CLIENT_COLUMNS: Tuple[str, ...] = (
+    "achieved_concurrency",
+    "client_cpu_avg",
+    "client_cpu_max",
+    "client_bound",
+)
+
+# 可选数值列：E2E（latency_*）其余分位 + 流式 TTFT/ITL/TPOT + 开环目标 QPS
+# + 实际平均输出 token 数 + 是否满足 SLO（1/0）+ goodput + 共享前缀比例
+# + 多轮会话轮次 + 稳态窗口（秒，相对负载点首个时间桶）+ 样本数与各分位点/
+# 失败率的置信区间 + 失败率与分类失败数 + token 吞吐 + 压测端瓶颈检测；
+# 缺失或空值时不解析
+OPTIONAL_FLOAT_COLUMNS: Tuple[str, ...] = (
+    tuple(c for c in dist_columns("latency") if c not in BASE_COLUMNS)
+    + dist_columns("ttft")
+    + dist_columns("itl")
+    + dist_columns("tpot")
+    + ("request_rate", "output_tokens_avg", "slo_ok")
+    + GOODPUT_COLUMNS
+    + ("prefix_share", "turn", "steady_start_s", "steady_end_s")
+    + ("requests", "fail_rate_ci_lo", "fail_rate_ci_hi")
+    + ci_columns("latency")
+    + ci_columns("ttft")
+    + ci_columns("itl")
+    + ci_columns("tpot")
+    + ERROR_COLUMNS
+    + TOKEN_COLUMNS
+    + CLIENT_COLUMNS
+)
+
+PERF_CSV_COLUMNS: Tuple[str, ...] = BASE_COLUMNS + OPTIONAL_FLOAT_COLUMNS
 
 
 @dataclass
@@ -70,6 +177,9 @@ def gen_mock_csv(rows: Iterable[PerfResult]) -> str:
 def parse_perf_csv(csv_text: str) -> List[Dict[str, Any]]:
     """解析 CSV 文本为字典列表。
 
+    必选列见 `BASE_COLUMNS`；`OPTIONAL_FLOAT_COLUMNS` 中的列若存在且非空则解析为
+    float，否则不出现在结果字典中（非流式运行的 TTFT 等列为空）。
+
     参数:
         csv_text: 字符串形式的 CSV 内容。
 
@@ -90,15 +200,12 @@ def parse_perf_csv(csv_text: str) -> List[Dict[str, Any]]:
             "latency_p50_ms": float(row["latency_p50_ms"]),
             "throughput_rps": float(row["throughput_rps"]),
         }
-        # 可选分位：latency_p95_ms / latency_p99_ms
-        if "latency_p95_ms" in row and row["latency_p95_ms"] not in (None, ""):
-            try:
-                item["latency_p95_ms"] = float(row["latency_p95_ms"])
-            except Exception:
-                pass
-        if "latency_p99_ms" in row and row["latency_p99_ms"] not in (None, ""):
+        # 可选列：E2E 其余分位（如 latency_p95_ms）与流式 TTFT/ITL/TPOT
+        for col in OPTIONAL_FLOAT_COLUMNS:
+            if row.get(col) in (None, ""):
+                continue
             try:
-                item["latency_p99_ms"] = float(row["latency_p99_ms"])
+                item[col] = float(row[col])
             except Exception:
                 pass
         out.append(item)
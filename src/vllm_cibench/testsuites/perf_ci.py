@@ -0,0 +1,157 @@
+"""置信区间与自适应样本量。
+
+固定的 `num_requests_per_concurrency`（16/32）对 P99 来说样本太少，对低并发的
+稳定负载点又偏多。本模块为每个负载点的指标给出置信区间，并据此判断何时停止加样：
+
+- 分位点：无分布假设的次序统计量区间——真实分位点 q 落在第 j 与第 k 个次序
+  统计量之间的概率由二项分布决定，这里用 Wilson 得分区间给出比例上下界
+  `[p_lo, p_hi]`，再换算为秩 `j = floor(n·p_lo)`、`k = ceil(n·p_hi) + 1`（1 起）；直方图按秩
+  取值即可，无需保留原始样本，合并后的分片/节点统计同样适用；
+- 比例（失败率）：Wilson 得分区间。
+
+上界秩超出样本数（如样本过少时的 P99）表示区间上界未知，记为 `inf`，
+此时不会判定为收敛。
+"""
+
+from __future__ import annotations
+
+import math
+from statistics import NormalDist
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Tuple
+
+from vllm_cibench.testsuites.perf import REPORT_QUANTILES, ci_columns
+
+if TYPE_CHECKING:  # pragma: no cover
+    from vllm_cibench.testsuites.perf_exec import LoadStats
+    from vllm_cibench.testsuites.perf_hist import LatencyHistogram
+
+DEFAULT_CONFIDENCE = 0.95
+# 可作为自适应停止判据的分布指标（对应 `LoadStats` 的同名直方图）
+CI_METRICS: Tuple[str, ...] = ("latency", "ttft", "itl", "tpot")
+
+
+def z_score(confidence: float) -> float:
+    """双侧置信水平对应的标准正态分位数（如 0.95 -> 1.96）。
+
+    异常:
+        ValueError: `confidence` 不在 (0, 1)。
+    """
+
+    if not 0.0 < confidence < 1.0:
+        raise ValueError(f"confidence must be in (0, 1), got {confidence}")
+    return NormalDist().inv_cdf(0.5 + confidence / 2.0)
+
+
+def wilson_interval(
+    k: float, n: int, confidence: float = DEFAULT_CONFIDENCE
+) -> Tuple[float, float]:
+    """比例 `k/n` 的 Wilson 得分区间。
+
+    参数:
+        k: 命中数（可为非整数，用于分位点秩换算）。
+        n: 样本数。
+        confidence: 置信水平。
+
+    返回值:
+        (lo, hi): 比例的上下界（n=0 时为 (0, 1)）。
+    """
+
+    z = z_score(confidence)
+    if n <= 0:
+        return 0.0, 1.0
+    p = min(max(k / n, 0.0), 1.0)
+    denom = 1.0 + z * z / n
+    center = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def quantile_rank_bounds(
+    n: int, pct: float, confidence: float = DEFAULT_CONFIDENCE
+) -> Tuple[int, Optional[int]]:
+    """分位点置信区间对应的次序统计量秩（0 起）。
+
+    参数:
+        n: 样本数。
+        pct: 百分位（0-100）。
+        confidence: 置信水平。
+
+    返回值:
+        (lo, hi): 下界秩与上界秩；上界超出样本数时为 None（区间上界未知）。
+    """
+
+    p_lo, p_hi = wilson_interval(pct / 100.0 * n, n, confidence)
+    lo = max(0, math.floor(n * p_lo) - 1)
+    hi = math.ceil(n * p_hi) + 1
+    return lo, (hi - 1 if hi <= n else None)
+
+
+def quantile_ci(
+    hist: "LatencyHistogram", pct: float, confidence: float = DEFAULT_CONFIDENCE
+) -> Tuple[float, float]:
+    """直方图分位点的置信区间（毫秒；上界未知为 inf，无样本为 (0, inf)）。"""
+
+    if not hist.count:
+        return 0.0, math.inf
+    lo, hi = quantile_rank_bounds(hist.count, pct, confidence)
+    ranks = [lo] if hi is None else [lo, hi]
+    values = hist.values_at_ranks(ranks)
+    return values[lo], (math.inf if hi is None else values[hi])
+
+
+def ci_summary(
+    stats: "LoadStats", confidence: float = DEFAULT_CONFIDENCE
+) -> Dict[str, float]:
+    """负载点全部报告指标的置信区间（键见 `perf.ci_columns`）。
+
+    分布指标仅输出有样本的部分（如非流式运行无 TTFT）；上界未知的分位点
+    只输出下界。另附失败率的 Wilson 区间。
+    """
+
+    out: Dict[str, float] = {}
+    for name in CI_METRICS:
+        hist = getattr(stats, name)
+        if not hist.count:
+            continue
+        cols = ci_columns(name)
+        for i, q in enumerate(REPORT_QUANTILES):
+            lo, hi = quantile_ci(hist, q, confidence)
+            out[cols[2 * i]] = lo
+            if math.isfinite(hi):
+                out[cols[2 * i + 1]] = hi
+    if stats.requests:
+        lo, hi = wilson_interval(stats.failures, stats.requests, confidence)
+        out["fail_rate_ci_lo"], out["fail_rate_ci_hi"] = lo, hi
+    return out
+
+
+def ci_converged(
+    stats: "LoadStats",
+    *,
+    metric: str,
+    quantiles: Sequence[float],
+    target: float,
+    confidence: float = DEFAULT_CONFIDENCE,
+) -> bool:
+    """判断所选分位点的区间是否都已收窄到目标相对半宽以内。
+
+    参数:
+        stats: 负载点统计。
+        metric: 分布指标名（`CI_METRICS` 之一）。
+        quantiles: 百分位列表。
+        target: 目标相对半宽（如 0.05 表示 ±5%）。
+        confidence: 置信水平。
+
+    返回值:
+        bool: 全部满足 `(hi - lo) / 2 <= target * 估计值` 时为 True；
+        无样本或上界未知时为 False。
+    """
+
+    hist = getattr(stats, metric)
+    if not hist.count:
+        return False
+    for q, est in zip(quantiles, hist.percentiles(quantiles)):
+        lo, hi = quantile_ci(hist, q, confidence)
+        if not math.isfinite(hi) or est <= 0 or (hi - lo) / 2.0 > target * est:
+            return False
+    return True
@@ -0,0 +1,317 @@
+"""压测端瓶颈（client-bound）检测。
+
+性能数字只有在压测端本身不是瓶颈时才有意义。本模块提供：
+
+- 标定（`calibrate_client`）：在本机独立子进程中启动零时延的 mock 服务
+  （`serve-mock`，与压测端不争用 GIL），用与档位相同的执行引擎与并发测出压测端
+  自身能达到的最大请求速率，以及流式下每秒能处理的 SSE chunk 数；
+- CPU 采样（`CpuSampler`）：正式测量期间后台线程按固定间隔采样本进程 CPU 时间，
+  可按任意时间窗口给出平均与峰值利用率（单位：核）；
+- 判定（`client_bound_reasons`）：负载点满足任一条件即标记为 client-bound——
+  `cpu_saturated`（窗口内平均 CPU ≥ 上限）、`concurrency_shortfall`（闭环负载点的
+  实际平均在途数低于目标的 `1 - tolerance`）、`near_client_max_rps`/
+  `near_client_chunk_rate`（实测吞吐达到标定上限的 `margin` 倍以上）。
+
+实际平均在途数按 Little 定律由全部请求（含失败）的时延总和 / 测量时长得出。
+CPU 采样只覆盖本进程：多进程（`workers > 1`）或代理模式下不输出 CPU 列。
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+DEFAULT_CPU_LIMIT = 0.9
+DEFAULT_MARGIN = 0.8
+DEFAULT_CONCURRENCY_TOLERANCE = 0.25
+DEFAULT_CALIBRATION_REQUESTS = 200
+# 标定 SSE 处理速率时每个请求的输出 chunk 数
+CALIBRATION_CHUNKS = 256
+
+
+@dataclass
+class ClientCapacity:
+    """压测端自身的能力上限（对零时延 mock 服务标定）。
+
+    属性:
+        engine: 标定所用执行引擎。
+        concurrency: 标定并发。
+        max_rps: 可达到的最大请求速率（req/s）。
+        chunk_rate: 流式下每秒可处理的 SSE chunk 数（非流式档位为 None）。
+    """
+
+    engine: str
+    concurrency: int
+    max_rps: float
+    chunk_rate: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转为 JSON 可序列化字典。"""
+
+        return asdict(self)
+
+
+@contextmanager
+def mock_subprocess() -> Iterator[str]:
+    """在独立 Python 进程中启动零时延 mock 服务（随机端口），产出其基础 URL。
+
+    mock 与压测端同进程时两者争用 GIL，测得的上限偏低；子进程隔离后标定值
+    只反映压测端自身的开销。
+
+    副作用:
+        启动 `python -m vllm_cibench.run serve-mock` 子进程，退出时终止它。
+
+    异常:
+        RuntimeError: 子进程未输出服务 URL 即退出。
+    """
+
+    import vllm_cibench
+
+    env = dict(os.environ)
+    src = str(Path(vllm_cibench.__file__).resolve().parents[1])
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (src, env.get("PYTHONPATH")) if p)
+    cmd = [
+        sys.executable,
+        "-m",
+        "vllm_cibench.run",
+        "serve-mock",
+        "--port",
+        "0",
+        "--ttft-ms",
+        "0",
+        "--token-delay-ms",
+        "0",
+    ]
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, env=env
+    )
+    try:
+        assert proc.stdout is not None
+        url = proc.stdout.readline().strip()
+        if not url.startswith("http"):
+            raise RuntimeError(f"mock server exited before serving: {proc.poll()}")
+        yield url
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5.0)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def calibrate_client(
+    engine: str,
+    *,
+    concurrency: int,
+    n_requests: int = DEFAULT_CALIBRATION_REQUESTS,
+    stream: bool = False,
+) -> ClientCapacity:
+    """对本机零时延 mock 服务测量压测端能力上限。
+
+    参数:
+        engine: 执行引擎（`thread`/`asyncio`）。
+        concurrency: 标定并发（通常取档位的最大并发）。
+        n_requests: 测请求速率时的请求数（测 chunk 速率时取其 1/8，至少 8）。
+        stream: 是否同时标定 SSE chunk 处理速率。
+
+    返回值:
+        ClientCapacity: 标定结果。
+
+    副作用:
+        在 127.0.0.1 的随机端口上短暂启动 mock 服务子进程（见 `mock_subprocess`）。
+    """
+
+    from vllm_cibench.testsuites.perf_exec import get_batch_runner, length_params
+
+    run_batch = get_batch_runner(engine)
+    c = max(1, concurrency)
+    with mock_subprocess() as url:
+        _, fails, dur = run_batch(
+            url,
+            "mock",
+            prompt="x",
+            n_requests=n_requests,
+            concurrency=c,
+            stream=stream,
+            extra_params=length_params(1, ignore_eos=False),
+        )
+        max_rps = (n_requests - fails) / dur if dur > 0 else 0.0
+        chunk_rate: Optional[float] = None
+        if stream:
+            n_stream = max(8, n_requests // 8)
+            _, fails, dur = run_batch(
+                url,
+                "mock",
+                prompt="x",
+                n_requests=n_stream,
+                concurrency=c,
+                stream=True,
+                extra_params=length_params(CALIBRATION_CHUNKS, ignore_eos=False),
+            )
+            chunks = (n_stream - fails) * CALIBRATION_CHUNKS
+            chunk_rate = chunks / dur if dur > 0 else 0.0
+    return ClientCapacity(engine, c, max_rps, chunk_rate)
+
+
+class CpuSampler:
+    """后台线程按固定间隔采样本进程累计 CPU 时间（`time.process_time`）。
+
+    参数:
+        interval_s: 采样间隔（秒）。
+
+    用法:
+        with CpuSampler() as cpu:
+            ...  # 测量
+            avg, peak = cpu.window(t0, t1)
+    """
+
+    def __init__(self, interval_s: float = 0.1) -> None:
+        self.interval_s = interval_s
+        self._times: List[float] = []
+        self._cpu: List[float] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> None:
+        """立即记录一个采样点。"""
+
+        with self._lock:
+            self._times.append(time.monotonic())
+            self._cpu.append(time.process_time())
+
+    def start(self) -> "CpuSampler":
+        """开始后台采样，返回自身。"""
+
+        self.sample()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """停止后台采样。"""
+
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "CpuSampler":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.sample()
+
+    def _cpu_at(self, t: float) -> float:
+        i = bisect.bisect_left(self._times, t)
+        if i <= 0:
+            return self._cpu[0]
+        if i >= len(self._times):
+            return self._cpu[-1]
+        t0, t1 = self._times[i - 1], self._times[i]
+        c0, c1 = self._cpu[i - 1], self._cpu[i]
+        return c0 + (c1 - c0) * (t - t0) / (t1 - t0) if t1 > t0 else c1
+
+    def window(self, t0: float, t1: float) -> Optional[Tuple[float, float]]:
+        """时间窗口（`time.monotonic()` 秒）内的平均与峰值 CPU 利用率（核）。
+
+        平均值按窗口两端插值的累计 CPU 时间计算；峰值为与窗口相交的各采样
+        间隔利用率的最大值（不少于平均值）。窗口为空或早于首个采样点时返回 None。
+        """
+
+        self.sample()
+        with self._lock:
+            if t1 <= t0 or not self._times or t1 <= self._times[0]:
+                return None
+            avg = (self._cpu_at(t1) - self._cpu_at(t0)) / (t1 - t0)
+            peak = avg
+            for i in range(1, len(self._times)):
+                a, b = self._times[i - 1], self._times[i]
+                if b <= t0 or a >= t1 or b <= a:
+                    continue
+                peak = max(peak, (self._cpu[i] - self._cpu[i - 1]) / (b - a))
+        return avg, peak
+
+
+def client_bound_reasons(
+    *,
+    target_concurrency: int,
+    achieved_concurrency: Optional[float],
+    cpu_avg: Optional[float],
+    rps: float,
+    chunk_rate: Optional[float],
+    capacity: Optional[ClientCapacity],
+    cpu_limit: float = DEFAULT_CPU_LIMIT,
+    margin: float = DEFAULT_MARGIN,
+    concurrency_tolerance: float = DEFAULT_CONCURRENCY_TOLERANCE,
+) -> List[str]:
+    """判定负载点是否受压测端限制，返回命中的原因（空列表表示未受限）。
+
+    参数:
+        target_concurrency: 目标并发（开环负载点为 0，不做在途数检查）。
+        achieved_concurrency: 实际平均在途数（None 表示不检查）。
+        cpu_avg: 窗口内平均 CPU 利用率（核；None 表示未采样）。
+        rps: 实测成功请求速率。
+        chunk_rate: 实测流式输出 chunk 速率（非流式为 None）。
+        capacity: 标定结果（None 表示未标定）。
+        cpu_limit: CPU 饱和阈值（核）。
+        margin: 吞吐达到标定上限的比例阈值。
+        concurrency_tolerance: 在途数相对目标的允许不足比例。
+
+    返回值:
+        list[str]: `cpu_saturated`/`concurrency_shortfall`/`near_client_max_rps`/
+        `near_client_chunk_rate` 的子集。
+    """
+
+    reasons: List[str] = []
+    if cpu_avg is not None and cpu_avg >= cpu_limit:
+        reasons.append("cpu_saturated")
+    if (
+        target_concurrency > 0
+        and achieved_concurrency is not None
+        and achieved_concurrency < target_concurrency * (1.0 - concurrency_tolerance)
+    ):
+        reasons.append("concurrency_shortfall")
+    if capacity is not None:
+        if capacity.max_rps > 0 and rps >= margin * capacity.max_rps:
+            reasons.append("near_client_max_rps")
+        if (
+            chunk_rate is not None
+            and capacity.chunk_rate
+            and chunk_rate >= margin * capacity.chunk_rate
+        ):
+            reasons.append("near_client_chunk_rate")
+    return reasons
+
+
+def write_client_json(
+    path: str, capacity: ClientCapacity, points: Sequence[Mapping[str, Any]]
+) -> None:
+    """写出瓶颈检测结果：标定值、各负载点的检测列与原因，以及受限负载点数。
+
+    副作用:
+        创建父目录并覆盖写入 `path`。
+    """
+
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "calibration": capacity.to_dict(),
+        "load_points": [dict(p) for p in points],
+        "client_bound_points": sum(1 for p in points if p.get("reasons")),
+    }
+    out.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
@@ -0,0 +1,452 @@
+"""分布式压测：协调者把负载点分片下发到多台压测机上的代理（agent）执行。
+
+单台压测机的网卡与 CPU 会限制可施加的负载（k8s-hybrid/k8s-pd 等多节点场景
+尤甚）。本模块在 `perf_workers` 的分片模型之上增加一层极简 HTTP 协议：
+
+- 代理（`PerfAgent`，`python -m vllm_cibench.run perf-agent`）：
+  - `GET /health`：`{"ok": true, "busy": bool}`；
+  - `GET /clock`：`{"time": <代理墙钟秒>}`，供协调者估计时钟偏差；
+  - `POST /shard`：请求体 `{kind, kwargs, precision, goodput_slo, start_at}`
+    （`start_at` 为代理墙钟的起跑时刻），代理等待至起跑时刻后在本进程执行分片（见
+    `perf_workers.run_shard`），以 NDJSON 流式返回：若干
+    `{"event": "records", "items": [...]}`，最后一行为
+    `{"event": "done", "stats": [...], "duration": s}` 或
+    `{"event": "error", "error": "..."}`；同一时刻只执行一个分片（忙时 409）。
+- 协调者（`run_distributed`，`run-perf --agents ...`）：按往返时延最小的样本
+  估计各代理的时钟偏差（NTP 式），把统一的起跑时刻换算到各代理时钟后并行
+  下发分片；请求记录即时转发给 `on_record`（时间戳换算回本机单调时钟），
+  各代理的 `LoadStats` 直方图在结束时精确合并。
+
+注意：代理会按协调者下发的参数向任意 `base_url` 发请求，默认仅监听
+127.0.0.1，跨机器部署时请限制在可信网络内。
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import traceback
+from dataclasses import dataclass, fields
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlsplit
+
+import requests
+
+from vllm_cibench.testsuites.perf_hist import DEFAULT_PRECISION
+from vllm_cibench.testsuites.perf_workers import RECORD_BATCH, SHARD_KINDS, run_shard
+
+if TYPE_CHECKING:  # pragma: no cover
+    from vllm_cibench.testsuites.perf_exec import LoadStep, RequestRecord
+
+DEFAULT_AGENT_PORT = 8765
+# 时钟同步的往返采样次数
+CLOCK_SAMPLES = 5
+# 起跑时刻相对下发时刻的提前量（秒），需覆盖分片下发的网络往返
+START_LEAD_S = 1.0
+# 协调者连接代理的超时（秒）；读取不设超时（分片可能运行很久）
+CONNECT_TIMEOUT_S = 5.0
+
+_RECORD_TIME_FIELDS = ("start_s", "end_s", "first_token_s")
+
+
+def record_to_dict(rec: "RequestRecord", shift: float = 0.0) -> Dict[str, Any]:
+    """把请求记录转为 JSON 可序列化字典，时间戳整体平移 `shift` 秒。
+
+    参数:
+        rec: 请求记录。
+        shift: 时间戳偏移（如单调时钟到墙钟的差值）。
+
+    返回值:
+        dict: 字段与 `RequestRecord` 一一对应。
+    """
+
+    out = {f.name: getattr(rec, f.name) for f in fields(rec)}
+    for key in _RECORD_TIME_FIELDS:
+        if out[key] is not None:
+            out[key] = float(out[key]) + shift
+    out["itl_ms"] = list(rec.itl_ms)
+    return out
+
+
+def record_from_dict(data: Mapping[str, Any], shift: float = 0.0) -> "RequestRecord":
+    """`record_to_dict` 的逆操作，时间戳整体平移 `shift` 秒；未知字段被忽略。"""
+
+    from vllm_cibench.testsuites.perf_exec import RequestRecord
+
+    names = {f.name for f in fields(RequestRecord)}
+    kw = {k: v for k, v in data.items() if k in names}
+    for key in _RECORD_TIME_FIELDS:
+        if kw.get(key) is not None:
+            kw[key] = float(kw[key]) + shift
+    return RequestRecord(**kw)
+
+
+def _wall_minus_monotonic() -> float:
+    return time.time() - time.monotonic()
+
+
+class _AgentServer(ThreadingHTTPServer):
+    """带所属代理引用的 HTTP 服务。"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], agent: "PerfAgent") -> None:
+        super().__init__(address, _AgentHandler)
+        self.agent = agent
+
+
+class _AgentHandler(BaseHTTPRequestHandler):
+    """代理的 HTTP 处理器（`server.agent` 指向所属 `PerfAgent`）。"""
+
+    server: _AgentServer
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+    def _json(self, code: int, obj: Mapping[str, Any]) -> None:
+        body = json.dumps(obj).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+        agent = self.server.agent
+        if self.path == "/clock":
+            self._json(200, {"time": time.time()})
+        elif self.path == "/health":
+            self._json(200, {"ok": True, "busy": agent.busy})
+        else:
+            self._json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:  # noqa: N802
+        agent = self.server.agent
+        if self.path != "/shard":
+            self._json(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+            spec = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(spec, dict):
+                raise ValueError("shard spec must be a JSON object")
+            kind = str(spec["kind"])
+            if kind not in SHARD_KINDS:
+                raise ValueError(f"unknown shard kind: {kind!r}")
+        except (KeyError, ValueError) as exc:
+            self._json(400, {"error": str(exc)})
+            return
+        if not agent.acquire():
+            self._json(409, {"error": "agent busy"})
+            return
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            self._run(kind, spec)
+        finally:
+            agent.release()
+
+    def _line(self, obj: Mapping[str, Any]) -> None:
+        self.wfile.write(json.dumps(obj).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+    def _run(self, kind: str, spec: Mapping[str, Any]) -> None:
+        """等待起跑时刻，执行分片并以 NDJSON 回传记录与统计。"""
+
+        buf: List[Dict[str, Any]] = []
+        shift = _wall_minus_monotonic()
+
+        def _emit(idx: int, rec: "RequestRecord") -> None:
+            item = record_to_dict(rec, shift)
+            item["step"] = idx
+            buf.append(item)
+            if len(buf) >= RECORD_BATCH:
+                self._line({"event": "records", "items": list(buf)})
+                buf.clear()
+
+        try:
+            delay = float(spec.get("start_at", 0.0)) - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            stats, dur = run_shard(
+                kind,
+                dict(spec.get("kwargs") or {}),
+                float(spec.get("precision", DEFAULT_PRECISION)),
+                _emit,
+                dict(spec.get("goodput_slo") or {}),
+            )
+            if buf:
+                self._line({"event": "records", "items": list(buf)})
+            self._line(
+                {
+                    "event": "done",
+                    "stats": [s.to_dict() for s in stats],
+                    "duration": dur,
+                }
+            )
+        except Exception:
+            self._line({"event": "error", "error": traceback.format_exc()})
+
+
+class PerfAgent:
+    """压测代理：在本机执行协调者下发的分片。
+
+    参数:
+        host: 监听地址（默认仅本机）。
+        port: 监听端口（0 表示随机空闲端口）。
+
+    副作用:
+        构造时即绑定端口；`start()` 在后台线程服务，`serve_forever()` 阻塞服务。
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_AGENT_PORT):
+        self._server = _AgentServer((host, port), self)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """代理基础 URL（如 `http://127.0.0.1:8765`）。"""
+
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    @property
+    def busy(self) -> bool:
+        """是否正在执行分片。"""
+
+        return self._lock.locked()
+
+    def acquire(self) -> bool:
+        """尝试占用代理（非阻塞），成功返回 True。"""
+
+        return self._lock.acquire(blocking=False)
+
+    def release(self) -> None:
+        """释放占用。"""
+
+        self._lock.release()
+
+    def start(self) -> "PerfAgent":
+        """在后台守护线程中开始服务，返回自身。"""
+
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """在当前线程阻塞服务，直至 `shutdown()`。"""
+
+        self._server.serve_forever()
+
+    def shutdown(self) -> None:
+        """停止服务并释放端口。"""
+
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+
+
+@dataclass
+class ClockSync:
+    """一次时钟同步的结果。
+
+    属性:
+        offset_s: 代理墙钟减去本机墙钟（秒）。
+        rtt_s: 所选样本的往返时延（秒），偏差误差不超过其一半。
+    """
+
+    offset_s: float
+    rtt_s: float
+
+
+def sync_clock(agent_url: str, samples: int = CLOCK_SAMPLES) -> ClockSync:
+    """估计代理与本机的时钟偏差。
+
+    发送 `samples` 次 `GET /clock`，取往返时延最小的一次，假设请求与响应
+    路径对称：`offset = t_agent - (t_send + t_recv) / 2`。
+
+    参数:
+        agent_url: 代理基础 URL。
+        samples: 采样次数（至少 1）。
+
+    返回值:
+        ClockSync: 偏差与往返时延。
+
+    异常:
+        requests.RequestException: 代理不可达或返回错误状态。
+    """
+
+    best: Optional[ClockSync] = None
+    for _ in range(max(1, samples)):
+        t0 = time.time()
+        resp = requests.get(agent_url.rstrip("/") + "/clock", timeout=CONNECT_TIMEOUT_S)
+        t1 = time.time()
+        resp.raise_for_status()
+        remote = float(resp.json()["time"])
+        cand = ClockSync(offset_s=remote - (t0 + t1) / 2.0, rtt_s=t1 - t0)
+        if best is None or cand.rtt_s < best.rtt_s:
+            best = cand
+    assert best is not None
+    return best
+
+
+def _drive_agent(
+    url: str,
+    spec: Mapping[str, Any],
+    shift: float,
+    on_event: Callable[[Mapping[str, Any], float], None],
+) -> None:
+    """向单个代理下发分片并逐行处理 NDJSON 事件。"""
+
+    with requests.post(
+        url.rstrip("/") + "/shard",
+        json=dict(spec),
+        stream=True,
+        timeout=(CONNECT_TIMEOUT_S, None),
+    ) as resp:
+        if resp.status_code != 200:
+            raise RuntimeError(f"agent {url} rejected shard: {resp.text}")
+        finished = False
+        for line in resp.iter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            on_event(event, shift)
+            finished = finished or event.get("event") in ("done", "error")
+        if not finished:
+            raise RuntimeError(f"agent {url} closed the stream before finishing")
+
+
+def run_distributed(
+    kind: str,
+    shards: Sequence[Mapping[str, Any]],
+    steps: Sequence["LoadStep"],
+    agents: Sequence[str],
+    *,
+    precision: float = DEFAULT_PRECISION,
+    on_record: Optional[Callable[["LoadStep", "RequestRecord"], None]] = None,
+    lead_s: float = START_LEAD_S,
+) -> float:
+    """在多个代理上并行执行分片，并把结果合并到 `steps`。
+
+    与 `perf_workers.run_sharded` 接口一致，第 i 个分片下发给第 i 个代理。
+
+    参数:
+        kind: 分片类型（见 `perf_workers.run_shard`）。
+        shards: 分片参数（`batch_shards` 等的结果，须 JSON 可序列化）。
+        steps: 本机负载点；分片统计按阶梯序号合并到 `steps[i].stats`
+            （代理沿用其逐请求 SLO）。
+        agents: 代理基础 URL 列表（不少于分片数）。
+        precision: 统计直方图精度（须与 `steps` 一致）。
+        on_record: 每条请求记录到达时的回调 `(step, record)`（串行调用）。
+        lead_s: 起跑时刻相对时钟同步完成时刻的提前量（秒）。
+
+    返回值:
+        float: 各代理测量时长的最大值（秒）。
+
+    异常:
+        ValueError: 代理数少于分片数。
+        RuntimeError: 任一代理失败、拒绝分片或不可达。
+    """
+
+    from vllm_cibench.testsuites.perf_exec import LoadStats
+
+    if len(agents) < len(shards):
+        raise ValueError(f"{len(shards)} shards need as many agents, got {len(agents)}")
+    pairs = list(zip(agents, shards))
+    goodput_slo = dict(steps[0].stats.goodput_slo) if steps else {}
+    try:
+        clocks = [sync_clock(url) for url, _ in pairs]
+    except requests.RequestException as exc:
+        raise RuntimeError(f"perf agent unreachable: {exc}") from exc
+    start_at = time.time() + lead_s + max((c.rtt_s for c in clocks), default=0.0)
+    local_shift = _wall_minus_monotonic()
+    lock = threading.Lock()
+    errors: List[str] = []
+    durations: List[float] = []
+
+    def _on_event(event: Mapping[str, Any], shift: float) -> None:
+        tag = event.get("event")
+        with lock:
+            if tag == "records":
+                if on_record is not None:
+                    for item in event.get("items") or []:
+                        on_record(
+                            steps[int(item["step"])], record_from_dict(item, shift)
+                        )
+            elif tag == "done":
+                for idx, data in enumerate(event.get("stats") or []):
+                    steps[idx].stats.merge(LoadStats.from_dict(data))
+                durations.append(float(event.get("duration", 0.0)))
+            elif tag == "error":
+                errors.append(str(event.get("error", "")))
+
+    def _worker(url: str, kw: Mapping[str, Any], clock: ClockSync) -> None:
+        spec = {
+            "kind": kind,
+            "kwargs": dict(kw),
+            "precision": precision,
+            "goodput_slo": goodput_slo,
+            "start_at": start_at + clock.offset_s,
+        }
+        # 代理墙钟 -> 本机墙钟 -> 本机单调时钟
+        shift = -clock.offset_s - local_shift
+        try:
+            _drive_agent(url, spec, shift, _on_event)
+        except Exception as exc:
+            with lock:
+                errors.append(f"agent {url}: {exc}")
+
+    threads: List[threading.Thread] = []
+    for (url, kw), clock in zip(pairs, clocks):
+        t = threading.Thread(target=_worker, args=(url, kw, clock), daemon=True)
+        t.start()
+        threads.append(t)
+    for t in threads:
+        t.join()
+    if errors:
+        raise RuntimeError("perf agent failed:\n" + errors[0])
+    return max(durations, default=0.0)
+
+
+def parse_agents(value: Optional[Union[str, Sequence[str]]]) -> List[str]:
+    """解析代理列表：逗号分隔字符串或字符串列表，去空白与空项。
+
+    异常:
+        ValueError: 某项不是 http(s)://host[:port] 形式的合法地址。
+    """
+
+    if not value:
+        return []
+    items: Sequence[str] = value.split(",") if isinstance(value, str) else value
+    out: List[str] = []
+    for item in items:
+        url = str(item).strip().rstrip("/")
+        if not url:
+            continue
+        url = url if "://" in url else f"http://{url}"
+        parts = urlsplit(url)
+        try:
+            parts.port
+        except ValueError:
+            raise ValueError(f"invalid perf agent URL: {item!r}") from None
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"invalid perf agent URL: {item!r}")
+        out.append(url)
+    return out
@@ -0,0 +1,78 @@
+"""失败请求的错误分类。
+
+过载时服务端往往快速返回 503/429，只看“完成数 / 时长”会把快速失败误当成
+更高的吞吐。执行器捕获请求异常后按本模块归类（写入 `RequestRecord.error`），
+`LoadStats` 按类计数，CSV/summary/Pushgateway 据此输出失败率与分类失败数，
+吞吐只统计成功请求。
+
+分类（`perf.ERROR_CLASSES`）：
+
+- `http_429`/`http_4xx`/`http_5xx`：服务端返回的非 2xx 状态；
+- `timeout`：连接或读取超时；
+- `connection`：连接失败或被重置；
+- `stream_truncated`：SSE 流在 `[DONE]` 之前结束，或响应体传输中断；
+- `invalid_json`：响应体或 SSE chunk 不是合法 JSON；
+- `other`：其余异常。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Optional
+
+import aiohttp
+import requests
+
+from vllm_cibench.clients.openai_client import StreamTruncatedError
+
+
+def http_status_class(status: int) -> str:
+    """HTTP 状态码对应的错误分类（429 单列，其余按 4xx/5xx 归并）。"""
+
+    if status == 429:
+        return "http_429"
+    return "http_5xx" if status >= 500 else "http_4xx"
+
+
+def _status_of(exc: BaseException) -> Optional[int]:
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return int(exc.status)
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return int(exc.response.status_code)
+    return None
+
+
+def classify_error(exc: BaseException) -> str:
+    """将请求异常归入 `perf.ERROR_CLASSES` 之一。
+
+    参数:
+        exc: 同步（requests）或异步（aiohttp）客户端抛出的异常。
+
+    返回值:
+        str: 错误分类名。
+    """
+
+    # 非 JSON 响应体（aiohttp 的 ContentTypeError 同时是 ClientResponseError）
+    if isinstance(exc, (json.JSONDecodeError, aiohttp.ContentTypeError)):
+        return "invalid_json"
+    status = _status_of(exc)
+    if status is not None:
+        return http_status_class(status)
+    # requests.ConnectTimeout 同时是 ConnectionError，超时优先
+    if isinstance(exc, (requests.Timeout, asyncio.TimeoutError, TimeoutError)):
+        return "timeout"
+    if isinstance(
+        exc,
+        (
+            StreamTruncatedError,
+            requests.exceptions.ChunkedEncodingError,
+            aiohttp.ClientPayloadError,
+        ),
+    ):
+        return "stream_truncated"
+    if isinstance(
+        exc, (requests.ConnectionError, aiohttp.ClientConnectionError, ConnectionError)
+    ):
+        return "connection"
+    return "other"
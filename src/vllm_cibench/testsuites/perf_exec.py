@@ -1,11 +1,42 @@
 """性能执行器（最小实现，面向 vLLM OpenAI 兼容服务）。
 
 提供面向 `/v1/chat/completions` 的并发请求执行与统计：
-- 生成固定长度的提示词（中英混合文本），
+- 生成固定长度的提示词（中英混合文本；字符级或按 token 精确，见 `perf_prompts`），
 - 以指定并发数与请求数发起请求，
 - 统计 P50/P75/P90/P95/P99/AVG、QPS、失败率，
-- 产出与 `testsuites/perf.py` 兼容（超集）的 CSV 表头：
-  `concurrency,input_len,output_len,latency_p50_ms,throughput_rps`。
+- 流式模式（`PerfProfile.stream`）下逐 chunk 打点，额外统计
+  TTFT（首 token 时延）、ITL（token 间隔）与 TPOT（每输出 token 时延），
+- 产出与 `testsuites/perf.py` 兼容（超集）的 CSV，列定义见 `PERF_CSV_COLUMNS`，
+  前 5 列固定为 `concurrency,input_len,output_len,latency_p50_ms,throughput_rps`，
+  `latency_*` 均表示端到端（E2E）时延。
+
+执行引擎（`PerfProfile.engine`）：
+- `thread`：线程池，每个并发单位占用一个阻塞线程（默认）；
+- `asyncio`：单事件循环 + aiohttp 连接池，可在一个进程内维持数千在途请求。
+
+多进程（`PerfProfile.workers > 1`）：每个负载点的负载均分到多个进程同步执行，
+结果合并后与单进程输出一致（见 `perf_workers`）。
+分布式（`PerfProfile.agents` 非空）：负载均分到多台压测机上的代理，起跑时刻与
+时钟对齐后执行，直方图合并为一份汇总（见 `perf_dist`）。
+
+并发控制（`PerfProfile.control_method`）：
+- `static`：对 `concurrency` 列表逐个值各跑一批固定请求数；
+- `climb`：单次连续运行内从 `init_concurrency` 起，每 `growth_interval_ms`
+  将在途并发乘以 `growth_rate`，直至 `max(concurrency)`，按阶梯分别统计
+  （始终在 asyncio 事件循环上执行）；
+- `rate`：开环，对 `request_rate` 列表中每个目标 QPS 按 `arrival`
+  （poisson/constant）间隔发出请求，不受在途请求数约束，时延从计划发出
+  时刻起算（始终在 asyncio 事件循环上执行）；
+- `search`：按 `slo` 对并发（static 方式）或 QPS（rate 方式）做倍增 + 二分
+  搜索，寻找满足 SLO 的最大负载（见 `perf_search`）；
+- `trace`：按 JSONL 轨迹的到达时刻、长度与采样参数开环回放（见 `perf_trace`），
+  整个回放输出一行（长度列为 0，`request_rate` 为轨迹的平均到达速率）；
+- `session`：多轮对话，`concurrency` 个虚拟用户各自执行 `session_turns` 轮，
+  每轮重发完整历史（含模型实际回复）并追加新的 user 消息，轮间等待
+  `think_time_ms`；每轮输出一行（`turn` 列），反映上下文增长下的 TTFT/时延
+  （始终在 asyncio 事件循环上执行）。
+
+档位（`PerfProfile`）的字段定义与 YAML 解析、校验见 `perf_profile`。
 
 注意：
 - 本模块仅作为“真实服务”性能试跑的最小实现；CI 默认仍走 mock 路径，
@@ -14,61 +45,118 @@
 
 from __future__ import annotations
 
+import asyncio
 import csv
+import functools
 import io
-import statistics
+import itertools
+import math
+import random
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
-from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
-from vllm_cibench.clients.openai_client import OpenAICompatClient
+import requests
 
+from vllm_cibench.clients.async_openai_client import AsyncOpenAICompatClient
+from vllm_cibench.clients.openai_client import (
+    DEFAULT_CONNECT_TIMEOUT_S,
+    OpenAICompatClient,
+    pooled_session,
+)
+from vllm_cibench.testsuites.perf import (
+    ERROR_CLASSES,
+    PERF_CSV_COLUMNS,
+    REPORT_QUANTILES,
+    dist_columns,
+)
+from vllm_cibench.testsuites.perf_ci import ci_converged, ci_summary
+from vllm_cibench.testsuites.perf_client import (
+    ClientCapacity,
+    CpuSampler,
+    calibrate_client,
+    client_bound_reasons,
+    write_client_json,
+)
+from vllm_cibench.testsuites.perf_dist import run_distributed
+from vllm_cibench.testsuites.perf_errors import classify_error
+from vllm_cibench.testsuites.perf_hist import DEFAULT_PRECISION, LatencyHistogram
+from vllm_cibench.testsuites.perf_mix import WorkloadMix
+from vllm_cibench.testsuites.perf_prefix import PrefixWorkload
+from vllm_cibench.testsuites.perf_profile import (
+    ARRIVALS,
+    ENGINES,
+    PerfProfile,
+    effective_engine,
+    http_pool_size,
+)
+from vllm_cibench.testsuites.perf_prompts import (
+    PromptBuilder,
+    calibrate_tokens_per_char,
+    load_tokenizer,
+    make_prompt,
+)
+from vllm_cibench.testsuites.perf_records import (
+    LOAD_POINT_COLUMNS,
+    RequestLogWriter,
+    summary_row,
+    write_summary_csv,
+)
+from vllm_cibench.testsuites.perf_search import CapacitySearch, request_met_slo, slo_met
+from vllm_cibench.testsuites.perf_timeline import Timeline, write_timeline_csv
+from vllm_cibench.testsuites.perf_trace import TraceRequest, schedule_trace
+from vllm_cibench.testsuites.perf_workers import (
+    batch_shards,
+    climb_shards,
+    open_loop_shards,
+    run_sharded,
+)
 
-def make_prompt(length: int) -> str:
-    """生成近似给定长度的中英混合提示词。
+BatchRunner = Callable[..., Tuple[List[float], int, float]]
 
-    参数:
-        length: 期望字符长度。
-
-    返回值:
-        str: 由若干段文本拼接而成，长度接近 `length`。
-    """
 
-    unit = (
-        "vLLM is a fast and flexible LLM serving engine. "
-        "它支持OpenAI兼容接口与多种推理配置。 "
-    )
-    buf: List[str] = []
-    while sum(len(x) for x in buf) < max(1, length):
-        buf.append(unit)
-    text = "".join(buf)
-    return text[:length]
+def _dist_stats(name: str, hist: LatencyHistogram) -> Dict[str, float]:
+    """由直方图计算分布指标的各分位点、均值与最大值，键名与 `perf.dist_columns` 一致。"""
 
+    if not hist.count:
+        return {}
+    vals = hist.percentiles(REPORT_QUANTILES)
+    out = {f"{name}_p{q}_ms": float(v) for q, v in zip(REPORT_QUANTILES, vals)}
+    out[f"{name}_avg_ms"] = float(hist.mean)
+    out[f"{name}_max_ms"] = float(hist.max)
+    return out
 
-def _percentile(values: Sequence[float], pct: float) -> float:
-    """计算百分位数（最小实现）。
 
-    参数:
-        values: 数值序列（毫秒）。
-        pct: 百分位（0-100）。
+def _latency_summary(
+    latency: LatencyHistogram, duration_s: float, total: int
+) -> Dict[str, float]:
+    """E2E 时延分布（无样本时为 0）与吞吐。
 
-    返回值:
-        float: 近似百分位数。
+    吞吐只计成功请求（`latency.count`）：过载时快速返回的失败不应抬高吞吐。
     """
 
-    if not values:
-        return 0.0
-    vs = sorted(values)
-    k = (pct / 100.0) * (len(vs) - 1)
-    f = int(k)
-    c = min(f + 1, len(vs) - 1)
-    if f == c:
-        return float(vs[f])
-    d0 = vs[f] * (c - k)
-    d1 = vs[c] * (k - f)
-    return float(d0 + d1)
+    out = {c: 0.0 for c in dist_columns("latency")}
+    if total <= 0 or duration_s <= 0:
+        out["throughput_rps"] = 0.0
+        return out
+    out.update(_dist_stats("latency", latency))
+    out["throughput_rps"] = float(latency.count) / float(duration_s)
+    return out
 
 
 def compute_summary(
@@ -79,227 +167,2519 @@ def compute_summary(
     参数:
         latencies_ms: 每次请求的时延（毫秒）。
         duration_s: 本轮测量的总用时（秒）。
-        total: 请求总数（用于 QPS 计算）。
+        total: 请求总数（含失败；为 0 时吞吐记 0）。
 
     返回值:
-        dict: 包含分位数与吞吐等聚合值。
+        dict: 包含分位数（经 `LatencyHistogram`，相对误差 ≤1%）、均值、最大值
+        与吞吐等聚合值。
     """
 
-    if total <= 0 or duration_s <= 0:
+    hist = LatencyHistogram().extend(latencies_ms)
+    return _latency_summary(hist, duration_s, total)
+
+
+@dataclass
+class RequestRecord:
+    """单个请求的测量记录（时间戳均为 `time.monotonic()` 秒）。
+
+    属性:
+        start_s: 请求发出时刻。
+        end_s: 响应结束（或失败）时刻。
+        ok: 是否成功。
+        first_token_s: 首个携带内容的 chunk 到达时刻（仅流式）。
+        itl_ms: 相邻内容 chunk 的间隔（毫秒，仅流式）。
+        output_tokens: 输出 token 数（优先取 `usage.completion_tokens`，
+            流式缺失 usage 时按内容 chunk 计数）。
+        send_lag_ms: 实际发出时刻晚于计划时刻的时长（仅开环模式；此时
+            `start_s` 为计划时刻，时延包含客户端排队，避免协调遗漏）。
+        input_tokens: 输入 token 数（`usage.prompt_tokens`，缺失为 0）。
+        error: 失败原因（错误分类，见 `perf_errors.classify_error`；成功为空串）。
+        turn: 多轮会话中的轮次（1 起，仅 session 控制；单轮请求为 0）。
+        request_type: 请求类型（混合负载条目 `id`；单一类型为空串）。
+    """
+
+    start_s: float
+    end_s: float
+    ok: bool
+    first_token_s: Optional[float] = None
+    itl_ms: List[float] = field(default_factory=list)
+    output_tokens: int = 0
+    send_lag_ms: float = 0.0
+    input_tokens: int = 0
+    error: str = ""
+    turn: int = 0
+    request_type: str = ""
+
+    @property
+    def latency_ms(self) -> float:
+        """端到端时延（E2E，毫秒）。"""
+
+        return (self.end_s - self.start_s) * 1000.0
+
+    @property
+    def ttft_ms(self) -> Optional[float]:
+        """首 token 时延（毫秒）；非流式或无内容时为 None。"""
+
+        if self.first_token_s is None:
+            return None
+        return (self.first_token_s - self.start_s) * 1000.0
+
+    @property
+    def tpot_ms(self) -> Optional[float]:
+        """每输出 token 时延（首 token 之后，毫秒）；不足 2 个 token 时为 None。"""
+
+        if self.first_token_s is None or self.output_tokens < 2:
+            return None
+        return (self.end_s - self.first_token_s) * 1000.0 / (self.output_tokens - 1)
+
+    @property
+    def output_tps(self) -> Optional[float]:
+        """单请求输出速率（输出 token 数 / E2E 时延，tok/s）；无输出时为 None。"""
+
+        dur = self.end_s - self.start_s
+        if self.output_tokens <= 0 or dur <= 0:
+            return None
+        return self.output_tokens / dur
+
+
+@dataclass
+class LoadStats:
+    """一个负载点的定长内存统计（可精确合并，不保留原始记录）。
+
+    属性:
+        precision: 直方图相对误差。
+        requests: 请求总数。
+        failures: 失败请求数。
+        latency/ttft/itl/tpot: 成功请求的各分布直方图（毫秒）。
+        output_tokens_sum/output_tokens_n: 报告了输出 token 数的请求的累计与个数。
+        input_tokens_sum/input_tokens_n: 报告了输入 token 数的请求的累计与个数。
+        output_rate: 成功请求的单请求输出速率分布（tok/s，见
+            `RequestRecord.output_tps`）。
+        goodput_slo: 逐请求 SLO（见 `perf_search.request_met_slo`）；为空时不统计 goodput。
+        good_requests/good_output_tokens: 满足逐请求 SLO 的请求数与其输出 token 数。
+        errors: 各错误分类的失败数（见 `perf_errors`）。
+        failed_latency_ms: 失败请求的时延总和（毫秒；失败请求同样占用在途时长，
+            与 `latency.total` 相加即全部请求的在途时长）。
+    """
+
+    precision: float = DEFAULT_PRECISION
+    requests: int = 0
+    failures: int = 0
+    output_tokens_sum: int = 0
+    output_tokens_n: int = 0
+    input_tokens_sum: int = 0
+    input_tokens_n: int = 0
+    goodput_slo: Dict[str, float] = field(default_factory=dict)
+    good_requests: int = 0
+    good_output_tokens: int = 0
+    errors: Dict[str, int] = field(default_factory=dict)
+    failed_latency_ms: float = 0.0
+    latency: LatencyHistogram = field(init=False)
+    ttft: LatencyHistogram = field(init=False)
+    itl: LatencyHistogram = field(init=False)
+    tpot: LatencyHistogram = field(init=False)
+    output_rate: LatencyHistogram = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.latency = LatencyHistogram(self.precision)
+        self.ttft = LatencyHistogram(self.precision)
+        self.itl = LatencyHistogram(self.precision)
+        self.tpot = LatencyHistogram(self.precision)
+        self.output_rate = LatencyHistogram(self.precision)
+
+    def add(self, rec: RequestRecord) -> None:
+        """计入一条请求记录。"""
+
+        self.requests += 1
+        if not rec.ok:
+            self.failures += 1
+            kind = rec.error if rec.error in ERROR_CLASSES else "other"
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+            self.failed_latency_ms += rec.latency_ms
+            return
+        if self.goodput_slo and request_met_slo(rec, self.goodput_slo):
+            self.good_requests += 1
+            self.good_output_tokens += rec.output_tokens
+        self.latency.record(rec.latency_ms)
+        if rec.ttft_ms is not None:
+            self.ttft.record(rec.ttft_ms)
+        for x in rec.itl_ms:
+            self.itl.record(x)
+        if rec.tpot_ms is not None:
+            self.tpot.record(rec.tpot_ms)
+        if rec.output_tokens > 0:
+            self.output_tokens_sum += rec.output_tokens
+            self.output_tokens_n += 1
+        if rec.input_tokens > 0:
+            self.input_tokens_sum += rec.input_tokens
+            self.input_tokens_n += 1
+        rate = rec.output_tps
+        if rate is not None:
+            self.output_rate.record(rate)
+
+    def merge(self, other: "LoadStats") -> "LoadStats":
+        """精确合并另一份统计（如另一 epoch/线程/进程），返回自身。"""
+
+        self.requests += other.requests
+        self.failures += other.failures
+        self.output_tokens_sum += other.output_tokens_sum
+        self.output_tokens_n += other.output_tokens_n
+        self.input_tokens_sum += other.input_tokens_sum
+        self.input_tokens_n += other.input_tokens_n
+        self.good_requests += other.good_requests
+        self.good_output_tokens += other.good_output_tokens
+        for kind, n in other.errors.items():
+            self.errors[kind] = self.errors.get(kind, 0) + n
+        self.failed_latency_ms += other.failed_latency_ms
+        self.latency.merge(other.latency)
+        self.ttft.merge(other.ttft)
+        self.itl.merge(other.itl)
+        self.tpot.merge(other.tpot)
+        self.output_rate.merge(other.output_rate)
+        return self
+
+    def summary(self, duration_s: float) -> Dict[str, float]:
+        """汇总为 CSV 行所需的指标，含义同 `summarize_records`。"""
+
+        out = _latency_summary(self.latency, duration_s, self.requests)
+        out["fail_rate"] = self.failures / self.requests if self.requests else 0.0
+        for kind in ERROR_CLASSES:
+            out[f"errors_{kind}"] = float(self.errors.get(kind, 0))
+        out.update(_dist_stats("ttft", self.ttft))
+        out.update(_dist_stats("itl", self.itl))
+        out.update(_dist_stats("tpot", self.tpot))
+        if self.output_tokens_n:
+            out["output_tokens_avg"] = self.output_tokens_sum / self.output_tokens_n
+        out.update(self._token_rates(duration_s))
+        if self.goodput_slo:
+            good = self.good_requests
+            out["slo_attainment_pct"] = (
+                100.0 * good / self.requests if self.requests else 0.0
+            )
+            out["goodput_rps"] = good / duration_s if duration_s > 0 else 0.0
+            out["goodput_tps"] = (
+                self.good_output_tokens / duration_s if duration_s > 0 else 0.0
+            )
+        return out
+
+    def _token_rates(self, duration_s: float) -> Dict[str, float]:
+        """token 吞吐列（见 `perf.TOKEN_COLUMNS`）；缺少对应 usage 的列不输出。"""
+
+        out: Dict[str, float] = {}
+        if duration_s <= 0:
+            return out
+        if self.output_tokens_n:
+            out["output_tps"] = self.output_tokens_sum / duration_s
+        if self.input_tokens_n:
+            out["input_tps"] = self.input_tokens_sum / duration_s
+        if self.output_tokens_n and self.input_tokens_n:
+            out["total_tps"] = out["input_tps"] + out["output_tps"]
+        if self.output_rate.count:
+            out["request_output_tps_avg"] = self.output_rate.mean
+            out["request_output_tps_p50"] = self.output_rate.percentile(50)
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON 可序列化表示（跨进程/节点传输）。"""
+
         return {
-            "latency_p50_ms": 0.0,
-            "latency_p75_ms": 0.0,
-            "latency_p90_ms": 0.0,
-            "latency_p95_ms": 0.0,
-            "latency_p99_ms": 0.0,
-            "latency_avg_ms": 0.0,
-            "throughput_rps": 0.0,
+            "precision": self.precision,
+            "requests": self.requests,
+            "failures": self.failures,
+            "output_tokens_sum": self.output_tokens_sum,
+            "output_tokens_n": self.output_tokens_n,
+            "input_tokens_sum": self.input_tokens_sum,
+            "input_tokens_n": self.input_tokens_n,
+            "goodput_slo": dict(self.goodput_slo),
+            "good_requests": self.good_requests,
+            "good_output_tokens": self.good_output_tokens,
+            "errors": dict(self.errors),
+            "failed_latency_ms": self.failed_latency_ms,
+            "latency": self.latency.to_dict(),
+            "ttft": self.ttft.to_dict(),
+            "itl": self.itl.to_dict(),
+            "tpot": self.tpot.to_dict(),
+            "output_rate": self.output_rate.to_dict(),
         }
-    p50 = _percentile(latencies_ms, 50)
-    p75 = _percentile(latencies_ms, 75)
-    p90 = _percentile(latencies_ms, 90)
-    p95 = _percentile(latencies_ms, 95)
-    p99 = _percentile(latencies_ms, 99)
-    avg = statistics.fmean(latencies_ms) if latencies_ms else 0.0
-    qps = float(total) / float(duration_s)
-    return {
-        "latency_p50_ms": float(p50),
-        "latency_p75_ms": float(p75),
-        "latency_p90_ms": float(p90),
-        "latency_p95_ms": float(p95),
-        "latency_p99_ms": float(p99),
-        "latency_avg_ms": float(avg),
-        "throughput_rps": float(qps),
-    }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "LoadStats":
+        """从 `to_dict` 的结果还原。"""
+
+        st = cls(
+            float(data.get("precision", DEFAULT_PRECISION)),
+            goodput_slo=dict(data.get("goodput_slo") or {}),
+        )
+        st.requests = int(data.get("requests", 0))
+        st.failures = int(data.get("failures", 0))
+        st.output_tokens_sum = int(data.get("output_tokens_sum", 0))
+        st.output_tokens_n = int(data.get("output_tokens_n", 0))
+        st.input_tokens_sum = int(data.get("input_tokens_sum", 0))
+        st.input_tokens_n = int(data.get("input_tokens_n", 0))
+        st.good_requests = int(data.get("good_requests", 0))
+        st.good_output_tokens = int(data.get("good_output_tokens", 0))
+        st.errors = {str(k): int(v) for k, v in (data.get("errors") or {}).items()}
+        st.failed_latency_ms = float(data.get("failed_latency_ms", 0.0))
+        for name in ("latency", "ttft", "itl", "tpot", "output_rate"):
+            if name in data:
+                setattr(st, name, LatencyHistogram.from_dict(data[name]))
+        return st
+
+
+def summarize_records(
+    records: Sequence[RequestRecord], duration_s: float
+) -> Dict[str, float]:
+    """汇总一组请求记录。
+
+    参数:
+        records: 该负载点（含多 epoch）的全部请求记录。
+        duration_s: 测量总用时（秒）。
+
+    返回值:
+        dict: `compute_summary` 的 E2E 指标；若存在流式打点，另含
+        `ttft_*`、`itl_*`、`tpot_*` 分位、均值与最大值（毫秒）；若服务端返回
+        usage，另含实际平均输出 token 数 `output_tokens_avg` 与 token 吞吐
+        （`input_tps`/`output_tps`/`total_tps`、单请求输出速率）；总含失败率
+        `fail_rate` 与分类失败数 `errors_<class>`。
+    """
+
+    stats = LoadStats()
+    for r in records:
+        stats.add(r)
+    return stats.summary(duration_s)
+
+
+RecordSink = Callable[[RequestRecord], None]
 
 
-def _do_chat_request(
+def _usage_tokens(
+    obj: Mapping[str, Any], key: str = "completion_tokens"
+) -> Optional[int]:
+    """读取响应/chunk 中的 `usage.<key>`（默认 completion_tokens，缺失返回 None）。"""
+
+    usage = obj.get("usage")
+    if not isinstance(usage, Mapping):
+        return None
+    val = usage.get(key)
+    return int(val) if isinstance(val, (int, float)) else None
+
+
+def _chunk_has_token(chunk: Mapping[str, Any]) -> bool:
+    """判断流式 chunk 是否携带输出内容（content/reasoning_content/text）。"""
+
+    for choice in chunk.get("choices") or []:
+        delta = choice.get("delta") or {}
+        if delta.get("content") or delta.get("reasoning_content"):
+            return True
+        if choice.get("text"):
+            return True
+    return False
+
+
+def _chunk_text(chunk: Mapping[str, Any]) -> str:
+    """提取流式 chunk 中的回复文本（`delta.content`）。"""
+
+    parts = [
+        str((choice.get("delta") or {}).get("content") or "")
+        for choice in chunk.get("choices") or []
+    ]
+    return "".join(parts)
+
+
+def _response_text(out: Any) -> str:
+    """提取非流式响应中首个 choice 的回复文本（缺失为空串）。"""
+
+    if not isinstance(out, Mapping):
+        return ""
+    choices = out.get("choices") or []
+    if not choices:
+        return ""
+    message = choices[0].get("message") or {}
+    return str(message.get("content") or "")
+
+
+class _StreamTimer:
+    """为流式响应的每个 chunk 打点，累积 TTFT/ITL 与输出 token 数。"""
+
+    def __init__(self, start_s: float) -> None:
+        self.start_s = start_s
+        self.first_s: Optional[float] = None
+        self.last_s: Optional[float] = None
+        self.itl_ms: List[float] = []
+        self.n_chunks = 0
+        self.usage_tokens: Optional[int] = None
+        self.prompt_tokens = 0
+
+    def observe(self, chunk: Mapping[str, Any], now: float) -> None:
+        """记录一个到达时刻为 `now` 的 chunk。"""
+
+        usage_tokens = _usage_tokens(chunk)
+        if usage_tokens is not None:
+            self.usage_tokens = usage_tokens
+            self.prompt_tokens = _usage_tokens(chunk, "prompt_tokens") or 0
+        if not _chunk_has_token(chunk):
+            return
+        if self.last_s is None:
+            self.first_s = now
+        else:
+            self.itl_ms.append((now - self.last_s) * 1000.0)
+        self.last_s = now
+        self.n_chunks += 1
+
+    def record(self, end_s: float, ok: bool, error: str = "") -> RequestRecord:
+        """生成请求记录。"""
+
+        tokens = self.usage_tokens if self.usage_tokens is not None else self.n_chunks
+        return RequestRecord(
+            start_s=self.start_s,
+            end_s=end_s,
+            ok=ok,
+            first_token_s=self.first_s,
+            itl_ms=self.itl_ms,
+            output_tokens=tokens,
+            input_tokens=self.prompt_tokens,
+            error=error,
+        )
+
+
+def _request_params(
+    temperature: float,
+    stream: bool,
+    extra: Optional[Mapping[str, Any]] = None,
+) -> Dict[str, Any]:
+    """构造压测请求参数；流式时请求服务端在末尾 chunk 中附带 usage。
+
+    参数:
+        temperature: 采样温度。
+        stream: 是否流式。
+        extra: 额外请求参数（如 `length_params` 生成的输出长度约束）。
+    """
+
+    params: Dict[str, Any] = {"temperature": temperature}
+    if stream:
+        params["stream_options"] = {"include_usage": True}
+    if extra:
+        params.update(extra)
+    return params
+
+
+def length_params(output_len: int, ignore_eos: bool = True) -> Dict[str, Any]:
+    """构造强制输出长度的请求参数。
+
+    参数:
+        output_len: 目标输出 token 数，作为 `max_tokens` 下发。
+        ignore_eos: 为 True 时附加 vLLM 扩展参数 `ignore_eos` 与
+            `min_tokens`，使模型恰好生成 `output_len` 个 token。
+
+    返回值:
+        dict: 可传给执行器 `extra_params` 的参数。
+    """
+
+    n = max(1, int(output_len))
+    params: Dict[str, Any] = {"max_tokens": n}
+    if ignore_eos:
+        params["ignore_eos"] = True
+        params["min_tokens"] = n
+    return params
+
+
+@dataclass
+class RequestSpec:
+    """一个待发请求：chat（`messages`）或 completions（`prompt` 非 None）。
+
+    属性:
+        messages: chat 消息数组。
+        prompt: completions 提示词；非 None 时请求 `/completions`。
+        params: 覆盖默认请求参数的额外参数（如混合负载条目的 `tools`）。
+        request_type: 请求类型标签（写入记录的 `request_type`）。
+    """
+
+    messages: Sequence[Mapping[str, Any]] = ()
+    prompt: Optional[str] = None
+    params: Mapping[str, Any] = field(default_factory=dict)
+    request_type: str = ""
+
+
+def _do_request(
     client: OpenAICompatClient,
     model: str,
-    messages: Sequence[Mapping[str, Any]],
+    spec: RequestSpec,
     params: Mapping[str, Any],
-    out_lat_ms: List[float],
-    out_fail: List[int],
-    lock: threading.Lock,
-) -> None:
-    """执行单个 chat 请求并记录耗时/失败计数。
+    *,
+    stream: bool = False,
+) -> RequestRecord:
+    """执行单个请求并返回测量记录。
 
     参数:
         client: OpenAI 客户端。
         model: 模型名。
-        messages: 消息数组。
-        params: 额外参数。
-        out_lat_ms: 用于收集耗时（毫秒）的列表（线程共享）。
-        out_fail: 用于收集失败计数的列表（线程共享，元素为 0/1）。
-        lock: 线程锁，保护共享写入。
+        spec: 待发请求（chat 或 completions）。
+        params: 默认请求参数（被 `spec.params` 覆盖）。
+        stream: 是否以 SSE 流式请求并逐 chunk 打点。
+
+    返回值:
+        RequestRecord: 单请求记录；异常被捕获并记为失败。
     """
 
+    merged = {**params, **spec.params}
     t0 = time.monotonic()
-    try:
-        _ = client.chat_completions(
-            model=model, messages=list(messages), **dict(params)
+    if stream:
+        timer = _StreamTimer(t0)
+        try:
+            if spec.prompt is None:
+                chunks = client.stream_chat_completions(
+                    model=model, messages=list(spec.messages), **merged
+                )
+            else:
+                chunks = client.stream_completions(
+                    model=model, prompt=spec.prompt, **merged
+                )
+            for chunk in chunks:
+                timer.observe(chunk, time.monotonic())
+            error = ""
+        except Exception as exc:
+            error = classify_error(exc)
+        rec = timer.record(time.monotonic(), not error, error)
+    else:
+        tokens = prompt_tokens = 0
+        error = ""
+        try:
+            if spec.prompt is None:
+                out = client.chat_completions(
+                    model=model, messages=list(spec.messages), **merged
+                )
+            else:
+                out = client.completions(model=model, prompt=spec.prompt, **merged)
+            if isinstance(out, Mapping):
+                tokens = _usage_tokens(out) or 0
+                prompt_tokens = _usage_tokens(out, "prompt_tokens") or 0
+        except Exception as exc:
+            error = classify_error(exc)
+        rec = RequestRecord(
+            start_s=t0,
+            end_s=time.monotonic(),
+            ok=not error,
+            output_tokens=tokens,
+            input_tokens=prompt_tokens,
+            error=error,
+        )
+    rec.request_type = spec.request_type
+    return rec
+
+
+def _user_messages(
+    prompt_len: int, prompt: Optional[str]
+) -> Sequence[Mapping[str, Any]]:
+    """构造单条 user 消息：优先使用预合成提示词，否则按字符长度生成。"""
+
+    text = make_prompt(prompt_len) if prompt is None else prompt
+    return ({"role": "user", "content": text},)
+
+
+RequestSource = Callable[[], RequestSpec]
+
+
+def _request_source(
+    prompt_len: int,
+    prompt: Optional[str],
+    workload: Optional[PrefixWorkload] = None,
+    mix: Optional[WorkloadMix] = None,
+) -> RequestSource:
+    """返回逐请求的请求生成函数。
+
+    给定 `workload` 时每次生成新消息（共享前缀 + 独立后缀），否则每次使用同一条
+    user 消息；给定 `mix` 时每次按权重抽取请求类型，未自带消息/提示词的条目
+    使用上述消息或提示词。
+    """
+
+    if workload is not None:
+        next_messages: Callable[[], Sequence[Mapping[str, Any]]] = workload.messages
+    else:
+        messages = _user_messages(prompt_len, prompt)
+        next_messages = lambda: messages  # noqa: E731
+    if mix is None:
+        return lambda: RequestSpec(next_messages())
+    text = make_prompt(prompt_len) if prompt is None else prompt
+
+    def _next() -> RequestSpec:
+        entry = mix.pick()
+        if entry.kind == "completions":
+            return RequestSpec(
+                prompt=entry.prompt or text,
+                params=entry.params,
+                request_type=entry.name,
+            )
+        return RequestSpec(
+            entry.messages or next_messages(),
+            params=entry.params,
+            request_type=entry.name,
         )
-        ok = True
-    except Exception:
-        ok = False
-    dt_ms = (time.monotonic() - t0) * 1000.0
-    with lock:
-        if ok:
-            out_lat_ms.append(dt_ms)
-        else:
-            out_fail.append(1)
+
+    return _next
 
 
 def run_openai_chat_batch(
     base_url: str,
     model: str,
     *,
-    prompt_len: int,
+    prompt_len: int = 128,
+    prompt: Optional[str] = None,
     n_requests: int,
     concurrency: int,
     temperature: float = 0.0,
     timeout_s: float = 30.0,
+    connect_timeout_s: float = DEFAULT_CONNECT_TIMEOUT_S,
     api_key: Optional[str] = None,
+    stream: bool = False,
+    extra_params: Optional[Mapping[str, Any]] = None,
+    on_record: Optional[RecordSink] = None,
+    workload: Optional[PrefixWorkload] = None,
+    mix: Optional[WorkloadMix] = None,
+    session: Optional[requests.Session] = None,
 ) -> Tuple[List[float], int, float]:
     """对 chat 端点执行一批请求并返回测量结果。
 
     参数:
         base_url: 服务基础 URL（/v1）。
         model: 模型名。
-        prompt_len: 输入提示长度（字符）。
+        prompt_len: 输入提示长度（字符）；给定 `prompt` 时忽略。
+        prompt: 预先合成的提示词（如 `PromptBuilder` 的 token 级结果）。
         n_requests: 请求总数。
         concurrency: 并发度（线程数）。
         temperature: 采样温度。
-        timeout_s: 单请求超时时间（秒）。
+        timeout_s: 单请求读超时（秒；流式下为相邻 chunk 的最长间隔）。
+        connect_timeout_s: 建连超时（秒）。
         api_key: 可选 API Key。
+        stream: 是否流式请求（用于 TTFT/ITL/TPOT 测量）。
+        extra_params: 额外请求参数（如 `length_params` 的输出长度约束）。
+        on_record: 每个请求完成后的回调（在锁内串行调用）。
+        workload: 共享前缀负载（逐请求生成消息，覆盖 `prompt`）。
+        mix: 加权混合负载（逐请求按权重抽取请求类型，见 `perf_mix`）。
+        session: 跨批次共享的 HTTP 会话（连接池应不小于 `concurrency`）；
+            缺省时本批自建大小为 `concurrency` 的连接池，结束后关闭。
 
     返回值:
         (latencies_ms, fail_count, duration_s)
     """
 
-    client = OpenAICompatClient(base_url=base_url, api_key=api_key)
-    messages: Sequence[Mapping[str, Any]] = (
-        {"role": "user", "content": make_prompt(prompt_len)},
+    client = OpenAICompatClient(
+        base_url=base_url,
+        api_key=api_key,
+        pool_size=max(1, concurrency),
+        read_timeout_s=timeout_s,
+        connect_timeout_s=connect_timeout_s,
+        session=session,
     )
-    params = {"temperature": temperature}
+    next_request = _request_source(prompt_len, prompt, workload, mix)
+    params = _request_params(temperature, stream, extra_params)
     lat_ms: List[float] = []
     fail: List[int] = []
     lock = threading.Lock()
+
+    def _one() -> None:
+        rec = _do_request(client, model, next_request(), params, stream=stream)
+        with lock:
+            if rec.ok:
+                lat_ms.append(rec.latency_ms)
+            else:
+                fail.append(1)
+            if on_record is not None:
+                on_record(rec)
+
     t0 = time.monotonic()
-    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as ex:
-        futs = [
-            ex.submit(
-                _do_chat_request,
-                client,
-                model,
-                messages,
-                params,
-                lat_ms,
-                fail,
-                lock,
-            )
-            for _ in range(max(1, n_requests))
-        ]
+    with client, ThreadPoolExecutor(max_workers=max(1, concurrency)) as ex:
+        futs = [ex.submit(_one) for _ in range(max(1, n_requests))]
         for _ in as_completed(futs):
             pass
     duration_s = time.monotonic() - t0
     return lat_ms, len(fail), float(duration_s)
 
 
-@dataclass
-class PerfProfile:
-    """性能档位（最小字段）。
+async def _async_request(
+    client: AsyncOpenAICompatClient,
+    model: str,
+    spec: RequestSpec,
+    params: Mapping[str, Any],
+    *,
+    stream: bool = False,
+    scheduled_s: Optional[float] = None,
+    reply: Optional[List[str]] = None,
+) -> RequestRecord:
+    """`_do_request` 的协程版本。
 
-    属性:
-        concurrency: 并发列表。
-        input_length: 输入长度候选列表（字符级）。
-        output_length: 输出长度候选列表（token 级估计，当前仅占位）。
-        num_requests_per_concurrency: 每个并发下请求数量。
-        warmup: 预热批次数（不计入统计）。
-        epochs: 重复测量轮数（取平均）。
-        temperature: 采样温度。
+    参数:
+        scheduled_s: 计划发出时刻（开环模式）；给定时记录的 `start_s`
+            取该值，实际发出的滞后写入 `send_lag_ms`。
+        reply: 给定时追加回复文本片段（多轮会话据此构造下一轮历史）。
+        其余参数同 `_do_request`。
     """
 
-    concurrency: List[int]
-    input_length: List[int]
-    output_length: List[int]
-    num_requests_per_concurrency: int
-    warmup: int = 1
-    epochs: int = 1
-    temperature: float = 0.0
+    merged = {**params, **spec.params}
+    t0 = time.monotonic()
+    if stream:
+        timer = _StreamTimer(t0)
+        try:
+            if spec.prompt is None:
+                chunks = client.stream_chat_completions(
+                    model=model, messages=list(spec.messages), **merged
+                )
+            else:
+                chunks = client.stream_completions(
+                    model=model, prompt=spec.prompt, **merged
+                )
+            async for chunk in chunks:
+                timer.observe(chunk, time.monotonic())
+                if reply is not None:
+                    reply.append(_chunk_text(chunk))
+            error = ""
+        except Exception as exc:
+            error = classify_error(exc)
+        rec = timer.record(time.monotonic(), not error, error)
+    else:
+        tokens = prompt_tokens = 0
+        error = ""
+        try:
+            if spec.prompt is None:
+                out = await client.chat_completions(
+                    model=model, messages=list(spec.messages), **merged
+                )
+            else:
+                out = await client.completions(
+                    model=model, prompt=spec.prompt, **merged
+                )
+            if isinstance(out, Mapping):
+                tokens = _usage_tokens(out) or 0
+                prompt_tokens = _usage_tokens(out, "prompt_tokens") or 0
+            if reply is not None:
+                reply.append(_response_text(out))
+        except Exception as exc:
+            error = classify_error(exc)
+        rec = RequestRecord(
+            start_s=t0,
+            end_s=time.monotonic(),
+            ok=not error,
+            output_tokens=tokens,
+            input_tokens=prompt_tokens,
+            error=error,
+        )
+    if scheduled_s is not None:
+        rec.send_lag_ms = max(0.0, (t0 - scheduled_s) * 1000.0)
+        rec.start_s = scheduled_s
+    rec.request_type = spec.request_type
+    return rec
 
 
-def run_profile_to_csv(
+async def _async_chat_batch(
+    client: AsyncOpenAICompatClient,
+    model: str,
+    next_request: RequestSource,
+    params: Mapping[str, Any],
+    *,
+    n_requests: int,
+    concurrency: int,
+    stream: bool = False,
+    on_record: Optional[RecordSink] = None,
+) -> Tuple[List[float], int]:
+    """在单事件循环内以固定并发度执行一批 chat 请求。
+
+    以 `concurrency` 个协程从共享计数器领取请求（闭环），与线程池引擎语义一致，
+    但不为每个在途请求占用线程。
+
+    参数:
+        client: 已进入上下文的异步客户端。
+        model: 模型名。
+        next_request: 逐请求的请求来源（见 `_request_source`）。
+        params: 额外参数。
+        n_requests: 请求总数。
+        concurrency: 并发协程数。
+        stream: 是否流式请求。
+        on_record: 每个请求完成后的回调。
+
+    返回值:
+        (latencies_ms, fail_count)
+    """
+
+    lat_ms: List[float] = []
+    fail = 0
+    remaining = max(1, n_requests)
+
+    async def _worker() -> None:
+        nonlocal remaining, fail
+        while remaining > 0:
+            remaining -= 1
+            rec = await _async_request(
+                client, model, next_request(), params, stream=stream
+            )
+            if rec.ok:
+                lat_ms.append(rec.latency_ms)
+            else:
+                fail += 1
+            if on_record is not None:
+                on_record(rec)
+
+    workers = max(1, min(concurrency, remaining))
+    await asyncio.gather(*(_worker() for _ in range(workers)))
+    return lat_ms, fail
+
+
+def run_openai_chat_batch_async(
     base_url: str,
     model: str,
-    profile: PerfProfile,
     *,
+    prompt_len: int = 128,
+    prompt: Optional[str] = None,
+    n_requests: int,
+    concurrency: int,
+    temperature: float = 0.0,
+    timeout_s: float = 30.0,
+    connect_timeout_s: float = DEFAULT_CONNECT_TIMEOUT_S,
     api_key: Optional[str] = None,
-) -> str:
-    """按给定档位执行并返回 CSV 文本（与 mock CSV 结构兼容）。
+    stream: bool = False,
+    extra_params: Optional[Mapping[str, Any]] = None,
+    on_record: Optional[RecordSink] = None,
+    workload: Optional[PrefixWorkload] = None,
+    mix: Optional[WorkloadMix] = None,
+) -> Tuple[List[float], int, float]:
+    """`run_openai_chat_batch` 的 asyncio 引擎版本（参数与返回值一致）。
 
     参数:
-        base_url: 服务基础 URL。
+        base_url: 服务基础 URL（/v1）。
         model: 模型名。
-        profile: 档位配置对象。
+        prompt_len: 输入提示长度（字符）；给定 `prompt` 时忽略。
+        prompt: 预先合成的提示词（如 `PromptBuilder` 的 token 级结果）。
+        n_requests: 请求总数。
+        concurrency: 并发度（在途请求数上限）。
+        temperature: 采样温度。
+        timeout_s: 单请求读超时（秒；流式下为相邻 chunk 的最长间隔）。
+        connect_timeout_s: 建连超时（秒）。
         api_key: 可选 API Key。
+        stream: 是否流式请求。
+        extra_params: 额外请求参数（如 `length_params` 的输出长度约束）。
+        on_record: 每个请求完成后的回调（在事件循环线程内调用）。
+        workload: 共享前缀负载（逐请求生成消息，覆盖 `prompt`）。
+        mix: 加权混合负载（逐请求按权重抽取请求类型，见 `perf_mix`）。
 
     返回值:
-        str: 包含表头的 CSV 文本。
+        (latencies_ms, fail_count, duration_s)
+
+    副作用:
+        创建并运行独立事件循环；连接池大小与并发度一致。
     """
 
-    buf = io.StringIO()
-    writer = csv.writer(buf)
-    writer.writerow(
-        [
-            "concurrency",
-            "input_len",
-            "output_len",
-            "latency_p50_ms",
-            "throughput_rps",
-        ]
-    )
-    in_len = profile.input_length[0] if profile.input_length else 128
-    out_len = profile.output_length[0] if profile.output_length else 128
+    next_request = _request_source(prompt_len, prompt, workload, mix)
+    params = _request_params(temperature, stream, extra_params)
 
-    for c in profile.concurrency:
-        # 预热
-        for _ in range(max(0, profile.warmup)):
-            _ = run_openai_chat_batch(
-                base_url,
+    async def _main() -> Tuple[List[float], int, float]:
+        async with AsyncOpenAICompatClient(
+            base_url,
+            api_key=api_key,
+            pool_size=max(1, concurrency),
+            read_timeout_s=timeout_s,
+            connect_timeout_s=connect_timeout_s,
+        ) as client:
+            t0 = time.monotonic()
+            lat_ms, fail = await _async_chat_batch(
+                client,
                 model,
-                prompt_len=in_len,
-                n_requests=min(2, profile.num_requests_per_concurrency),
-                concurrency=max(1, min(c, 4)),  # 预热限速
-                temperature=profile.temperature,
-                api_key=api_key,
+                next_request,
+                params,
+                n_requests=n_requests,
+                concurrency=concurrency,
+                stream=stream,
+                on_record=on_record,
             )
+            duration_s = time.monotonic() - t0
+        return lat_ms, fail, float(duration_s)
 
-        # 多 epoch 测量，聚合为均值
-        agg_lat_ms: List[float] = []
-        total_reqs = 0
-        total_duration = 0.0
-        for _ in range(max(1, profile.epochs)):
-            lat_ms, fail_count, dur = run_openai_chat_batch(
-                base_url,
-                model,
-                prompt_len=in_len,
-                n_requests=profile.num_requests_per_concurrency,
-                concurrency=c,
-                temperature=profile.temperature,
-                api_key=api_key,
-            )
-            agg_lat_ms.extend(lat_ms)
-            total_reqs += profile.num_requests_per_concurrency
-            total_duration += dur
+    return asyncio.run(_main())
 
-        if total_reqs <= 0 or total_duration <= 0:
-            p50 = 0.0
-            thr = 0.0
-        else:
-            summary = compute_summary(agg_lat_ms, total_duration, total_reqs)
-            p50 = summary["latency_p50_ms"]
-            thr = summary["throughput_rps"]
-        writer.writerow([c, in_len, out_len, f"{p50:.3f}", f"{thr:.3f}"])
+
+def arrival_gaps(rate: float, arrival: str, seed: int = 0) -> Iterator[float]:
+    """生成开环到达间隔（秒）的无限序列。
+
+    参数:
+        rate: 目标请求速率（QPS，须 > 0）。
+        arrival: `poisson`（指数分布间隔）或 `constant`（固定间隔 1/rate）。
+        seed: 随机种子（仅 poisson），保证到达序列可复现。
+
+    返回值:
+        Iterator[float]: 相邻请求的计划发出间隔。
+
+    异常:
+        ValueError: 速率非正或到达分布未知。
+    """
+
+    if rate <= 0:
+        raise ValueError(f"request_rate must be > 0, got {rate}")
+    if arrival not in ARRIVALS:
+        raise ValueError(f"unknown arrival: {arrival!r}; expected one of {ARRIVALS}")
+    rng = random.Random(seed)
+    while True:
+        yield rng.expovariate(rate) if arrival == "poisson" else 1.0 / rate
+
+
+ReplayItem = Tuple[float, RequestSpec, Mapping[str, Any]]
+
+
+async def _async_replay(
+    client: AsyncOpenAICompatClient,
+    model: str,
+    items: Iterable[ReplayItem],
+    *,
+    stream: bool,
+    on_record: RecordSink,
+) -> None:
+    """按计划时刻逐个发出请求，不等待在途请求完成（开环）。
+
+    参数:
+        items: `(offset_s, spec, params)` 序列，`offset_s` 为相对起点的
+            计划时刻（非递减）；惰性消费，只在需要发出下一请求时读取。
+        其余参数同 `_async_open_loop`。
+    """
+
+    pending: Set["asyncio.Task[None]"] = set()
+
+    async def _one(
+        scheduled_s: float, spec: RequestSpec, params: Mapping[str, Any]
+    ) -> None:
+        rec = await _async_request(
+            client, model, spec, params, stream=stream, scheduled_s=scheduled_s
+        )
+        on_record(rec)
+
+    t0 = time.monotonic()
+    for offset_s, spec, params in items:
+        next_s = t0 + offset_s
+        delay = next_s - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(_one(next_s, spec, params))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+    await asyncio.gather(*pending)
+
+
+async def _async_open_loop(
+    client: AsyncOpenAICompatClient,
+    model: str,
+    next_request: RequestSource,
+    params: Mapping[str, Any],
+    *,
+    n_requests: int,
+    gaps: Iterator[float],
+    stream: bool,
+    on_record: RecordSink,
+) -> None:
+    """按到达间隔 `gaps` 发出 `n_requests` 个请求（开环）。"""
+
+    def _items() -> Iterator[ReplayItem]:
+        offset = 0.0
+        for _ in range(max(1, n_requests)):
+            yield offset, next_request(), params
+            offset += next(gaps)
+
+    await _async_replay(client, model, _items(), stream=stream, on_record=on_record)
+
+
+def run_openai_chat_open_loop(
+    base_url: str,
+    model: str,
+    *,
+    prompt_len: int = 128,
+    prompt: Optional[str] = None,
+    n_requests: int,
+    request_rate: float,
+    arrival: str = "poisson",
+    seed: int = 0,
+    temperature: float = 0.0,
+    timeout_s: float = 30.0,
+    connect_timeout_s: float = DEFAULT_CONNECT_TIMEOUT_S,
+    api_key: Optional[str] = None,
+    stream: bool = False,
+    extra_params: Optional[Mapping[str, Any]] = None,
+    on_record: Optional[RecordSink] = None,
+    workload: Optional[PrefixWorkload] = None,
+    mix: Optional[WorkloadMix] = None,
+) -> Tuple[List[float], int, float]:
+    """以目标 QPS 开环发送一批 chat 请求（与在途请求数无关）。
+
+    时延从计划发出时刻起算：当客户端或服务端排队导致发送滞后时，
+    滞后计入时延而不会被“协调遗漏”掩盖。连接池不设上限。
+
+    参数:
+        base_url: 服务基础 URL（/v1）。
+        model: 模型名。
+        prompt_len: 输入提示长度（字符）；给定 `prompt` 时忽略。
+        prompt: 预先合成的提示词（如 `PromptBuilder` 的 token 级结果）。
+        n_requests: 请求总数。
+        request_rate: 目标请求速率（QPS）。
+        arrival: 到达分布（`poisson`/`constant`）。
+        seed: 到达序列随机种子。
+        temperature: 采样温度。
+        timeout_s: 单请求读超时（秒；流式下为相邻 chunk 的最长间隔）。
+        connect_timeout_s: 建连超时（秒）。
+        api_key: 可选 API Key。
+        stream: 是否流式请求。
+        extra_params: 额外请求参数（如 `length_params` 的输出长度约束）。
+        on_record: 每个请求完成后的回调。
+        workload: 共享前缀负载（逐请求生成消息，覆盖 `prompt`）。
+        mix: 加权混合负载（逐请求按权重抽取请求类型，见 `perf_mix`）。
+
+    返回值:
+        (latencies_ms, fail_count, duration_s)
+    """
+
+    gaps = arrival_gaps(request_rate, arrival, seed)
+    next_request = _request_source(prompt_len, prompt, workload, mix)
+    params = _request_params(temperature, stream, extra_params)
+    lat_ms: List[float] = []
+    fail = 0
+
+    def _collect(rec: RequestRecord) -> None:
+        nonlocal fail
+        if rec.ok:
+            lat_ms.append(rec.latency_ms)
+        else:
+            fail += 1
+        if on_record is not None:
+            on_record(rec)
+
+    async def _main() -> float:
+        async with AsyncOpenAICompatClient(
+            base_url,
+            api_key=api_key,
+            pool_size=0,
+            read_timeout_s=timeout_s,
+            connect_timeout_s=connect_timeout_s,
+        ) as client:
+            t0 = time.monotonic()
+            await _async_open_loop(
+                client,
+                model,
+                next_request,
+                params,
+                n_requests=n_requests,
+                gaps=gaps,
+                stream=stream,
+                on_record=_collect,
+            )
+            return time.monotonic() - t0
+
+    duration_s = asyncio.run(_main())
+    return lat_ms, fail, float(duration_s)
+
+
+def run_openai_chat_trace(
+    base_url: str,
+    model: str,
+    *,
+    trace: Iterable[TraceRequest],
+    prompt_for: Callable[[int], str] = make_prompt,
+    temperature: float = 0.0,
+    timeout_s: float = 30.0,
+    connect_timeout_s: float = DEFAULT_CONNECT_TIMEOUT_S,
+    api_key: Optional[str] = None,
+    stream: bool = False,
+    ignore_eos: bool = True,
+    on_record: Optional[RecordSink] = None,
+) -> Tuple[List[float], int, float]:
+    """按轨迹的到达时刻与长度开环回放 chat 请求。
+
+    轨迹惰性消费（见 `perf_trace.schedule_trace`）；每个请求的消息取自轨迹的
+    `messages`，否则由 `prompt_for(input_len)` 合成；`output_len` 经
+    `length_params` 约束输出长度；轨迹 `params` 覆盖其余采样参数。
+    时延与 rate 模式一致从计划发出时刻起算。
+
+    参数:
+        base_url: 服务基础 URL（/v1）。
+        model: 模型名。
+        trace: 回放计划（`TraceRequest` 序列，`offset_s` 非递减）。
+        prompt_for: 按输入长度合成提示词（如 `PromptBuilder.build`）。
+        temperature: 默认采样温度。
+        timeout_s: 单请求读超时（秒；流式下为相邻 chunk 的最长间隔）。
+        connect_timeout_s: 建连超时（秒）。
+        api_key: 可选 API Key。
+        stream: 是否流式请求。
+        ignore_eos: 是否附加 `ignore_eos/min_tokens` 使输出恰为 `output_len`。
+        on_record: 每个请求完成后的回调。
+
+    返回值:
+        (latencies_ms, fail_count, duration_s)
+    """
+
+    lat_ms: List[float] = []
+    fail = 0
+
+    def _collect(rec: RequestRecord) -> None:
+        nonlocal fail
+        if rec.ok:
+            lat_ms.append(rec.latency_ms)
+        else:
+            fail += 1
+        if on_record is not None:
+            on_record(rec)
+
+    def _items() -> Iterator[ReplayItem]:
+        for req in trace:
+            messages = req.messages or _user_messages(0, prompt_for(req.input_len))
+            extra = dict(
+                length_params(req.output_len, ignore_eos)
+                if req.output_len is not None
+                else {}
+            )
+            extra.update(req.params)
+            params = _request_params(temperature, stream, extra)
+            yield req.offset_s, RequestSpec(messages), params
+
+    async def _main() -> float:
+        async with AsyncOpenAICompatClient(
+            base_url,
+            api_key=api_key,
+            pool_size=0,
+            read_timeout_s=timeout_s,
+            connect_timeout_s=connect_timeout_s,
+        ) as client:
+            t0 = time.monotonic()
+            await _async_replay(
+                client, model, _items(), stream=stream, on_record=_collect
+            )
+            return time.monotonic() - t0
+
+    duration_s = asyncio.run(_main())
+    return lat_ms, fail, float(duration_s)
+
+
+async def _async_sessions(
+    client: AsyncOpenAICompatClient,
+    model: str,
+    next_request: RequestSource,
+    follow_up: str,
+    params: Mapping[str, Any],
+    *,
+    n_sessions: int,
+    concurrency: int,
+    turns: int,
+    think_time_s: float,
+    stream: bool,
+    on_record: RecordSink,
+) -> None:
+    """以 `concurrency` 个虚拟用户执行 `n_sessions` 个多轮会话（闭环）。
+
+    每个会话首轮发送 `next_request()` 的消息，此后每轮把模型实际回复作为
+    assistant 消息追加到历史，再追加一条以 `follow_up` 为内容的 user 消息，
+    重发完整历史；轮间等待 `think_time_s`。某轮失败时会话提前结束
+    （后续轮次不再发出）。记录的 `turn` 为轮次（1 起）。
+    """
+
+    remaining = max(1, n_sessions)
+
+    async def _session() -> None:
+        history: List[Mapping[str, Any]] = list(next_request().messages)
+        for turn in range(1, turns + 1):
+            if turn > 1:
+                if think_time_s > 0:
+                    await asyncio.sleep(think_time_s)
+                history.append(
+                    {"role": "user", "content": f"[turn {turn}] {follow_up}"}
+                )
+            reply: List[str] = []
+            rec = await _async_request(
+                client,
+                model,
+                RequestSpec(history),
+                params,
+                stream=stream,
+                reply=reply,
+            )
+            rec.turn = turn
+            on_record(rec)
+            if not rec.ok:
+                return
+            history.append({"role": "assistant", "content": "".join(reply)})
+
+    async def _user() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await _session()
+
+    users = max(1, min(concurrency, remaining))
+    await asyncio.gather(*(_user() for _ in range(users)))
+
+
+def run_openai_chat_sessions(
+    base_url: str,
+    model: str,
+    *,
+    prompt_len: int = 128,
+    prompt: Optional[str] = None,
+    n_sessions: int,
+    concurrency: int,
+    turns: int,
+    think_time_s: float = 0.0,
+    temperature: float = 0.0,
+    timeout_s: float = 30.0,
+    connect_timeout_s: float = DEFAULT_CONNECT_TIMEOUT_S,
+    api_key: Optional[str] = None,
+    stream: bool = False,
+    extra_params: Optional[Mapping[str, Any]] = None,
+    on_record: Optional[RecordSink] = None,
+    workload: Optional[PrefixWorkload] = None,
+) -> Tuple[List[float], int, float]:
+    """执行一批多轮对话会话（上下文随轮次增长）。
+
+    每轮新增的 user 消息与首轮提示词等长，因此第 k 轮的输入约为
+    `k * 输入长度 + (k - 1) * 输出长度`；同一会话的历史前缀逐轮复用，
+    可观察 KV 缓存复用与长上下文 prefill 的开销。
+
+    参数:
+        base_url: 服务基础 URL（/v1）。
+        model: 模型名。
+        prompt_len: 输入提示长度（字符）；给定 `prompt` 时忽略。
+        prompt: 预先合成的提示词（首轮 user 消息与后续各轮追加的内容）。
+        n_sessions: 会话总数。
+        concurrency: 并发虚拟用户数。
+        turns: 每个会话的轮数。
+        think_time_s: 收到回复到发出下一轮的等待时间（秒）。
+        temperature: 采样温度。
+        timeout_s: 单请求读超时（秒；流式下为相邻 chunk 的最长间隔）。
+        connect_timeout_s: 建连超时（秒）。
+        api_key: 可选 API Key。
+        stream: 是否流式请求。
+        extra_params: 额外请求参数（如 `length_params` 的输出长度约束）。
+        on_record: 每个请求完成后的回调（记录的 `turn` 为轮次）。
+        workload: 共享前缀负载（用于生成各会话的首轮消息）。
+
+    返回值:
+        (latencies_ms, fail_count, duration_s)
+
+    异常:
+        ValueError: `turns < 1` 或 `think_time_s < 0`。
+    """
+
+    if turns < 1:
+        raise ValueError(f"session turns must be >= 1, got {turns}")
+    if think_time_s < 0:
+        raise ValueError(f"think time must be >= 0, got {think_time_s}")
+    next_request = _request_source(prompt_len, prompt, workload)
+    follow_up = str(_user_messages(prompt_len, prompt)[0]["content"])
+    params = _request_params(temperature, stream, extra_params)
+    lat_ms: List[float] = []
+    fail = 0
+
+    def _collect(rec: RequestRecord) -> None:
+        nonlocal fail
+        if rec.ok:
+            lat_ms.append(rec.latency_ms)
+        else:
+            fail += 1
+        if on_record is not None:
+            on_record(rec)
+
+    async def _main() -> float:
+        async with AsyncOpenAICompatClient(
+            base_url,
+            api_key=api_key,
+            pool_size=concurrency,
+            read_timeout_s=timeout_s,
+            connect_timeout_s=connect_timeout_s,
+        ) as client:
+            t0 = time.monotonic()
+            await _async_sessions(
+                client,
+                model,
+                next_request,
+                follow_up,
+                params,
+                n_sessions=n_sessions,
+                concurrency=concurrency,
+                turns=turns,
+                think_time_s=think_time_s,
+                stream=stream,
+                on_record=_collect,
+            )
+            return time.monotonic() - t0
+
+    duration_s = asyncio.run(_main())
+    return lat_ms, fail, float(duration_s)
+
+
+def climb_schedule(init: int, growth_rate: float, max_concurrency: int) -> List[int]:
+    """生成 climb 模式的并发阶梯。
+
+    参数:
+        init: 起始并发。
+        growth_rate: 每个阶梯的乘法增长因子（须 > 1）。
+        max_concurrency: 并发上限（最后一级恰为该值）。
+
+    返回值:
+        list[int]: 严格递增的并发序列，例如 (1, 2, 16) -> [1, 2, 4, 8, 16]。
+
+    异常:
+        ValueError: `growth_rate <= 1`。
+    """
+
+    if growth_rate <= 1:
+        raise ValueError(f"growth_rate must be > 1, got {growth_rate}")
+    top = max(1, int(max_concurrency))
+    cur = max(1, min(int(init), top))
+    steps = [cur]
+    while cur < top:
+        cur = min(top, max(cur + 1, math.ceil(cur * growth_rate)))
+        steps.append(cur)
+    return steps
+
+
+@dataclass
+class LoadStep:
+    """一个负载点（static 并发值 / climb 阶梯 / rate 目标 QPS）的测量结果。
+
+    属性:
+        concurrency: 在途并发（开环 rate 负载点为 0）。
+        duration_s: 测量持续时长（秒）。
+        request_rate: 开环目标 QPS（闭环负载点为 None）。
+        stats: 归属于该负载点的请求统计（climb 按发出时刻归属；
+            定长内存直方图，不保留原始记录）。
+        index: 负载点在本次运行中的序号（climb 阶梯序号，供分片结果合并）。
+        turn: 多轮会话的轮次（1 起，仅 session 控制）。
+        by_type: 按请求类型的分项统计（混合负载，由 `run_profile_to_csv` 填充）。
+        timeline: 逐秒时间序列（给定产物目录或开启稳态裁剪时由
+            `run_profile_to_csv` 填充，见 `perf_timeline`）。
+        type_timelines: 按请求类型的逐秒时间序列（混合负载且 `timeline`
+            被填充时，与其共用桶起点，供分项按同一稳态窗口汇总）。
+    """
+
+    concurrency: int
+    duration_s: float
+    request_rate: Optional[float] = None
+    stats: LoadStats = field(default_factory=LoadStats)
+    index: int = 0
+    turn: Optional[int] = None
+    by_type: Dict[str, LoadStats] = field(default_factory=dict)
+    timeline: Optional[Timeline] = None
+    type_timelines: Dict[str, Timeline] = field(default_factory=dict)
+
+
+StepSink = Callable[[LoadStep, RequestRecord], None]
+
+
+def _step_sink(step: LoadStep, on_record: Optional[StepSink]) -> RecordSink:
+    """返回将记录归入 `step` 并转发给 `on_record(step, rec)` 的回调。"""
+
+    def _sink(rec: RequestRecord) -> None:
+        step.stats.add(rec)
+        if on_record is not None:
+            on_record(step, rec)
+
+    return _sink
+
+
+def _turn_sink(sinks: Sequence[RecordSink]) -> RecordSink:
+    """返回按 `rec.turn`（从 1 起）把记录分发到对应轮次回调的回调。"""
+
+    def _sink(rec: RequestRecord) -> None:
+        sinks[rec.turn - 1](rec)
+
+    return _sink
+
+
+async def _async_climb(
+    client: AsyncOpenAICompatClient,
+    model: str,
+    next_request: RequestSource,
+    params: Mapping[str, Any],
+    *,
+    schedule: Sequence[int],
+    interval_s: float,
+    stream: bool,
+    on_record: RecordSink,
+) -> None:
+    """按阶梯逐步增加常驻协程数，每个协程持续发请求直至结束。
+
+    到达最后一个阶梯并持续 `interval_s` 后停止发新请求，等待在途请求收尾。
+    """
+
+    stop = False
+
+    async def _worker() -> None:
+        while not stop:
+            rec = await _async_request(
+                client, model, next_request(), params, stream=stream
+            )
+            on_record(rec)
+
+    tasks: List["asyncio.Task[None]"] = []
+    for c in schedule:
+        while len(tasks) < c:
+            tasks.append(asyncio.create_task(_worker()))
+        await asyncio.sleep(interval_s)
+    stop = True
+    await asyncio.gather(*tasks)
+
+
+def run_openai_chat_climb(
+    base_url: str,
+    model: str,
+    *,
+    prompt_len: int = 128,
+    prompt: Optional[str] = None,
+    schedule: Sequence[int],
+    interval_s: float,
+    temperature: float = 0.0,
+    timeout_s: float = 30.0,
+    connect_timeout_s: float = DEFAULT_CONNECT_TIMEOUT_S,
+    api_key: Optional[str] = None,
+    stream: bool = False,
+    extra_params: Optional[Mapping[str, Any]] = None,
+    on_record: Optional[StepSink] = None,
+    precision: float = DEFAULT_PRECISION,
+    goodput_slo: Optional[Mapping[str, float]] = None,
+    workload: Optional[PrefixWorkload] = None,
+    mix: Optional[WorkloadMix] = None,
+) -> List[LoadStep]:
+    """以 climb 方式在一次连续运行内逐级提升并发并分阶梯统计。
+
+    参数:
+        base_url: 服务基础 URL（/v1）。
+        model: 模型名。
+        prompt_len: 输入提示长度（字符）；给定 `prompt` 时忽略。
+        prompt: 预先合成的提示词（如 `PromptBuilder` 的 token 级结果）。
+        schedule: 并发阶梯（见 `climb_schedule`）。
+        interval_s: 每个阶梯持续时长（秒）。
+        temperature: 采样温度。
+        timeout_s: 单请求读超时（秒；流式下为相邻 chunk 的最长间隔）。
+        connect_timeout_s: 建连超时（秒）。
+        api_key: 可选 API Key。
+        stream: 是否流式请求。
+        extra_params: 额外请求参数（如 `length_params` 的输出长度约束）。
+        on_record: 每个请求完成并归入阶梯后的回调 `(step, record)`。
+        precision: 阶梯统计直方图的相对误差。
+        goodput_slo: 阶梯统计的逐请求 SLO（goodput）。
+        workload: 共享前缀负载（逐请求生成消息，覆盖 `prompt`）。
+        mix: 加权混合负载（逐请求按权重抽取请求类型，见 `perf_mix`）。
+
+    返回值:
+        list[LoadStep]: 与 `schedule` 一一对应；请求按发出时刻归入阶梯，
+        最后一级包含停止后收尾的在途请求。
+    """
+
+    steps = [
+        LoadStep(
+            int(c),
+            duration_s=interval_s,
+            stats=LoadStats(precision, goodput_slo=dict(goodput_slo or {})),
+            index=i,
+        )
+        for i, c in enumerate(schedule)
+    ]
+    next_request = _request_source(prompt_len, prompt, workload, mix)
+    params = _request_params(temperature, stream, extra_params)
+    t0 = time.monotonic()
+
+    def _collect(rec: RequestRecord) -> None:
+        idx = int((rec.start_s - t0) / interval_s) if interval_s > 0 else 0
+        step = steps[max(0, min(idx, len(steps) - 1))]
+        step.stats.add(rec)
+        if on_record is not None:
+            on_record(step, rec)
+
+    async def _main() -> None:
+        nonlocal t0
+        async with AsyncOpenAICompatClient(
+            base_url,
+            api_key=api_key,
+            pool_size=max(schedule, default=1),
+            read_timeout_s=timeout_s,
+            connect_timeout_s=connect_timeout_s,
+        ) as client:
+            t0 = time.monotonic()
+            await _async_climb(
+                client,
+                model,
+                next_request,
+                params,
+                schedule=schedule,
+                interval_s=interval_s,
+                stream=stream,
+                on_record=_collect,
+            )
+
+    asyncio.run(_main())
+    return steps
+
+
+def get_batch_runner(engine: str) -> BatchRunner:
+    """按引擎名返回批量执行函数。
+
+    参数:
+        engine: `thread` 或 `asyncio`。
+
+    返回值:
+        Callable: `run_openai_chat_batch` 或 `run_openai_chat_batch_async`。
+
+    异常:
+        ValueError: 未知引擎名。
+    """
+
+    if engine == "thread":
+        return run_openai_chat_batch
+    if engine == "asyncio":
+        return run_openai_chat_batch_async
+    raise ValueError(f"unknown perf engine: {engine!r}; expected one of {ENGINES}")
+
+
+def _shard_common(
+    base_url: str,
+    model: str,
+    profile: PerfProfile,
+    prompt: str,
+    api_key: Optional[str],
+    extra_params: Optional[Mapping[str, Any]],
+    workload: Optional[PrefixWorkload] = None,
+) -> Dict[str, Any]:
+    """各类分片共用的请求参数（JSON 可序列化，供工作进程/代理使用）。"""
+
+    common: Dict[str, Any] = {
+        "base_url": base_url,
+        "model": model,
+        "prompt": prompt,
+        "temperature": profile.temperature,
+        "timeout_s": profile.read_timeout_s,
+        "connect_timeout_s": profile.connect_timeout_s,
+        "api_key": api_key,
+        "stream": profile.stream,
+        "extra_params": dict(extra_params or {}),
+    }
+    if workload is not None:
+        common["workload"] = workload.to_dict()
+    if profile.mix is not None:
+        common["mix"] = profile.mix.to_dict()
+    return common
+
+
+def _new_stats(profile: PerfProfile) -> LoadStats:
+    """按档位的直方图精度与逐请求 SLO 创建空统计。"""
+
+    return LoadStats(profile.histogram_precision, goodput_slo=dict(profile.goodput_slo))
+
+
+def _shard_count(profile: PerfProfile) -> int:
+    """每个负载点拆分的分片数：代理数（协调者模式）或进程数。"""
+
+    return len(profile.agents) or profile.workers
+
+
+def _run_shards(
+    kind: str,
+    shards: Sequence[Mapping[str, Any]],
+    steps: Sequence[LoadStep],
+    profile: PerfProfile,
+    on_record: Optional[StepSink],
+) -> float:
+    """按档位把分片交给远端代理或本机工作进程执行，返回最长测量时长。"""
+
+    if profile.agents:
+        return run_distributed(
+            kind,
+            shards,
+            steps,
+            profile.agents,
+            precision=profile.histogram_precision,
+            on_record=on_record,
+        )
+    return run_sharded(
+        kind,
+        shards,
+        steps,
+        precision=profile.histogram_precision,
+        on_record=on_record,
+    )
+
+
+def _rounds(profile: PerfProfile, step: LoadStep) -> Iterator[int]:
+    """逐批产出一个负载点的请求数。
+
+    固定模式为 `epochs` 批 `num_requests_per_concurrency`；自适应模式
+    （`ci_target > 0`）每批同样大小，达到 `min_requests` 后在 `step.stats` 的
+    置信区间满足目标时停止，至多 `max_requests`（末批截断）。调用方须在取下一批
+    之前把本批结果计入 `step.stats`。
+    """
+
+    n = profile.num_requests_per_concurrency
+    if profile.ci_target <= 0:
+        for _ in range(max(1, profile.epochs)):
+            yield n
+        return
+    lo = profile.min_requests or n
+    hi = profile.max_requests or 10 * lo
+    done = 0
+    while done < hi:
+        if done >= lo and ci_converged(
+            step.stats,
+            metric=profile.ci_metric,
+            quantiles=profile.ci_quantiles,
+            target=profile.ci_target,
+            confidence=profile.ci_confidence,
+        ):
+            return
+        batch = min(max(1, n), hi - done)
+        yield batch
+        done += batch
+
+
+def _static_point(
+    base_url: str,
+    model: str,
+    profile: PerfProfile,
+    concurrency: int,
+    *,
+    prompt: str,
+    api_key: Optional[str],
+    extra_params: Optional[Mapping[str, Any]] = None,
+    on_record: Optional[StepSink] = None,
+    workload: Optional[PrefixWorkload] = None,
+    session: Optional[requests.Session] = None,
+) -> LoadStep:
+    """测量一个闭环并发点：先预热，再逐批测量（见 `_rounds`）并合并统计。
+
+    `session` 仅用于 thread 引擎：预热与各批次复用同一连接池，建连只发生在预热中。
+    """
+
+    run_batch = get_batch_runner(profile.engine)
+    if session is not None and profile.engine == "thread":
+        run_batch = functools.partial(run_batch, session=session)
+    c = concurrency
+    # 预热
+    for _ in range(max(0, profile.warmup)):
+        _ = run_batch(
+            base_url,
+            model,
+            prompt=prompt,
+            n_requests=min(2, profile.num_requests_per_concurrency),
+            concurrency=max(1, min(c, 4)),  # 预热限速
+            temperature=profile.temperature,
+            timeout_s=profile.read_timeout_s,
+            connect_timeout_s=profile.connect_timeout_s,
+            api_key=api_key,
+            stream=profile.stream,
+            extra_params=extra_params,
+            workload=workload,
+            mix=profile.mix,
+        )
+
+    # 多批测量，合并全部请求记录后统一汇总
+    step = LoadStep(c, duration_s=0.0, stats=_new_stats(profile))
+    sink = _step_sink(step, on_record)
+    for n_requests in _rounds(profile, step):
+        if profile.agents or profile.workers > 1:
+            shards = batch_shards(
+                _shard_common(
+                    base_url, model, profile, prompt, api_key, extra_params, workload
+                ),
+                engine=profile.engine,
+                concurrency=c,
+                n_requests=n_requests,
+                workers=_shard_count(profile),
+            )
+            step.duration_s += _run_shards("batch", shards, [step], profile, on_record)
+            continue
+        _, _, dur = run_batch(
+            base_url,
+            model,
+            prompt=prompt,
+            n_requests=n_requests,
+            concurrency=c,
+            temperature=profile.temperature,
+            timeout_s=profile.read_timeout_s,
+            connect_timeout_s=profile.connect_timeout_s,
+            api_key=api_key,
+            stream=profile.stream,
+            extra_params=extra_params,
+            workload=workload,
+            mix=profile.mix,
+            on_record=sink,
+        )
+        step.duration_s += dur
+    return step
+
+
+def _measure_static(
+    base_url: str,
+    model: str,
+    profile: PerfProfile,
+    *,
+    prompt: str,
+    api_key: Optional[str],
+    extra_params: Optional[Mapping[str, Any]] = None,
+    on_record: Optional[StepSink] = None,
+    workload: Optional[PrefixWorkload] = None,
+    session: Optional[requests.Session] = None,
+) -> Iterator[LoadStep]:
+    """static 控制：每个并发值先预热，再跑 `epochs` 批固定请求数。
+
+    返回值:
+        逐个并发值产出 `LoadStep`。
+    """
+
+    for c in profile.concurrency:
+        yield _static_point(
+            base_url,
+            model,
+            profile,
+            c,
+            prompt=prompt,
+            api_key=api_key,
+            extra_params=extra_params,
+            workload=workload,
+            on_record=on_record,
+            session=session,
+        )
+
+
+def _measure_climb(
+    base_url: str,
+    model: str,
+    profile: PerfProfile,
+    *,
+    prompt: str,
+    api_key: Optional[str],
+    extra_params: Optional[Mapping[str, Any]] = None,
+    on_record: Optional[StepSink] = None,
+    workload: Optional[PrefixWorkload] = None,
+) -> Iterator[LoadStep]:
+    """climb 控制：预热后按阶梯连续爬升，`epochs` 轮同阶梯结果合并。
+
+    返回值:
+        逐个阶梯产出 `LoadStep`。
+    """
+
+    schedule = climb_schedule(
+        profile.init_concurrency,
+        profile.growth_rate,
+        max(profile.concurrency, default=profile.init_concurrency),
+    )
+    interval_s = max(0.001, profile.growth_interval_ms / 1000.0)
+    for _ in range(max(0, profile.warmup)):
+        _ = run_openai_chat_batch_async(
+            base_url,
+            model,
+            prompt=prompt,
+            n_requests=min(2, profile.num_requests_per_concurrency),
+            concurrency=max(1, min(schedule[0], 4)),
+            temperature=profile.temperature,
+            timeout_s=profile.read_timeout_s,
+            connect_timeout_s=profile.connect_timeout_s,
+            api_key=api_key,
+            stream=profile.stream,
+            extra_params=extra_params,
+            workload=workload,
+            mix=profile.mix,
+        )
+    precision = profile.histogram_precision
+    merged = [
+        LoadStep(c, duration_s=0.0, stats=_new_stats(profile), index=i)
+        for i, c in enumerate(schedule)
+    ]
+    for _ in range(max(1, profile.epochs)):
+        if profile.agents or profile.workers > 1:
+            shards = climb_shards(
+                _shard_common(
+                    base_url, model, profile, prompt, api_key, extra_params, workload
+                ),
+                schedule=schedule,
+                interval_s=interval_s,
+                workers=_shard_count(profile),
+            )
+            _run_shards("climb", shards, merged, profile, on_record)
+            for acc in merged:
+                acc.duration_s += interval_s
+            continue
+        steps = run_openai_chat_climb(
+            base_url,
+            model,
+            prompt=prompt,
+            schedule=schedule,
+            interval_s=interval_s,
+            temperature=profile.temperature,
+            timeout_s=profile.read_timeout_s,
+            connect_timeout_s=profile.connect_timeout_s,
+            api_key=api_key,
+            stream=profile.stream,
+            extra_params=extra_params,
+            workload=workload,
+            mix=profile.mix,
+            on_record=on_record,
+            precision=precision,
+            goodput_slo=profile.goodput_slo,
+        )
+        for acc, step in zip(merged, steps):
+            acc.stats.merge(step.stats)
+            acc.duration_s += step.duration_s
+    yield from merged
+
+
+def _rate_point(
+    base_url: str,
+    model: str,
+    profile: PerfProfile,
+    rate: float,
+    *,
+    prompt: str,
+    api_key: Optional[str],
+    extra_params: Optional[Mapping[str, Any]] = None,
+    on_record: Optional[StepSink] = None,
+    workload: Optional[PrefixWorkload] = None,
+) -> LoadStep:
+    """测量一个开环 QPS 点：先预热，再逐批开环发送（见 `_rounds`）并合并统计。"""
+
+    for _ in range(max(0, profile.warmup)):
+        _ = run_openai_chat_batch_async(
+            base_url,
+            model,
+            prompt=prompt,
+            n_requests=min(2, profile.num_requests_per_concurrency),
+            concurrency=2,
+            temperature=profile.temperature,
+            timeout_s=profile.read_timeout_s,
+            connect_timeout_s=profile.connect_timeout_s,
+            api_key=api_key,
+            stream=profile.stream,
+            extra_params=extra_params,
+            workload=workload,
+            mix=profile.mix,
+        )
+    step = LoadStep(
+        0,
+        duration_s=0.0,
+        request_rate=rate,
+        stats=_new_stats(profile),
+    )
+    sink = _step_sink(step, on_record)
+    for epoch, n_requests in enumerate(_rounds(profile, step)):
+        if profile.agents or profile.workers > 1:
+            shards = open_loop_shards(
+                _shard_common(
+                    base_url, model, profile, prompt, api_key, extra_params, workload
+                ),
+                request_rate=rate,
+                n_requests=n_requests,
+                arrival=profile.arrival,
+                seed=profile.seed + epoch,
+                workers=_shard_count(profile),
+            )
+            step.duration_s += _run_shards(
+                "open_loop", shards, [step], profile, on_record
+            )
+            continue
+        _, _, dur = run_openai_chat_open_loop(
+            base_url,
+            model,
+            prompt=prompt,
+            n_requests=n_requests,
+            request_rate=rate,
+            arrival=profile.arrival,
+            seed=profile.seed + epoch,
+            temperature=profile.temperature,
+            timeout_s=profile.read_timeout_s,
+            connect_timeout_s=profile.connect_timeout_s,
+            api_key=api_key,
+            stream=profile.stream,
+            extra_params=extra_params,
+            workload=workload,
+            mix=profile.mix,
+            on_record=sink,
+        )
+        step.duration_s += dur
+    return step
+
+
+def _measure_rate(
+    base_url: str,
+    model: str,
+    profile: PerfProfile,
+    *,
+    prompt: str,
+    api_key: Optional[str],
+    extra_params: Optional[Mapping[str, Any]] = None,
+    on_record: Optional[StepSink] = None,
+    workload: Optional[PrefixWorkload] = None,
+) -> Iterator[LoadStep]:
+    """rate 控制：每个目标 QPS 预热后开环发送 `epochs` 批请求。
+
+    返回值:
+        逐个目标 QPS 产出 `LoadStep`（`concurrency=0`）。
+    """
+
+    for rate in profile.request_rate:
+        yield _rate_point(
+            base_url,
+            model,
+            profile,
+            rate,
+            prompt=prompt,
+            api_key=api_key,
+            extra_params=extra_params,
+            workload=workload,
+            on_record=on_record,
+        )
+
+
+def _effective_stats(
+    step: LoadStep, profile: Optional[PerfProfile]
+) -> Tuple[LoadStats, float, Optional[Tuple[float, float]]]:
+    """返回用于汇总的统计、时长与稳态窗口（秒，相对首个桶）。
+
+    `profile.steady_state` 且检测到稳态时为窗口内的统计，否则为整段统计。
+    """
+
+    tl = step.timeline
+    window = _steady_buckets(step, profile)
+    if tl is not None and window is not None:
+        stats, dur = tl.window_stats(*window)
+        return stats, dur, (window[0] * tl.bucket_s, window[1] * tl.bucket_s)
+    return step.stats, step.duration_s, None
+
+
+def _steady_buckets(
+    step: LoadStep, profile: Optional[PerfProfile]
+) -> Optional[Tuple[int, int]]:
+    """开启 `steady_state` 且检测到稳态时返回窗口（桶下标，相对首个非空桶）。"""
+
+    tl = step.timeline
+    if profile is None or not profile.steady_state or tl is None:
+        return None
+    return tl.steady(tolerance=profile.steady_tolerance)
+
+
+def _type_stats(
+    step: LoadStep, profile: PerfProfile
+) -> List[Tuple[str, LoadStats, float]]:
+    """按请求类型的 `(类型, 统计, 时长)`，与 `_effective_stats` 使用同一稳态窗口。
+
+    整体行按稳态窗口裁剪时，分项行也只计窗口内完成的请求并以窗口时长计算
+    吞吐，使分项与整体可比。
+    """
+
+    tl = step.timeline
+    window = _steady_buckets(step, profile)
+    out: List[Tuple[str, LoadStats, float]] = []
+    for name, part in sorted(step.by_type.items()):
+        sub = step.type_timelines.get(name)
+        if tl is not None and window is not None and sub is not None:
+            lo, hi = window
+            out.append((name, sub.merged(tl.buckets(lo, hi)), (hi - lo) * tl.bucket_s))
+        else:
+            out.append((name, part, step.duration_s))
+    return out
+
+
+def step_summary(
+    step: LoadStep, profile: Optional[PerfProfile] = None
+) -> Dict[str, float]:
+    """负载点汇总（`LoadStats.summary`，含失败率 `fail_rate`，供 SLO 判定）。
+
+    给定 `profile` 且开启 `steady_state` 时按稳态窗口汇总。
+    """
+
+    stats, duration_s, _ = _effective_stats(step, profile)
+    return stats.summary(duration_s)
+
+
+def _measure_search(
+    base_url: str,
+    model: str,
+    profile: PerfProfile,
+    *,
+    prompt: str,
+    api_key: Optional[str],
+    extra_params: Optional[Mapping[str, Any]] = None,
+    on_record: Optional[StepSink] = None,
+    workload: Optional[PrefixWorkload] = None,
+    session: Optional[requests.Session] = None,
+) -> Iterator[LoadStep]:
+    """search 控制：按 SLO 倍增 + 二分搜索可持续的最大并发/QPS。
+
+    每个探测点按 static（`search_over=concurrency`）或 rate（`search_over=rate`）
+    方式测量，满足 `profile.slo` 即向上、违反即向下（见 `perf_search`）。
+
+    返回值:
+        按探测顺序产出 `LoadStep`。
+    """
+
+    search = CapacitySearch(
+        low=profile.search_min,
+        high=profile.search_max,
+        integer=profile.search_over == "concurrency",
+        tolerance=profile.search_tolerance,
+        max_probes=profile.search_max_probes,
+    )
+    kw: Dict[str, Any] = {
+        "prompt": prompt,
+        "api_key": api_key,
+        "extra_params": extra_params,
+        "on_record": on_record,
+        "workload": workload,
+    }
+    while True:
+        load = search.next_probe()
+        if load is None:
+            return
+        if search.integer:
+            step = _static_point(
+                base_url, model, profile, int(load), session=session, **kw
+            )
+        else:
+            step = _rate_point(base_url, model, profile, load, **kw)
+        search.observe(load, slo_met(step_summary(step, profile), profile.slo))
+        yield step
+
+
+def _measure_trace(
+    base_url: str,
+    model: str,
+    profile: PerfProfile,
+    *,
+    prompt: str,
+    api_key: Optional[str],
+    extra_params: Optional[Mapping[str, Any]] = None,
+    on_record: Optional[StepSink] = None,
+    workload: Optional[PrefixWorkload] = None,
+) -> Iterator[LoadStep]:
+    """trace 控制：预热后按轨迹开环回放，整个回放作为一个负载点。
+
+    提示词由 `prompt_builder_for` 按各请求的输入长度合成（按长度缓存）；
+    `prompt` 与 `extra_params` 仅用于预热。
+
+    返回值:
+        产出一个 `LoadStep`（`concurrency=0`，`request_rate` 为平均到达速率）。
+    """
+
+    if not profile.trace_path:
+        raise ValueError("control_method 'trace' requires trace_path")
+    for _ in range(max(0, profile.warmup)):
+        _ = run_openai_chat_batch_async(
+            base_url,
+            model,
+            prompt=prompt,
+            n_requests=2,
+            concurrency=2,
+            temperature=profile.temperature,
+            timeout_s=profile.read_timeout_s,
+            connect_timeout_s=profile.connect_timeout_s,
+            api_key=api_key,
+            stream=profile.stream,
+            extra_params=extra_params,
+            workload=workload,
+        )
+    builder = prompt_builder_for(base_url, model, profile, api_key=api_key)
+    step = LoadStep(0, duration_s=0.0, stats=_new_stats(profile))
+    span = {"n": 0, "first": 0.0, "last": 0.0}
+
+    def _counted() -> Iterator[TraceRequest]:
+        for req in schedule_trace(
+            profile.trace_path or "",
+            time_scale=profile.trace_time_scale,
+            loop=profile.trace_loop,
+            max_requests=profile.trace_max_requests,
+        ):
+            if span["n"] == 0:
+                span["first"] = req.offset_s
+            span["n"] += 1
+            span["last"] = req.offset_s
+            yield req
+
+    _, _, dur = run_openai_chat_trace(
+        base_url,
+        model,
+        trace=_counted(),
+        prompt_for=builder.build,
+        temperature=profile.temperature,
+        timeout_s=profile.read_timeout_s,
+        connect_timeout_s=profile.connect_timeout_s,
+        api_key=api_key,
+        stream=profile.stream,
+        ignore_eos=profile.ignore_eos,
+        on_record=_step_sink(step, on_record),
+    )
+    step.duration_s = dur
+    # n 个到达之间只有 n-1 个间隔
+    gap = span["last"] - span["first"]
+    if span["n"] > 1 and gap > 0:
+        step.request_rate = (span["n"] - 1) / gap
+    yield step
+
+
+def _measure_session(
+    base_url: str,
+    model: str,
+    profile: PerfProfile,
+    *,
+    prompt: str,
+    api_key: Optional[str],
+    extra_params: Optional[Mapping[str, Any]] = None,
+    on_record: Optional[StepSink] = None,
+    workload: Optional[PrefixWorkload] = None,
+) -> Iterator[LoadStep]:
+    """session 控制：对每个并发值执行一批多轮会话，每轮产出一个负载点。
+
+    各轮负载点的 `duration_s` 均为整批会话的时长，因此各轮吞吐之和即整批吞吐；
+    TTFT/时延随 `turn` 的变化反映上下文增长的影响。
+    """
+
+    for conc in profile.concurrency:
+        for _ in range(max(0, profile.warmup)):
+            _ = run_openai_chat_batch_async(
+                base_url,
+                model,
+                prompt=prompt,
+                n_requests=2,
+                concurrency=2,
+                temperature=profile.temperature,
+                timeout_s=profile.read_timeout_s,
+                connect_timeout_s=profile.connect_timeout_s,
+                api_key=api_key,
+                stream=profile.stream,
+                extra_params=extra_params,
+                workload=workload,
+            )
+        steps = [
+            LoadStep(
+                conc, duration_s=0.0, stats=_new_stats(profile), index=k, turn=k + 1
+            )
+            for k in range(profile.session_turns)
+        ]
+        sinks = [_step_sink(step, on_record) for step in steps]
+        for _ in range(max(1, profile.epochs)):
+            _, _, dur = run_openai_chat_sessions(
+                base_url,
+                model,
+                prompt=prompt,
+                n_sessions=profile.num_requests_per_concurrency,
+                concurrency=conc,
+                turns=profile.session_turns,
+                think_time_s=profile.think_time_ms / 1000.0,
+                temperature=profile.temperature,
+                timeout_s=profile.read_timeout_s,
+                connect_timeout_s=profile.connect_timeout_s,
+                api_key=api_key,
+                stream=profile.stream,
+                extra_params=extra_params,
+                on_record=_turn_sink(sinks),
+                workload=workload,
+            )
+            for step in steps:
+                step.duration_s += dur
+        yield from steps
+
+
+def prompt_builder_for(
+    base_url: str,
+    model: str,
+    profile: PerfProfile,
+    *,
+    api_key: Optional[str] = None,
+) -> PromptBuilder:
+    """按档位构造提示词合成器。
+
+    优先使用 `tokenizer_path` 精确分词；否则若 `calibrate_prompt` 为真，
+    向服务端发两次探测请求标定每字符 token 数；两者皆无时为字符级。
+
+    参数:
+        base_url: 服务基础 URL（标定时使用）。
+        model: 模型名（缓存键）。
+        profile: 档位配置对象。
+        api_key: 可选 API Key。
+
+    返回值:
+        PromptBuilder: 以 `profile.seed` 为语料种子的合成器。
+    """
+
+    tokenizer = (
+        load_tokenizer(profile.tokenizer_path) if profile.tokenizer_path else None
+    )
+    tpc: Optional[float] = None
+    if tokenizer is None and profile.calibrate_prompt:
+        tpc = calibrate_tokens_per_char(base_url, model, api_key=api_key)
+    return PromptBuilder(
+        model,
+        tokenizer=tokenizer,
+        tokens_per_char=tpc,
+        cache_dir=profile.prompt_cache_dir,
+        seed=profile.seed,
+        tokenizer_id=(
+            str(Path(profile.tokenizer_path).resolve())
+            if profile.tokenizer_path
+            else None
+        ),
+    )
+
+
+_MEASURES: Dict[str, Callable[..., Iterator[LoadStep]]] = {
+    "static": _measure_static,
+    "climb": _measure_climb,
+    "rate": _measure_rate,
+    "search": _measure_search,
+    "trace": _measure_trace,
+    "session": _measure_session,
+}
+
+
+def _log_sink(
+    log: RequestLogWriter,
+    input_len: int,
+    output_len: int,
+    prefix_share: Optional[float] = None,
+) -> StepSink:
+    """返回将记录连同负载点字段写入 `log` 的回调。"""
+
+    def _sink(step: LoadStep, rec: RequestRecord) -> None:
+        log.write(
+            rec,
+            concurrency=step.concurrency,
+            request_rate=step.request_rate,
+            input_len=input_len,
+            output_len=output_len,
+            prefix_share=prefix_share,
+            turn=step.turn,
+            request_type=rec.request_type or None,
+        )
+
+    return _sink
+
+
+def _type_sink(profile: PerfProfile, on_record: Optional[StepSink]) -> StepSink:
+    """返回按 `request_type` 把记录归入 `step.by_type` 并转发给 `on_record` 的回调。"""
+
+    def _sink(step: LoadStep, rec: RequestRecord) -> None:
+        stats = step.by_type.get(rec.request_type)
+        if stats is None:
+            stats = step.by_type[rec.request_type] = _new_stats(profile)
+        stats.add(rec)
+        if on_record is not None:
+            on_record(step, rec)
+
+    return _sink
+
+
+def _timeline_sink(profile: PerfProfile, on_record: Optional[StepSink]) -> StepSink:
+    """返回把记录计入 `step.timeline`（按需创建）并转发给 `on_record` 的回调。
+
+    混合负载时同时计入 `step.type_timelines` 中对应类型的序列（与整体共用桶起点）。
+    """
+
+    def _sink(step: LoadStep, rec: RequestRecord) -> None:
+        if step.timeline is None:
+            step.timeline = Timeline(
+                lambda: _new_stats(profile), profile.timeline_bucket_s
+            )
+        step.timeline.add(rec)
+        if profile.mix is not None:
+            sub = step.type_timelines.get(rec.request_type)
+            if sub is None:
+                sub = step.type_timelines[rec.request_type] = Timeline(
+                    lambda: _new_stats(profile),
+                    profile.timeline_bucket_s,
+                    origin_s=step.timeline.origin_s,
+                )
+            sub.add(rec)
+        if on_record is not None:
+            on_record(step, rec)
+
+    return _sink
+
+
+def _window_sink(
+    windows: Dict[int, List[float]], on_record: Optional[StepSink]
+) -> StepSink:
+    """返回记录各负载点首个请求发出与末个请求结束时刻（按 `id(step)`）的回调。"""
+
+    def _sink(step: LoadStep, rec: RequestRecord) -> None:
+        w = windows.get(id(step))
+        if w is None:
+            windows[id(step)] = [rec.start_s, rec.end_s]
+        else:
+            w[0], w[1] = min(w[0], rec.start_s), max(w[1], rec.end_s)
+        if on_record is not None:
+            on_record(step, rec)
+
+    return _sink
+
+
+def _client_check(
+    step: LoadStep,
+    stats: LoadStats,
+    duration_s: float,
+    summary: Mapping[str, float],
+    profile: PerfProfile,
+    capacity: Optional[ClientCapacity],
+    cpu: Optional[Tuple[float, float]],
+) -> Tuple[Dict[str, float], List[str]]:
+    """负载点的压测端瓶颈检测列（`perf.CLIENT_COLUMNS`）与命中原因。"""
+
+    cols: Dict[str, float] = {}
+    achieved: Optional[float] = None
+    if duration_s > 0 and step.turn is None:
+        # Little 定律：平均在途数 = 全部请求（含失败）时延总和 / 测量时长；
+        # 只计成功请求会把快速失败（如 503）占用的在途时长误判为并发不足
+        busy_ms = stats.latency.total + stats.failed_latency_ms
+        achieved = busy_ms / 1000.0 / duration_s
+        cols["achieved_concurrency"] = achieved
+    if cpu is not None:
+        cols["client_cpu_avg"], cols["client_cpu_max"] = cpu
+    reasons = client_bound_reasons(
+        target_concurrency=step.concurrency,
+        achieved_concurrency=achieved,
+        cpu_avg=None if cpu is None else cpu[0],
+        rps=summary.get("throughput_rps", 0.0),
+        chunk_rate=summary.get("output_tps") if profile.stream else None,
+        capacity=capacity,
+        cpu_limit=profile.client_cpu_limit,
+        margin=profile.client_margin,
+        concurrency_tolerance=profile.client_concurrency_tolerance,
+    )
+    cols["client_bound"] = float(bool(reasons))
+    return cols, reasons
+
+
+def run_profile_to_csv(
+    base_url: str,
+    model: str,
+    profile: PerfProfile,
+    *,
+    api_key: Optional[str] = None,
+    artifacts_dir: Optional[str] = None,
+    tag: str = "perf",
+    session: Optional[requests.Session] = None,
+) -> str:
+    """按给定档位执行并返回 CSV 文本（与 mock CSV 结构兼容）。
+
+    对 `input_length × output_length` 全部组合逐一测量；每个组合以
+    `max_tokens=output_len`（及可选 `ignore_eos/min_tokens`）强制输出长度，
+    `output_tokens_avg` 列记录服务端 usage 报告的实际生成 token 数。
+    提示词在测量前一次性合成（见 `prompt_builder_for`），不计入测量时间。
+    引擎由 `profile.engine` 选择（仅 static/search，见 `effective_engine`），
+    两种引擎产出的 CSV 结构完全一致；
+    `control_method=climb` 时每个并发阶梯输出一行；`control_method=rate` 时
+    每个目标 QPS 输出一行（`concurrency=0`，`request_rate` 列为目标值）；
+    `control_method=trace` 时按轨迹回放，整个回放输出一行（长度列为 0，提示词
+    按轨迹中的长度在回放中合成并按长度缓存）；`control_method=session` 时
+    每个并发值按会话轮次各输出一行（`turn` 列）。
+    `profile.prefix_share` 非空时，每个长度组合再按每个共享前缀比例各测一遍
+    （CSV `prefix_share` 列区分），用于对比前缀缓存命中率不同时的吞吐与 TTFT。
+    `profile.mix` 非空时各类型请求在同一负载点内混发，CSV 每个负载点仍为一行
+    （全部类型合计），summary 产物在合计行之后按类型追加分项行（`request_type` 列）。
+    给定产物目录时另写 `timeline_<tag>.csv`（逐秒完成数、token 速率、在途数与
+    时延分位）；`profile.steady_state` 时 CSV 与 summary 的合计行按稳态窗口汇总。
+    `profile.client_check` 时先标定压测端能力上限，测量中采样 CPU，每个负载点
+    输出 `perf.CLIENT_COLUMNS`（`client_bound=1` 表示该点数字受压测端限制），
+    给定产物目录时另写 `client_<tag>.json`（标定结果与各负载点的判定原因）。
+    thread 引擎的 static/search 测量全程复用一个 keep-alive 连接池（大小见
+    `http_pool_size`），建连开销只出现在预热中而不计入测量。
+
+    参数:
+        base_url: 服务基础 URL。
+        model: 模型名。
+        profile: 档位配置对象。
+        api_key: 可选 API Key。
+        artifacts_dir: 产物目录；给定时请求完成即写入
+            `requests_<tag>.<record_format>`，并在结束时写入 `summary_<tag>.csv`、
+            `timeline_<tag>.csv` 与（`client_check` 时）`client_<tag>.json`。
+        tag: 产物文件名后缀（如 run_type）。
+        session: 外部共享的 HTTP 会话（如编排中各阶段共用）；缺省时按
+            `http_pool_size` 自建，结束后关闭。
+
+    返回值:
+        str: 包含表头的 CSV 文本。
+
+    副作用:
+        给定 `artifacts_dir` 时写文件。
+    """
+
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=list(PERF_CSV_COLUMNS), restval="")
+    writer.writeheader()
+    measure = _MEASURES[profile.control_method]
+    if profile.control_method == "trace":
+        # 长度来自轨迹：整个回放为一个负载点，长度列记 0，提示词仅用于预热
+        combos: List[Tuple[int, int]] = [(0, 0)]
+        prompts = {0: make_prompt(128)}
+    else:
+        builder = prompt_builder_for(base_url, model, profile, api_key=api_key)
+        in_lens = profile.input_length or [128]
+        combos = list(itertools.product(in_lens, profile.output_length or [128]))
+        prompts = {n: builder.build(n) for n in in_lens}
+    log: Optional[RequestLogWriter] = None
+    summaries: List[Dict[str, Any]] = []
+    timeline_rows: List[Dict[str, Any]] = []
+    if artifacts_dir:
+        log = RequestLogWriter(
+            str(Path(artifacts_dir) / f"requests_{tag}.{profile.record_format}"),
+            profile.record_format,
+        )
+
+    shares: List[Optional[float]] = list(profile.prefix_share) or [None]
+    if profile.control_method == "trace":
+        shares = [None]  # 轨迹自带提示词，不做前缀切分
+
+    capacity: Optional[ClientCapacity] = None
+    sampler: Optional[CpuSampler] = None
+    windows: Dict[int, List[float]] = {}
+    client_points: List[Dict[str, Any]] = []
+    if profile.client_check:
+        # 按测量实际使用的引擎标定（climb 等控制方式不受 `engine` 影响）
+        capacity = calibrate_client(
+            effective_engine(profile),
+            concurrency=max(profile.concurrency, default=64),
+            n_requests=profile.client_calibration_requests,
+            stream=profile.stream,
+        )
+        if not (profile.agents or profile.workers > 1):
+            # CPU 采样只覆盖本进程，多进程/代理模式下不采样
+            sampler = CpuSampler().start()
+
+    measure_kw: Dict[str, Any] = {}
+    own_session: Optional[requests.Session] = None
+    if effective_engine(profile) == "thread" and not (
+        profile.agents or profile.workers > 1
+    ):
+        if session is None:
+            session = own_session = pooled_session(http_pool_size(profile))
+        measure_kw["session"] = session
+
+    try:
+        for (in_len, out_len), share in itertools.product(combos, shares):
+            extra = length_params(out_len, profile.ignore_eos)
+            on_record = None if log is None else _log_sink(log, in_len, out_len, share)
+            if profile.mix is not None:
+                on_record = _type_sink(profile, on_record)
+            if log is not None or profile.steady_state:
+                on_record = _timeline_sink(profile, on_record)
+            if sampler is not None:
+                on_record = _window_sink(windows, on_record)
+            workload = None
+            if share is not None:
+                workload = PrefixWorkload.split(
+                    prompts[in_len],
+                    share,
+                    group_size=profile.prefix_group_size,
+                    nonce=profile.prefix_nonce,
+                )
+            for step in measure(
+                base_url,
+                model,
+                profile,
+                prompt=prompts[in_len],
+                api_key=api_key,
+                extra_params=extra,
+                on_record=on_record,
+                workload=workload,
+                **measure_kw,
+            ):
+                stats, duration_s, window = _effective_stats(step, profile)
+                summary = stats.summary(duration_s)
+                row: Dict[str, Any] = {
+                    "concurrency": step.concurrency,
+                    "input_len": in_len,
+                    "output_len": out_len,
+                }
+                if step.request_rate is not None:
+                    row["request_rate"] = f"{step.request_rate:.3f}"
+                if share is not None:
+                    row["prefix_share"] = f"{share:.3f}"
+                if step.turn is not None:
+                    row["turn"] = step.turn
+                row.update({k: f"{v:.3f}" for k, v in summary.items()})
+                cis = ci_summary(stats, profile.ci_confidence)
+                row["requests"] = stats.requests
+                row.update({k: f"{v:.6f}" for k, v in cis.items()})
+                if window is not None:
+                    row["steady_start_s"] = f"{window[0]:.3f}"
+                    row["steady_end_s"] = f"{window[1]:.3f}"
+                if profile.slo:
+                    row["slo_ok"] = int(
+                        slo_met(step_summary(step, profile), profile.slo)
+                    )
+                client: Dict[str, float] = {}
+                if profile.client_check:
+                    w = windows.pop(id(step), None)
+                    cpu = None
+                    if sampler is not None and w is not None:
+                        cpu = sampler.window(w[0], w[1])
+                    client, reasons = _client_check(
+                        step, stats, duration_s, summary, profile, capacity, cpu
+                    )
+                    row.update({k: f"{v:.3f}" for k, v in client.items()})
+                    row["client_bound"] = int(client["client_bound"])
+                    client_points.append(
+                        {
+                            "concurrency": step.concurrency,
+                            "request_rate": step.request_rate,
+                            "input_len": in_len,
+                            "output_len": out_len,
+                            "prefix_share": share,
+                            "turn": step.turn,
+                            **client,
+                            "reasons": reasons,
+                        }
+                    )
+                writer.writerow(row)
+                if log is not None:
+                    log.flush()
+                    load_point: Dict[str, Any] = {
+                        "concurrency": step.concurrency,
+                        "request_rate": step.request_rate,
+                        "input_len": in_len,
+                        "output_len": out_len,
+                        "prefix_share": share,
+                        "turn": step.turn,
+                    }
+                    summaries.append(
+                        summary_row(
+                            {**summary, **cis, **client},
+                            requests=stats.requests,
+                            failures=stats.failures,
+                            **load_point,
+                        )
+                    )
+                    for name, part, part_s in _type_stats(step, profile):
+                        summaries.append(
+                            summary_row(
+                                {
+                                    **part.summary(part_s),
+                                    **ci_summary(part, profile.ci_confidence),
+                                },
+                                requests=part.requests,
+                                failures=part.failures,
+                                request_type=name,
+                                **load_point,
+                            )
+                        )
+                    if step.timeline is not None:
+                        tl = step.timeline
+                        steady = tl.steady(tolerance=profile.steady_tolerance)
+                        timeline_rows.extend(
+                            {**load_point, **r} for r in tl.rows(steady)
+                        )
+    finally:
+        if own_session is not None:
+            own_session.close()
+        if sampler is not None:
+            sampler.stop()
+        if log is not None:
+            log.close()
+            if capacity is not None:
+                write_client_json(
+                    str(Path(log.path.parent) / f"client_{tag}.json"),
+                    capacity,
+                    client_points,
+                )
+            write_summary_csv(
+                str(Path(log.path.parent) / f"summary_{tag}.csv"), summaries
+            )
+            write_timeline_csv(
+                str(Path(log.path.parent) / f"timeline_{tag}.csv"),
+                timeline_rows,
+                LOAD_POINT_COLUMNS,
+            )
 
     return buf.getvalue()
@@ -0,0 +1,197 @@
+"""可合并的定长内存时延直方图（对数分桶，HDR 风格）。
+
+以相对误差 `precision` 确定对数桶宽 `gamma = (1 + p) / (1 - p)`：值 v 落入
+桶 `ceil(log_gamma(v))`，桶代表值与桶内任意值的相对误差不超过 p。
+桶数只与取值范围有关（1µs–1e8ms、p=1% 时约 1300 个），与样本数无关；
+样本数、和、最小值、最大值精确维护，故均值与 MAX 精确，分位点相对误差 ≤ p。
+
+相同精度的直方图按桶计数相加即可精确合并（epoch/线程/进程/节点之间），
+`to_dict/from_dict` 提供 JSON 可序列化表示，便于跨进程与跨节点传输。
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Mapping, Sequence, Set, Tuple
+
+DEFAULT_PRECISION = 0.01
+# 小于该值（毫秒）的样本计入零桶，避免 log(0)
+MIN_VALUE_MS = 1e-3
+
+
+class LatencyHistogram:
+    """对数分桶直方图。
+
+    参数:
+        precision: 分位点的最大相对误差（0 < p < 1），默认 1%。
+
+    异常:
+        ValueError: `precision` 越界。
+    """
+
+    def __init__(self, precision: float = DEFAULT_PRECISION) -> None:
+        if not 0.0 < precision < 1.0:
+            raise ValueError(f"precision must be in (0, 1), got {precision}")
+        self.precision = float(precision)
+        self._gamma = (1.0 + self.precision) / (1.0 - self.precision)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __len__(self) -> int:
+        return self.count
+
+    def record(self, value: float, n: int = 1) -> None:
+        """记录 `n` 个值为 `value` 的样本（毫秒）。"""
+
+        if n <= 0:
+            return
+        v = float(value)
+        if v < MIN_VALUE_MS:
+            self.zero_count += n
+        else:
+            idx = math.ceil(math.log(v) / self._log_gamma)
+            self.buckets[idx] = self.buckets.get(idx, 0) + n
+        self.count += n
+        self.total += v * n
+        self.min = min(self.min, v)
+        self.max = max(self.max, v)
+
+    def extend(self, values: Sequence[float]) -> "LatencyHistogram":
+        """批量记录样本，返回自身。"""
+
+        for v in values:
+            self.record(v)
+        return self
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """将 `other` 精确合并进自身，返回自身。
+
+        异常:
+            ValueError: 两者精度不同（桶边界不一致，无法精确合并）。
+        """
+
+        if other.precision != self.precision:
+            raise ValueError(
+                f"cannot merge histograms with precision {self.precision} "
+                f"and {other.precision}"
+            )
+        for idx, c in other.buckets.items():
+            self.buckets[idx] = self.buckets.get(idx, 0) + c
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def mean(self) -> float:
+        """精确均值（无样本时为 0）。"""
+
+        return self.total / self.count if self.count else 0.0
+
+    def _bucket_value(self, idx: int) -> float:
+        return 2.0 * self._gamma**idx / (self._gamma + 1.0)
+
+    def percentiles(self, pcts: Sequence[float]) -> List[float]:
+        """一次遍历计算多个百分位。
+
+        与排序后线性插值的定义一致：`k = p/100 * (count - 1)`，在第 `floor(k)`
+        与 `floor(k)+1` 个样本（按桶代表值，首尾取精确 min/max）之间插值。
+
+        参数:
+            pcts: 百分位列表（0-100）。
+
+        返回值:
+            list[float]: 与 `pcts` 对应的值；无样本时均为 0。
+        """
+
+        if not self.count:
+            return [0.0 for _ in pcts]
+        last = self.count - 1
+        plan: List[Tuple[float, int, int]] = []
+        ranks: Set[int] = set()
+        for p in pcts:
+            k = min(max(p, 0.0), 100.0) / 100.0 * last
+            f = int(k)
+            c = min(f + 1, last)
+            plan.append((k, f, c))
+            ranks.update((f, c))
+        values = self._values_at_ranks(sorted(ranks))
+        out: List[float] = []
+        for k, f, c in plan:
+            if f == c:
+                out.append(values[f])
+            else:
+                out.append(values[f] * (c - k) + values[c] * (k - f))
+        return out
+
+    def percentile(self, pct: float) -> float:
+        """单个百分位（0-100）。"""
+
+        return self.percentiles([pct])[0]
+
+    def values_at_ranks(self, ranks: Sequence[int]) -> Dict[int, float]:
+        """按 rank（0 起）返回次序统计量的近似值（用于分位点置信区间）。"""
+
+        return self._values_at_ranks(sorted(set(ranks)))
+
+    def _values_at_ranks(self, ranks: Sequence[int]) -> Dict[int, float]:
+        """按升序 rank（0 起）返回样本近似值，结果钳制在 [min, max]。"""
+
+        out: Dict[int, float] = {}
+        last = self.count - 1
+        pending = [r for r in ranks if 0 < r < last]
+        for r in ranks:
+            if r <= 0:
+                out[r] = self.min
+            elif r >= last:
+                out[r] = self.max
+        if not pending:
+            return out
+        i = 0
+        seen = self.zero_count
+        while i < len(pending) and pending[i] < seen:
+            out[pending[i]] = self.min
+            i += 1
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            rep = min(max(self._bucket_value(idx), self.min), self.max)
+            while i < len(pending) and pending[i] < seen:
+                out[pending[i]] = rep
+                i += 1
+            if i >= len(pending):
+                break
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        """返回 JSON 可序列化表示（用于跨进程/节点合并）。"""
+
+        return {
+            "precision": self.precision,
+            "buckets": {str(k): v for k, v in self.buckets.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "LatencyHistogram":
+        """从 `to_dict` 的结果还原直方图。"""
+
+        h = cls(float(data.get("precision", DEFAULT_PRECISION)))
+        h.buckets = {int(k): int(v) for k, v in (data.get("buckets") or {}).items()}
+        h.zero_count = int(data.get("zero_count", 0))
+        h.count = int(data.get("count", 0))
+        h.total = float(data.get("total", 0.0))
+        if h.count:
+            h.min = float(data["min"])
+            h.max = float(data["max"])
+        return h
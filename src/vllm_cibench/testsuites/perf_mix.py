@@ -0,0 +1,177 @@
+"""加权混合负载：在一次压测中按权重混发多种请求类型。
+
+生产流量是混合的：同一批次里的 guided decoding（`response_format`）、工具调用
+解析、reasoning、带 logprobs 的 completions 会拖慢普通 chat 请求，单一类型的
+压测无法体现。本模块让档位声明一组带权重的请求类型，条目格式与功能测试的
+`cases` 相同（见 `functional.build_cases_from_config`），另加 `weight`：
+
+    mix:
+      - {id: plain, type: chat, weight: 6}
+      - id: tools
+        type: chat
+        weight: 1
+        messages: [{role: user, content: "What's the weather in Paris?"}]
+        params: {tools: [...], tool_choice: auto}
+      - {id: logprobs, type: completions, weight: 1, params: {logprobs: 2}}
+
+chat 条目未给 `messages`、completions 条目未给 `prompt` 时使用当前长度组合的
+合成提示词（随 `input_length` 扫描）；条目 `params` 覆盖档位的默认采样与输出
+长度参数（`stream` 由档位决定，条目中的值被忽略）。每个请求按权重独立抽取
+类型，记录的 `request_type` 为条目 `id`，用于分类型统计。
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from vllm_cibench.testsuites.functional import (
+    ChatCase,
+    CompletionCase,
+    build_cases_from_config,
+)
+
+# 档位 `backend` 取值：默认请求类型（`mix` 为空时生效）
+BACKENDS: Tuple[str, ...] = ("openai-chat", "openai-completions")
+
+
+@dataclass
+class MixEntry:
+    """混合负载中的一种请求类型。
+
+    参数:
+        name: 类型名（条目 `id`，写入记录的 `request_type`）。
+        kind: 端点类型（`chat`/`completions`）。
+        weight: 抽取权重（> 0）。
+        messages: 固定消息数组（chat；None 表示使用合成提示词）。
+        prompt: 固定提示词（completions；None 表示使用合成提示词）。
+        params: 覆盖默认请求参数的额外参数。
+    """
+
+    name: str
+    kind: str
+    weight: float = 1.0
+    messages: Optional[List[Mapping[str, Any]]] = None
+    prompt: Optional[str] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_case(
+        cls, case: Union[ChatCase, CompletionCase], weight: float
+    ) -> "MixEntry":
+        """由功能测试用例构造（`stream` 参数被丢弃，由档位决定）。"""
+
+        params = {k: v for k, v in dict(case.params).items() if k != "stream"}
+        if isinstance(case, ChatCase):
+            return cls(
+                case.id, "chat", weight, list(case.messages) or None, None, params
+            )
+        return cls(case.id, "completions", weight, None, case.prompt or None, params)
+
+
+class WorkloadMix:
+    """按权重抽取请求类型（线程安全，抽取序列由 `seed` 决定）。
+
+    参数:
+        entries: 请求类型列表。
+        seed: 随机种子。
+
+    异常:
+        ValueError: 列表为空、类型名重复或权重非正。
+    """
+
+    def __init__(self, entries: Sequence[MixEntry], seed: int = 0) -> None:
+        if not entries:
+            raise ValueError("mix must contain at least one entry")
+        names = [e.name for e in entries]
+        if len(set(names)) != len(names):
+            raise ValueError(f"mix entry ids must be unique, got {names}")
+        for e in entries:
+            if e.weight <= 0:
+                raise ValueError(f"mix weight for {e.name!r} must be > 0")
+        self.entries = list(entries)
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._weights = [e.weight for e in self.entries]
+        self._lock = threading.Lock()
+
+    def pick(self) -> MixEntry:
+        """按权重抽取下一个请求的类型。"""
+
+        with self._lock:
+            return self._rng.choices(self.entries, weights=self._weights)[0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON 可序列化表示（跨进程/代理传输）。"""
+
+        return {
+            "seed": self.seed,
+            "entries": [
+                {
+                    "name": e.name,
+                    "kind": e.kind,
+                    "weight": e.weight,
+                    "messages": e.messages,
+                    "prompt": e.prompt,
+                    "params": e.params,
+                }
+                for e in self.entries
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "WorkloadMix":
+        """从 `to_dict` 的结果还原。"""
+
+        entries = [MixEntry(**dict(e)) for e in data.get("entries", [])]
+        return cls(entries, seed=int(data.get("seed", 0)))
+
+
+def parse_mix(
+    data: Optional[Sequence[Mapping[str, Any]]],
+    *,
+    backend: str = "openai-chat",
+    seed: int = 0,
+) -> Optional[WorkloadMix]:
+    """解析档位的 `mix`/`backend` 字段。
+
+    参数:
+        data: `mix` 条目列表（功能测试 `cases` 格式 + `weight`）。
+        backend: 默认请求类型；`mix` 为空且为 `openai-completions` 时，
+            等价于单一的 completions 条目。
+        seed: 抽取序列的随机种子。
+
+    返回值:
+        WorkloadMix | None: 无 `mix` 且为 `openai-chat` 时返回 None（单一 chat）。
+
+    异常:
+        ValueError: `backend` 未知、条目类型未知、缺少 `id`、权重非正或 id 重复。
+    """
+
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend: {backend!r}; expected one of {BACKENDS}")
+    items = list(data or [])
+    if not items:
+        if backend == "openai-completions":
+            return WorkloadMix([MixEntry("completions", "completions")], seed=seed)
+        return None
+    weights: Dict[str, float] = {}
+    for item in items:
+        kind = str(item.get("type", "")).lower()
+        if kind not in ("chat", "completion", "completions"):
+            raise ValueError(f"mix entry type must be chat/completions, got {kind!r}")
+        if not item.get("id"):
+            raise ValueError("mix entries require an 'id'")
+        weights[str(item["id"])] = float(item.get("weight", 1.0))
+    chat, comp = build_cases_from_config({"cases": items})
+    by_id: Dict[str, Union[ChatCase, CompletionCase]] = {c.id: c for c in chat}
+    by_id.update({c.id: c for c in comp})
+    if len(by_id) != len(items):
+        raise ValueError("mix entry ids must be unique")
+    entries = [
+        MixEntry.from_case(by_id[str(item["id"])], weights[str(item["id"])])
+        for item in items
+    ]
+    return WorkloadMix(entries, seed=seed)
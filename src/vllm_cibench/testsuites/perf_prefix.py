@@ -0,0 +1,118 @@
+"""共享前缀 / 独立前缀负载：用于前缀缓存（prefix caching）的基准测试。
+
+默认每个请求发送完全相同的提示词，开启 `--enable-prefix-caching` 的服务端
+会整段命中缓存，测得的 TTFT/吞吐被系统性高估。本模块把一条提示词按
+共享比例 `share` 切成两段：
+
+- 共享前缀（前 `share` 部分）：作为 system 消息，在同一组请求间完全相同；
+  `group_size=N` 时每 N 个请求换一个前缀（前缀首部带组标记），`0` 表示
+  全部请求共享同一前缀；
+- 独立后缀（其余部分）：作为 user 消息，首部带逐请求随机数（nonce），
+  保证后缀及之后的 token 全部缓存未命中。
+
+`share=0` 时整段为独立后缀（完全未命中），`share=1` 时仅 nonce 不同。
+组标记与 nonce 含每个实例的随机盐，跨 epoch/进程/代理不会意外复用缓存；
+它们会给提示词增加少量 token。
+"""
+
+from __future__ import annotations
+
+import itertools
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Mapping
+
+
+@dataclass
+class PrefixWorkload:
+    """按共享前缀比例生成逐请求消息。
+
+    参数:
+        prefix: 共享前缀文本（为空时不发 system 消息）。
+        suffix: 独立后缀文本。
+        share: 共享比例（仅用于记录与序列化）。
+        group_size: 每个前缀被多少个请求共享（0 表示全部共享）。
+        nonce: 是否在后缀首部加逐请求 nonce（关闭则后缀也完全相同）。
+    """
+
+    prefix: str
+    suffix: str
+    share: float = 0.0
+    group_size: int = 0
+    nonce: bool = True
+    _salt: str = field(
+        default_factory=lambda: uuid.uuid4().hex[:8], init=False, repr=False
+    )
+    _counter: Iterator[int] = field(
+        default_factory=itertools.count, init=False, repr=False
+    )
+
+    @classmethod
+    def split(
+        cls,
+        text: str,
+        share: float,
+        *,
+        group_size: int = 0,
+        nonce: bool = True,
+    ) -> "PrefixWorkload":
+        """按比例切分提示词。
+
+        参数:
+            text: 完整提示词（如 `PromptBuilder.build` 的结果）。
+            share: 共享前缀占比（0-1，按字符切分）。
+            group_size: 见类说明。
+            nonce: 见类说明。
+
+        返回值:
+            PrefixWorkload: 新实例（独立的随机盐与计数器）。
+
+        异常:
+            ValueError: `share` 不在 [0, 1] 或 `group_size < 0`。
+        """
+
+        if not 0.0 <= share <= 1.0:
+            raise ValueError(f"prefix share must be in [0, 1], got {share}")
+        if group_size < 0:
+            raise ValueError(f"prefix_group_size must be >= 0, got {group_size}")
+        cut = int(round(len(text) * share))
+        return cls(
+            text[:cut], text[cut:], share=share, group_size=group_size, nonce=nonce
+        )
+
+    def messages(self) -> List[Dict[str, Any]]:
+        """生成下一个请求的消息数组（线程安全：计数器自增为原子操作）。"""
+
+        n = next(self._counter)
+        out: List[Dict[str, Any]] = []
+        if self.prefix:
+            tag = ""
+            if self.group_size > 0:
+                tag = f"[group {self._salt}-{n // self.group_size}] "
+            out.append({"role": "system", "content": tag + self.prefix})
+        head = f"[req {self._salt}-{n}] " if self.nonce else ""
+        out.append({"role": "user", "content": head + self.suffix})
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON 可序列化表示（跨进程/代理传输；不含随机盐与计数器）。"""
+
+        return {
+            "prefix": self.prefix,
+            "suffix": self.suffix,
+            "share": self.share,
+            "group_size": self.group_size,
+            "nonce": self.nonce,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "PrefixWorkload":
+        """从 `to_dict` 的结果还原（生成新的随机盐）。"""
+
+        return cls(
+            str(data.get("prefix", "")),
+            str(data.get("suffix", "")),
+            share=float(data.get("share", 0.0)),
+            group_size=int(data.get("group_size", 0)),
+            nonce=bool(data.get("nonce", True)),
+        )
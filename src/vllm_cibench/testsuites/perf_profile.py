@@ -0,0 +1,417 @@
+"""性能档位：`PerfProfile` 数据结构与档位 YAML 的解析、校验。
+
+档位描述一次压测“测什么、怎么测”（负载点、控制方式、引擎、统计与检测参数），
+由 `profile_from_dict` 从 YAML 字典构造并校验全部字段；执行见 `perf_exec`。
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from vllm_cibench.clients.openai_client import (
+    DEFAULT_CONNECT_TIMEOUT_S,
+    DEFAULT_READ_TIMEOUT_S,
+)
+from vllm_cibench.testsuites.perf_ci import CI_METRICS
+from vllm_cibench.testsuites.perf_client import DEFAULT_CALIBRATION_REQUESTS
+from vllm_cibench.testsuites.perf_dist import parse_agents
+from vllm_cibench.testsuites.perf_hist import DEFAULT_PRECISION
+from vllm_cibench.testsuites.perf_mix import WorkloadMix, parse_mix
+from vllm_cibench.testsuites.perf_records import RECORD_FORMATS
+from vllm_cibench.testsuites.perf_search import (
+    SEARCH_DIMENSIONS,
+    CapacitySearch,
+    parse_goodput_slo,
+    parse_slo,
+)
+
+ENGINES: Tuple[str, ...] = ("thread", "asyncio")
+CONTROL_METHODS: Tuple[str, ...] = (
+    "static",
+    "climb",
+    "rate",
+    "search",
+    "trace",
+    "session",
+)
+ARRIVALS: Tuple[str, ...] = ("poisson", "constant")
+# 按档位 `engine` 选择执行引擎的控制方式；其余控制方式固定在 asyncio 引擎上执行
+ENGINE_CONTROL_METHODS: Tuple[str, ...] = ("static", "search")
+
+
+@dataclass
+class PerfProfile:
+    """性能档位（最小字段）。
+
+    属性:
+        concurrency: 并发列表。
+        input_length: 输入长度候选列表（默认字符级；配置 `tokenizer_path` 或
+            `calibrate_prompt` 时为 token 数）。
+        output_length: 输出长度候选列表（token 数，作为 `max_tokens` 下发）。
+        num_requests_per_concurrency: 每个并发下请求数量。
+        warmup: 预热批次数（不计入统计）。
+        epochs: 重复测量轮数（各轮合并为同一直方图统计）。
+        temperature: 采样温度。
+        engine: 执行引擎（`thread`/`asyncio`）；仅 static/search 控制生效，
+            climb/rate/trace/session 固定使用 asyncio（见 `effective_engine`）。
+        stream: 是否流式请求并统计 TTFT/ITL/TPOT。
+        control_method: 负载控制方式（`static`/`climb`/`rate`/`search`/
+            `trace`/`session`）。
+        growth_rate: climb 每阶梯的并发乘法因子。
+        growth_interval_ms: climb 每阶梯持续时长（毫秒）。
+        init_concurrency: climb 起始并发；上限为 `max(concurrency)`。
+        request_rate: rate 控制下的目标 QPS 列表（开环负载点）。
+        arrival: rate 控制的到达分布（`poisson`/`constant`）。
+        seed: 随机种子（到达序列等）。
+        ignore_eos: 是否附加 `ignore_eos/min_tokens` 使输出恰为 `output_len`。
+        tokenizer_path: 本地 `tokenizer.json`（或其所在目录），按 token 精确合成提示词。
+        calibrate_prompt: 无分词器时，是否经服务端 usage 标定按 token 近似合成。
+        prompt_cache_dir: token 级提示词的磁盘缓存目录（None 表示不落盘）。
+        record_format: 逐请求记录产物格式（`csv`/`jsonl`）。
+        histogram_precision: 时延直方图分位点的相对误差（默认 1%）。
+        workers: 压测进程数；>1 时每个负载点的负载均分到多个进程
+            （同步起跑，直方图与逐请求记录合并，见 `perf_workers`）。
+        agents: 压测代理 URL 列表；非空时每个负载点的负载均分到各代理
+            （协调者模式，优先于 `workers`，见 `perf_dist`）。
+        slo: 负载点 SLO（指标名 -> 上限，如 `{"ttft_p99_ms": 2000}`）；非空时
+            CSV 输出 `slo_ok` 列，search 控制据此搜索容量。
+        search_over: search 控制的搜索维度（`concurrency`/`rate`）。
+        search_min: search 下界（首个探测负载）。
+        search_max: search 上界。
+        search_tolerance: rate 维度的收敛阈值（区间相对宽度）。
+        search_max_probes: search 最多探测点数。
+        goodput_slo: 逐请求 SLO（`ttft_ms`/`tpot_ms`/`latency_ms` 上限）；非空时
+            CSV 输出 `slo_attainment_pct`、`goodput_rps`、`goodput_tps`。
+        trace_path: trace 控制回放的 JSONL 轨迹路径。
+        trace_time_scale: 回放速度倍数（>1 加速）。
+        trace_loop: 轨迹回放轮数。
+        trace_max_requests: 最多回放的请求数（None 不限制）。
+        prefix_share: 共享前缀比例列表（0-1）；非空时每个长度组合按每个比例
+            各测一遍（CSV 输出 `prefix_share` 列），请求改为“共享 system 前缀 +
+            带 nonce 的独立后缀”，见 `perf_prefix`；为空时所有请求提示词相同。
+        prefix_group_size: 每个共享前缀被多少个请求共享（0 表示全部共享）。
+        prefix_nonce: 是否在独立后缀首部加逐请求 nonce。
+        session_turns: session 控制下每个会话的轮数（此时
+            `num_requests_per_concurrency` 表示每个并发值的会话数）。
+        think_time_ms: session 控制下的轮间等待（毫秒）。
+        backend: 默认请求类型（`openai-chat`/`openai-completions`）。
+        mix: 加权混合负载（由 `mix`/`backend` 字段解析，见 `perf_mix`）；非空时
+            逐请求按权重抽取请求类型，summary 产物按类型输出分项统计。
+        steady_state: 是否按检测到的稳态窗口汇总（裁剪爬升与收尾，CSV 输出
+            `steady_start_s`/`steady_end_s`；未检测到稳态时回退为整段汇总）。
+        steady_tolerance: 稳态判定相对平台在途水平的允许下探比例。
+        timeline_bucket_s: 时间序列的桶宽（秒）。
+        ci_target: 自适应样本量的目标相对半宽（如 0.05 表示 ±5%）；>0 时 static/
+            rate 控制的每个负载点按 `num_requests_per_concurrency` 一批批追加
+            请求，直至 `ci_metric` 在 `ci_quantiles` 上的置信区间收窄到目标以内
+            （见 `perf_ci`），`epochs` 不再生效；为 0 时按固定请求数测量。
+        ci_confidence: 置信水平（CSV 的置信区间列同样按此输出）。
+        ci_metric: 停止判据的分布指标（`latency`/`ttft`/`itl`/`tpot`）。
+        ci_quantiles: 停止判据的百分位列表。
+        min_requests: 自适应模式下每个负载点的最少请求数（默认一批）。
+        max_requests: 自适应模式下每个负载点的最多请求数（默认 10 批）。
+        client_check: 是否做压测端瓶颈检测：测量前对本机零时延 mock 服务标定
+            压测端能力上限，测量中采样本进程 CPU，CSV 输出 `perf.CLIENT_COLUMNS`
+            （见 `perf_client`）。
+        client_cpu_limit: CPU 饱和阈值（核）。
+        client_margin: 实测吞吐达到标定上限的该比例即视为受压测端限制。
+        client_concurrency_tolerance: 闭环负载点实际平均在途数低于目标的允许比例。
+        client_calibration_requests: 标定请求数。
+        connect_timeout_s: 单请求建连超时（秒）。
+        read_timeout_s: 单请求读超时（秒；流式下为相邻 chunk 的最长间隔）。
+    """
+
+    concurrency: List[int]
+    input_length: List[int]
+    output_length: List[int]
+    num_requests_per_concurrency: int
+    warmup: int = 1
+    epochs: int = 1
+    temperature: float = 0.0
+    engine: str = "thread"
+    stream: bool = False
+    control_method: str = "static"
+    growth_rate: float = 2.0
+    growth_interval_ms: int = 5000
+    init_concurrency: int = 1
+    request_rate: List[float] = field(default_factory=list)
+    arrival: str = "poisson"
+    seed: int = 0
+    ignore_eos: bool = True
+    tokenizer_path: Optional[str] = None
+    calibrate_prompt: bool = False
+    prompt_cache_dir: Optional[str] = None
+    record_format: str = "csv"
+    histogram_precision: float = DEFAULT_PRECISION
+    workers: int = 1
+    agents: List[str] = field(default_factory=list)
+    slo: Dict[str, float] = field(default_factory=dict)
+    search_over: str = "concurrency"
+    search_min: float = 1.0
+    search_max: float = 1.0
+    search_tolerance: float = 0.05
+    search_max_probes: int = 12
+    goodput_slo: Dict[str, float] = field(default_factory=dict)
+    trace_path: Optional[str] = None
+    trace_time_scale: float = 1.0
+    trace_loop: int = 1
+    trace_max_requests: Optional[int] = None
+    prefix_share: List[float] = field(default_factory=list)
+    prefix_group_size: int = 0
+    prefix_nonce: bool = True
+    session_turns: int = 4
+    think_time_ms: float = 0.0
+    backend: str = "openai-chat"
+    mix: Optional[WorkloadMix] = None
+    steady_state: bool = False
+    steady_tolerance: float = 0.2
+    timeline_bucket_s: float = 1.0
+    ci_target: float = 0.0
+    ci_confidence: float = 0.95
+    ci_metric: str = "latency"
+    ci_quantiles: List[float] = field(default_factory=lambda: [50.0, 99.0])
+    min_requests: int = 0
+    max_requests: int = 0
+    client_check: bool = False
+    client_cpu_limit: float = 0.9
+    client_margin: float = 0.8
+    client_concurrency_tolerance: float = 0.25
+    client_calibration_requests: int = DEFAULT_CALIBRATION_REQUESTS
+    connect_timeout_s: float = DEFAULT_CONNECT_TIMEOUT_S
+    read_timeout_s: float = DEFAULT_READ_TIMEOUT_S
+
+
+def profile_from_dict(
+    data: Mapping[str, Any], *, engine: Optional[str] = None
+) -> PerfProfile:
+    """从档位 YAML 字典构造 `PerfProfile`。
+
+    参数:
+        data: 档位配置（如 `configs/tests/perf/profiles/pr.yaml` 的内容）。
+        engine: 覆盖配置中的 `engine` 字段（如 CLI `--engine`）。
+
+    返回值:
+        PerfProfile: 档位对象；未知字段被忽略。
+
+    异常:
+        ValueError: 引擎/控制方式/到达分布/记录格式未知、直方图精度越界、
+            `workers < 1`、`growth_rate <= 1`、rate 控制缺少 `request_rate`，
+            或 search 控制缺少 `slo`/搜索维度未知/搜索边界非法，`goodput_slo` 非法，或 trace 控制
+            缺少 `trace_path`/回放参数非法/与多进程或代理同时使用，或
+            `prefix_share` 不在 [0, 1]/`prefix_group_size < 0`，或 session 控制的
+            轮数/轮间等待非法/与多进程或代理同时使用，或 `backend`/`mix` 非法、
+            与 trace/session 控制同时使用，或稳态/时间序列参数非法，或
+            置信区间参数非法/`min_requests > max_requests`，或压测端瓶颈检测
+            参数非法，或超时非正。
+    """
+
+    eng = str(engine or data.get("engine", "thread") or "thread").lower()
+    if eng not in ENGINES:
+        raise ValueError(f"unknown perf engine: {eng!r}; expected one of {ENGINES}")
+    method = str(data.get("control_method", "static") or "static").lower()
+    if method not in CONTROL_METHODS:
+        raise ValueError(
+            f"unknown control_method: {method!r}; expected one of {CONTROL_METHODS}"
+        )
+    growth_rate = float(data.get("growth_rate", 2.0))
+    if growth_rate <= 1:
+        raise ValueError(f"growth_rate must be > 1, got {growth_rate}")
+    rates = [float(x) for x in (data.get("request_rate", []) or [])]
+    if method == "rate" and not rates:
+        raise ValueError("control_method 'rate' requires a non-empty request_rate")
+    arrival = str(data.get("arrival", "poisson") or "poisson").lower()
+    if arrival not in ARRIVALS:
+        raise ValueError(f"unknown arrival: {arrival!r}; expected one of {ARRIVALS}")
+    record_format = str(data.get("record_format", "csv") or "csv").lower()
+    if record_format not in RECORD_FORMATS:
+        raise ValueError(
+            f"unknown record_format: {record_format!r}; expected one of {RECORD_FORMATS}"
+        )
+    precision = float(data.get("histogram_precision", DEFAULT_PRECISION))
+    if not 0.0 < precision < 1.0:
+        raise ValueError(f"histogram_precision must be in (0, 1), got {precision}")
+    workers = int(data.get("workers", 1))
+    if workers < 1:
+        raise ValueError(f"workers must be >= 1, got {workers}")
+    slo = parse_slo(data.get("slo"))
+    search_over = str(data.get("search_over", "concurrency") or "concurrency").lower()
+    if search_over not in SEARCH_DIMENSIONS:
+        raise ValueError(
+            f"unknown search_over: {search_over!r}; expected one of {SEARCH_DIMENSIONS}"
+        )
+    bounds = rates if search_over == "rate" else list(data.get("concurrency") or [])
+    search = CapacitySearch(
+        low=float(data.get("search_min", min(bounds, default=1))),
+        high=float(data.get("search_max", max(bounds, default=1))),
+        integer=search_over == "concurrency",
+        tolerance=float(data.get("search_tolerance", 0.05)),
+        max_probes=int(data.get("search_max_probes", 12)),
+    )
+    if method == "search" and not slo:
+        raise ValueError("control_method 'search' requires a non-empty slo")
+    agents = parse_agents(data.get("agents"))
+    trace_scale = float(data.get("trace_time_scale", 1.0))
+    trace_loop = int(data.get("trace_loop", 1))
+    trace_max = data.get("trace_max_requests")
+    if trace_scale <= 0:
+        raise ValueError(f"trace_time_scale must be > 0, got {trace_scale}")
+    if trace_loop < 1:
+        raise ValueError(f"trace_loop must be >= 1, got {trace_loop}")
+    if method == "trace":
+        if not data.get("trace_path"):
+            raise ValueError("control_method 'trace' requires trace_path")
+        if workers > 1 or agents:
+            raise ValueError("control_method 'trace' runs in a single process")
+    turns = int(data.get("session_turns", 4))
+    think_ms = float(data.get("think_time_ms", 0.0))
+    if turns < 1:
+        raise ValueError(f"session_turns must be >= 1, got {turns}")
+    if think_ms < 0:
+        raise ValueError(f"think_time_ms must be >= 0, got {think_ms}")
+    if method == "session" and (workers > 1 or agents):
+        raise ValueError("control_method 'session' runs in a single process")
+    backend = str(data.get("backend", "openai-chat") or "openai-chat").lower()
+    mix = parse_mix(data.get("mix"), backend=backend, seed=int(data.get("seed", 0)))
+    if mix is not None and method in ("trace", "session"):
+        raise ValueError(f"control_method {method!r} does not support mix/backend")
+    steady_tol = float(data.get("steady_tolerance", 0.2))
+    bucket_s = float(data.get("timeline_bucket_s", 1.0))
+    if not 0.0 <= steady_tol < 1.0:
+        raise ValueError(f"steady_tolerance must be in [0, 1), got {steady_tol}")
+    if bucket_s <= 0:
+        raise ValueError(f"timeline_bucket_s must be > 0, got {bucket_s}")
+    n_requests = int(data.get("num_requests_per_concurrency", 8))
+    ci_target = float(data.get("ci_target", 0.0))
+    ci_confidence = float(data.get("ci_confidence", 0.95))
+    ci_metric = str(data.get("ci_metric", "latency") or "latency").lower()
+    ci_quantiles = [float(q) for q in (data.get("ci_quantiles") or [50, 99])]
+    min_requests = int(data.get("min_requests", n_requests))
+    max_requests = int(data.get("max_requests", 10 * min_requests))
+    if ci_target < 0:
+        raise ValueError(f"ci_target must be >= 0, got {ci_target}")
+    if not 0.0 < ci_confidence < 1.0:
+        raise ValueError(f"ci_confidence must be in (0, 1), got {ci_confidence}")
+    if ci_metric not in CI_METRICS:
+        raise ValueError(
+            f"unknown ci_metric: {ci_metric!r}; expected one of {CI_METRICS}"
+        )
+    if any(not 0.0 < q < 100.0 for q in ci_quantiles):
+        raise ValueError(f"ci_quantiles must be in (0, 100), got {ci_quantiles}")
+    if not 1 <= min_requests <= max_requests:
+        raise ValueError(
+            f"need 1 <= min_requests <= max_requests, got {min_requests}/{max_requests}"
+        )
+    cpu_limit = float(data.get("client_cpu_limit", 0.9))
+    margin = float(data.get("client_margin", 0.8))
+    conc_tol = float(data.get("client_concurrency_tolerance", 0.25))
+    calib_n = int(data.get("client_calibration_requests", DEFAULT_CALIBRATION_REQUESTS))
+    if cpu_limit <= 0:
+        raise ValueError(f"client_cpu_limit must be > 0, got {cpu_limit}")
+    if not 0.0 < margin <= 1.0:
+        raise ValueError(f"client_margin must be in (0, 1], got {margin}")
+    if not 0.0 <= conc_tol < 1.0:
+        raise ValueError(
+            f"client_concurrency_tolerance must be in [0, 1), got {conc_tol}"
+        )
+    if calib_n < 1:
+        raise ValueError(f"client_calibration_requests must be >= 1, got {calib_n}")
+    connect_s = float(data.get("connect_timeout_s", DEFAULT_CONNECT_TIMEOUT_S))
+    read_s = float(data.get("read_timeout_s", DEFAULT_READ_TIMEOUT_S))
+    if connect_s <= 0:
+        raise ValueError(f"connect_timeout_s must be > 0, got {connect_s}")
+    if read_s <= 0:
+        raise ValueError(f"read_timeout_s must be > 0, got {read_s}")
+    shares = [float(x) for x in (data.get("prefix_share", []) or [])]
+    group_size = int(data.get("prefix_group_size", 0))
+    nonce = bool(data.get("prefix_nonce", True))
+    if any(not 0.0 <= x <= 1.0 for x in shares):
+        raise ValueError(f"prefix_share must be in [0, 1], got {shares}")
+    if group_size < 0:
+        raise ValueError(f"prefix_group_size must be >= 0, got {group_size}")
+    return PerfProfile(
+        concurrency=list(data.get("concurrency", []) or []),
+        input_length=list(data.get("input_length", []) or []),
+        output_length=list(data.get("output_length", []) or []),
+        num_requests_per_concurrency=n_requests,
+        warmup=int(data.get("warmup", 1)),
+        epochs=int(data.get("epochs", 1)),
+        temperature=float(data.get("temperature", 0.0)),
+        engine=eng,
+        stream=bool(data.get("stream", False)),
+        control_method=method,
+        growth_rate=growth_rate,
+        growth_interval_ms=int(data.get("growth_interval_ms", 5000)),
+        init_concurrency=int(data.get("init_concurrency", 1)),
+        request_rate=rates,
+        arrival=arrival,
+        seed=int(data.get("seed", 0)),
+        ignore_eos=bool(data.get("ignore_eos", True)),
+        tokenizer_path=data.get("tokenizer_path") or None,
+        calibrate_prompt=bool(data.get("calibrate_prompt", False)),
+        prompt_cache_dir=data.get("prompt_cache_dir") or None,
+        record_format=record_format,
+        histogram_precision=precision,
+        workers=workers,
+        agents=agents,
+        slo=slo,
+        search_over=search_over,
+        search_min=search.low,
+        search_max=search.high,
+        search_tolerance=search.tolerance,
+        search_max_probes=search.max_probes,
+        goodput_slo=parse_goodput_slo(data.get("goodput_slo")),
+        trace_path=data.get("trace_path") or None,
+        trace_time_scale=trace_scale,
+        trace_loop=trace_loop,
+        trace_max_requests=None if trace_max is None else int(trace_max),
+        prefix_share=shares,
+        prefix_group_size=group_size,
+        prefix_nonce=nonce,
+        session_turns=turns,
+        think_time_ms=think_ms,
+        backend=backend,
+        mix=mix,
+        steady_state=bool(data.get("steady_state", False)),
+        steady_tolerance=steady_tol,
+        timeline_bucket_s=bucket_s,
+        ci_target=ci_target,
+        ci_confidence=ci_confidence,
+        ci_metric=ci_metric,
+        ci_quantiles=ci_quantiles,
+        min_requests=min_requests,
+        max_requests=max_requests,
+        client_check=bool(data.get("client_check", False)),
+        client_cpu_limit=cpu_limit,
+        client_margin=margin,
+        client_concurrency_tolerance=conc_tol,
+        client_calibration_requests=calib_n,
+        connect_timeout_s=connect_s,
+        read_timeout_s=read_s,
+    )
+
+
+def http_pool_size(profile: PerfProfile) -> int:
+    """档位测量中可能达到的最大闭环并发，用作共享 HTTP 连接池的大小。
+
+    search 控制且 `search_over=concurrency` 时取 `search_max`，否则取
+    `concurrency` 列表的最大值（至少 1）。
+    """
+
+    size = max(profile.concurrency, default=1)
+    if profile.control_method == "search" and profile.search_over == "concurrency":
+        size = max(size, int(math.ceil(profile.search_max)))
+    return max(1, size)
+
+
+def effective_engine(profile: PerfProfile) -> str:
+    """档位测量实际使用的执行引擎。
+
+    static/search 控制取 `profile.engine`；climb/rate/trace/session 控制
+    固定使用 asyncio（与 `engine` 配置无关）。
+    """
+
+    if profile.control_method in ENGINE_CONTROL_METHODS:
+        return profile.engine
+    return "asyncio"
@@ -0,0 +1,315 @@
+"""性能测试提示词合成（字符级 / token 精确）与磁盘缓存。
+
+`input_length` 的两种解释：
+- 字符级（默认）：`make_prompt(length)` 截取固定文本，长度为字符数，兼容历史结果；
+- token 级：按目标模型的 token 数合成提示词。给定本地 `tokenizer.json`
+  （需可选依赖 `tokenizers`）时逐 token 精确截断；否则可向服务端发两次探测请求，
+  根据 `usage.prompt_tokens` 标定“每字符 token 数”后按比例截取（近似）。
+
+token 级提示词按 `(model, length, seed)` 缓存到内存，并可落盘到
+`cache_dir/<model>/<length>_<seed>_<指纹>.json`，使重复运行无需再次分词或标定，
+且同一种子下的提示词内容逐字节可复现。指纹取分词器标识（路径）或四舍五入后的
+每字符 token 数，并写入缓存内容、读取时校验：更换分词器或标定结果变化时不会
+误用旧文本。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Sequence, Tuple
+
+from vllm_cibench.clients.openai_client import OpenAICompatClient
+
+PROMPT_UNIT = (
+    "vLLM is a fast and flexible LLM serving engine. "
+    "它支持OpenAI兼容接口与多种推理配置。 "
+)
+
+CORPUS_SENTENCES: Tuple[str, ...] = (
+    "vLLM is a fast and flexible LLM serving engine. ",
+    "它支持OpenAI兼容接口与多种推理配置。 ",
+    "PagedAttention manages the key-value cache in fixed-size blocks. ",
+    "连续批处理可以在解码阶段动态插入新的请求。 ",
+    "Throughput and latency must be measured under realistic load. ",
+    "量化权重能够降低显存占用并提升吞吐。 ",
+    "Speculative decoding drafts several tokens and verifies them at once. ",
+    "前缀缓存可复用相同系统提示词的计算结果。 ",
+)
+
+
+class TokenizerLike(Protocol):
+    """最小分词器协议：`encode` 返回 token id 列表，`decode` 还原文本。"""
+
+    def encode(self, text: str) -> List[int]: ...
+
+    def decode(self, ids: Sequence[int]) -> str: ...
+
+
+class _HFTokenizer:
+    """`tokenizers.Tokenizer` 的适配器（`encode(...).ids` → `List[int]`）。"""
+
+    def __init__(self, tok: Any) -> None:
+        self._tok = tok
+
+    def encode(self, text: str) -> List[int]:
+        return list(self._tok.encode(text, add_special_tokens=False).ids)
+
+    def decode(self, ids: Sequence[int]) -> str:
+        return str(self._tok.decode(list(ids)))
+
+
+def make_prompt(length: int) -> str:
+    """生成近似给定长度的中英混合提示词。
+
+    参数:
+        length: 期望字符长度。
+
+    返回值:
+        str: 由若干段文本拼接而成，长度恰为 `length`（至少 0）。
+    """
+
+    n = max(0, int(length))
+    return (PROMPT_UNIT * (n // len(PROMPT_UNIT) + 1))[:n]
+
+
+def corpus_text(n_chars: int, seed: int = 0) -> str:
+    """按种子生成至少 `n_chars` 个字符的语料文本。
+
+    每一轮将 `CORPUS_SENTENCES` 以 `random.Random(seed)` 打乱后拼接，
+    不同种子得到不同的句子顺序，同一种子结果确定。
+
+    参数:
+        n_chars: 最少字符数。
+        seed: 随机种子。
+
+    返回值:
+        str: 语料文本（长度 >= `n_chars`）。
+    """
+
+    rng = random.Random(seed)
+    parts: List[str] = []
+    total = 0
+    pool = list(CORPUS_SENTENCES)
+    while total < max(1, n_chars):
+        rng.shuffle(pool)
+        parts.extend(pool)
+        total += sum(len(s) for s in pool)
+    return "".join(parts)
+
+
+def load_tokenizer(path: str) -> TokenizerLike:
+    """加载本地 HuggingFace `tokenizer.json`。
+
+    参数:
+        path: `tokenizer.json` 文件路径，或包含该文件的模型目录。
+
+    返回值:
+        TokenizerLike: 分词器适配对象。
+
+    异常:
+        RuntimeError: 未安装可选依赖 `tokenizers`。
+        FileNotFoundError: 路径下不存在 `tokenizer.json`。
+    """
+
+    try:
+        from tokenizers import Tokenizer  # type: ignore[import-not-found]
+    except ImportError as e:  # pragma: no cover - 取决于环境
+        raise RuntimeError(
+            "tokenizer_path requires the optional 'tokenizers' package"
+        ) from e
+    p = Path(path)
+    if p.is_dir():
+        p = p / "tokenizer.json"
+    if not p.is_file():
+        raise FileNotFoundError(f"tokenizer file not found: {p}")
+    return _HFTokenizer(Tokenizer.from_file(str(p)))
+
+
+def calibrate_tokens_per_char(
+    base_url: str,
+    model: str,
+    *,
+    api_key: Optional[str] = None,
+    probe_chars: Tuple[int, int] = (256, 1024),
+) -> float:
+    """通过服务端 `usage.prompt_tokens` 标定“每字符 token 数”。
+
+    以两种长度的语料各发一次 `max_tokens=1` 的 chat 请求，取 prompt token
+    增量与字符增量之比，从而扣除 chat 模板等固定开销。
+
+    参数:
+        base_url: 服务基础 URL（/v1）。
+        model: 模型名。
+        api_key: 可选 API Key。
+        probe_chars: 两次探测的字符数（须不同）。
+
+    返回值:
+        float: 每字符 token 数（> 0）。
+
+    异常:
+        ValueError: 响应缺少 `usage.prompt_tokens` 或标定结果非正。
+    """
+
+    counts: List[int] = []
+    with OpenAICompatClient(base_url=base_url, api_key=api_key) as client:
+        for n in probe_chars:
+            out = client.chat_completions(
+                model=model,
+                messages=[{"role": "user", "content": corpus_text(n)[:n]}],
+                max_tokens=1,
+                temperature=0.0,
+            )
+            usage = out.get("usage") if isinstance(out, dict) else None
+            tokens = usage.get("prompt_tokens") if isinstance(usage, dict) else None
+            if not isinstance(tokens, int):
+                raise ValueError("calibration response lacks usage.prompt_tokens")
+            counts.append(tokens)
+    d_chars = probe_chars[1] - probe_chars[0]
+    ratio = (counts[1] - counts[0]) / d_chars if d_chars else 0.0
+    if ratio <= 0:
+        raise ValueError(f"invalid tokens-per-char calibration: {counts}")
+    return float(ratio)
+
+
+class PromptBuilder:
+    """按目标长度合成提示词，并缓存 token 级结果。
+
+    参数:
+        model: 模型名（缓存键的一部分）。
+        tokenizer: 分词器；给定时按 token 精确截断。
+        tokens_per_char: 标定得到的每字符 token 数；仅在无分词器时使用。
+        cache_dir: 磁盘缓存根目录；None 表示仅内存缓存。
+        seed: 语料种子（缓存键的一部分）。
+        tokenizer_id: 分词器标识（如 `tokenizer_path`，缓存指纹的一部分）；
+            缺省取分词器类型名。
+
+    两者均未给定时退化为字符级 `make_prompt`（不缓存）。
+    """
+
+    def __init__(
+        self,
+        model: str,
+        *,
+        tokenizer: Optional[TokenizerLike] = None,
+        tokens_per_char: Optional[float] = None,
+        cache_dir: Optional[str] = None,
+        seed: int = 0,
+        tokenizer_id: Optional[str] = None,
+    ) -> None:
+        self.model = model
+        self.tokenizer = tokenizer
+        self.tokenizer_id = tokenizer_id
+        self.tokens_per_char = tokens_per_char
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.seed = int(seed)
+        self._memo: Dict[int, str] = {}
+
+    @property
+    def method(self) -> str:
+        """合成方式：`tokenizer` / `calibrated` / `chars`。"""
+
+        if self.tokenizer is not None:
+            return "tokenizer"
+        if self.tokens_per_char:
+            return "calibrated"
+        return "chars"
+
+    @property
+    def fingerprint(self) -> str:
+        """token 级合成的来源指纹：`tokenizer:<标识>` 或 `tpc:<每字符 token 数>`。"""
+
+        if self.tokenizer is not None:
+            return f"tokenizer:{self.tokenizer_id or type(self.tokenizer).__name__}"
+        return f"tpc:{float(self.tokens_per_char or 0.0):.4f}"
+
+    def cache_path(self, length: int) -> Optional[Path]:
+        """返回 `(model, length, seed, 指纹)` 对应的缓存文件路径（未配置目录时为 None）。"""
+
+        if self.cache_dir is None:
+            return None
+        safe = re.sub(r"[^A-Za-z0-9._-]+", "_", self.model) or "model"
+        digest = hashlib.sha1(self.fingerprint.encode("utf-8")).hexdigest()[:8]
+        return self.cache_dir / safe / f"{int(length)}_{self.seed}_{digest}.json"
+
+    def build(self, length: int) -> str:
+        """返回目标长度的提示词。
+
+        参数:
+            length: 目标长度（token 级方式下为 token 数，否则为字符数）。
+
+        返回值:
+            str: 提示词文本。
+
+        副作用:
+            token 级方式下首次生成时写入磁盘缓存（若配置了 `cache_dir`）。
+        """
+
+        method = self.method
+        if method == "chars":
+            return make_prompt(length)
+        if length in self._memo:
+            return self._memo[length]
+        path = self.cache_path(length)
+        text = self._load(path, method)
+        if text is None:
+            if self.tokenizer is not None:
+                text = self._fit_tokens(self.tokenizer, length)
+            else:
+                n = max(1, round(length / float(self.tokens_per_char or 1.0)))
+                text = corpus_text(n, self.seed)[:n]
+            self._store(path, method, length, text)
+        self._memo[length] = text
+        return text
+
+    def _fit_tokens(self, tok: TokenizerLike, length: int) -> str:
+        """从语料中截取恰好 `length` 个 token 的文本（边界合并时微调截断点）。"""
+
+        if length <= 0:
+            return ""
+        n_chars = length * 4 + 64
+        ids = tok.encode(corpus_text(n_chars, self.seed))
+        while len(ids) < length:
+            n_chars *= 2
+            ids = tok.encode(corpus_text(n_chars, self.seed))
+        cut = length
+        text = tok.decode(ids[:cut])
+        for _ in range(8):
+            got = len(tok.encode(text))
+            if got == length:
+                break
+            cut = max(1, min(len(ids), cut + (length - got)))
+            text = tok.decode(ids[:cut])
+        return text
+
+    def _load(self, path: Optional[Path], method: str) -> Optional[str]:
+        if path is None or not path.is_file():
+            return None
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("method") != method:
+            return None
+        if data.get("fingerprint") != self.fingerprint:
+            return None
+        text = data.get("text")
+        return text if isinstance(text, str) else None
+
+    def _store(self, path: Optional[Path], method: str, length: int, text: str) -> None:
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "model": self.model,
+            "length": int(length),
+            "seed": self.seed,
+            "method": method,
+            "tokens_per_char": self.tokens_per_char,
+            "fingerprint": self.fingerprint,
+            "text": text,
+        }
+        path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
@@ -0,0 +1,258 @@
+"""性能执行的逐请求记录与负载点汇总产物（requests_* / summary_*）。
+
+- `RequestLogWriter`：请求完成即追加一行到 `requests_<tag>.csv|jsonl`，
+  不在内存中保留记录，长时间压测的内存占用与请求数无关；
+- `summary_row` / `write_summary_csv`：每个负载点一行，含请求数、失败数、
+  失败率与分类失败数、QPS 与 token 吞吐（仅成功请求）、 E2E/TTFT/TPOT 的 P50/P75/P90/P95/P99/AVG/MAX。
+
+逐请求记录中的时间戳为墙钟（Unix 秒），由单调时钟按写入器创建时刻换算，
+便于与服务端日志对齐排查慢请求。
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import time
+from pathlib import Path
+from types import TracebackType
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from vllm_cibench.testsuites.perf import (
+    CLIENT_COLUMNS,
+    ERROR_COLUMNS,
+    GOODPUT_COLUMNS,
+    TOKEN_COLUMNS,
+    ci_columns,
+    dist_columns,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from vllm_cibench.testsuites.perf_exec import RequestRecord
+
+RECORD_FORMATS: Tuple[str, ...] = ("csv", "jsonl")
+
+LOAD_POINT_COLUMNS: Tuple[str, ...] = (
+    "concurrency",
+    "request_rate",
+    "input_len",
+    "output_len",
+    "prefix_share",
+    "turn",
+    "request_type",
+)
+
+REQUEST_COLUMNS: Tuple[str, ...] = LOAD_POINT_COLUMNS + (
+    "send_ts",
+    "first_token_ts",
+    "end_ts",
+    "latency_ms",
+    "ttft_ms",
+    "status",
+    "error",
+    "input_tokens",
+    "output_tokens",
+    "send_lag_ms",
+)
+
+SUMMARY_COLUMNS: Tuple[str, ...] = (
+    LOAD_POINT_COLUMNS
+    + ("requests", "failures", "fail_rate", "qps")
+    + TOKEN_COLUMNS
+    + dist_columns("latency")
+    + dist_columns("ttft")
+    + dist_columns("tpot")
+    + GOODPUT_COLUMNS
+    + tuple(c for c in ERROR_COLUMNS if c != "fail_rate")
+    + ("fail_rate_ci_lo", "fail_rate_ci_hi")
+    + ci_columns("latency")
+    + ci_columns("ttft")
+    + ci_columns("tpot")
+    + CLIENT_COLUMNS
+)
+
+
+def _round(val: Optional[float]) -> Optional[float]:
+    return None if val is None else round(float(val), 6)
+
+
+class RequestLogWriter:
+    """逐请求记录的流式写入器（CSV 或 JSONL）。
+
+    参数:
+        path: 输出文件路径（父目录自动创建）。
+        fmt: `csv` 或 `jsonl`。
+
+    异常:
+        ValueError: 未知格式。
+
+    用法:
+        with RequestLogWriter(path) as w:
+            w.write(record, concurrency=4, input_len=128, output_len=128)
+    """
+
+    def __init__(self, path: str, fmt: str = "csv") -> None:
+        if fmt not in RECORD_FORMATS:
+            raise ValueError(
+                f"unknown record format: {fmt!r}; expected one of {RECORD_FORMATS}"
+            )
+        self.path = Path(path)
+        self.fmt = fmt
+        self.count = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh: IO[str] = self.path.open("w", encoding="utf-8", newline="")
+        self._csv: Optional["csv.DictWriter[str]"] = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(
+                self._fh, fieldnames=list(REQUEST_COLUMNS), restval=""
+            )
+            self._csv.writeheader()
+        # 单调时钟 → 墙钟的换算偏移
+        self._wall_offset = time.time() - time.monotonic()
+
+    def row(self, rec: "RequestRecord", **load_point: Any) -> Dict[str, Any]:
+        """将 `RequestRecord` 与负载点字段转换为一行（键为 `REQUEST_COLUMNS`）。"""
+
+        off = self._wall_offset
+        first = rec.first_token_s
+        out: Dict[str, Any] = {k: load_point.get(k) for k in LOAD_POINT_COLUMNS}
+        out.update(
+            {
+                "send_ts": _round(rec.start_s + off),
+                "first_token_ts": None if first is None else _round(first + off),
+                "end_ts": _round(rec.end_s + off),
+                "latency_ms": _round(rec.latency_ms),
+                "ttft_ms": _round(rec.ttft_ms),
+                "status": "ok" if rec.ok else "fail",
+                "error": rec.error,
+                "input_tokens": int(rec.input_tokens),
+                "output_tokens": int(rec.output_tokens),
+                "send_lag_ms": _round(rec.send_lag_ms),
+            }
+        )
+        return out
+
+    def write(self, rec: "RequestRecord", **load_point: Any) -> None:
+        """追加一条请求记录。
+
+        参数:
+            rec: `perf_exec.RequestRecord`。
+            load_point: 负载点字段（`concurrency/request_rate/input_len/output_len`）。
+
+        副作用:
+            写文件（按行追加，不在内存中累积）。
+        """
+
+        out = self.row(rec, **load_point)
+        if self._csv is not None:
+            self._csv.writerow({k: "" if v is None else v for k, v in out.items()})
+        else:
+            self._fh.write(json.dumps(out, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def flush(self) -> None:
+        """刷新缓冲区（每个负载点结束时调用）。"""
+
+        self._fh.flush()
+
+    def close(self) -> None:
+        """关闭文件。"""
+
+        if not self._fh.closed:
+            self._fh.close()
+
+    def __enter__(self) -> "RequestLogWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def summary_row(
+    summary: Mapping[str, float],
+    *,
+    requests: int,
+    failures: int,
+    **load_point: Any,
+) -> Dict[str, Any]:
+    """构造 summary CSV 的一行。
+
+    参数:
+        summary: `summarize_records` 的结果（含 `throughput_rps` 与分布列）。
+        requests: 该负载点请求总数。
+        failures: 失败请求数。
+        load_point: 负载点字段。
+
+    返回值:
+        dict: 键为 `SUMMARY_COLUMNS` 的子集；缺失的分布列留空。
+    """
+
+    row: Dict[str, Any] = {k: load_point.get(k) for k in LOAD_POINT_COLUMNS}
+    row["requests"] = int(requests)
+    row["failures"] = int(failures)
+    row["fail_rate"] = round(failures / requests, 6) if requests else 0.0
+    row["qps"] = round(float(summary.get("throughput_rps", 0.0)), 3)
+    for col in SUMMARY_COLUMNS:
+        if col in row or col not in summary:
+            continue
+        if col.startswith("errors_") or col == "client_bound":
+            row[col] = int(summary[col])
+        else:
+            row[col] = round(float(summary[col]), 3)
+    return row
+
+
+def write_summary_csv(path: str, rows: Iterable[Mapping[str, Any]]) -> str:
+    """将负载点汇总写入 CSV。
+
+    参数:
+        path: 输出路径（父目录自动创建）。
+        rows: `summary_row` 的结果序列。
+
+    返回值:
+        str: 写入的文件路径。
+    """
+
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with p.open("w", encoding="utf-8", newline="") as fh:
+        writer = csv.DictWriter(
+            fh, fieldnames=list(SUMMARY_COLUMNS), restval="", extrasaction="ignore"
+        )
+        writer.writeheader()
+        for r in rows:
+            writer.writerow({k: "" if v is None else v for k, v in r.items()})
+    return str(p)
+
+
+def read_request_log(path: str) -> List[Dict[str, Any]]:
+    """读取逐请求记录文件（CSV 或 JSONL，按扩展名判断），用于事后分析。
+
+    参数:
+        path: `requests_*.csv` 或 `requests_*.jsonl`。
+
+    返回值:
+        list[dict]: 记录行；CSV 中的值保持字符串。
+    """
+
+    p = Path(path)
+    with p.open("r", encoding="utf-8", newline="") as fh:
+        if p.suffix == ".jsonl":
+            return [json.loads(line) for line in fh if line.strip()]
+        return [dict(r) for r in csv.DictReader(fh)]
@@ -0,0 +1,201 @@
+"""SLO 驱动的饱和点搜索：在时延目标下寻找可持续的最大并发/QPS。
+
+固定的 `concurrency: [1, 2, 4, 8, 16]` 扫描只能靠肉眼读拐点，且大量测量点落在
+远离拐点的区域。本模块给定 SLO（如 `ttft_p99_ms <= 2000`、`tpot_p99_ms <= 80`）
+后按“倍增（galloping）+ 二分”选择下一个负载点：
+
+1. 从下界起每次将负载翻倍，直至违反 SLO 或到达上界；
+2. 在最后一个满足点与首个违反点之间二分，直至区间收敛
+   （并发：相差 1；QPS：相对宽度不超过 `tolerance`）或探测次数用尽。
+
+最终报告满足 SLO 的最大负载（capacity），作为容量规划的单一指标。
+搜索以 `next_probe/observe` 增量驱动，便于在生成器中逐点测量并输出。
+
+另提供逐请求 SLO（goodput）判定：`request_met_slo` 判断单个请求的
+TTFT/TPOT/E2E 是否达标，`LoadStats` 据此统计达标率与有效吞吐。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Tuple
+
+from vllm_cibench.testsuites.perf import dist_columns
+
+if TYPE_CHECKING:  # pragma: no cover
+    from vllm_cibench.testsuites.perf_exec import RequestRecord
+
+SEARCH_DIMENSIONS: Tuple[str, ...] = ("concurrency", "rate")
+# SLO 可约束的指标：E2E/TTFT/ITL/TPOT 的分布列与失败率
+SLO_KEYS: Tuple[str, ...] = (
+    dist_columns("latency")
+    + dist_columns("ttft")
+    + dist_columns("itl")
+    + dist_columns("tpot")
+    + ("fail_rate",)
+)
+
+# 逐请求 SLO 可约束的指标（对应 `RequestRecord` 的同名属性，毫秒）
+GOODPUT_SLO_KEYS: Tuple[str, ...] = ("ttft_ms", "tpot_ms", "latency_ms")
+
+
+def _parse_limits(
+    data: Optional[Mapping[str, object]], keys: Tuple[str, ...], what: str
+) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for key, value in (data or {}).items():
+        if key not in keys:
+            raise ValueError(f"unknown {what} metric: {key!r}; expected one of {keys}")
+        limit = float(value)  # type: ignore[arg-type]
+        if limit <= 0:
+            raise ValueError(f"{what} limit for {key} must be > 0, got {limit}")
+        out[key] = limit
+    return out
+
+
+def parse_slo(data: Optional[Mapping[str, object]]) -> Dict[str, float]:
+    """解析 SLO 配置（指标名 -> 上限）。
+
+    参数:
+        data: 如 `{"ttft_p99_ms": 2000, "tpot_p99_ms": 80}`；None 表示不设 SLO。
+
+    返回值:
+        dict[str, float]: 规范化后的 SLO。
+
+    异常:
+        ValueError: 指标名不在 `SLO_KEYS` 中，或上限非正数。
+    """
+
+    return _parse_limits(data, SLO_KEYS, "SLO")
+
+
+def parse_goodput_slo(data: Optional[Mapping[str, object]]) -> Dict[str, float]:
+    """解析逐请求 SLO（goodput）配置。
+
+    参数:
+        data: 如 `{"ttft_ms": 2000, "tpot_ms": 80, "latency_ms": 30000}`。
+
+    返回值:
+        dict[str, float]: 规范化后的逐请求 SLO。
+
+    异常:
+        ValueError: 指标名不在 `GOODPUT_SLO_KEYS` 中，或上限非正数。
+    """
+
+    return _parse_limits(data, GOODPUT_SLO_KEYS, "goodput SLO")
+
+
+def request_met_slo(rec: "RequestRecord", slo: Mapping[str, float]) -> bool:
+    """判断单个请求是否满足逐请求 SLO。
+
+    失败请求不达标；约束了 `ttft_ms` 而请求没有 TTFT（非流式）时不达标；
+    `tpot_ms` 在输出不足 2 个 token（无解码阶段）时视为达标。
+    """
+
+    if not rec.ok:
+        return False
+    for key, limit in slo.items():
+        value = getattr(rec, key)
+        if value is None:
+            if key == "tpot_ms":
+                continue
+            return False
+        if float(value) > limit:
+            return False
+    return True
+
+
+def slo_met(summary: Mapping[str, float], slo: Mapping[str, float]) -> bool:
+    """判断一个负载点的汇总是否满足全部 SLO。
+
+    参数:
+        summary: 负载点汇总（`LoadStats.summary` 的结果，可附加 `fail_rate`）。
+        slo: `parse_slo` 的结果。
+
+    返回值:
+        bool: 全部满足为 True；被约束的指标缺失（如非流式运行的 TTFT）视为不满足。
+    """
+
+    for key, limit in slo.items():
+        value = summary.get(key)
+        if value is None or float(value) > limit:
+            return False
+    return True
+
+
+@dataclass
+class CapacitySearch:
+    """倍增 + 二分的容量搜索状态机。
+
+    参数:
+        low: 搜索下界（首个探测点）。
+        high: 搜索上界（不会探测超过该值的负载）。
+        integer: 是否为整数维度（并发）；否则为连续维度（QPS）。
+        tolerance: 连续维度的收敛阈值（区间相对宽度）。
+        max_probes: 最多探测次数。
+
+    异常:
+        ValueError: 上下界或参数非法。
+    """
+
+    low: float
+    high: float
+    integer: bool = True
+    tolerance: float = 0.05
+    max_probes: int = 12
+    probes: List[Tuple[float, bool]] = field(default_factory=list)
+    _good: Optional[float] = field(default=None, init=False, repr=False)
+    _bad: Optional[float] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.low <= 0 or self.high < self.low:
+            raise ValueError(
+                f"search bounds must satisfy 0 < low <= high, got {self.low}, {self.high}"
+            )
+        if self.max_probes < 1:
+            raise ValueError(f"max_probes must be >= 1, got {self.max_probes}")
+        if not self.integer and not 0.0 < self.tolerance < 1.0:
+            raise ValueError(f"tolerance must be in (0, 1), got {self.tolerance}")
+
+    def _norm(self, x: float) -> float:
+        return float(round(x)) if self.integer else float(x)
+
+    def _converged(self, good: float, bad: float) -> bool:
+        if self.integer:
+            return bad - good <= 1
+        return (bad - good) / good <= self.tolerance
+
+    def next_probe(self) -> Optional[float]:
+        """返回下一个待测负载；搜索结束时返回 None。"""
+
+        if len(self.probes) >= self.max_probes:
+            return None
+        good, bad = self._good, self._bad
+        if good is None:
+            # 尚无满足点：探测下界；下界即违反则结束
+            return None if bad is not None else self._norm(self.low)
+        if bad is None:
+            if good >= self.high:
+                return None
+            return self._norm(min(good * 2.0, self.high))
+        if self._converged(good, bad):
+            return None
+        mid = self._norm((good + bad) / 2.0)
+        if mid <= good or mid >= bad:
+            return None
+        return mid
+
+    def observe(self, load: float, ok: bool) -> None:
+        """记录负载 `load` 的探测结果。"""
+
+        self.probes.append((load, ok))
+        if ok:
+            self._good = load if self._good is None else max(self._good, load)
+        else:
+            self._bad = load if self._bad is None else min(self._bad, load)
+
+    @property
+    def capacity(self) -> float:
+        """满足 SLO 的最大已测负载（无满足点时为 0）。"""
+
+        return self._good or 0.0
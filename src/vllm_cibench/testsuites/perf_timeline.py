@@ -0,0 +1,250 @@
+"""逐秒时间序列与稳态窗口检测。
+
+整段汇总（一个 P50、一个 RPS）会把爬升期（在途请求尚未达到目标并发）与收尾期
+（最后一批请求陆续完成、在途请求递减）一并计入；预热批次只有少量并发，无法
+可靠消除这些瞬态。本模块把一个负载点的请求按时间分桶（默认 1 秒）：
+
+- 按完成时刻归桶：完成数、失败数、输出 token 数与时延/TTFT 直方图（`LoadStats`，
+  定长内存、可合并）；
+- 按请求的在途区间与桶的重叠时长累计平均在途数（in-flight）。
+
+稳态检测（`steady_window`）以平均在途数为信号：取非零桶的中位数作为平台水平，
+首个与最后一个达到平台 `1 - tolerance` 的桶之间即为稳态窗口，窗口外的爬升与
+收尾被裁剪；窗口短于 `min_buckets` 时视为未检测到稳态（回退为整段汇总）。
+"""
+
+from __future__ import annotations
+
+import csv
+import math
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from vllm_cibench.testsuites.perf_exec import LoadStats, RequestRecord
+
+DEFAULT_BUCKET_S = 1.0
+DEFAULT_TOLERANCE = 0.2
+DEFAULT_MIN_BUCKETS = 3
+
+# 时间序列产物的指标列（负载点字段列见 `perf_records.LOAD_POINT_COLUMNS`）
+TIMELINE_COLUMNS: Tuple[str, ...] = (
+    "t_s",
+    "completions",
+    "failures",
+    "rps",
+    "output_tps",
+    "inflight_avg",
+    "latency_p50_ms",
+    "latency_p90_ms",
+    "latency_p99_ms",
+    "ttft_p50_ms",
+    "ttft_p99_ms",
+    "steady",
+)
+
+
+def steady_window(
+    levels: Sequence[float],
+    *,
+    tolerance: float = DEFAULT_TOLERANCE,
+    min_buckets: int = DEFAULT_MIN_BUCKETS,
+) -> Optional[Tuple[int, int]]:
+    """在逐桶的在途水平序列中检测稳态窗口。
+
+    参数:
+        levels: 逐桶平均在途数。
+        tolerance: 相对平台水平（非零桶中位数）的允许下探比例。
+        min_buckets: 稳态窗口的最少桶数。
+
+    返回值:
+        (lo, hi) | None: 半开区间 `[lo, hi)` 的桶下标；未检测到稳态时为 None。
+
+    异常:
+        ValueError: `tolerance` 不在 [0, 1) 或 `min_buckets < 1`。
+    """
+
+    if not 0.0 <= tolerance < 1.0:
+        raise ValueError(f"tolerance must be in [0, 1), got {tolerance}")
+    if min_buckets < 1:
+        raise ValueError(f"min_buckets must be >= 1, got {min_buckets}")
+    active = sorted(v for v in levels if v > 0)
+    if not active:
+        return None
+    floor = (1.0 - tolerance) * active[len(active) // 2]
+    hits = [i for i, v in enumerate(levels) if v >= floor]
+    lo, hi = hits[0], hits[-1] + 1
+    if hi - lo < min_buckets:
+        return None
+    return lo, hi
+
+
+class Timeline:
+    """一个负载点的逐桶统计。
+
+    参数:
+        make_stats: 创建空 `LoadStats` 的工厂（决定直方图精度与 goodput SLO）。
+        bucket_s: 桶宽（秒）。
+        origin_s: 桶 0 的起点（秒；默认取首条记录的发出时刻）。分项时间序列
+            传入整体序列的起点，使两者桶下标对齐。
+
+    异常:
+        ValueError: `bucket_s <= 0`。
+    """
+
+    def __init__(
+        self,
+        make_stats: Callable[[], "LoadStats"],
+        bucket_s: float = DEFAULT_BUCKET_S,
+        origin_s: Optional[float] = None,
+    ) -> None:
+        if bucket_s <= 0:
+            raise ValueError(f"bucket_s must be > 0, got {bucket_s}")
+        self.bucket_s = float(bucket_s)
+        self.origin_s = origin_s
+        self._make_stats = make_stats
+        self._stats: Dict[int, "LoadStats"] = {}
+        self._inflight_s: Dict[int, float] = {}
+
+    def _index(self, t: float) -> int:
+        assert self.origin_s is not None
+        return math.floor((t - self.origin_s) / self.bucket_s)
+
+    def add(self, rec: "RequestRecord") -> None:
+        """计入一条请求记录（按完成时刻归桶，并累计在途时长）。"""
+
+        if self.origin_s is None:
+            self.origin_s = rec.start_s
+        end = self._index(rec.end_s)
+        stats = self._stats.get(end)
+        if stats is None:
+            stats = self._stats[end] = self._make_stats()
+        stats.add(rec)
+        for i in range(self._index(rec.start_s), end + 1):
+            lo = self.origin_s + i * self.bucket_s
+            overlap = min(rec.end_s, lo + self.bucket_s) - max(rec.start_s, lo)
+            if overlap > 0:
+                self._inflight_s[i] = self._inflight_s.get(i, 0.0) + overlap
+
+    def _span(self) -> range:
+        keys = [*self._stats, *self._inflight_s]
+        return range(min(keys), max(keys) + 1) if keys else range(0)
+
+    def levels(self) -> List[float]:
+        """逐桶平均在途数（从首个非空桶到最后一个非空桶，含中间空桶）。"""
+
+        return [self._inflight_s.get(i, 0.0) / self.bucket_s for i in self._span()]
+
+    def steady(
+        self,
+        *,
+        tolerance: float = DEFAULT_TOLERANCE,
+        min_buckets: int = DEFAULT_MIN_BUCKETS,
+    ) -> Optional[Tuple[int, int]]:
+        """检测稳态窗口（桶下标半开区间，见 `steady_window`）。"""
+
+        return steady_window(
+            self.levels(), tolerance=tolerance, min_buckets=min_buckets
+        )
+
+    def window_stats(self, lo: int, hi: int) -> Tuple["LoadStats", float]:
+        """合并 `[lo, hi)` 桶的统计。
+
+        返回值:
+            (stats, duration_s): 合并后的统计与窗口时长（秒）。
+        """
+
+        return self.merged(self.buckets(lo, hi)), (hi - lo) * self.bucket_s
+
+    def buckets(self, lo: int, hi: int) -> range:
+        """窗口 `[lo, hi)`（相对首个非空桶）对应的绝对桶下标。"""
+
+        return self._span()[lo:hi]
+
+    def merged(self, buckets: Iterable[int]) -> "LoadStats":
+        """合并给定绝对桶下标的统计（不存在的桶视为空）。"""
+
+        merged = self._make_stats()
+        for i in buckets:
+            if i in self._stats:
+                merged.merge(self._stats[i])
+        return merged
+
+    def rows(self, window: Optional[Tuple[int, int]] = None) -> List[Dict[str, Any]]:
+        """逐桶指标行（键为 `TIMELINE_COLUMNS`）。
+
+        参数:
+            window: 稳态窗口；窗口内的行 `steady=1`，其余为 0（None 时全部为 0）。
+
+        返回值:
+            list[dict]: `t_s` 为桶起点相对首个桶的秒数。
+        """
+
+        out: List[Dict[str, Any]] = []
+        levels = self.levels()
+        for pos, i in enumerate(self._span()):
+            stats = self._stats.get(i) or self._make_stats()
+            ok = stats.latency
+            lat = ok.percentiles([50, 90, 99]) if ok.count else [None] * 3
+            ttft = stats.ttft.percentiles([50, 99]) if stats.ttft.count else [None] * 2
+            out.append(
+                {
+                    "t_s": round(pos * self.bucket_s, 3),
+                    "completions": stats.requests - stats.failures,
+                    "failures": stats.failures,
+                    "rps": round((stats.requests - stats.failures) / self.bucket_s, 3),
+                    "output_tps": round(stats.output_tokens_sum / self.bucket_s, 3),
+                    "inflight_avg": round(levels[pos], 3),
+                    "latency_p50_ms": _round(lat[0]),
+                    "latency_p90_ms": _round(lat[1]),
+                    "latency_p99_ms": _round(lat[2]),
+                    "ttft_p50_ms": _round(ttft[0]),
+                    "ttft_p99_ms": _round(ttft[1]),
+                    "steady": int(window is not None and window[0] <= pos < window[1]),
+                }
+            )
+        return out
+
+
+def _round(val: Optional[float]) -> Optional[float]:
+    return None if val is None else round(float(val), 3)
+
+
+def write_timeline_csv(
+    path: str, rows: Iterable[Mapping[str, Any]], load_columns: Sequence[str]
+) -> str:
+    """将时间序列写入 CSV。
+
+    参数:
+        path: 输出路径（父目录自动创建）。
+        rows: 负载点字段与 `Timeline.rows` 合并后的行。
+        load_columns: 负载点字段列（位于指标列之前）。
+
+    返回值:
+        str: 写入的文件路径。
+    """
+
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    with p.open("w", encoding="utf-8", newline="") as fh:
+        writer = csv.DictWriter(
+            fh,
+            fieldnames=[*load_columns, *TIMELINE_COLUMNS],
+            restval="",
+            extrasaction="ignore",
+        )
+        writer.writeheader()
+        for r in rows:
+            writer.writerow({k: "" if v is None else v for k, v in r.items()})
+    return str(p)
@@ -0,0 +1,163 @@
+"""JSONL 请求轨迹（trace）的惰性读取与回放调度。
+
+轨迹每行一个 JSON 对象，描述一次历史请求：
+
+- `timestamp`（秒）或 `offset_ms`（毫秒）：到达时刻；`timestamp` 可为绝对时间
+  （如 Unix 秒），按首行归一化为相对偏移；
+- `input_len`/`input_tokens` 与 `output_len`/`output_tokens`：输入/输出长度，
+  输入按长度合成提示词，输出作为 `max_tokens`（可配合 `ignore_eos`）；
+- `messages`（可选）：完整消息数组，给定时优先于 `input_len`；
+- `params`（可选）：该请求的采样参数（如 `temperature`、`top_p`），覆盖档位默认值。
+
+读取与调度均为生成器：逐行解析、按需产出，百万行级轨迹无需整体载入内存；
+`time_scale` 压缩/拉伸到达间隔，`loop` 重复回放（每轮在上一轮末请求之后接续）。
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+
+@dataclass
+class TraceRequest:
+    """轨迹中的一次请求。
+
+    属性:
+        offset_s: 相对回放起点的计划发出时刻（秒）。
+        input_len: 输入长度（无 `messages` 时用于合成提示词）。
+        output_len: 输出长度（None 表示不约束）。
+        messages: 完整消息数组（可选）。
+        params: 该请求的采样参数覆盖。
+        line: 源文件行号（1 起，便于定位）。
+    """
+
+    offset_s: float
+    input_len: int = 0
+    output_len: Optional[int] = None
+    messages: Optional[List[Dict[str, Any]]] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+    line: int = 0
+
+
+def _first_int(obj: Mapping[str, Any], *keys: str) -> Optional[int]:
+    for key in keys:
+        if obj.get(key) is not None:
+            return int(obj[key])
+    return None
+
+
+def parse_trace_line(obj: Mapping[str, Any], line: int = 0) -> TraceRequest:
+    """把一行轨迹对象解析为 `TraceRequest`（`offset_s` 为原始时刻，未归一化）。
+
+    参数:
+        obj: 一行 JSON 解析后的对象。
+        line: 行号（仅用于错误信息）。
+
+    返回值:
+        TraceRequest: 解析结果。
+
+    异常:
+        ValueError: 缺少到达时刻，或既无 `messages` 也无输入长度，或字段类型非法。
+    """
+
+    if obj.get("timestamp") is not None:
+        offset = float(obj["timestamp"])
+    elif obj.get("offset_ms") is not None:
+        offset = float(obj["offset_ms"]) / 1000.0
+    else:
+        raise ValueError(f"trace line {line}: missing 'timestamp' or 'offset_ms'")
+    messages = obj.get("messages")
+    if messages is not None and not isinstance(messages, list):
+        raise ValueError(f"trace line {line}: 'messages' must be a list")
+    input_len = _first_int(obj, "input_len", "input_tokens")
+    if messages is None and input_len is None:
+        raise ValueError(f"trace line {line}: need 'messages' or 'input_len'")
+    params = obj.get("params") or {}
+    if not isinstance(params, Mapping):
+        raise ValueError(f"trace line {line}: 'params' must be an object")
+    return TraceRequest(
+        offset_s=offset,
+        input_len=int(input_len or 0),
+        output_len=_first_int(obj, "output_len", "output_tokens"),
+        messages=messages,
+        params=dict(params),
+        line=line,
+    )
+
+
+def read_trace(path: str) -> Iterator[TraceRequest]:
+    """逐行惰性读取轨迹，到达时刻归一化为相对首行的偏移（秒）。
+
+    空行与 `#` 开头的注释行被跳过。
+
+    参数:
+        path: JSONL 轨迹路径。
+
+    返回值:
+        Iterator[TraceRequest]: 按文件顺序产出。
+
+    异常:
+        ValueError: 某行不是合法 JSON 或字段非法（错误信息含行号）。
+        OSError: 文件不可读。
+    """
+
+    base: Optional[float] = None
+    with Path(path).open("r", encoding="utf-8") as fh:
+        for lineno, raw in enumerate(fh, start=1):
+            text = raw.strip()
+            if not text or text.startswith("#"):
+                continue
+            try:
+                obj = json.loads(text)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"trace line {lineno}: invalid JSON: {exc}") from exc
+            if not isinstance(obj, Mapping):
+                raise ValueError(f"trace line {lineno}: expected a JSON object")
+            req = parse_trace_line(obj, lineno)
+            if base is None:
+                base = req.offset_s
+            req.offset_s -= base
+            yield req
+
+
+def schedule_trace(
+    path: str,
+    *,
+    time_scale: float = 1.0,
+    loop: int = 1,
+    max_requests: Optional[int] = None,
+) -> Iterator[TraceRequest]:
+    """生成回放计划：按 `time_scale` 缩放到达时刻，并按 `loop` 重复。
+
+    参数:
+        path: JSONL 轨迹路径。
+        time_scale: 回放速度倍数（2.0 表示间隔减半、负载翻倍）。
+        loop: 回放轮数（至少 1）；第 k 轮整体后移前 k 轮的时长。
+        max_requests: 最多产出的请求数（None 不限制）。
+
+    返回值:
+        Iterator[TraceRequest]: `offset_s` 为缩放、接续后的计划时刻，非递减
+        （轨迹乱序的行按不早于前一请求的时刻发出）。
+
+    异常:
+        ValueError: `time_scale <= 0` 或 `loop < 1`。
+    """
+
+    if time_scale <= 0:
+        raise ValueError(f"trace time_scale must be > 0, got {time_scale}")
+    if loop < 1:
+        raise ValueError(f"trace loop must be >= 1, got {loop}")
+    emitted = 0
+    base = 0.0
+    last = 0.0
+    for _ in range(int(loop)):
+        for req in read_trace(path):
+            if max_requests is not None and emitted >= max_requests:
+                return
+            last = max(last, base + req.offset_s / time_scale)
+            yield replace(req, offset_s=last)
+            emitted += 1
+        base = last
@@ -0,0 +1,303 @@
+"""多进程压测：将一个负载点拆分到 N 个工作进程并合并结果。
+
+单个 Python 进程受 GIL 限制，SSE 解析在每秒数千请求量级即饱和；对小模型或
+高 QPS 场景，压测端会先于服务端成为瓶颈。本模块把一个负载点的负载按份额
+（`split_counts`）拆成若干“分片”（shard），每个分片在独立进程中执行：
+
+- `static`：并发与请求数按进程均分（kind=`batch`）；
+- `rate`：目标 QPS 与请求数按进程均分（kind=`open_loop`；独立 Poisson 过程
+  之和仍为 Poisson 过程，速率相加）；
+- `climb`：每个阶梯的并发按进程均分（kind=`climb`），阶梯节奏一致。
+
+各进程在 `multiprocessing.Barrier` 处同步后同时开始发请求；请求记录按批经
+队列回传，父进程即时转发给 `on_record`（逐请求记录落盘），各进程的
+`LoadStats` 直方图在结束时精确合并到父进程的 `LoadStep`。
+
+注意：记录中的时间戳为 `time.monotonic()`，Linux 上为系统级单调时钟，跨进程
+可直接比较。
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import queue as _queue
+import traceback
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from vllm_cibench.testsuites.perf_hist import DEFAULT_PRECISION
+from vllm_cibench.testsuites.perf_mix import WorkloadMix
+from vllm_cibench.testsuites.perf_prefix import PrefixWorkload
+
+if TYPE_CHECKING:  # pragma: no cover
+    from vllm_cibench.testsuites.perf_exec import LoadStats, LoadStep, RequestRecord
+
+SHARD_KINDS: Tuple[str, ...] = ("batch", "open_loop", "climb")
+# 工作进程等待同伴就绪的最长时间（秒）
+BARRIER_TIMEOUT_S = 120.0
+# 每批回传的请求记录数
+RECORD_BATCH = 256
+
+ShardEmit = Callable[[int, "RequestRecord"], None]
+
+
+def split_counts(total: int, parts: int) -> List[int]:
+    """将整数 `total` 尽量均匀地拆成 `parts` 份（前若干份多 1）。
+
+    参数:
+        total: 待拆分总数（负数按 0 处理）。
+        parts: 份数（至少 1）。
+
+    返回值:
+        list[int]: 长度为 `parts`、和为 `total` 的列表。
+    """
+
+    n = max(1, int(parts))
+    base, extra = divmod(max(0, int(total)), n)
+    return [base + (1 if i < extra else 0) for i in range(n)]
+
+
+def batch_shards(
+    common: Mapping[str, Any],
+    *,
+    engine: str,
+    concurrency: int,
+    n_requests: int,
+    workers: int,
+) -> List[Dict[str, Any]]:
+    """static 负载点的分片参数：并发与请求数按进程均分，空分片被丢弃。"""
+
+    out: List[Dict[str, Any]] = []
+    for c, n in zip(
+        split_counts(concurrency, workers), split_counts(n_requests, workers)
+    ):
+        if c > 0 and n > 0:
+            out.append(dict(common, engine=engine, concurrency=c, n_requests=n))
+    return out
+
+
+def open_loop_shards(
+    common: Mapping[str, Any],
+    *,
+    request_rate: float,
+    n_requests: int,
+    arrival: str,
+    seed: int,
+    workers: int,
+) -> List[Dict[str, Any]]:
+    """rate 负载点的分片参数。
+
+    速率按请求数份额分配（各分片同时结束），第 i 个分片种子为 `seed*1000+i`。
+    """
+
+    counts = [n for n in split_counts(n_requests, workers) if n > 0]
+    return [
+        dict(
+            common,
+            n_requests=n,
+            request_rate=float(request_rate) * n / max(1, n_requests),
+            arrival=arrival,
+            seed=seed * 1000 + i,
+        )
+        for i, n in enumerate(counts)
+    ]
+
+
+def climb_shards(
+    common: Mapping[str, Any],
+    *,
+    schedule: Sequence[int],
+    interval_s: float,
+    workers: int,
+) -> List[Dict[str, Any]]:
+    """climb 的分片参数：每个阶梯的并发按进程均分，全为 0 的分片被丢弃。"""
+
+    per_step = [split_counts(c, workers) for c in schedule]
+    out: List[Dict[str, Any]] = []
+    for i in range(max(1, int(workers))):
+        sched = [shares[i] for shares in per_step]
+        if any(sched):
+            out.append(dict(common, schedule=sched, interval_s=interval_s))
+    return out
+
+
+def run_shard(
+    kind: str,
+    kwargs: Mapping[str, Any],
+    precision: float = DEFAULT_PRECISION,
+    emit: Optional[ShardEmit] = None,
+    goodput_slo: Optional[Mapping[str, float]] = None,
+) -> Tuple[List["LoadStats"], float]:
+    """在当前进程内执行一个分片。
+
+    参数:
+        kind: `batch`（闭环批，kwargs 含 `engine`）、`open_loop` 或 `climb`。
+        kwargs: 对应执行函数的关键字参数（不含 `on_record`；`workload`/`mix`
+            可为 `PrefixWorkload.to_dict`/`WorkloadMix.to_dict` 的结果）。
+        precision: 统计直方图精度。
+        emit: 每条请求记录的回调 `(step_index, record)`。
+        goodput_slo: 统计的逐请求 SLO（goodput）。
+
+    返回值:
+        (stats_per_step, duration_s)：`batch/open_loop` 只有一个负载点；
+        `climb` 与阶梯一一对应。
+
+    异常:
+        ValueError: 未知分片类型。
+    """
+
+    from vllm_cibench.testsuites import perf_exec as pe
+
+    kwargs = dict(kwargs)
+    if isinstance(kwargs.get("workload"), Mapping):
+        kwargs["workload"] = PrefixWorkload.from_dict(kwargs["workload"])
+    if isinstance(kwargs.get("mix"), Mapping):
+        kwargs["mix"] = WorkloadMix.from_dict(kwargs["mix"])
+    if kind == "climb":
+
+        def _climb_sink(step: "LoadStep", rec: "RequestRecord") -> None:
+            if emit is not None:
+                emit(step.index, rec)
+
+        steps = pe.run_openai_chat_climb(
+            **dict(kwargs),
+            precision=precision,
+            goodput_slo=goodput_slo,
+            on_record=_climb_sink,
+        )
+        return [s.stats for s in steps], sum(s.duration_s for s in steps)
+
+    stats = pe.LoadStats(precision, goodput_slo=dict(goodput_slo or {}))
+
+    def _sink(rec: "RequestRecord") -> None:
+        stats.add(rec)
+        if emit is not None:
+            emit(0, rec)
+
+    kw = dict(kwargs)
+    if kind == "batch":
+        runner = pe.get_batch_runner(str(kw.pop("engine", "thread")))
+        _, _, dur = runner(**kw, on_record=_sink)
+    elif kind == "open_loop":
+        _, _, dur = pe.run_openai_chat_open_loop(**kw, on_record=_sink)
+    else:
+        raise ValueError(f"unknown shard kind: {kind!r}; expected one of {SHARD_KINDS}")
+    return [stats], float(dur)
+
+
+def _process_main(
+    wid: int,
+    kind: str,
+    kwargs: Dict[str, Any],
+    precision: float,
+    goodput_slo: Dict[str, float],
+    barrier: Any,
+    out: Any,
+) -> None:
+    """工作进程入口：同步起跑，分批回传记录，最后回传统计。"""
+
+    try:
+        barrier.wait(timeout=BARRIER_TIMEOUT_S)
+        buf: List[Tuple[int, "RequestRecord"]] = []
+
+        def _emit(idx: int, rec: "RequestRecord") -> None:
+            buf.append((idx, rec))
+            if len(buf) >= RECORD_BATCH:
+                out.put(("records", wid, list(buf)))
+                buf.clear()
+
+        stats, dur = run_shard(kind, kwargs, precision, _emit, goodput_slo)
+        if buf:
+            out.put(("records", wid, list(buf)))
+        out.put(("done", wid, [s.to_dict() for s in stats], dur))
+    except BaseException:
+        out.put(("error", wid, traceback.format_exc()))
+
+
+def run_sharded(
+    kind: str,
+    shards: Sequence[Mapping[str, Any]],
+    steps: Sequence["LoadStep"],
+    *,
+    precision: float = DEFAULT_PRECISION,
+    on_record: Optional[Callable[["LoadStep", "RequestRecord"], None]] = None,
+    start_method: str = "spawn",
+) -> float:
+    """在多个进程中并行执行分片，并把结果合并到 `steps`。
+
+    参数:
+        kind: 分片类型（见 `run_shard`）。
+        shards: 每个进程的参数（`batch_shards` 等的结果）。
+        steps: 父进程中的负载点；分片统计按阶梯序号合并到 `steps[i].stats`
+            （工作进程沿用其逐请求 SLO）。
+        precision: 统计直方图精度（须与 `steps` 一致）。
+        on_record: 每条请求记录到达父进程时的回调 `(step, record)`。
+        start_method: multiprocessing 启动方式（默认 `spawn`，避免继承事件循环/线程）。
+
+    返回值:
+        float: 各进程测量时长的最大值（秒）。
+
+    异常:
+        RuntimeError: 任一工作进程失败或异常退出。
+    """
+
+    from vllm_cibench.testsuites.perf_exec import LoadStats
+
+    goodput_slo = dict(steps[0].stats.goodput_slo) if steps else {}
+    ctx: Any = mp.get_context(start_method)
+    out = ctx.Queue()
+    barrier = ctx.Barrier(len(shards))
+    procs = [
+        ctx.Process(
+            target=_process_main,
+            args=(i, kind, dict(kw), precision, goodput_slo, barrier, out),
+            daemon=True,
+        )
+        for i, kw in enumerate(shards)
+    ]
+    for p in procs:
+        p.start()
+    reported: Set[int] = set()
+    errors: List[str] = []
+    duration = 0.0
+    try:
+        while len(reported) < len(procs):
+            try:
+                msg = out.get(timeout=1.0)
+            except _queue.Empty:
+                for i, p in enumerate(procs):
+                    if i not in reported and p.exitcode not in (None, 0):
+                        reported.add(i)
+                        errors.append(f"worker {i} exited with code {p.exitcode}")
+                continue
+            tag, wid = msg[0], int(msg[1])
+            if tag == "records":
+                if on_record is not None:
+                    for idx, rec in msg[2]:
+                        on_record(steps[idx], rec)
+            elif tag == "done":
+                for idx, data in enumerate(msg[2]):
+                    steps[idx].stats.merge(LoadStats.from_dict(data))
+                duration = max(duration, float(msg[3]))
+                reported.add(wid)
+            else:
+                errors.append(str(msg[2]))
+                reported.add(wid)
+    finally:
+        for p in procs:
+            p.join(timeout=5.0)
+            if p.is_alive():
+                p.terminate()
+    if errors:
+        raise RuntimeError("perf worker failed:\n" + errors[0])
+    return duration
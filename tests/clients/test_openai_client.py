@@ -0,0 +1,151 @@
+"""OpenAI 兼容客户端连接池与超时的测试。"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+from typing import Any, Iterator
+
+import pytest
+import requests
+
+from vllm_cibench.clients.async_openai_client import AsyncOpenAICompatClient
+from vllm_cibench.clients.openai_client import (
+    SSE_DONE,
+    OpenAICompatClient,
+    parse_sse_line,
+    pooled_session,
+    session_scope,
+)
+from vllm_cibench.deploy.mock_server import MockConfig, MockServer
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_exec import run_openai_chat_batch, run_profile_to_csv
+from vllm_cibench.testsuites.perf_profile import (
+    PerfProfile,
+    http_pool_size,
+    profile_from_dict,
+)
+
+MSGS = [{"role": "user", "content": "hi"}]
+
+
+@pytest.fixture
+def mock() -> Iterator[MockServer]:
+    srv = MockServer(MockConfig(ttft_ms=0.0, token_delay_ms=0.0), port=0).start()
+    try:
+        yield srv
+    finally:
+        srv.shutdown()
+
+
+def _connections(session: requests.Session, url: str) -> int:
+    adapter: Any = session.get_adapter(url)
+    return sum(p.num_connections for p in adapter.poolmanager.pools._container.values())
+
+
+def test_client_reuses_keep_alive_connection(mock: MockServer) -> None:
+    with OpenAICompatClient(mock.url) as client:
+        for _ in range(10):
+            client.chat_completions("m", MSGS, max_tokens=2)
+        list(client.stream_chat_completions("m", MSGS, max_tokens=2))
+        session = client._session()
+        assert _connections(session, mock.url) == 1
+    # 退出上下文后自建会话被关闭，再次请求会新建会话
+    assert client._owned is None
+
+
+def test_failed_stream_response_released_to_pool() -> None:
+    cfg = MockConfig(ttft_ms=0.0, token_delay_ms=0.0, fail_rate=1.0)
+    srv = MockServer(cfg, port=0).start()
+    try:
+        with OpenAICompatClient(srv.url, pool_size=1) as client:
+            for _ in range(5):
+                with pytest.raises(requests.HTTPError):
+                    client.chat_completions("m", MSGS, stream=True)
+            # 出错的响应被关闭后连接归还连接池，后续请求复用同一连接
+            assert _connections(client._session(), srv.url) == 1
+    finally:
+        srv.shutdown()
+
+
+def test_thread_batch_pool_sized_to_concurrency(mock: MockServer) -> None:
+    with session_scope(pool_size=4) as http:
+        for _ in range(3):
+            _, fails, _ = run_openai_chat_batch(
+                mock.url, "m", n_requests=40, concurrency=4, session=http
+            )
+            assert fails == 0
+        # 三批共 120 个请求只建立不超过并发数的连接
+        assert 1 <= _connections(http, mock.url) <= 4
+
+
+def test_timeouts_passed_through(requests_mock: Any) -> None:
+    url = "http://example.com/v1/chat/completions"
+    requests_mock.post(url, json={"choices": []})
+    client = OpenAICompatClient(
+        "http://example.com/v1", connect_timeout_s=1.5, read_timeout_s=7.0
+    )
+    client.chat_completions("m", MSGS)
+    assert requests_mock.last_request.timeout == (1.5, 7.0)
+
+
+def test_shared_session_not_closed_and_validation() -> None:
+    shared = pooled_session(2)
+    client = OpenAICompatClient("http://x/v1", session=shared)
+    assert client._session() is shared
+    client.close()
+    client.close()
+    assert shared.get_adapter("http://x").poolmanager is not None
+    shared.close()
+    for bad in ({"pool_size": 0}, {"connect_timeout_s": 0}, {"read_timeout_s": -1}):
+        with pytest.raises(ValueError):
+            OpenAICompatClient("http://x/v1", **bad)
+    with pytest.raises(ValueError):
+        pooled_session(0)
+
+
+def test_parse_sse_line_done_sentinel() -> None:
+    assert parse_sse_line(b"data: [DONE]\n") is SSE_DONE
+    # 空 JSON 对象是普通 chunk，不能与结束标记混淆
+    assert parse_sse_line(b"data: {}") == {}
+    assert parse_sse_line(b"data: {}") is not SSE_DONE
+    assert parse_sse_line(b": keep-alive") is None
+
+
+def test_http_pool_size_covers_search_range() -> None:
+    prof = PerfProfile([1, 8, 4], [8], [8], 1)
+    assert http_pool_size(prof) == 8
+    assert http_pool_size(replace(prof, control_method="search", search_max=48.0)) == 48
+
+
+def test_async_read_timeout_is_per_chunk() -> None:
+    srv = MockServer(MockConfig(ttft_ms=0.0, token_delay_ms=40.0), port=0).start()
+
+    async def _run() -> int:
+        async with AsyncOpenAICompatClient(srv.url, read_timeout_s=0.3) as client:
+            chunks = client.stream_chat_completions("m", MSGS, max_tokens=12)
+            return len([c async for c in chunks])
+
+    try:
+        # 总时长约 0.5s 超过读超时，但相邻 chunk 间隔远小于它，不应中断
+        assert asyncio.run(_run()) == 12
+    finally:
+        srv.shutdown()
+
+
+@pytest.mark.parametrize("engine", ["thread", "asyncio"])
+def test_profile_read_timeout_reaches_clients(openai_stub: Any, engine: str) -> None:
+    openai_stub.delay_s = 0.5
+    pf = profile_from_dict(
+        {
+            "concurrency": [2],
+            "input_length": [8],
+            "output_length": [2],
+            "num_requests_per_concurrency": 2,
+            "warmup": 0,
+            "engine": engine,
+            "read_timeout_s": 0.1,
+        }
+    )
+    row = parse_perf_csv(run_profile_to_csv(openai_stub.base_url, "m", pf))[0]
+    assert row["fail_rate"] == 1.0 and row["errors_timeout"] == 2.0
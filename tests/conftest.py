@@ -1,11 +1,116 @@
 """测试全局配置。
 
 将 `src` 目录加入 `sys.path`，以便在未打包安装时可直接导入包。
+另提供 `openai_stub` 夹具：在本地线程中启动最小 OpenAI 兼容 HTTP 服务，
+供需要真实 socket 的执行器（如 asyncio 引擎）测试使用。
 """
 
+import json
 import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from typing import Any, Dict, Iterator
+
+import pytest
 
 SRC_DIR = Path(__file__).resolve().parents[1] / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """最小 OpenAI 兼容处理器：chat/completions 支持非流式与 SSE 流式。
+
+    输出 token 数取请求的 `max_tokens`（缺省为 `server.n_chunks`），并在
+    响应（或 `include_usage` 的末尾 chunk）中返回对应 usage；prompt token 数
+    按“3（模板开销）+ 消息字符数 // 2”模拟。`server.truncate` 为真时流式响应
+    不发送 `[DONE]`（模拟截断）。
+    """
+
+    server: "_StubServer"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length", "0") or 0)
+        payload: Dict[str, Any] = json.loads(self.rfile.read(length) or b"{}")
+        with self.server.lock:
+            self.server.payloads.append(payload)
+        if self.server.delay_s:
+            time.sleep(self.server.delay_s)
+        if self.server.status != 200:
+            body = json.dumps({"error": {"message": "stub error"}}).encode()
+            self.send_response(self.server.status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        n_tokens = int(payload.get("max_tokens") or self.server.n_chunks)
+        chars = sum(len(str(m.get("content", ""))) for m in payload.get("messages", []))
+        usage = {"prompt_tokens": 3 + chars // 2, "completion_tokens": n_tokens}
+        if payload.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for i in range(n_tokens):
+                chunk = {"choices": [{"index": 0, "delta": {"content": f"t{i}"}}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+            if (payload.get("stream_options") or {}).get("include_usage"):
+                tail = {"choices": [], "usage": usage}
+                self.wfile.write(f"data: {json.dumps(tail)}\n\n".encode())
+            if not self.server.truncate:
+                self.wfile.write(b"data: [DONE]\n\n")
+            return
+        body = json.dumps(
+            {
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": "ok"},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _StubHandler)
+        self.lock = threading.Lock()
+        self.payloads: list = []
+        self.status = 200
+        self.delay_s = 0.0
+        self.n_chunks = 4
+        self.truncate = False
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+@pytest.fixture
+def openai_stub() -> Iterator[_StubServer]:
+    """启动本地 OpenAI 兼容桩服务，返回服务对象（含 `base_url` 与可调参数）。"""
+
+    srv = _StubServer()
+    th = threading.Thread(target=srv.serve_forever, daemon=True)
+    th.start()
+    try:
+        yield srv
+    finally:
+        srv.shutdown()
+        srv.server_close()
@@ -0,0 +1,208 @@
+"""连续批处理模拟器（deploy.batch_sim）的测试。"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+import requests
+from typer.testing import CliRunner
+
+from vllm_cibench.clients.openai_client import OpenAICompatClient
+from vllm_cibench.deploy.batch_sim import (
+    BatchScheduler,
+    SimConfig,
+    exact_percentile,
+    fit_sim_config,
+    load_sim_config,
+    open_loop_requests,
+    sim_config_from_args,
+    sim_summary,
+    simulate,
+    to_records,
+)
+from vllm_cibench.deploy.mock_server import MockConfig, MockServer
+from vllm_cibench.run import app
+from vllm_cibench.testsuites.perf_exec import LoadStats
+
+# 步长只含固定开销：每步 10ms，便于手算
+FLAT = SimConfig(
+    max_num_seqs=2,
+    kv_cache_tokens=1000,
+    prefill_ms_per_token=0.0,
+    decode_base_ms=10.0,
+    decode_ms_per_seq=0.0,
+)
+
+
+def test_sim_config_validation() -> None:
+    for bad in (
+        {"max_num_seqs": 0},
+        {"kv_cache_tokens": 0},
+        {"preemption_mode": "drop"},
+        {"prefill_ms_per_token": 0, "decode_base_ms": 0, "decode_ms_per_seq": 0},
+    ):
+        with pytest.raises(ValueError):
+            SimConfig.from_dict(bad)
+
+
+def test_max_num_seqs_queues_extra_requests() -> None:
+    res = simulate(FLAT, [(0.0, 10, 3)] * 3)
+    # 前两个请求第 1/2/3 步出 token；第三个等到第 4 步才被接纳
+    assert [r.ttft_ms for r in res] == pytest.approx([10.0, 10.0, 40.0])
+    assert [r.latency_ms for r in res] == pytest.approx([30.0, 30.0, 60.0])
+    assert res[0].tpot_ms == pytest.approx(10.0)
+
+
+def test_step_cost_counts_prefill_and_decode() -> None:
+    cfg = SimConfig(prefill_ms_per_token=1.0, decode_base_ms=5.0, decode_ms_per_seq=2.0)
+    sched = BatchScheduler(cfg)
+    sched.submit(0.0, 100, 4)
+    dur, touched = sched.step(0.0)
+    assert dur == pytest.approx(0.105) and len(touched) == 1
+    dur, _ = sched.step(dur)
+    assert dur == pytest.approx(0.007)
+
+
+def test_kv_pressure_preempts_latest_sequence() -> None:
+    cfg = SimConfig(
+        max_num_seqs=4,
+        kv_cache_tokens=24,
+        prefill_ms_per_token=0.0,
+        decode_base_ms=10.0,
+        decode_ms_per_seq=0.0,
+    )
+    res = simulate(cfg, [(0.0, 8, 6), (0.0, 8, 6)])
+    assert all(r.finish_s is not None and not r.rejected for r in res)
+    assert res[0].preemptions == 0 and res[1].preemptions >= 1
+    assert res[1].latency_ms > res[0].latency_ms
+    swap = simulate(
+        SimConfig(**{**cfg.__dict__, "preemption_mode": "swap"}),
+        [(0.0, 8, 6), (0.0, 8, 6)],
+    )
+    assert swap[1].preemptions >= 1
+    # 被抢占后已生成的 token 不会重复产出
+    assert all(len(r.token_times) == 6 for r in res + swap)
+
+
+def test_oversized_request_rejected() -> None:
+    res = simulate(FLAT, [(0.0, 990, 20), (0.0, 10, 2)])
+    assert res[0].rejected and res[0].latency_ms is None
+    assert not res[1].rejected
+    summary = sim_summary(res)
+    assert summary["fail_rate"] == 0.5
+
+
+def test_sim_config_from_pd_decode_params() -> None:
+    cfg = sim_config_from_args(
+        "--max-num-seqs=24 --preemption-mode swap --num_gpu_blocks_override 100 "
+        "--block-size=32 --swap-space=16"
+    )
+    assert cfg.max_num_seqs == 24
+    assert cfg.preemption_mode == "swap"
+    assert cfg.kv_cache_tokens == 3200
+    what_if = sim_config_from_args("--max-num-seqs 48", cfg)
+    assert what_if.max_num_seqs == 48 and what_if.kv_cache_tokens == 3200
+
+
+def test_fit_recovers_step_costs() -> None:
+    rows = [
+        {
+            "concurrency": c,
+            "input_len": 1000,
+            "ttft_p50_ms": 12.0 + 0.02 * 1000,
+            "tpot_p50_ms": 12.0 + 0.5 * c,
+        }
+        for c in (1, 8, 32)
+    ]
+    rows.append({"concurrency": 0, "request_rate": 5.0, "ttft_p50_ms": 1.0})
+    cfg = fit_sim_config(rows, SimConfig(max_num_seqs=64))
+    assert cfg.decode_base_ms == pytest.approx(12.0)
+    assert cfg.decode_ms_per_seq == pytest.approx(0.5)
+    assert cfg.prefill_ms_per_token == pytest.approx(0.02)
+    assert cfg.max_num_seqs == 64
+    with pytest.raises(ValueError):
+        fit_sim_config([{"concurrency": 4}])
+
+
+def test_load_sim_config_layers(tmp_path: Path) -> None:
+    p = tmp_path / "sim.yaml"
+    p.write_text(
+        "decode_base_ms: 7\nengine_args: '--max-num-seqs=8'\n", encoding="utf-8"
+    )
+    cfg = load_sim_config(str(p), engine_args="--preemption-mode=swap")
+    assert (cfg.decode_base_ms, cfg.max_num_seqs) == (7, 8)
+    assert cfg.preemption_mode == "swap"
+
+
+def test_harness_percentiles_match_ground_truth() -> None:
+    cfg = SimConfig(max_num_seqs=16, kv_cache_tokens=8192)
+    res = simulate(cfg, open_loop_requests(40.0, 2000, 256, 32, seed=7))
+    truth = sim_summary(res)
+    stats = LoadStats()
+    for rec in to_records(res):
+        stats.add(rec)
+    got = stats.summary(1.0)
+    for col in ("latency_p50_ms", "latency_p99_ms", "ttft_p90_ms", "tpot_p99_ms"):
+        assert got[col] == pytest.approx(truth[col], rel=0.01), col
+    xs = [float(r.latency_ms or 0.0) for r in res]
+    assert exact_percentile(xs, 100) == max(xs)
+
+
+def test_more_seqs_what_if_lowers_queueing() -> None:
+    reqs = open_loop_requests(60.0, 600, 128, 64, seed=1)
+    small = sim_summary(simulate(SimConfig(max_num_seqs=8), reqs))
+    large = sim_summary(simulate(SimConfig(max_num_seqs=64), reqs))
+    assert large["ttft_p99_ms"] < small["ttft_p99_ms"]
+
+
+def test_simulate_cli() -> None:
+    out = CliRunner().invoke(
+        app,
+        [
+            "simulate",
+            "--request-rate",
+            "5,20",
+            "--num-requests",
+            "50",
+            "--input-len",
+            "64",
+            "--output-len",
+            "8",
+            "--engine-args",
+            "--max-num-seqs=4",
+        ],
+    )
+    assert out.exit_code == 0, out.output
+    rows = json.loads(out.output)
+    assert [r["request_rate"] for r in rows] == [5.0, 20.0]
+    assert rows[1]["ttft_p99_ms"] >= rows[0]["ttft_p99_ms"]
+
+
+def test_mock_server_with_simulated_backend() -> None:
+    sim = SimConfig(
+        max_num_seqs=2,
+        kv_cache_tokens=64,
+        prefill_ms_per_token=0.0,
+        decode_base_ms=2.0,
+        decode_ms_per_seq=0.0,
+    )
+    srv = MockServer(MockConfig(sim=sim), port=0).start()
+    try:
+        client = OpenAICompatClient(srv.url)
+        msgs = [{"role": "user", "content": "hello world"}]
+        chunks = list(client.stream_chat_completions("m", msgs, max_tokens=3))
+        assert [c["choices"][0]["delta"]["content"] for c in chunks] == [
+            "t0 ",
+            "t1 ",
+            "t2 ",
+        ]
+        with pytest.raises(requests.HTTPError) as err:
+            client.chat_completions("m", msgs, max_tokens=200)
+        assert err.value.response.status_code == 400
+        assert srv.engine is not None
+        done = list(srv.engine.completed)
+        assert len(done) == 1 and (done[0].tpot_ms or 0.0) >= 1.9
+    finally:
+        srv.shutdown()
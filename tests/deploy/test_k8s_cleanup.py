@@ -49,7 +49,7 @@ def test_k8s_cleanup_invoked(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) ->
     monkeypatch.setattr(
         rp,
         "run_smoke_suite",
-        lambda base_url, model: {"choices": [{"message": {"content": "ok"}}]},
+        lambda base_url, model, **k: {"choices": [{"message": {"content": "ok"}}]},
     )
 
     # 写入临时 YAML 并通过环境变量声明清理
@@ -0,0 +1,113 @@
+"""内置 OpenAI 兼容 mock 服务（deploy.mock_server）的测试。"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator
+
+import pytest
+import requests
+
+from vllm_cibench.clients.openai_client import OpenAICompatClient, StreamTruncatedError
+from vllm_cibench.deploy.mock_server import MockConfig, MockServer
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_exec import run_profile_to_csv
+from vllm_cibench.testsuites.perf_profile import PerfProfile
+
+MSGS = [{"role": "user", "content": "hello world"}]
+
+
+def _serve(**kw: Any) -> MockServer:
+    return MockServer(MockConfig(**kw), port=0).start()
+
+
+@pytest.fixture
+def mock() -> Iterator[MockServer]:
+    srv = _serve(ttft_ms=5.0, token_delay_ms=1.0)
+    try:
+        yield srv
+    finally:
+        srv.shutdown()
+
+
+def test_mock_config_validation() -> None:
+    bad: Any
+    for bad in (
+        {"fail_rate": 1.5},
+        {"ttft_ms": -1},
+        {"output_tokens": 0},
+        {"fail_status": 200},
+        {"max_concurrency": -1},
+    ):
+        with pytest.raises(ValueError):
+            MockConfig(**bad)
+
+
+def test_models_chat_and_completions(mock: MockServer) -> None:
+    models = requests.get(mock.url + "/models", timeout=5).json()
+    assert models["data"][0]["id"] == "mock"
+    client = OpenAICompatClient(mock.url)
+    out = client.chat_completions("m", MSGS, max_tokens=3)
+    assert isinstance(out, dict)
+    assert out["choices"][0]["message"]["content"] == "t0 t1 t2 "
+    assert out["usage"]["completion_tokens"] == 3
+    chunks = list(
+        client.stream_chat_completions(
+            "m", MSGS, max_tokens=4, stream_options={"include_usage": True}
+        )
+    )
+    assert [c["choices"][0]["delta"]["content"] for c in chunks[:4]] == [
+        "t0 ",
+        "t1 ",
+        "t2 ",
+        "t3 ",
+    ]
+    assert chunks[-1]["usage"]["completion_tokens"] == 4
+    comp = list(client.stream_completions("m", "hello", max_tokens=2))
+    assert [c["choices"][0]["text"] for c in comp] == ["t0 ", "t1 "]
+    assert client.completions("m", "hi")["usage"]["completion_tokens"] == 16
+
+
+def test_failure_injection() -> None:
+    srv = _serve(fail_rate=1.0, fail_status=429, ttft_ms=0, token_delay_ms=0)
+    try:
+        with pytest.raises(requests.HTTPError) as err:
+            OpenAICompatClient(srv.url).chat_completions("m", MSGS)
+        assert err.value.response.status_code == 429
+    finally:
+        srv.shutdown()
+    srv = _serve(truncate_rate=1.0, ttft_ms=0, token_delay_ms=0)
+    try:
+        with pytest.raises(StreamTruncatedError):
+            list(OpenAICompatClient(srv.url).stream_chat_completions("m", MSGS))
+    finally:
+        srv.shutdown()
+
+
+def test_concurrency_cap_queues_requests() -> None:
+    srv = _serve(max_concurrency=2, ttft_ms=20.0, token_delay_ms=0)
+    try:
+        client = OpenAICompatClient(srv.url)
+        with ThreadPoolExecutor(8) as ex:
+            outs = list(ex.map(lambda _: client.chat_completions("m", MSGS), range(8)))
+        assert len(outs) == 8 and srv.requests_total == 8
+        assert srv.peak_inflight == 2
+    finally:
+        srv.shutdown()
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize("engine", ["thread", "asyncio"])
+def test_perf_profile_against_mock(mock: MockServer, engine: str) -> None:
+    pf = PerfProfile(
+        concurrency=[4],
+        input_length=[32],
+        output_length=[8],
+        num_requests_per_concurrency=16,
+        warmup=0,
+        engine=engine,
+        stream=True,
+    )
+    row = parse_perf_csv(run_profile_to_csv(mock.url, "mock", pf))[0]
+    assert row["fail_rate"] == 0.0 and row["output_tokens_avg"] == 8.0
+    assert row["ttft_p50_ms"] >= 5.0 and row["input_tps"] > 0
@@ -122,3 +122,50 @@ def test_metrics_from_perf_records_with_quantiles():
     assert out["ci_perf_latency_p50_ms_avg"] == 50
     assert out["ci_perf_latency_p95_ms_avg"] == 100
     assert out["ci_perf_latency_p99_ms_avg"] == 120
+
+
+def test_metrics_from_perf_records_capacity():
+    rows = [
+        {"concurrency": 4, "input_len": 128, "output_len": 128, "slo_ok": 1.0},
+        {"concurrency": 8, "input_len": 128, "output_len": 128, "slo_ok": 0.0},
+        {"concurrency": 2, "input_len": 512, "output_len": 128, "slo_ok": 1.0},
+    ]
+    out = pg.metrics_from_perf_records(rows)
+    # 多个长度组合取最小容量
+    assert out["ci_perf_capacity_concurrency"] == 2
+    rate_rows = [
+        {"concurrency": 0, "request_rate": 5.0, "slo_ok": 1.0},
+        {"concurrency": 0, "request_rate": 7.5, "slo_ok": 1.0},
+    ]
+    assert pg.metrics_from_perf_records(rate_rows)["ci_perf_capacity_rps"] == 7.5
+    assert "ci_perf_capacity_rps" not in pg.metrics_from_perf_records(rows)
+
+
+def test_metrics_from_perf_records_errors():
+    recs = [
+        {"throughput_rps": 2.0, "fail_rate": 0.5, "errors_http_5xx": 3.0},
+        {"throughput_rps": 4.0, "fail_rate": 0.0, "errors_http_5xx": 1.0},
+    ]
+    m = pg.metrics_from_perf_records(recs)
+    assert m["ci_perf_fail_rate_avg"] == 0.25
+    assert m["ci_perf_errors_http_5xx_total"] == 4.0
+    assert "ci_perf_fail_rate_avg" not in pg.metrics_from_perf_records([{}])
+
+
+def test_metrics_from_perf_records_tokens():
+    recs = [
+        {"input_tps": 100.0, "output_tps": 10.0, "total_tps": 110.0},
+        {"input_tps": 300.0, "output_tps": 30.0, "total_tps": 330.0},
+        {"request_output_tps_p50": 8.0},
+    ]
+    m = pg.metrics_from_perf_records(recs)
+    assert m["ci_perf_input_tps_avg"] == 200.0
+    assert m["ci_perf_output_tps_avg"] == 20.0
+    assert m["ci_perf_total_tps_avg"] == 220.0
+    assert m["ci_perf_request_output_tps_p50_avg"] == 8.0
+
+
+def test_metrics_from_perf_records_client_bound():
+    recs = [{"client_bound": 1.0}, {"client_bound": 0.0}, {"client_bound": 1.0}]
+    assert pg.metrics_from_perf_records(recs)["ci_perf_client_bound_total"] == 2.0
+    assert "ci_perf_client_bound_total" not in pg.metrics_from_perf_records([{}])
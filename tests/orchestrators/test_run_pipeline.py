@@ -21,7 +21,7 @@ def test_execute_pr_flow_monkeypatched(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr(
         rp,
         "run_smoke_suite",
-        lambda base_url, model: {"choices": [{"message": {"content": "ok"}}]},
+        lambda base_url, model, **k: {"choices": [{"message": {"content": "ok"}}]},
     )
     monkeypatch.setattr(rp, "push_metrics", lambda *a, **kw: False)
 
@@ -48,7 +48,7 @@ def test_execute_daily_push(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr(
         rp,
         "run_smoke_suite",
-        lambda base_url, model: {"choices": [{"message": {"content": "ok"}}]},
+        lambda base_url, model, **k: {"choices": [{"message": {"content": "ok"}}]},
     )
     called = {"flag": False}
 
@@ -78,7 +78,7 @@ def test_execute_daily_dry_run(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr(
         rp,
         "run_smoke_suite",
-        lambda base_url, model: {"choices": [{"message": {"content": "ok"}}]},
+        lambda base_url, model, **k: {"choices": [{"message": {"content": "ok"}}]},
     )
     called = {"flag": False}
 
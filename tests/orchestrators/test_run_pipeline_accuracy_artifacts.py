@@ -22,13 +22,13 @@ def test_accuracy_artifacts_written(
     monkeypatch.setattr(
         rp,
         "run_smoke_suite",
-        lambda base_url, model: {"choices": [{"message": {"content": "ok"}}]},
+        lambda base_url, model, **k: {"choices": [{"message": {"content": "ok"}}]},
     )
     # 固定精度结果
     monkeypatch.setattr(
         rp,
         "run_accuracy",
-        lambda base_url, model, cfg=None: {
+        lambda base_url, model, cfg=None, **k: {
             "task": "gpqa",
             "score": 0.5,
             "correct": 1,
@@ -21,12 +21,12 @@ def test_execute_uses_global_accuracy_cfg(monkeypatch: pytest.MonkeyPatch):
     monkeypatch.setattr(
         rp,
         "run_smoke_suite",
-        lambda base_url, model: {"choices": [{"message": {"content": "ok"}}]},
+        lambda base_url, model, **k: {"choices": [{"message": {"content": "ok"}}]},
     )
 
     captured = {}
 
-    def fake_acc(base_url: str, model: str, cfg=None):
+    def fake_acc(base_url: str, model: str, cfg=None, **k):
         captured["cfg"] = dict(cfg or {})
         return {
             "task": captured["cfg"].get("task", "none"),
@@ -14,10 +14,18 @@ import vllm_cibench.orchestrators.run_pipeline as rp
 class _DummyClient:
     """伪 OpenAI 客户端：根据问题返回正确答案文本。"""
 
-    def __init__(self, base_url: str, api_key: str | None = None) -> None:  # noqa: D401
+    def __init__(
+        self, base_url: str, api_key: str | None = None, **_: Any
+    ) -> None:  # noqa: D401
         self.base_url = base_url
         self.api_key = api_key
 
+    def __enter__(self) -> "_DummyClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        pass
+
     def chat_completions(self, model: str, messages: list[Mapping[str, Any]], temperature: float = 0.0):  # type: ignore[override]
         text = ""
         if messages:
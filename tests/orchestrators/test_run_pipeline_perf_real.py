@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import shutil
 from pathlib import Path
 
 import pytest
@@ -9,6 +10,13 @@ import pytest
 import vllm_cibench.orchestrators.run_pipeline as rp
 
 
+def _repo_copy(tmp_path: Path) -> str:
+    """复制配置到临时根目录，使产物写入 tmp_path 而非仓库工作区。"""
+
+    shutil.copytree(Path.cwd() / "configs", tmp_path / "configs")
+    return str(tmp_path)
+
+
 @pytest.mark.perf
 def test_execute_perf_real_mode_monkeypatched(
     monkeypatch: pytest.MonkeyPatch, tmp_path: Path
@@ -22,7 +30,7 @@ def test_execute_perf_real_mode_monkeypatched(
     monkeypatch.setattr(
         rp,
         "run_smoke_suite",
-        lambda base_url, model: {"choices": [{"message": {"content": "ok"}}]},
+        lambda base_url, model, **k: {"choices": [{"message": {"content": "ok"}}]},
     )
     monkeypatch.setattr(rp, "push_metrics", lambda *a, **kw: False)
     # 伪造 run_profile_to_csv 返回的 CSV 文本
@@ -40,9 +48,89 @@ def test_execute_perf_real_mode_monkeypatched(
     res = rp.execute(
         scenario_id="local_single_qwen3-32b_guided_w8a8",
         run_type="pr",
-        root=str(Path.cwd()),
+        root=_repo_copy(tmp_path),
         timeout_s=0.1,
         dry_run=True,
     )
     assert res["perf_metrics"].get("mode") == "real"
     assert "ci_perf_throughput_rps_avg" in res["perf_metrics"]
+
+
+@pytest.mark.perf
+def test_execute_perf_real_mode_writes_artifacts(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(
+        rp,
+        "_discover_and_wait",
+        lambda base, s, timeout_s=60.0: "http://127.0.0.1:9000/v1",
+    )
+    monkeypatch.setattr(
+        rp,
+        "run_smoke_suite",
+        lambda base_url, model, **k: {"choices": [{"message": {"content": "ok"}}]},
+    )
+    monkeypatch.setattr(rp, "push_metrics", lambda *a, **kw: False)
+    seen = {}
+
+    def _fake_run(*a, **k):
+        seen.update(k)
+        return "concurrency,input_len,output_len,latency_p50_ms,throughput_rps\n"
+
+    monkeypatch.setattr(rp, "run_profile_to_csv", _fake_run)
+    monkeypatch.setenv("VLLM_CIBENCH_PERF_MODE", "real")
+    res = rp.execute(
+        scenario_id="local_single_qwen3-32b_guided_w8a8",
+        run_type="pr",
+        root=_repo_copy(tmp_path),
+        timeout_s=0.1,
+        dry_run=True,
+    )
+    perf_dir = Path(res["artifacts"]["perf_dir"])
+    assert seen["artifacts_dir"] == str(perf_dir) and seen["tag"] == "pr"
+    assert perf_dir.parent.name == "local_single_qwen3-32b_guided_w8a8"
+    assert perf_dir.parent.parent.name == "perf"
+    assert (perf_dir / "perf_pr.csv").is_file()
+    assert perf_dir.is_relative_to(tmp_path)
+
+
+@pytest.mark.perf
+def test_execute_bad_perf_profile_runs_functional_first(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(
+        rp,
+        "_discover_and_wait",
+        lambda base, s, timeout_s=60.0: "http://127.0.0.1:9000/v1",
+    )
+    calls = []
+
+    def _smoke(base_url, model, **k):
+        calls.append(k["session"])
+        return {"choices": [{"message": {"content": "ok"}}]}
+
+    monkeypatch.setattr(rp, "run_smoke_suite", _smoke)
+    closed = []
+    real_pooled = rp.pooled_session
+
+    def _pooled(size):
+        session = real_pooled(size)
+        monkeypatch.setattr(session, "close", lambda: closed.append(size))
+        return session
+
+    monkeypatch.setattr(rp, "pooled_session", _pooled)
+    bad = tmp_path / "bad.yaml"
+    bad.write_text("concurrency: [4]\nsteady_tolerance: 2\n", encoding="utf-8")
+    monkeypatch.setenv("VLLM_CIBENCH_PERF_MODE", "real")
+    monkeypatch.setenv("VLLM_CIBENCH_PERF_PROFILE", str(bad))
+    with pytest.raises(ValueError):
+        rp.execute(
+            scenario_id="local_single_qwen3-32b_guided_w8a8",
+            run_type="pr",
+            root=_repo_copy(tmp_path),
+            timeout_s=0.1,
+            dry_run=True,
+        )
+    # 功能测试照常执行，非法档位在性能阶段抛出，连接池按默认大小创建并被关闭
+    assert len(calls) == 1
+    assert closed == [rp.DEFAULT_POOL_SIZE]
@@ -0,0 +1,83 @@
+"""压测工具自身微基准（testsuites.harness_bench）的测试。"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from vllm_cibench.run import app
+from vllm_cibench.testsuites.harness_bench import (
+    BENCHMARKS,
+    DEFAULT_THRESHOLDS_US,
+    failures,
+    load_thresholds,
+    measure,
+    run_benchmarks,
+)
+
+
+@pytest.mark.bench
+@pytest.mark.parametrize("name", list(BENCHMARKS))
+def test_hot_path_within_threshold(name: str) -> None:
+    report = run_benchmarks([name], min_time_s=0.0, repeat=3)
+    res = report["results"][name]
+    assert res["median_us"] > 0
+    assert res["ok"], f"{name}: {res['median_us']:.1f}us > {res['threshold_us']}us"
+
+
+def test_every_benchmark_has_threshold() -> None:
+    assert set(BENCHMARKS) == set(DEFAULT_THRESHOLDS_US)
+
+
+def test_measure_scales_batch_to_min_time() -> None:
+    calls = []
+    res = measure(lambda: calls.append(1), min_time_s=0.001, repeat=2)
+    assert res["number"] > 1 and res["repeat"] == 2
+    assert res["min_us"] <= res["median_us"]
+
+
+def test_load_thresholds_from_mapping_and_baseline(tmp_path: Path) -> None:
+    p = tmp_path / "limits.json"
+    p.write_text(json.dumps({"make_prompt_4096": 3}), encoding="utf-8")
+    assert load_thresholds(str(p))["make_prompt_4096"] == 3.0
+    base = tmp_path / "base.json"
+    base.write_text(
+        json.dumps({"results": {"sse_parse_1k": {"median_us": 100.0}}}),
+        encoding="utf-8",
+    )
+    limits = load_thresholds(str(base), tolerance=0.2)
+    assert limits["sse_parse_1k"] == pytest.approx(120.0)
+    assert limits["percentiles_100k"] == DEFAULT_THRESHOLDS_US["percentiles_100k"]
+    with pytest.raises(ValueError):
+        load_thresholds(None, tolerance=-1)
+
+
+def test_threshold_breach_reported() -> None:
+    report = run_benchmarks(
+        ["make_prompt_4096"], thresholds={"make_prompt_4096": 0.0}, min_time_s=0.0
+    )
+    assert not report["ok"]
+    assert [f[0] for f in failures(report)] == ["make_prompt_4096"]
+    with pytest.raises(ValueError):
+        run_benchmarks(["nope"])
+
+
+def test_bench_cli_writes_json_and_exit_code(tmp_path: Path) -> None:
+    out = tmp_path / "bench.json"
+    args = ["bench", "--only", "make_prompt_4096", "--out", str(out)]
+    # 阈值取极端值，使退出码与机器快慢无关
+    loose = tmp_path / "loose.json"
+    loose.write_text(json.dumps({"make_prompt_4096": 1e12}), encoding="utf-8")
+    res = CliRunner().invoke(
+        app, args + ["--min-time", "0", "--thresholds", str(loose)]
+    )
+    assert res.exit_code == 0, res.output
+    report = json.loads(out.read_text(encoding="utf-8"))
+    assert report["ok"] and "make_prompt_4096" in report["results"]
+    limits = tmp_path / "limits.json"
+    limits.write_text(json.dumps({"make_prompt_4096": 0}), encoding="utf-8")
+    res = CliRunner().invoke(app, args + ["--thresholds", str(limits)])
+    assert res.exit_code == 1
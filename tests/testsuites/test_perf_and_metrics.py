@@ -30,3 +30,5 @@ def test_perf_csv_and_rename():
     renamed = rename_record_keys(parsed[0], DEFAULT_MAPPING)
     assert "throughput_requests_per_second" in renamed
     assert "latency_p50_milliseconds" in renamed
+    tokens = rename_record_keys({"output_tps": 1.0, "total_tps": 2.0})
+    assert set(tokens) == {"output_tokens_per_second", "total_tokens_per_second"}
@@ -0,0 +1,108 @@
+"""perf_ci 置信区间与自适应样本量的测试。"""
+
+from __future__ import annotations
+
+import math
+import random
+from pathlib import Path
+
+import pytest
+
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_ci import (
+    ci_converged,
+    ci_summary,
+    quantile_ci,
+    quantile_rank_bounds,
+    wilson_interval,
+    z_score,
+)
+from vllm_cibench.testsuites.perf_exec import (
+    LoadStats,
+    RequestRecord,
+    run_profile_to_csv,
+)
+from vllm_cibench.testsuites.perf_hist import LatencyHistogram
+from vllm_cibench.testsuites.perf_profile import PerfProfile, profile_from_dict
+from vllm_cibench.testsuites.perf_records import read_request_log
+
+
+def test_wilson_and_rank_bounds() -> None:
+    assert z_score(0.95) == pytest.approx(1.96, abs=1e-3)
+    lo, hi = wilson_interval(0, 100)
+    assert lo == 0.0 and 0.0 < hi < 0.05
+    lo, hi = wilson_interval(50, 100)
+    assert lo < 0.5 < hi and hi - lo == pytest.approx(0.19, abs=0.01)
+    with pytest.raises(ValueError):
+        z_score(1.0)
+    # 样本太少时 P99 的上界未知；样本足够时区间覆盖估计秩
+    assert quantile_rank_bounds(100, 99)[1] is None
+    lo_r, hi_r = quantile_rank_bounds(2000, 99)
+    assert hi_r is not None and lo_r < 1980 < hi_r < 2000
+
+
+def test_quantile_ci_brackets_estimate() -> None:
+    rng = random.Random(7)
+    hist = LatencyHistogram().extend([rng.expovariate(0.01) for _ in range(5000)])
+    for q in (50, 90, 99):
+        lo, hi = quantile_ci(hist, q)
+        assert lo <= hist.percentile(q) <= hi < math.inf
+    assert quantile_ci(LatencyHistogram(), 50) == (0.0, math.inf)
+
+
+def test_ci_summary_and_convergence() -> None:
+    stats = LoadStats()
+    for i in range(400):
+        stats.add(RequestRecord(0.0, 1.0 + i / 400.0, i % 40 != 0))
+    cis = ci_summary(stats)
+    assert cis["latency_p50_ci_lo_ms"] <= cis["latency_p50_ci_hi_ms"]
+    assert cis["fail_rate_ci_lo"] < 10 / 400 < cis["fail_rate_ci_hi"]
+    assert "ttft_p50_ci_lo_ms" not in cis
+    kw = {"metric": "latency", "quantiles": [50, 90]}
+    assert ci_converged(stats, target=0.2, **kw)
+    assert not ci_converged(stats, target=0.01, **kw)
+    assert not ci_converged(stats, metric="latency", quantiles=[99.9], target=0.5)
+    assert not ci_converged(LoadStats(), target=1.0, **kw)
+
+
+def test_profile_ci_fields() -> None:
+    pf = profile_from_dict({"num_requests_per_concurrency": 16, "ci_target": 0.1})
+    assert (pf.min_requests, pf.max_requests) == (16, 160)
+    for bad in (
+        {"ci_target": -1},
+        {"ci_confidence": 1.5},
+        {"ci_metric": "qps"},
+        {"ci_quantiles": [100]},
+        {"min_requests": 10, "max_requests": 5},
+    ):
+        with pytest.raises(ValueError):
+            profile_from_dict(bad)
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize("target,expected", [(0.5, 20), (1e-6, 60)])
+def test_adaptive_sampling_stops_on_target(
+    openai_stub, tmp_path: Path, target: float, expected: int
+) -> None:
+    pf = PerfProfile(
+        concurrency=[4],
+        input_length=[8],
+        output_length=[4],
+        num_requests_per_concurrency=10,
+        warmup=0,
+        ci_target=target,
+        ci_quantiles=[50.0],
+        min_requests=20,
+        max_requests=60,
+    )
+    rows = parse_perf_csv(
+        run_profile_to_csv(openai_stub.base_url, "m", pf, artifacts_dir=str(tmp_path))
+    )
+    row = rows[0]
+    assert row["requests"] == expected
+    assert row["latency_p50_ci_lo_ms"] <= row["latency_p50_ms"]
+    assert row["latency_p50_ms"] <= row["latency_p50_ci_hi_ms"]
+    assert row["fail_rate_ci_lo"] == 0.0 and row["fail_rate_ci_hi"] > 0
+    summary = read_request_log(str(tmp_path / "summary_perf.csv"))
+    assert summary[0]["requests"] == str(expected)
+    assert float(summary[0]["latency_p50_ci_hi_ms"]) > 0
@@ -0,0 +1,185 @@
+"""压测端瓶颈检测（perf_client）的测试。"""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+import vllm_cibench.testsuites.perf_exec as pe
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_client import (
+    ClientCapacity,
+    CpuSampler,
+    calibrate_client,
+    client_bound_reasons,
+)
+from vllm_cibench.testsuites.perf_exec import (
+    LoadStats,
+    LoadStep,
+    RequestRecord,
+    _client_check,
+    run_profile_to_csv,
+)
+from vllm_cibench.testsuites.perf_profile import effective_engine, profile_from_dict
+
+
+def test_client_bound_reasons() -> None:
+    cap = ClientCapacity("thread", 4, max_rps=100.0, chunk_rate=1000.0)
+    ok = dict(target_concurrency=4, achieved_concurrency=3.9, cpu_avg=0.2)
+    assert client_bound_reasons(rps=10.0, chunk_rate=50.0, capacity=cap, **ok) == []
+    assert client_bound_reasons(
+        target_concurrency=4,
+        achieved_concurrency=2.0,
+        cpu_avg=0.95,
+        rps=90.0,
+        chunk_rate=900.0,
+        capacity=cap,
+    ) == [
+        "cpu_saturated",
+        "concurrency_shortfall",
+        "near_client_max_rps",
+        "near_client_chunk_rate",
+    ]
+    # 开环负载点（目标并发 0）不检查在途数；未标定时不比较吞吐
+    assert (
+        client_bound_reasons(
+            target_concurrency=0,
+            achieved_concurrency=0.1,
+            cpu_avg=None,
+            rps=1e6,
+            chunk_rate=None,
+            capacity=None,
+        )
+        == []
+    )
+
+
+def test_cpu_sampler_window_tracks_busy_loop() -> None:
+    with CpuSampler(interval_s=0.01) as cpu:
+        t0 = time.monotonic()
+        while time.monotonic() - t0 < 0.2:
+            pass
+        t1 = time.monotonic()
+        time.sleep(0.2)
+        t2 = time.monotonic()
+        busy = cpu.window(t0, t1)
+        idle = cpu.window(t1 + 0.02, t2)
+    assert busy is not None and idle is not None
+    assert busy[0] > 0.5 and busy[1] >= busy[0]
+    assert idle[0] < 0.3
+    assert cpu.window(t1, t0) is None
+
+
+@pytest.mark.parametrize("engine", ["thread", "asyncio"])
+def test_calibrate_client_against_mock(engine: str) -> None:
+    cap = calibrate_client(engine, concurrency=4, n_requests=40, stream=True)
+    assert cap.max_rps > 0 and cap.chunk_rate is not None and cap.chunk_rate > 0
+    assert cap.to_dict()["concurrency"] == 4
+    assert calibrate_client(engine, concurrency=2, n_requests=8).chunk_rate is None
+
+
+def test_achieved_concurrency_counts_failed_inflight() -> None:
+    stats = LoadStats()
+    # 4 并发跑满 1 秒：一半请求成功，一半以 503 失败，但同样占满在途时长
+    for ok in (True, False, True, False):
+        stats.add(RequestRecord(0.0, 1.0, ok, error="" if ok else "http_5xx"))
+    back = LoadStats.from_dict(stats.to_dict())
+    assert back.failed_latency_ms == pytest.approx(2000.0)
+    pf = profile_from_dict({"concurrency": [4], "client_check": True})
+    step = LoadStep(concurrency=4, duration_s=1.0, stats=back)
+    cols, reasons = _client_check(step, back, 1.0, back.summary(1.0), pf, None, None)
+    assert cols["achieved_concurrency"] == pytest.approx(4.0)
+    assert "concurrency_shortfall" not in reasons
+
+
+def test_profile_client_check_validation() -> None:
+    for bad in (
+        {"client_cpu_limit": 0},
+        {"client_margin": 1.5},
+        {"client_concurrency_tolerance": 1.0},
+        {"client_calibration_requests": 0},
+    ):
+        with pytest.raises(ValueError):
+            profile_from_dict({"concurrency": [1], **bad})
+    pf = profile_from_dict({"concurrency": [1], "client_check": True})
+    assert pf.client_check and pf.client_margin == 0.8
+
+
+@pytest.mark.perf
+def test_run_profile_flags_client_bound_points(openai_stub, tmp_path: Path) -> None:
+    pf = profile_from_dict(
+        {
+            "concurrency": [2, 16],
+            "input_length": [8],
+            "output_length": [4],
+            "num_requests_per_concurrency": 4,
+            "warmup": 0,
+            "stream": True,
+            "client_check": True,
+            "client_calibration_requests": 16,
+        }
+    )
+    csv_text = run_profile_to_csv(
+        openai_stub.base_url, "m", pf, artifacts_dir=str(tmp_path)
+    )
+    rows = {r["concurrency"]: r for r in parse_perf_csv(csv_text)}
+    for r in rows.values():
+        assert r["achieved_concurrency"] > 0
+        assert r["client_cpu_max"] >= r["client_cpu_avg"] >= 0
+    # 16 并发只有 4 个请求：实际在途数远低于目标
+    assert rows[16]["client_bound"] == 1.0
+    report = json.loads((tmp_path / "client_perf.json").read_text(encoding="utf-8"))
+    assert report["calibration"]["max_rps"] > 0
+    point = [p for p in report["load_points"] if p["concurrency"] == 16][0]
+    assert "concurrency_shortfall" in point["reasons"]
+    assert report["client_bound_points"] >= 1
+    summary = (tmp_path / "summary_perf.csv").read_text(encoding="utf-8")
+    assert "client_bound" in summary.splitlines()[0]
+
+
+@pytest.mark.perf
+def test_calibration_uses_engine_of_control_method(
+    openai_stub, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    seen = []
+
+    def _calibrate(engine: str, **kw: object) -> ClientCapacity:
+        seen.append(engine)
+        return ClientCapacity(engine, 4, 1e6)
+
+    monkeypatch.setattr(pe, "calibrate_client", _calibrate)
+    pf = profile_from_dict(
+        {
+            "control_method": "climb",
+            "engine": "thread",
+            "concurrency": [2],
+            "input_length": [8],
+            "output_length": [2],
+            "growth_interval_ms": 50,
+            "warmup": 0,
+            "client_check": True,
+        }
+    )
+    # climb 固定在 asyncio 上执行，标定与 client.json 记录的也应是 asyncio
+    assert effective_engine(pf) == "asyncio"
+    assert effective_engine(profile_from_dict({"engine": "thread"})) == "thread"
+    run_profile_to_csv(openai_stub.base_url, "m", pf, artifacts_dir=str(tmp_path))
+    report = json.loads((tmp_path / "client_perf.json").read_text(encoding="utf-8"))
+    assert seen == ["asyncio"] and report["calibration"]["engine"] == "asyncio"
+
+
+def test_client_check_off_by_default(openai_stub) -> None:
+    pf = profile_from_dict(
+        {
+            "concurrency": [1],
+            "input_length": [8],
+            "output_length": [2],
+            "num_requests_per_concurrency": 2,
+            "warmup": 0,
+        }
+    )
+    row = parse_perf_csv(run_profile_to_csv(openai_stub.base_url, "m", pf))[0]
+    assert "client_bound" not in row and "achieved_concurrency" not in row
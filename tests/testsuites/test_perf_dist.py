@@ -0,0 +1,133 @@
+"""perf_dist 协调者/代理分布式压测测试（本机多代理）。"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+import requests
+
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_dist import (
+    PerfAgent,
+    parse_agents,
+    record_from_dict,
+    record_to_dict,
+    run_distributed,
+    sync_clock,
+)
+from vllm_cibench.testsuites.perf_exec import (
+    LoadStats,
+    LoadStep,
+    RequestRecord,
+    run_profile_to_csv,
+)
+from vllm_cibench.testsuites.perf_profile import PerfProfile, profile_from_dict
+from vllm_cibench.testsuites.perf_records import read_request_log
+from vllm_cibench.testsuites.perf_workers import batch_shards, climb_shards
+
+
+@pytest.fixture
+def agents() -> Iterator[List[PerfAgent]]:
+    started = [PerfAgent("127.0.0.1", 0).start() for _ in range(3)]
+    yield started
+    for a in started:
+        a.shutdown()
+
+
+def test_record_round_trip_and_parse_agents() -> None:
+    rec = RequestRecord(1.0, 2.0, True, first_token_s=1.5, itl_ms=[3.0])
+    back = record_from_dict(record_to_dict(rec, 10.0), -10.0)
+    assert back == rec
+    assert record_from_dict({"start_s": 0, "end_s": 1, "ok": False, "x": 1}).ok is False
+    assert parse_agents("h1:8765, http://h2:8765/,") == [
+        "http://h1:8765",
+        "http://h2:8765",
+    ]
+    assert profile_from_dict({"agents": ["h1:1"]}).agents == ["http://h1:1"]
+
+
+@pytest.mark.parametrize("bad", ["h1:notaport", "ftp://h1:1", "http://:8765"])
+def test_parse_agents_rejects_malformed(bad: str) -> None:
+    with pytest.raises(ValueError, match="invalid perf agent URL"):
+        parse_agents(bad)
+
+
+@pytest.mark.perf
+def test_agent_clock_and_health(agents: List[PerfAgent]) -> None:
+    sync = sync_clock(agents[0].url)
+    assert abs(sync.offset_s) < 0.1 and sync.rtt_s >= 0
+    body = requests.get(agents[0].url + "/health", timeout=5).json()
+    assert body == {"ok": True, "busy": False}
+    for bad in ({"kind": "zigzag"}, [], 1):
+        resp = requests.post(agents[0].url + "/shard", json=bad, timeout=5)
+        assert resp.status_code == 400
+
+
+@pytest.mark.perf
+def test_run_distributed_merges_agents(openai_stub, agents: List[PerfAgent]) -> None:
+    step = LoadStep(6, duration_s=0.0, stats=LoadStats())
+    recs: List[RequestRecord] = []
+    shards = batch_shards(
+        {"base_url": openai_stub.base_url, "model": "m", "prompt": "hi"},
+        engine="asyncio",
+        concurrency=6,
+        n_requests=9,
+        workers=3,
+    )
+    dur = run_distributed(
+        "batch",
+        shards,
+        [step],
+        [a.url for a in agents],
+        lead_s=0.05,
+        on_record=lambda s, r: recs.append(r),
+    )
+    assert step.stats.requests == 9 and step.stats.failures == 0 and dur > 0
+    assert len(recs) == 9 and step.stats.latency.count == 9
+    # 时间戳已换算回本机单调时钟
+    assert all(r.end_s >= r.start_s for r in recs)
+
+
+@pytest.mark.perf
+def test_run_distributed_climb_and_errors(openai_stub, agents: List[PerfAgent]) -> None:
+    steps = [
+        LoadStep(c, duration_s=0.0, stats=LoadStats(), index=i)
+        for i, c in enumerate([2, 4])
+    ]
+    shards = climb_shards(
+        {"base_url": openai_stub.base_url, "model": "m", "prompt": "hi"},
+        schedule=[2, 4],
+        interval_s=0.1,
+        workers=2,
+    )
+    run_distributed("climb", shards, steps, [a.url for a in agents], lead_s=0.05)
+    assert all(s.stats.requests > 0 for s in steps)
+    with pytest.raises(ValueError):
+        run_distributed("batch", [{}, {}], steps, [agents[0].url])
+    with pytest.raises(RuntimeError):
+        run_distributed("batch", [{}], [steps[0]], [agents[0].url], lead_s=0.0)
+    with pytest.raises(RuntimeError):
+        run_distributed("batch", [{}], [steps[0]], ["http://127.0.0.1:9"])
+
+
+@pytest.mark.perf
+def test_profile_csv_with_agents(
+    openai_stub, agents: List[PerfAgent], tmp_path: Path
+) -> None:
+    pf = PerfProfile(
+        concurrency=[4],
+        input_length=[8],
+        output_length=[4],
+        num_requests_per_concurrency=8,
+        warmup=0,
+        engine="asyncio",
+        stream=True,
+        agents=[a.url for a in agents[:2]],
+    )
+    rows = parse_perf_csv(
+        run_profile_to_csv(openai_stub.base_url, "m", pf, artifacts_dir=str(tmp_path))
+    )
+    assert rows[0]["concurrency"] == 4 and rows[0]["ttft_p99_ms"] > 0
+    assert len(read_request_log(str(tmp_path / "requests_perf.csv"))) == 8
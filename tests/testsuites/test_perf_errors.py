@@ -0,0 +1,99 @@
+"""perf_errors 错误分类与失败率统计的测试。"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import aiohttp
+import pytest
+import requests
+
+from vllm_cibench.clients.openai_client import OpenAICompatClient, StreamTruncatedError
+from vllm_cibench.testsuites.perf import ERROR_CLASSES, parse_perf_csv
+from vllm_cibench.testsuites.perf_errors import classify_error
+from vllm_cibench.testsuites.perf_exec import run_profile_to_csv
+from vllm_cibench.testsuites.perf_profile import PerfProfile
+from vllm_cibench.testsuites.perf_records import read_request_log
+
+
+def _http_error(status: int) -> requests.HTTPError:
+    resp = requests.Response()
+    resp.status_code = status
+    return requests.HTTPError(response=resp)
+
+
+def test_classify_error() -> None:
+    cases = [
+        (_http_error(503), "http_5xx"),
+        (_http_error(429), "http_429"),
+        (_http_error(400), "http_4xx"),
+        (requests.ReadTimeout(), "timeout"),
+        (requests.ConnectTimeout(), "timeout"),
+        (asyncio.TimeoutError(), "timeout"),
+        (requests.ConnectionError(), "connection"),
+        (ConnectionResetError(), "connection"),
+        (aiohttp.ServerDisconnectedError(), "connection"),
+        (StreamTruncatedError(), "stream_truncated"),
+        (requests.exceptions.ChunkedEncodingError(), "stream_truncated"),
+        (aiohttp.ClientPayloadError(), "stream_truncated"),
+        (json.JSONDecodeError("x", "{", 0), "invalid_json"),
+        (KeyError("choices"), "other"),
+    ]
+    for exc, expected in cases:
+        assert classify_error(exc) == expected, exc
+    assert {c for _, c in cases} <= set(ERROR_CLASSES)
+
+
+def test_stream_without_done_is_truncated(requests_mock) -> None:
+    url = "http://x/v1/chat/completions"
+    chunk = json.dumps({"choices": [{"delta": {"content": "a"}}]})
+    requests_mock.post(url, text=f"data: {chunk}\n\n")
+    client = OpenAICompatClient("http://x/v1")
+    with pytest.raises(StreamTruncatedError):
+        list(client.stream_chat_completions("m", [{"role": "user", "content": "hi"}]))
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize("engine", ["thread", "asyncio"])
+def test_profile_csv_fail_rate_and_classes(
+    openai_stub, tmp_path: Path, engine: str
+) -> None:
+    openai_stub.status = 503
+    pf = PerfProfile(
+        concurrency=[2],
+        input_length=[8],
+        output_length=[4],
+        num_requests_per_concurrency=6,
+        warmup=0,
+        engine=engine,
+    )
+    rows = parse_perf_csv(
+        run_profile_to_csv(openai_stub.base_url, "m", pf, artifacts_dir=str(tmp_path))
+    )
+    # 快速失败不计入吞吐
+    assert rows[0]["throughput_rps"] == 0.0
+    assert rows[0]["fail_rate"] == 1.0 and rows[0]["errors_http_5xx"] == 6
+    assert rows[0]["errors_timeout"] == 0
+    logged = read_request_log(str(tmp_path / "requests_perf.csv"))
+    assert {r["error"] for r in logged} == {"http_5xx"}
+    summary = read_request_log(str(tmp_path / "summary_perf.csv"))
+    assert summary[0]["errors_http_5xx"] == "6" and summary[0]["qps"] == "0.0"
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize("engine", ["thread", "asyncio"])
+def test_profile_csv_stream_truncation(openai_stub, engine: str) -> None:
+    openai_stub.truncate = True
+    pf = PerfProfile(
+        concurrency=[2],
+        input_length=[8],
+        output_length=[4],
+        num_requests_per_concurrency=4,
+        warmup=0,
+        engine=engine,
+        stream=True,
+    )
+    rows = parse_perf_csv(run_profile_to_csv(openai_stub.base_url, "m", pf))
+    assert rows[0]["errors_stream_truncated"] == 4 and rows[0]["fail_rate"] == 1.0
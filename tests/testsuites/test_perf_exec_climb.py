@@ -0,0 +1,74 @@
+"""perf_exec climb 并发爬升控制测试。"""
+
+from __future__ import annotations
+
+import pytest
+
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_exec import (
+    climb_schedule,
+    run_openai_chat_climb,
+    run_profile_to_csv,
+)
+from vllm_cibench.testsuites.perf_profile import profile_from_dict
+
+
+def test_climb_schedule() -> None:
+    assert climb_schedule(1, 2, 16) == [1, 2, 4, 8, 16]
+    assert climb_schedule(1, 3, 10) == [1, 3, 9, 10]
+    assert climb_schedule(2, 1.1, 4) == [2, 3, 4]
+    assert climb_schedule(8, 2, 4) == [4]
+    with pytest.raises(ValueError):
+        climb_schedule(1, 1.0, 4)
+
+
+def test_profile_from_dict_climb_fields() -> None:
+    pf = profile_from_dict(
+        {
+            "control_method": "climb",
+            "growth_rate": 2,
+            "growth_interval_ms": 250,
+            "init_concurrency": 2,
+            "concurrency": [2, 8],
+        }
+    )
+    assert pf.control_method == "climb" and pf.growth_interval_ms == 250
+    assert pf.init_concurrency == 2 and pf.growth_rate == 2.0
+    with pytest.raises(ValueError):
+        profile_from_dict({"control_method": "zigzag"})
+
+
+@pytest.mark.perf
+def test_climb_run_reports_per_step(openai_stub) -> None:
+    openai_stub.delay_s = 0.01
+    steps = run_openai_chat_climb(
+        openai_stub.base_url,
+        "m",
+        prompt_len=16,
+        schedule=[1, 2, 4],
+        interval_s=0.2,
+    )
+    assert [s.concurrency for s in steps] == [1, 2, 4]
+    assert all(s.stats.requests and not s.stats.failures for s in steps)
+    # 更高并发阶梯在相同时长内完成更多请求
+    assert steps[2].stats.requests > steps[0].stats.requests
+
+
+@pytest.mark.perf
+def test_profile_csv_climb_rows(openai_stub) -> None:
+    openai_stub.delay_s = 0.005
+    pf = profile_from_dict(
+        {
+            "control_method": "climb",
+            "growth_rate": 2,
+            "growth_interval_ms": 100,
+            "init_concurrency": 1,
+            "concurrency": [1, 4],
+            "input_length": [16],
+            "output_length": [8],
+            "warmup": 0,
+        }
+    )
+    rows = parse_perf_csv(run_profile_to_csv(openai_stub.base_url, "m", pf))
+    assert [r["concurrency"] for r in rows] == [1, 2, 4]
+    assert all(r["throughput_rps"] > 0 for r in rows)
@@ -0,0 +1,59 @@
+"""perf_exec 执行引擎（thread/asyncio）测试。"""
+
+from __future__ import annotations
+
+import pytest
+
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_exec import (
+    get_batch_runner,
+    run_openai_chat_batch,
+    run_openai_chat_batch_async,
+    run_profile_to_csv,
+)
+from vllm_cibench.testsuites.perf_profile import PerfProfile, profile_from_dict
+
+
+@pytest.mark.perf
+def test_async_batch_counts(openai_stub) -> None:
+    lat, fail, dur = run_openai_chat_batch_async(
+        openai_stub.base_url, "m", prompt_len=16, n_requests=20, concurrency=8
+    )
+    assert len(lat) == 20 and fail == 0 and dur > 0
+    assert len(openai_stub.payloads) == 20
+
+
+@pytest.mark.perf
+def test_async_batch_failures(openai_stub) -> None:
+    openai_stub.status = 503
+    lat, fail, _ = run_openai_chat_batch_async(
+        openai_stub.base_url, "m", prompt_len=16, n_requests=5, concurrency=2
+    )
+    assert lat == [] and fail == 5
+
+
+@pytest.mark.perf
+def test_engines_produce_same_csv_schema(openai_stub) -> None:
+    pf = PerfProfile(
+        concurrency=[1, 4],
+        input_length=[32],
+        output_length=[16],
+        num_requests_per_concurrency=4,
+        warmup=0,
+    )
+    thread_csv = run_profile_to_csv(openai_stub.base_url, "m", pf)
+    pf.engine = "asyncio"
+    async_csv = run_profile_to_csv(openai_stub.base_url, "m", pf)
+    assert thread_csv.splitlines()[0] == async_csv.splitlines()[0]
+    rows = parse_perf_csv(async_csv)
+    assert [r["concurrency"] for r in rows] == [1, 4]
+    assert all(r["throughput_rps"] > 0 for r in rows)
+
+
+def test_profile_from_dict_engine() -> None:
+    pf = profile_from_dict({"concurrency": [1], "engine": "asyncio"})
+    assert pf.engine == "asyncio"
+    assert profile_from_dict({}, engine="thread").engine == "thread"
+    assert get_batch_runner("thread") is run_openai_chat_batch
+    with pytest.raises(ValueError):
+        profile_from_dict({"engine": "gevent"})
@@ -0,0 +1,62 @@
+"""perf_exec 输入×输出长度全量扫描与输出长度强制测试。"""
+
+from __future__ import annotations
+
+import pytest
+
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_exec import (
+    RequestRecord,
+    length_params,
+    run_profile_to_csv,
+    summarize_records,
+)
+from vllm_cibench.testsuites.perf_profile import profile_from_dict
+
+
+def test_token_throughput_summary() -> None:
+    recs = [
+        RequestRecord(0.0, 1.0, True, output_tokens=10, input_tokens=100),
+        RequestRecord(0.0, 2.0, True, output_tokens=30, input_tokens=100),
+        RequestRecord(0.0, 0.1, False),
+    ]
+    out = summarize_records(recs, duration_s=2.0)
+    assert out["input_tps"] == pytest.approx(100.0)
+    assert out["output_tps"] == pytest.approx(20.0)
+    assert out["total_tps"] == pytest.approx(120.0)
+    # 单请求输出速率：10 tok/s 与 15 tok/s
+    assert out["request_output_tps_avg"] == pytest.approx(12.5)
+    # 无 usage 时不输出 token 吞吐
+    assert "input_tps" not in summarize_records(recs[2:], duration_s=1.0)
+
+
+def test_length_params() -> None:
+    assert length_params(64) == {"max_tokens": 64, "ignore_eos": True, "min_tokens": 64}
+    assert length_params(64, ignore_eos=False) == {"max_tokens": 64}
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize("stream", [False, True])
+def test_profile_sweeps_full_length_grid(openai_stub, stream: bool) -> None:
+    pf = profile_from_dict(
+        {
+            "concurrency": [1, 2],
+            "input_length": [8, 32],
+            "output_length": [3, 5, 7],
+            "num_requests_per_concurrency": 2,
+            "warmup": 0,
+            "stream": stream,
+        }
+    )
+    rows = parse_perf_csv(run_profile_to_csv(openai_stub.base_url, "m", pf))
+    grid = {(r["input_len"], r["output_len"], r["concurrency"]) for r in rows}
+    assert len(rows) == 12 and len(grid) == 12
+    for r in rows:
+        assert r["output_tokens_avg"] == float(r["output_len"])
+        assert r["output_tps"] == pytest.approx(
+            r["output_tokens_avg"] * r["throughput_rps"], rel=0.01
+        )
+        assert r["total_tps"] == pytest.approx(r["input_tps"] + r["output_tps"], 0.01)
+        assert r["request_output_tps_p50"] > 0
+    sent = openai_stub.payloads[-1]
+    assert sent["max_tokens"] == 7 and sent["min_tokens"] == 7 and sent["ignore_eos"]
@@ -0,0 +1,78 @@
+"""perf_exec 开环 request-rate（Poisson/constant）模式测试。"""
+
+from __future__ import annotations
+
+import itertools
+import statistics
+from typing import List
+
+import pytest
+
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_exec import (
+    RequestRecord,
+    arrival_gaps,
+    run_openai_chat_open_loop,
+    run_profile_to_csv,
+)
+from vllm_cibench.testsuites.perf_profile import profile_from_dict
+
+
+def test_arrival_gaps_constant_and_poisson() -> None:
+    assert list(itertools.islice(arrival_gaps(4.0, "constant"), 3)) == [0.25] * 3
+    gaps = list(itertools.islice(arrival_gaps(10.0, "poisson", seed=1), 4000))
+    assert statistics.fmean(gaps) == pytest.approx(0.1, rel=0.1)
+    again = list(itertools.islice(arrival_gaps(10.0, "poisson", seed=1), 4000))
+    assert gaps == again
+    with pytest.raises(ValueError):
+        next(arrival_gaps(0.0, "poisson"))
+    with pytest.raises(ValueError):
+        next(arrival_gaps(1.0, "bursty"))
+
+
+def test_profile_from_dict_rate() -> None:
+    pf = profile_from_dict(
+        {"control_method": "rate", "request_rate": [5, 10], "arrival": "constant"}
+    )
+    assert pf.request_rate == [5.0, 10.0] and pf.arrival == "constant"
+    with pytest.raises(ValueError):
+        profile_from_dict({"control_method": "rate"})
+
+
+@pytest.mark.perf
+def test_open_loop_does_not_wait_for_inflight(openai_stub) -> None:
+    # 服务端每请求 0.2s；开环 50 QPS 下应远多于 1 个在途请求
+    openai_stub.delay_s = 0.2
+    recs: List[RequestRecord] = []
+    lat, fail, dur = run_openai_chat_open_loop(
+        openai_stub.base_url,
+        "m",
+        prompt_len=8,
+        n_requests=10,
+        request_rate=50.0,
+        arrival="constant",
+        on_record=recs.append,
+    )
+    assert len(lat) == 10 and fail == 0
+    # 闭环单并发需要 >= 2s；开环约 0.2s + 9/50s
+    assert dur < 1.5
+    starts = sorted(r.start_s for r in recs)
+    assert starts[-1] - starts[0] == pytest.approx(9 / 50.0, abs=1e-6)
+
+
+@pytest.mark.perf
+def test_profile_csv_rate_rows(openai_stub) -> None:
+    pf = profile_from_dict(
+        {
+            "control_method": "rate",
+            "request_rate": [20, 40],
+            "arrival": "poisson",
+            "num_requests_per_concurrency": 6,
+            "input_length": [8],
+            "output_length": [8],
+            "warmup": 0,
+        }
+    )
+    rows = parse_perf_csv(run_profile_to_csv(openai_stub.base_url, "m", pf))
+    assert [r["request_rate"] for r in rows] == [20.0, 40.0]
+    assert all(r["concurrency"] == 0 and r["latency_p50_ms"] > 0 for r in rows)
@@ -0,0 +1,98 @@
+"""perf_exec 流式模式：TTFT/ITL/TPOT 打点与 CSV 列测试。"""
+
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+
+from vllm_cibench.metrics.pushgateway import metrics_from_perf_records
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_exec import (
+    RequestRecord,
+    _StreamTimer,
+    run_openai_chat_batch,
+    run_openai_chat_batch_async,
+    run_profile_to_csv,
+    summarize_records,
+)
+from vllm_cibench.testsuites.perf_profile import PerfProfile
+
+
+def test_record_derived_latencies() -> None:
+    rec = RequestRecord(
+        start_s=10.0, end_s=10.5, ok=True, first_token_s=10.1, output_tokens=5
+    )
+    assert rec.latency_ms == pytest.approx(500.0)
+    assert rec.ttft_ms == pytest.approx(100.0)
+    assert rec.tpot_ms == pytest.approx(100.0)
+    assert RequestRecord(0.0, 1.0, True).ttft_ms is None
+
+
+def test_stream_timer_prefers_usage() -> None:
+    timer = _StreamTimer(0.0)
+    timer.observe({"choices": [{"delta": {"role": "assistant"}}]}, 0.05)
+    timer.observe({"choices": [{"delta": {"content": "a"}}]}, 0.1)
+    timer.observe({"choices": [{"delta": {"content": "b"}}]}, 0.3)
+    timer.observe({"choices": [], "usage": {"completion_tokens": 7}}, 0.31)
+    rec = timer.record(0.4, ok=True)
+    assert rec.ttft_ms == pytest.approx(100.0)
+    assert rec.itl_ms == [pytest.approx(200.0)]
+    assert rec.output_tokens == 7
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize("runner", [run_openai_chat_batch, run_openai_chat_batch_async])
+def test_stream_batch_records(openai_stub, runner) -> None:
+    recs: List[RequestRecord] = []
+    lat, fail, _ = runner(
+        openai_stub.base_url,
+        "m",
+        prompt_len=16,
+        n_requests=6,
+        concurrency=3,
+        stream=True,
+        on_record=recs.append,
+    )
+    assert len(lat) == 6 and fail == 0 and len(recs) == 6
+    for r in recs:
+        assert r.ttft_ms is not None and len(r.itl_ms) == 3 and r.output_tokens == 4
+    sent = openai_stub.payloads[0]
+    assert sent["stream"] is True and sent["stream_options"]["include_usage"]
+
+
+def test_summarize_records_stream_columns() -> None:
+    recs = [
+        RequestRecord(
+            0.0, 1.0, True, first_token_s=0.2, itl_ms=[10.0], output_tokens=3
+        ),
+        RequestRecord(
+            0.0, 2.0, True, first_token_s=0.4, itl_ms=[30.0], output_tokens=3
+        ),
+        RequestRecord(0.0, 0.1, False),
+    ]
+    out = summarize_records(recs, duration_s=2.0)
+    assert out["ttft_p50_ms"] == pytest.approx(300.0)
+    assert out["itl_avg_ms"] == pytest.approx(20.0)
+    assert out["tpot_p99_ms"] > out["tpot_p50_ms"]
+    # 吞吐只计成功请求
+    assert out["throughput_rps"] == pytest.approx(1.0)
+    assert out["fail_rate"] == pytest.approx(1 / 3)
+
+
+@pytest.mark.perf
+def test_profile_csv_stream_vs_nonstream(openai_stub) -> None:
+    pf = PerfProfile(
+        concurrency=[2],
+        input_length=[16],
+        output_length=[8],
+        num_requests_per_concurrency=4,
+        warmup=0,
+        stream=True,
+    )
+    rows = parse_perf_csv(run_profile_to_csv(openai_stub.base_url, "m", pf))
+    assert rows[0]["ttft_p99_ms"] > 0 and "tpot_p50_ms" in rows[0]
+    assert "ci_perf_ttft_p99_ms_avg" in metrics_from_perf_records(rows)
+    pf.stream = False
+    rows = parse_perf_csv(run_profile_to_csv(openai_stub.base_url, "m", pf))
+    assert "ttft_p99_ms" not in rows[0] and rows[0]["latency_p99_ms"] > 0
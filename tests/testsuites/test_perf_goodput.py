@@ -0,0 +1,82 @@
+"""goodput（逐请求 SLO 达标率与有效吞吐）测试。"""
+
+from __future__ import annotations
+
+import pytest
+
+from vllm_cibench.metrics.pushgateway import metrics_from_perf_records
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_exec import (
+    LoadStats,
+    RequestRecord,
+    run_profile_to_csv,
+)
+from vllm_cibench.testsuites.perf_profile import profile_from_dict
+from vllm_cibench.testsuites.perf_search import parse_goodput_slo, request_met_slo
+from vllm_cibench.testsuites.perf_workers import run_shard
+
+
+def _rec(ttft_s: float, end_s: float, tokens: int, ok: bool = True) -> RequestRecord:
+    return RequestRecord(0.0, end_s, ok, first_token_s=ttft_s, output_tokens=tokens)
+
+
+def test_request_met_slo() -> None:
+    slo = {"ttft_ms": 500.0, "tpot_ms": 50.0}
+    assert request_met_slo(_rec(0.2, 1.0, 20), slo)
+    assert not request_met_slo(_rec(0.6, 1.0, 20), slo)  # TTFT 超标
+    assert not request_met_slo(_rec(0.2, 3.0, 20), slo)  # TPOT 超标
+    assert not request_met_slo(_rec(0.2, 1.0, 20, ok=False), slo)
+    # 单 token 无解码阶段，TPOT 视为达标；非流式缺 TTFT 不达标
+    assert request_met_slo(_rec(0.2, 0.3, 1), slo)
+    assert not request_met_slo(RequestRecord(0.0, 1.0, True), slo)
+    with pytest.raises(ValueError):
+        parse_goodput_slo({"itl_ms": 1})
+    with pytest.raises(ValueError):
+        profile_from_dict({"goodput_slo": {"ttft_ms": -1}})
+
+
+def test_load_stats_goodput_summary_and_merge() -> None:
+    stats = LoadStats(goodput_slo={"latency_ms": 1500.0})
+    for rec in (_rec(0.1, 1.0, 10), _rec(0.1, 2.0, 30), _rec(0.1, 1.0, 5, ok=False)):
+        stats.add(rec)
+    summary = stats.summary(2.0)
+    assert summary["slo_attainment_pct"] == pytest.approx(100.0 / 3)
+    assert summary["goodput_rps"] == 0.5 and summary["goodput_tps"] == 5.0
+    back = LoadStats.from_dict(stats.to_dict())
+    assert back.goodput_slo == stats.goodput_slo and back.good_requests == 1
+    back.merge(stats)
+    assert back.summary(4.0)["goodput_tps"] == 5.0
+    assert "goodput_rps" not in LoadStats().summary(1.0)
+
+
+@pytest.mark.perf
+def test_goodput_in_csv_metrics_and_shards(openai_stub) -> None:
+    pf = profile_from_dict(
+        {
+            "concurrency": [2],
+            "input_length": [8],
+            "output_length": [4],
+            "num_requests_per_concurrency": 4,
+            "warmup": 0,
+            "stream": True,
+            "goodput_slo": {"ttft_ms": 60000, "latency_ms": 60000},
+        }
+    )
+    rows = parse_perf_csv(run_profile_to_csv(openai_stub.base_url, "m", pf))
+    assert rows[0]["slo_attainment_pct"] == 100.0
+    assert rows[0]["goodput_rps"] == pytest.approx(rows[0]["throughput_rps"], rel=0.01)
+    agg = metrics_from_perf_records(rows)
+    assert agg["ci_perf_slo_attainment_pct_avg"] == 100.0
+    assert agg["ci_perf_goodput_tps_avg"] > 0
+    stats, _ = run_shard(
+        "batch",
+        {
+            "base_url": openai_stub.base_url,
+            "model": "m",
+            "prompt": "hi",
+            "concurrency": 1,
+            "n_requests": 2,
+        },
+        goodput_slo={"latency_ms": 60000},
+    )
+    assert stats[0].good_requests == 2
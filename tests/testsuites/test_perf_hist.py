@@ -0,0 +1,75 @@
+"""perf_hist 可合并时延直方图测试。"""
+
+from __future__ import annotations
+
+import json
+import random
+
+import pytest
+
+from vllm_cibench.testsuites.perf_exec import LoadStats, RequestRecord
+from vllm_cibench.testsuites.perf_hist import LatencyHistogram
+
+
+def _exact(values, pct):
+    vs = sorted(values)
+    k = pct / 100.0 * (len(vs) - 1)
+    f = int(k)
+    c = min(f + 1, len(vs) - 1)
+    return vs[f] if f == c else vs[f] * (c - k) + vs[c] * (k - f)
+
+
+def test_percentiles_within_relative_error() -> None:
+    rng = random.Random(7)
+    values = [rng.lognormvariate(4.0, 1.0) for _ in range(20000)]
+    h = LatencyHistogram(precision=0.01).extend(values)
+    for pct, got in zip((50, 90, 99, 99.9), h.percentiles([50, 90, 99, 99.9])):
+        assert got == pytest.approx(_exact(values, pct), rel=0.02)
+    assert h.max == max(values) and h.min == min(values)
+    assert h.mean == pytest.approx(sum(values) / len(values))
+    # 内存与样本数无关：桶数远小于样本数
+    assert len(h.buckets) < 2000
+
+
+def test_small_samples_match_interpolation() -> None:
+    h = LatencyHistogram().extend([200.0, 400.0])
+    assert h.percentile(50) == pytest.approx(300.0)
+    assert LatencyHistogram().percentile(99) == 0.0
+    h0 = LatencyHistogram().extend([0.0, 0.0, 5.0])
+    assert h0.percentile(0) == 0.0 and h0.percentile(100) == 5.0
+
+
+def test_merge_is_exact_and_serializable() -> None:
+    rng = random.Random(1)
+    a_vals = [rng.uniform(1, 500) for _ in range(3000)]
+    b_vals = [rng.uniform(100, 2000) for _ in range(3000)]
+    whole = LatencyHistogram().extend(a_vals + b_vals)
+    a = LatencyHistogram().extend(a_vals)
+    b = LatencyHistogram.from_dict(
+        json.loads(json.dumps(LatencyHistogram().extend(b_vals).to_dict()))
+    )
+    merged = a.merge(b)
+    assert merged.buckets == whole.buckets and merged.count == whole.count
+    assert merged.percentiles([50, 99]) == whole.percentiles([50, 99])
+    with pytest.raises(ValueError):
+        merged.merge(LatencyHistogram(precision=0.05))
+    with pytest.raises(ValueError):
+        LatencyHistogram(precision=0.0)
+
+
+def test_load_stats_merge_roundtrip() -> None:
+    a, b = LoadStats(), LoadStats()
+    a.add(
+        RequestRecord(0.0, 0.1, True, first_token_s=0.02, itl_ms=[5.0], output_tokens=2)
+    )
+    b.add(RequestRecord(0.0, 0.3, True, output_tokens=4))
+    b.add(RequestRecord(0.0, 0.1, False, error="http_5xx"))
+    merged = LoadStats.from_dict(json.loads(json.dumps(a.to_dict()))).merge(b)
+    out = merged.summary(duration_s=1.0)
+    assert merged.requests == 3 and merged.failures == 1
+    assert merged.errors == {"http_5xx": 1}
+    # 吞吐只计成功请求
+    assert out["throughput_rps"] == pytest.approx(2.0)
+    assert out["latency_max_ms"] == pytest.approx(300.0)
+    assert out["output_tokens_avg"] == pytest.approx(3.0)
+    assert out["ttft_p50_ms"] == pytest.approx(20.0)
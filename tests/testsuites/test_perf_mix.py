@@ -0,0 +1,118 @@
+"""加权混合负载（perf_mix）与按类型分项统计的测试。"""
+
+from __future__ import annotations
+
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_exec import run_profile_to_csv
+from vllm_cibench.testsuites.perf_mix import WorkloadMix, parse_mix
+from vllm_cibench.testsuites.perf_profile import PerfProfile, profile_from_dict
+from vllm_cibench.testsuites.perf_records import read_request_log
+
+MIX = [
+    {"id": "plain", "type": "chat", "weight": 3},
+    {
+        "id": "guided",
+        "type": "chat",
+        "weight": 1,
+        "params": {"response_format": {"type": "json_object"}, "stream": False},
+    },
+    {"id": "comp", "type": "completions", "weight": 1, "params": {"logprobs": 2}},
+]
+
+
+def test_parse_mix_and_weights() -> None:
+    mix = parse_mix(MIX, seed=1)
+    assert mix is not None
+    assert [(e.name, e.kind) for e in mix.entries] == [
+        ("plain", "chat"),
+        ("guided", "chat"),
+        ("comp", "completions"),
+    ]
+    # 用例中的 stream 由档位决定，被丢弃
+    assert mix.entries[1].params == {"response_format": {"type": "json_object"}}
+    counts = Counter(mix.pick().name for _ in range(2000))
+    assert counts["plain"] > counts["guided"] + counts["comp"]
+    # 还原后的抽取序列与同种子的新实例一致（可复现）
+    back = WorkloadMix.from_dict(mix.to_dict())
+    fresh = parse_mix(MIX, seed=1)
+    assert fresh is not None
+    assert [back.pick().name for _ in range(20)] == [
+        fresh.pick().name for _ in range(20)
+    ]
+    assert parse_mix(None) is None
+    only = parse_mix(None, backend="openai-completions")
+    assert only is not None and only.entries[0].kind == "completions"
+
+
+def test_parse_mix_errors() -> None:
+    with pytest.raises(ValueError):
+        parse_mix(None, backend="grpc")
+    with pytest.raises(ValueError):
+        parse_mix([{"id": "a", "type": "embeddings"}])
+    with pytest.raises(ValueError):
+        parse_mix([{"type": "chat"}])
+    with pytest.raises(ValueError):
+        parse_mix([{"id": "a", "type": "chat", "weight": 0}])
+    with pytest.raises(ValueError):
+        parse_mix([{"id": "a", "type": "chat"}, {"id": "a", "type": "completions"}])
+    with pytest.raises(ValueError):
+        profile_from_dict({"control_method": "session", "mix": MIX})
+    assert profile_from_dict({"mix": MIX}).mix is not None
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize("engine", ["thread", "asyncio"])
+def test_profile_csv_mixed_breakdown(openai_stub, tmp_path: Path, engine: str) -> None:
+    pf = PerfProfile(
+        concurrency=[4],
+        input_length=[16],
+        output_length=[4],
+        num_requests_per_concurrency=30,
+        warmup=0,
+        engine=engine,
+        stream=True,
+        mix=parse_mix(MIX, seed=3),
+    )
+    rows = parse_perf_csv(
+        run_profile_to_csv(openai_stub.base_url, "m", pf, artifacts_dir=str(tmp_path))
+    )
+    assert len(rows) == 1 and rows[0]["ttft_p99_ms"] > 0
+    sent = Counter("prompt" in p for p in openai_stub.payloads)
+    guided = [p for p in openai_stub.payloads if "response_format" in p]
+    assert sent[True] > 0 and guided and all(p["stream"] for p in guided)
+    logged = read_request_log(str(tmp_path / "requests_perf.csv"))
+    types = Counter(r["request_type"] for r in logged)
+    assert sum(types.values()) == 30 and set(types) <= {"plain", "guided", "comp"}
+    summary = read_request_log(str(tmp_path / "summary_perf.csv"))
+    assert summary[0]["request_type"] == "" and summary[0]["requests"] == "30"
+    per_type = {r["request_type"]: int(r["requests"]) for r in summary[1:]}
+    assert per_type == dict(types)
+
+
+@pytest.mark.perf
+def test_mixed_breakdown_uses_steady_window(openai_stub, tmp_path: Path) -> None:
+    openai_stub.delay_s = 0.05
+    pf = PerfProfile(
+        concurrency=[4],
+        input_length=[8],
+        output_length=[4],
+        num_requests_per_concurrency=60,
+        warmup=0,
+        engine="asyncio",
+        mix=parse_mix(MIX, seed=5),
+        steady_state=True,
+        timeline_bucket_s=0.05,
+    )
+    run_profile_to_csv(openai_stub.base_url, "m", pf, artifacts_dir=str(tmp_path))
+    summary = read_request_log(str(tmp_path / "summary_perf.csv"))
+    total = int(summary[0]["requests"])
+    # 分项与整体按同一稳态窗口裁剪：分项请求数之和等于整体，吞吐之和亦相等
+    assert 0 < total <= 60
+    assert sum(int(r["requests"]) for r in summary[1:]) == total
+    qps = sum(float(r["qps"]) for r in summary[1:])
+    assert qps == pytest.approx(float(summary[0]["qps"]), abs=0.01)
@@ -0,0 +1,74 @@
+"""perf_prefix 共享前缀负载与按共享比例测量的测试。"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_exec import run_profile_to_csv
+from vllm_cibench.testsuites.perf_prefix import PrefixWorkload
+from vllm_cibench.testsuites.perf_profile import PerfProfile, profile_from_dict
+from vllm_cibench.testsuites.perf_records import read_request_log
+
+
+def test_split_and_messages() -> None:
+    wl = PrefixWorkload.split("abcdefghij", 0.3)
+    assert (wl.prefix, wl.suffix) == ("abc", "defghij")
+    first, second = wl.messages(), wl.messages()
+    assert first[0] == second[0] == {"role": "system", "content": "abc"}
+    # 独立后缀带逐请求 nonce，互不相同
+    assert first[1]["content"] != second[1]["content"]
+    assert first[1]["content"].endswith("defghij")
+    # share=0：无 system 消息；关闭 nonce 时请求完全相同
+    same = PrefixWorkload.split("xyz", 0.0, nonce=False)
+    assert same.messages() == same.messages() == [{"role": "user", "content": "xyz"}]
+    with pytest.raises(ValueError):
+        PrefixWorkload.split("x", 1.5)
+    with pytest.raises(ValueError):
+        PrefixWorkload.split("x", 0.5, group_size=-1)
+
+
+def test_group_size_rotates_prefix_and_round_trip() -> None:
+    wl = PrefixWorkload.split("p" * 10, 0.5, group_size=2)
+    systems = [wl.messages()[0]["content"] for _ in range(5)]
+    assert systems[0] == systems[1] != systems[2] == systems[3] != systems[4]
+    back = PrefixWorkload.from_dict(wl.to_dict())
+    assert back.to_dict() == wl.to_dict()
+    # 新实例使用新的随机盐，不与原实例共享缓存
+    assert back.messages()[0]["content"] != systems[0]
+
+
+def test_profile_prefix_fields() -> None:
+    pf = profile_from_dict({"prefix_share": [0, 0.5], "prefix_group_size": 4})
+    assert pf.prefix_share == [0.0, 0.5] and pf.prefix_group_size == 4
+    assert pf.prefix_nonce is True
+    with pytest.raises(ValueError):
+        profile_from_dict({"prefix_share": [2]})
+    with pytest.raises(ValueError):
+        profile_from_dict({"prefix_share": [0.5], "prefix_group_size": -1})
+
+
+@pytest.mark.perf
+def test_profile_csv_per_share_level(openai_stub, tmp_path: Path) -> None:
+    pf = PerfProfile(
+        concurrency=[2],
+        input_length=[64],
+        output_length=[4],
+        num_requests_per_concurrency=4,
+        warmup=0,
+        stream=True,
+        prefix_share=[0.0, 0.9],
+    )
+    rows = parse_perf_csv(
+        run_profile_to_csv(openai_stub.base_url, "m", pf, artifacts_dir=str(tmp_path))
+    )
+    assert [r["prefix_share"] for r in rows] == [0.0, 0.9]
+    assert all(r["ttft_p99_ms"] > 0 for r in rows)
+    logged = read_request_log(str(tmp_path / "requests_perf.csv"))
+    assert len(logged) == 8
+    shared = [p["messages"] for p in openai_stub.payloads if len(p["messages"]) == 2]
+    assert len(shared) == 4
+    assert len({m[0]["content"] for m in shared}) == 1
+    assert len({m[1]["content"] for m in shared}) == 4
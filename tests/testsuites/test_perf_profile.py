@@ -0,0 +1,35 @@
+"""性能档位解析与校验（testsuites.perf_profile）的测试。"""
+
+from __future__ import annotations
+
+from typing import Any, Dict
+
+import pytest
+
+from vllm_cibench.testsuites.perf_profile import profile_from_dict
+
+
+@pytest.mark.parametrize(
+    "bad, field",
+    [
+        ({"steady_tolerance": 1.0}, "steady_tolerance"),
+        ({"steady_tolerance": -0.1}, "steady_tolerance"),
+        ({"ci_confidence": 1.0}, "ci_confidence"),
+        ({"ci_confidence": 0}, "ci_confidence"),
+        ({"prefix_share": [0.5, 1.5]}, "prefix_share"),
+        ({"prefix_share": [0.5], "prefix_group_size": -1}, "prefix_group_size"),
+        ({"connect_timeout_s": 0}, "connect_timeout_s"),
+        ({"read_timeout_s": -1}, "read_timeout_s"),
+        ({"control_method": "climb", "growth_rate": 1.0}, "growth_rate"),
+    ],
+)
+def test_range_checks_name_the_field(bad: Dict[str, Any], field: str) -> None:
+    with pytest.raises(ValueError, match=field):
+        profile_from_dict(bad)
+
+
+def test_defaults_parse() -> None:
+    pf = profile_from_dict({"concurrency": [1, 2], "prefix_share": [0.0, 1.0]})
+    assert pf.steady_tolerance == 0.2 and pf.ci_confidence == 0.95
+    assert pf.prefix_share == [0.0, 1.0]
+    assert (pf.connect_timeout_s, pf.read_timeout_s) == (10.0, 30.0)
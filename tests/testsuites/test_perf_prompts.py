@@ -0,0 +1,112 @@
+"""perf_prompts 提示词合成（字符级/token 级）与缓存测试。"""
+
+from __future__ import annotations
+
+import json
+from typing import List, Sequence
+
+import pytest
+
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_exec import run_profile_to_csv
+from vllm_cibench.testsuites.perf_profile import profile_from_dict
+from vllm_cibench.testsuites.perf_prompts import (
+    PromptBuilder,
+    calibrate_tokens_per_char,
+    corpus_text,
+    make_prompt,
+)
+
+
+class _WordTokenizer:
+    """测试用分词器：每个空白分隔的词（含其后空白）为一个 token。"""
+
+    def __init__(self) -> None:
+        self.vocab: List[str] = []
+
+    def encode(self, text: str) -> List[int]:
+        ids: List[int] = []
+        for word in text.split(" "):
+            if not word:
+                continue
+            self.vocab.append(word + " ")
+            ids.append(len(self.vocab) - 1)
+        return ids
+
+    def decode(self, ids: Sequence[int]) -> str:
+        return "".join(self.vocab[i] for i in ids)
+
+
+def test_make_prompt_exact_length_and_large() -> None:
+    assert make_prompt(0) == ""
+    assert len(make_prompt(37)) == 37
+    assert len(make_prompt(200_000)) == 200_000
+
+
+def test_corpus_text_seeded() -> None:
+    assert corpus_text(500, seed=1) == corpus_text(500, seed=1)
+    assert corpus_text(500, seed=1) != corpus_text(500, seed=2)
+    assert len(corpus_text(500)) >= 500
+
+
+def test_builder_tokenizer_exact_and_cached(tmp_path) -> None:
+    tok = _WordTokenizer()
+    b = PromptBuilder("org/m", tokenizer=tok, cache_dir=str(tmp_path), seed=3)
+    text = b.build(50)
+    assert len(tok.encode(text)) == 50 and b.method == "tokenizer"
+    path = b.cache_path(50)
+    assert path is not None and path.name.startswith("50_3_")
+    assert path.parent.name == "org_m"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["text"] == text and data["seed"] == 3
+    # 新实例命中磁盘缓存，无需重新分词
+    data["text"] = "cached"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    again = PromptBuilder("org/m", tokenizer=tok, cache_dir=str(tmp_path), seed=3)
+    assert again.build(50) == "cached"
+
+    # 换分词器（或标定值变化）时不复用旧文本
+    other = PromptBuilder(
+        "org/m", tokenizer=tok, cache_dir=str(tmp_path), seed=3, tokenizer_id="t2"
+    )
+    assert other.cache_path(50) != path and other.build(50) == text
+    path.write_text(json.dumps({**data, "fingerprint": "tpc:0.5000"}), "utf-8")
+    assert (
+        PromptBuilder("org/m", tokenizer=tok, cache_dir=str(tmp_path), seed=3).build(50)
+        == text
+    )
+
+
+def test_builder_chars_fallback() -> None:
+    b = PromptBuilder("m")
+    assert b.method == "chars" and b.build(16) == make_prompt(16)
+    assert b.cache_path(16) is None
+
+
+@pytest.mark.perf
+def test_calibrated_prompt_lengths(openai_stub) -> None:
+    # 桩服务 prompt_tokens = 3 + chars // 2 → 每字符 0.5 token
+    tpc = calibrate_tokens_per_char(openai_stub.base_url, "m")
+    assert tpc == pytest.approx(0.5)
+    b = PromptBuilder("m", tokens_per_char=tpc)
+    assert len(b.build(100)) == 200
+
+
+@pytest.mark.perf
+def test_profile_calibrate_prompt(openai_stub, tmp_path) -> None:
+    pf = profile_from_dict(
+        {
+            "concurrency": [1],
+            "input_length": [64],
+            "output_length": [4],
+            "num_requests_per_concurrency": 2,
+            "warmup": 0,
+            "calibrate_prompt": True,
+            "prompt_cache_dir": str(tmp_path),
+        }
+    )
+    rows = parse_perf_csv(run_profile_to_csv(openai_stub.base_url, "m", pf))
+    assert rows[0]["input_len"] == 64
+    sent = openai_stub.payloads[-1]["messages"][0]["content"]
+    assert len(sent) == 128
+    assert len(list((tmp_path / "m").glob("64_0_*.json"))) == 1
@@ -0,0 +1,86 @@
+"""perf_records 逐请求记录（requests_*）与负载点汇总（summary_*）测试。"""
+
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+
+import pytest
+
+from vllm_cibench.testsuites.perf_exec import (
+    RequestRecord,
+    run_profile_to_csv,
+    summarize_records,
+)
+from vllm_cibench.testsuites.perf_profile import PerfProfile, profile_from_dict
+from vllm_cibench.testsuites.perf_records import (
+    REQUEST_COLUMNS,
+    SUMMARY_COLUMNS,
+    RequestLogWriter,
+    read_request_log,
+    summary_row,
+)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_request_log_writer_roundtrip(tmp_path: Path, fmt: str) -> None:
+    path = tmp_path / f"requests_x.{fmt}"
+    with RequestLogWriter(str(path), fmt) as w:
+        w.write(
+            RequestRecord(1.0, 1.5, True, first_token_s=1.1, output_tokens=3),
+            concurrency=2,
+            input_len=16,
+            output_len=3,
+        )
+        w.write(RequestRecord(1.0, 1.2, False, error="HTTPError"), concurrency=2)
+    rows = read_request_log(str(path))
+    assert len(rows) == 2 and w.count == 2
+    assert set(rows[0]) == set(REQUEST_COLUMNS)
+    assert float(rows[0]["latency_ms"]) == pytest.approx(500.0)
+    assert float(rows[0]["ttft_ms"]) == pytest.approx(100.0)
+    assert rows[1]["status"] == "fail" and rows[1]["error"] == "HTTPError"
+    # 墙钟时间戳：与单调时钟差值保持一致
+    assert float(rows[0]["end_ts"]) - float(rows[0]["send_ts"]) == pytest.approx(0.5)
+
+
+def test_request_log_writer_rejects_format(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        RequestLogWriter(str(tmp_path / "r.txt"), "parquet")
+    with pytest.raises(ValueError):
+        profile_from_dict({"record_format": "parquet"})
+
+
+def test_summary_row_fields() -> None:
+    recs = [RequestRecord(0.0, x / 1000.0, True) for x in (10, 20, 30, 40)]
+    recs.append(RequestRecord(0.0, 0.005, False, error="timeout"))
+    summary = summarize_records(recs, duration_s=1.0)
+    row = summary_row(summary, requests=5, failures=1, concurrency=4)
+    # qps 只计成功请求；失败按分类计数
+    assert row["fail_rate"] == pytest.approx(0.2) and row["qps"] == 4.0
+    assert row["errors_timeout"] == 1 and row["errors_http_5xx"] == 0
+    assert row["latency_max_ms"] == pytest.approx(40.0)
+    assert set(row) <= set(SUMMARY_COLUMNS)
+
+
+@pytest.mark.perf
+def test_profile_writes_requests_and_summary(openai_stub, tmp_path: Path) -> None:
+    pf = PerfProfile(
+        concurrency=[1, 2],
+        input_length=[16],
+        output_length=[4],
+        num_requests_per_concurrency=3,
+        warmup=1,
+        stream=True,
+    )
+    run_profile_to_csv(openai_stub.base_url, "m", pf, artifacts_dir=str(tmp_path))
+    reqs = read_request_log(str(tmp_path / "requests_perf.csv"))
+    # 预热请求不写入记录
+    assert len(reqs) == 6
+    assert {r["concurrency"] for r in reqs} == {"1", "2"}
+    assert all(r["status"] == "ok" and r["output_tokens"] == "4" for r in reqs)
+    assert all(r["ttft_ms"] and int(r["input_tokens"]) > 0 for r in reqs)
+    with (tmp_path / "summary_perf.csv").open(encoding="utf-8") as fh:
+        summary = list(csv.DictReader(fh))
+    assert [r["concurrency"] for r in summary] == ["1", "2"]
+    assert all(r["requests"] == "3" and r["fail_rate"] == "0.0" for r in summary)
+    assert all(float(r["ttft_max_ms"]) >= float(r["ttft_p99_ms"]) for r in summary)
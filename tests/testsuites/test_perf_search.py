@@ -0,0 +1,84 @@
+"""perf_search SLO 容量搜索测试。"""
+
+from __future__ import annotations
+
+import pytest
+
+from vllm_cibench.metrics.pushgateway import metrics_from_perf_records
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_exec import run_profile_to_csv
+from vllm_cibench.testsuites.perf_profile import profile_from_dict
+from vllm_cibench.testsuites.perf_search import CapacitySearch, parse_slo, slo_met
+
+
+def _drive(search: CapacitySearch, limit: float) -> list:
+    seen = []
+    while (load := search.next_probe()) is not None:
+        seen.append(load)
+        search.observe(load, load <= limit)
+    return seen
+
+
+def test_integer_search_gallops_then_bisects() -> None:
+    search = CapacitySearch(low=1, high=64)
+    assert _drive(search, 11) == [1, 2, 4, 8, 16, 12, 10, 11]
+    assert search.capacity == 11
+    capped = CapacitySearch(low=1, high=6)
+    assert _drive(capped, 100) == [1, 2, 4, 6] and capped.capacity == 6
+    none = CapacitySearch(low=2, high=8)
+    assert _drive(none, 1) == [2] and none.capacity == 0
+
+
+def test_rate_search_converges_within_tolerance() -> None:
+    search = CapacitySearch(low=1.0, high=100.0, integer=False, tolerance=0.05)
+    _drive(search, 7.3)
+    assert 7.3 * 0.95 <= search.capacity <= 7.3
+    limited = CapacitySearch(low=1.0, high=100.0, integer=False, max_probes=3)
+    assert len(_drive(limited, 7.3)) == 3
+
+
+def test_slo_parsing_and_validation() -> None:
+    slo = parse_slo({"ttft_p99_ms": 2000, "fail_rate": 0.01})
+    assert slo_met({"ttft_p99_ms": 1500.0, "fail_rate": 0.0}, slo)
+    assert not slo_met({"ttft_p99_ms": 2500.0, "fail_rate": 0.0}, slo)
+    # 被约束的指标缺失视为不满足
+    assert not slo_met({"fail_rate": 0.0}, slo)
+    with pytest.raises(ValueError):
+        parse_slo({"ttft_p42_ms": 1})
+    with pytest.raises(ValueError):
+        parse_slo({"ttft_p99_ms": 0})
+    with pytest.raises(ValueError):
+        profile_from_dict({"control_method": "search"})
+    with pytest.raises(ValueError):
+        profile_from_dict({"slo": {"latency_p99_ms": 1}, "search_over": "tokens"})
+    with pytest.raises(ValueError):
+        CapacitySearch(low=4, high=2)
+    pf = profile_from_dict(
+        {
+            "control_method": "search",
+            "search_over": "rate",
+            "request_rate": [1, 50],
+            "slo": {"latency_p99_ms": 500},
+        }
+    )
+    assert (pf.search_min, pf.search_max) == (1.0, 50.0)
+
+
+@pytest.mark.perf
+def test_search_profile_reports_capacity(openai_stub) -> None:
+    pf = profile_from_dict(
+        {
+            "control_method": "search",
+            "concurrency": [1, 4],
+            "input_length": [8],
+            "output_length": [4],
+            "num_requests_per_concurrency": 4,
+            "warmup": 0,
+            "engine": "asyncio",
+            "slo": {"latency_p99_ms": 60000, "fail_rate": 0.5},
+        }
+    )
+    rows = parse_perf_csv(run_profile_to_csv(openai_stub.base_url, "m", pf))
+    assert [r["concurrency"] for r in rows] == [1, 2, 4]
+    assert all(r["slo_ok"] == 1.0 for r in rows)
+    assert metrics_from_perf_records(rows)["ci_perf_capacity_concurrency"] == 4
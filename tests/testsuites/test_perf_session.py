@@ -0,0 +1,92 @@
+"""session 控制（多轮对话、上下文增长）的测试。"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_exec import (
+    RequestRecord,
+    run_openai_chat_sessions,
+    run_profile_to_csv,
+)
+from vllm_cibench.testsuites.perf_profile import PerfProfile, profile_from_dict
+from vllm_cibench.testsuites.perf_records import read_request_log
+
+
+def test_profile_session_fields() -> None:
+    pf = profile_from_dict(
+        {"control_method": "session", "session_turns": 3, "think_time_ms": 50}
+    )
+    assert (pf.session_turns, pf.think_time_ms) == (3, 50.0)
+    with pytest.raises(ValueError):
+        profile_from_dict({"session_turns": 0})
+    with pytest.raises(ValueError):
+        profile_from_dict({"think_time_ms": -1})
+    with pytest.raises(ValueError):
+        profile_from_dict({"control_method": "session", "workers": 2})
+
+
+@pytest.mark.perf
+def test_sessions_resend_history_with_replies(openai_stub) -> None:
+    recs: List[RequestRecord] = []
+    lat, fail, dur = run_openai_chat_sessions(
+        openai_stub.base_url,
+        "m",
+        prompt="hello",
+        n_sessions=2,
+        concurrency=2,
+        turns=3,
+        think_time_s=0.01,
+        stream=True,
+        on_record=recs.append,
+    )
+    assert fail == 0 and len(lat) == 6 and dur > 0
+    assert sorted(r.turn for r in recs) == [1, 1, 2, 2, 3, 3]
+    sizes = sorted(len(p["messages"]) for p in openai_stub.payloads)
+    assert sizes == [1, 1, 3, 3, 5, 5]
+    last = max(openai_stub.payloads, key=lambda p: len(p["messages"]))["messages"]
+    # 模型实际回复（流式拼接）作为 assistant 消息进入历史
+    assert [m["role"] for m in last] == ["user", "assistant"] * 2 + ["user"]
+    assert last[1]["content"] == "t0t1t2t3"
+    assert last[4]["content"] == "[turn 3] hello"
+
+
+@pytest.mark.perf
+def test_sessions_stop_after_failure(openai_stub) -> None:
+    openai_stub.status = 500
+    recs: List[RequestRecord] = []
+    _, fail, _ = run_openai_chat_sessions(
+        openai_stub.base_url,
+        "m",
+        prompt="hi",
+        n_sessions=2,
+        concurrency=1,
+        turns=4,
+        on_record=recs.append,
+    )
+    assert fail == 2 and [r.turn for r in recs] == [1, 1]
+
+
+@pytest.mark.perf
+def test_profile_csv_rows_per_turn(openai_stub, tmp_path: Path) -> None:
+    pf = PerfProfile(
+        concurrency=[2],
+        input_length=[16],
+        output_length=[4],
+        num_requests_per_concurrency=3,
+        warmup=0,
+        stream=True,
+        control_method="session",
+        session_turns=3,
+    )
+    rows = parse_perf_csv(
+        run_profile_to_csv(openai_stub.base_url, "m", pf, artifacts_dir=str(tmp_path))
+    )
+    assert [r["turn"] for r in rows] == [1, 2, 3]
+    assert all(r["ttft_p99_ms"] > 0 for r in rows)
+    logged = read_request_log(str(tmp_path / "requests_perf.csv"))
+    assert len(logged) == 9
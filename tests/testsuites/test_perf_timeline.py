@@ -0,0 +1,72 @@
+"""perf_timeline 逐秒时间序列与稳态窗口检测的测试。"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_exec import (
+    LoadStats,
+    RequestRecord,
+    run_profile_to_csv,
+)
+from vllm_cibench.testsuites.perf_profile import PerfProfile, profile_from_dict
+from vllm_cibench.testsuites.perf_records import read_request_log
+from vllm_cibench.testsuites.perf_timeline import Timeline, steady_window
+
+
+def test_steady_window_trims_ramp_and_drain() -> None:
+    levels = [1.0, 3.0, 8.0, 8.2, 7.9, 8.1, 8.0, 4.0, 1.0]
+    assert steady_window(levels) == (2, 7)
+    assert steady_window(levels, min_buckets=6) is None
+    assert steady_window([0.0, 0.0]) is None
+    with pytest.raises(ValueError):
+        steady_window(levels, tolerance=1.0)
+    with pytest.raises(ValueError):
+        profile_from_dict({"timeline_bucket_s": 0})
+
+
+def test_timeline_buckets_and_window_stats() -> None:
+    tl = Timeline(LoadStats)
+    # 两个请求各在途 1.5 秒；一个失败请求在第 2 秒完成
+    tl.add(RequestRecord(100.0, 101.5, True, output_tokens=10))
+    tl.add(RequestRecord(100.5, 102.0, True, output_tokens=20))
+    tl.add(RequestRecord(101.0, 102.2, False))
+    assert tl.levels() == pytest.approx([1.5, 2.5, 0.2])
+    rows = tl.rows((0, 2))
+    assert [r["completions"] for r in rows] == [0, 1, 1]
+    assert [r["failures"] for r in rows] == [0, 0, 1]
+    assert rows[1]["output_tps"] == 10.0 and rows[1]["latency_p50_ms"] > 0
+    assert [r["steady"] for r in rows] == [1, 1, 0]
+    stats, dur = tl.window_stats(1, 3)
+    assert (stats.requests, stats.failures, dur) == (3, 1, 2.0)
+
+
+@pytest.mark.perf
+def test_profile_timeline_artifact_and_steady(openai_stub, tmp_path: Path) -> None:
+    openai_stub.delay_s = 0.05
+    pf = PerfProfile(
+        concurrency=[4],
+        input_length=[8],
+        output_length=[4],
+        num_requests_per_concurrency=60,
+        warmup=0,
+        engine="asyncio",
+        steady_state=True,
+        timeline_bucket_s=0.05,
+    )
+    rows = parse_perf_csv(
+        run_profile_to_csv(openai_stub.base_url, "m", pf, artifacts_dir=str(tmp_path))
+    )
+    row = rows[0]
+    assert 0 <= row["steady_start_s"] < row["steady_end_s"]
+    timeline = read_request_log(str(tmp_path / "timeline_perf.csv"))
+    assert sum(int(r["completions"]) for r in timeline) == 60
+    assert {r["concurrency"] for r in timeline} == {"4"}
+    steady = [r for r in timeline if r["steady"] == "1"]
+    assert steady and all(float(r["inflight_avg"]) > 2.0 for r in steady)
+    summary = read_request_log(str(tmp_path / "summary_perf.csv"))
+    # 稳态汇总只计入窗口内完成的请求
+    assert 0 < int(summary[0]["requests"]) <= 60
@@ -0,0 +1,111 @@
+"""perf_trace 轨迹读取/调度与 trace 回放模式测试。"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_exec import run_openai_chat_trace, run_profile_to_csv
+from vllm_cibench.testsuites.perf_profile import profile_from_dict
+from vllm_cibench.testsuites.perf_records import read_request_log
+from vllm_cibench.testsuites.perf_trace import read_trace, schedule_trace
+
+
+def _write(path: Path, rows: list) -> str:
+    lines = ["# recorded trace", ""] + [json.dumps(r) for r in rows]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_read_and_schedule_trace(tmp_path: Path) -> None:
+    path = _write(
+        tmp_path / "t.jsonl",
+        [
+            {"timestamp": 1000.0, "input_len": 16, "output_len": 4},
+            {"timestamp": 1000.5, "input_tokens": 32, "params": {"top_p": 0.5}},
+            {"offset_ms": 400, "messages": [{"role": "user", "content": "hi"}]},
+        ],
+    )
+    reqs = list(read_trace(path))
+    assert [r.line for r in reqs] == [3, 4, 5]
+    assert reqs[1].input_len == 32 and reqs[1].output_len is None
+    assert reqs[1].params == {"top_p": 0.5} and reqs[2].messages
+    # 第三行 offset 0.4s 为绝对值，相对首行（1000s）为负：调度时钳为非递减
+    offsets = [r.offset_s for r in schedule_trace(path, time_scale=2.0, loop=2)]
+    assert offsets == [0.0, 0.25, 0.25, 0.25, 0.5, 0.5]
+    assert len(list(schedule_trace(path, loop=3, max_requests=4))) == 4
+    with pytest.raises(ValueError):
+        list(schedule_trace(path, time_scale=0))
+    bad = _write(tmp_path / "bad.jsonl", [{"input_len": 3}])
+    with pytest.raises(ValueError, match="line 3"):
+        list(read_trace(bad))
+
+
+def test_trace_profile_validation() -> None:
+    with pytest.raises(ValueError):
+        profile_from_dict({"control_method": "trace"})
+    with pytest.raises(ValueError):
+        profile_from_dict(
+            {"control_method": "trace", "trace_path": "t.jsonl", "workers": 2}
+        )
+    with pytest.raises(ValueError):
+        profile_from_dict({"trace_loop": 0})
+
+
+@pytest.mark.perf
+def test_run_trace_replays_lengths_and_params(openai_stub, tmp_path: Path) -> None:
+    path = _write(
+        tmp_path / "t.jsonl",
+        [
+            {"offset_ms": 0, "input_len": 40, "output_len": 3},
+            {"offset_ms": 20, "input_len": 10, "params": {"temperature": 0.9}},
+        ],
+    )
+    recs = []
+    _, fail, dur = run_openai_chat_trace(
+        openai_stub.base_url,
+        "m",
+        trace=schedule_trace(path),
+        on_record=recs.append,
+    )
+    assert fail == 0 and len(recs) == 2 and dur >= 0.02
+    # 桩服务按内容长度报告 prompt_tokens：长输入对应更多 token
+    assert recs[0].input_tokens > recs[1].input_tokens
+
+
+@pytest.mark.perf
+def test_trace_profile_to_csv(openai_stub, tmp_path: Path) -> None:
+    path = _write(
+        tmp_path / "t.jsonl",
+        [{"offset_ms": i * 10, "input_len": 8, "output_len": 2} for i in range(5)],
+    )
+    pf = profile_from_dict(
+        {
+            "control_method": "trace",
+            "trace_path": path,
+            "trace_time_scale": 2.0,
+            "trace_loop": 2,
+            "warmup": 0,
+        }
+    )
+    rows = parse_perf_csv(
+        run_profile_to_csv(openai_stub.base_url, "m", pf, artifacts_dir=str(tmp_path))
+    )
+    assert len(rows) == 1 and rows[0]["input_len"] == 0
+    assert rows[0]["request_rate"] > 0
+    assert len(read_request_log(str(tmp_path / "requests_perf.csv"))) == 10
+
+
+@pytest.mark.perf
+def test_trace_request_rate_counts_gaps(openai_stub, tmp_path: Path) -> None:
+    path = _write(
+        tmp_path / "t.jsonl",
+        [{"offset_ms": i * 100, "input_len": 8, "output_len": 2} for i in range(5)],
+    )
+    pf = profile_from_dict({"control_method": "trace", "trace_path": path})
+    rows = parse_perf_csv(run_profile_to_csv(openai_stub.base_url, "m", pf))
+    # 5 个到达、4 个 100ms 间隔 → 10 req/s
+    assert rows[0]["request_rate"] == pytest.approx(10.0)
@@ -0,0 +1,138 @@
+"""perf_workers 多进程分片执行与结果合并测试。"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from vllm_cibench.run import app
+from vllm_cibench.testsuites.perf import parse_perf_csv
+from vllm_cibench.testsuites.perf_exec import LoadStats, LoadStep, run_profile_to_csv
+from vllm_cibench.testsuites.perf_profile import PerfProfile, profile_from_dict
+from vllm_cibench.testsuites.perf_records import read_request_log
+from vllm_cibench.testsuites.perf_workers import (
+    batch_shards,
+    climb_shards,
+    open_loop_shards,
+    run_shard,
+    run_sharded,
+    split_counts,
+)
+
+
+def test_split_counts_and_shards() -> None:
+    assert split_counts(10, 3) == [4, 3, 3]
+    assert split_counts(1, 3) == [1, 0, 0]
+    common = {"base_url": "u", "model": "m"}
+    shards = batch_shards(
+        common, engine="asyncio", concurrency=3, n_requests=8, workers=4
+    )
+    assert [(s["concurrency"], s["n_requests"]) for s in shards] == [
+        (1, 2),
+        (1, 2),
+        (1, 2),
+    ]
+    rates = open_loop_shards(
+        common, request_rate=10.0, n_requests=5, arrival="poisson", seed=2, workers=2
+    )
+    assert [r["request_rate"] for r in rates] == [6.0, 4.0]
+    assert [r["seed"] for r in rates] == [2000, 2001]
+    climb = climb_shards(common, schedule=[1, 2, 4], interval_s=0.1, workers=2)
+    assert [c["schedule"] for c in climb] == [[1, 1, 2], [0, 1, 2]]
+    with pytest.raises(ValueError):
+        profile_from_dict({"workers": 0})
+
+
+@pytest.mark.perf
+def test_run_shard_in_process(openai_stub) -> None:
+    seen = []
+    stats, dur = run_shard(
+        "batch",
+        {
+            "base_url": openai_stub.base_url,
+            "model": "m",
+            "prompt": "hi",
+            "engine": "asyncio",
+            "concurrency": 2,
+            "n_requests": 4,
+        },
+        emit=lambda idx, rec: seen.append(idx),
+    )
+    assert stats[0].requests == 4 and seen == [0, 0, 0, 0] and dur > 0
+    with pytest.raises(ValueError):
+        run_shard("zigzag", {})
+
+
+@pytest.mark.perf
+def test_run_sharded_merges_processes(openai_stub) -> None:
+    step = LoadStep(4, duration_s=0.0, stats=LoadStats())
+    recs = []
+    shards = batch_shards(
+        {"base_url": openai_stub.base_url, "model": "m", "prompt": "hi"},
+        engine="asyncio",
+        concurrency=4,
+        n_requests=10,
+        workers=2,
+    )
+    dur = run_sharded("batch", shards, [step], on_record=lambda s, r: recs.append(r))
+    assert step.stats.requests == 10 and step.stats.failures == 0 and dur > 0
+    assert len(recs) == 10 and step.stats.latency.count == 10
+
+
+@pytest.mark.perf
+def test_run_sharded_reports_worker_error() -> None:
+    step = LoadStep(1, duration_s=0.0)
+    with pytest.raises(RuntimeError):
+        run_sharded("zigzag", [{}], [step])
+
+
+@pytest.mark.perf
+def test_profile_csv_with_workers(openai_stub, tmp_path: Path) -> None:
+    pf = PerfProfile(
+        concurrency=[4],
+        input_length=[8],
+        output_length=[4],
+        num_requests_per_concurrency=8,
+        warmup=0,
+        engine="asyncio",
+        stream=True,
+        workers=2,
+    )
+    rows = parse_perf_csv(
+        run_profile_to_csv(openai_stub.base_url, "m", pf, artifacts_dir=str(tmp_path))
+    )
+    assert rows[0]["concurrency"] == 4 and rows[0]["ttft_p99_ms"] > 0
+    assert len(read_request_log(str(tmp_path / "requests_perf.csv"))) == 8
+
+
+@pytest.mark.parametrize(
+    "profile, workers",
+    [
+        ("control_method: trace\ntrace_path: t.jsonl\n", "4"),
+        ("control_method: session\nconcurrency: [1]\n", "2"),
+        ("concurrency: [1]\n", "0"),
+    ],
+)
+def test_cli_workers_override_is_validated(
+    tmp_path: Path, profile: str, workers: str
+) -> None:
+    prof = tmp_path / "p.yaml"
+    prof.write_text(profile, encoding="utf-8")
+    args = ["run-perf", "--base-url", "http://127.0.0.1:1/v1", "--model", "m"]
+    args += ["--profile", str(prof), "--workers", workers]
+    res = CliRunner().invoke(app, args + ["--out", str(tmp_path / "o.csv")])
+    # 覆盖后的进程数同样经档位校验，非法组合以参数错误退出而不是静默单进程运行
+    assert res.exit_code == 2, res.output
+    assert not (tmp_path / "o.csv").exists()
+
+
+def test_cli_agents_override_is_validated(tmp_path: Path) -> None:
+    prof = tmp_path / "p.yaml"
+    prof.write_text("concurrency: [1]\n", encoding="utf-8")
+    args = ["run-perf", "--base-url", "http://127.0.0.1:1/v1", "--model", "m"]
+    args += ["--profile", str(prof), "--agents", "h1:notaport"]
+    res = CliRunner().invoke(app, args + ["--out", str(tmp_path / "o.csv")])
+    assert res.exit_code == 2, res.output
+    assert not (tmp_path / "o.csv").exists()